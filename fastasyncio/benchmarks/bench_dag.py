@@ -0,0 +1,133 @@
+import asyncio
+import gc
+import logging
+import os
+import random
+import sys
+import time
+import tracemalloc
+from unittest.mock import patch
+
+# Compares the TaskDag used by generic_job_handler_dag with the networkx.DiGraph it replaced, on layered DAGs of
+# 1k to 100k tasks in which every task depends on up to three tasks of the previous layer:
+#   - build: constructing the graph and sorting it topologically;
+#   - memory: memory held by the built graph, and the peak allocated while building, measured with tracemalloc;
+#   - schedule: one pass of the indegree-counting scheduler of run_tasks, without executing tasks;
+#   - handler: running GenericJobHandler over no-op tasks, per task, with the DAG compiled beforehand (TaskDag only).
+# networkx is optional; without it only the TaskDag figures are printed.
+#
+# Usage:
+#     python benchmarks/bench_dag.py [max_tasks]
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from joborchrestrator.dag import TaskDag
+from joborchrestrator.handler.generic_job_handler_dag import GenericJobHandler
+
+try:
+    import networkx as nx
+except ImportError:
+    nx = None
+
+WIDTH = 100
+SIZES = (1_000, 10_000, 100_000)
+
+
+def generate_tasks(count, seed=0):
+    """Builds a layered DAG of `count` tasks, `WIDTH` per layer, each depending on up to three of the previous."""
+    rng = random.Random(seed)
+    tasks = []
+    for index in range(count):
+        layer = index // WIDTH
+        dependencies = [f"Task{(layer - 1) * WIDTH + dep}" for dep in rng.sample(range(WIDTH), 3)] if layer else []
+        tasks.append({"name": f"Task{index}", "dependencies": dependencies})
+    return tasks
+
+
+def build_networkx(tasks):
+    graph = nx.DiGraph()
+    for task in tasks:
+        graph.add_node(task["name"])
+        for dep in task.get("dependencies", []):
+            graph.add_edge(dep, task["name"])
+    return graph, list(nx.topological_sort(graph))
+
+
+def schedule_networkx(graph, sorted_tasks):
+    remaining = {task: graph.in_degree(task) for task in sorted_tasks}
+    ready = [task for task in sorted_tasks if remaining[task] == 0]
+    while ready:
+        task = ready.pop()
+        for dependent in graph.successors(task):
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                ready.append(dependent)
+
+
+def schedule_dag(dag):
+    remaining = list(dag.indegrees)
+    ready = [task_id for task_id in dag.order if remaining[task_id] == 0]
+    while ready:
+        task_id = ready.pop()
+        for dependent in dag.successors_of(task_id):
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                ready.append(dependent)
+
+
+def measure(build):
+    """
+    Returns the seconds taken by `build()`, the memory held by its result and the peak allocated while building, in
+    bytes, and its result. Memory is traced in a second build, as tracing slows allocations down.
+    """
+    gc.collect()
+    start_time = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start_time
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, held, peak, result
+
+
+def timed(fn, *args):
+    start_time = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start_time
+
+
+class NoopTask:
+    async def execute(self, input_data=None):
+        return None
+
+
+def run_handler(tasks, dag):
+    handler = GenericJobHandler({"name": "bench", "tasks": tasks}, dag=dag)
+    with patch.object(handler, 'load_task_class', return_value=NoopTask):
+        start_time = time.perf_counter()
+        asyncio.run(handler.run())
+    return time.perf_counter() - start_time
+
+
+def main(max_tasks=100_000):
+    logging.disable(logging.WARNING)
+    print(f"{'tasks':>7} {'graph':<9} {'build':>9} {'held':>9} {'peak':>9} {'schedule':>9} {'handler/task':>13}")
+    for count in (size for size in SIZES if size <= max_tasks):
+        tasks = generate_tasks(count)
+        if nx is not None:
+            build_time, held, peak, (graph, sorted_tasks) = measure(lambda: build_networkx(tasks))
+            print(f"{count:>7} {'networkx':<9} {build_time:>8.3f}s {held / 2**20:>7.1f}MB {peak / 2**20:>7.1f}MB "
+                  f"{timed(schedule_networkx, graph, sorted_tasks):>8.3f}s {'':>13}")
+            del graph, sorted_tasks
+        build_time, held, peak, dag = measure(lambda: TaskDag.from_tasks(tasks))
+        handler_time = run_handler(tasks, dag)
+        print(f"{count:>7} {'TaskDag':<9} {build_time:>8.3f}s {held / 2**20:>7.1f}MB {peak / 2**20:>7.1f}MB "
+              f"{timed(schedule_dag, dag):>8.3f}s {handler_time / count * 1e6:>10.1f}us")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -1,6 +1,6 @@
 from .base_task import BaseTask
+from joborchrestrator.logging_config import task_logger
 import time
-import logging
 import asyncio
 
 class Task1(BaseTask):
@@ -12,6 +12,6 @@ class Task1(BaseTask):
         data = input_data if input_data else "NO_INPUT"
         result = {self.__class__.__name__ : data}        
         
-        logging.debug(f'Executed {self.__class__.__name__} with input : {data}')
+        task_logger.debug('Executed %s with input : %s', self.__class__.__name__, data)
         return result
 
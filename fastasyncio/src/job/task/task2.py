@@ -1,6 +1,6 @@
 from .base_task import BaseTask
+from joborchrestrator.logging_config import task_logger
 import time
-import logging
 import asyncio
 
 class Task2(BaseTask):
@@ -10,5 +10,5 @@ class Task2(BaseTask):
         #result = f"Return from {self.__class__.__name__} ", input_data if input_data else ""
         data = input_data if input_data else "NO_INPUT"
         result = {self.__class__.__name__ : data}        
-        logging.debug(f'Executed {self.__class__.__name__} with input : {data}')
+        task_logger.debug('Executed %s with input : %s', self.__class__.__name__, data)
         return result
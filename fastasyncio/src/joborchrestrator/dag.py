@@ -0,0 +1,145 @@
+from array import array
+
+# Typecode of the arrays holding task IDs and offsets.
+ID_TYPECODE = 'l'
+
+
+class TaskDag:
+    """
+    The dependency graph of a job in compact form, built once per compiled job.
+
+    Every task name is interned to an integer ID, its position in `names`. The dependencies (predecessors) and
+    dependents (successors) of every task are stored CSR-style: one flat array of IDs per direction, and an array of
+    offsets such that the neighbours of task `i` are the entries from `offsets[i]` to `offsets[i + 1]`. A graph of
+    100k tasks therefore takes a handful of flat arrays instead of a dictionary per node and edge. The indegree of
+    every task, a topological order and the level of every task, 0 for tasks without dependencies and otherwise one
+    more than the highest level of its dependencies, are computed when the graph is built. A TaskDag is never modified.
+
+    Dependencies that are not tasks of the job are interned as tasks without dependencies, and a dependency listed
+    twice counts once.
+
+    Attributes:
+        names (list): The task names, by ID.
+        ids (dict): Maps task names to their IDs.
+        indegrees (array): The number of dependencies of every task.
+        order (array): The task IDs in a topological order, dependencies first.
+        levels (array): The level of every task.
+    """
+
+    def __init__(self, names, ids, predecessor_offsets, predecessors, successor_offsets, successors):
+        self.names = names
+        self.ids = ids
+        self.predecessor_offsets = predecessor_offsets
+        self.predecessor_ids = predecessors
+        self.successor_offsets = successor_offsets
+        self.successor_ids = successors
+        self.indegrees = array(ID_TYPECODE, (predecessor_offsets[task_id + 1] - predecessor_offsets[task_id]
+                                             for task_id in range(len(names))))
+        self.order, self.levels = self._sort()
+
+    @classmethod
+    def from_tasks(cls, tasks):
+        """
+        Builds the graph of a job's tasks.
+
+        Args:
+            tasks (list of dict): The task configurations, with their `dependencies`.
+
+        Returns:
+            TaskDag: The graph.
+
+        Raises:
+            ValueError: If the dependencies are cyclic.
+        """
+        ids = {}
+        names = []
+        for task in tasks:
+            ids.setdefault(task['name'], len(names))
+            if len(ids) > len(names):
+                names.append(task['name'])
+        if len(names) < len(tasks):
+            # A task listed twice depends on the dependencies of both entries
+            merged = {}
+            for task in tasks:
+                merged.setdefault(task['name'], []).extend(task.get('dependencies', ()))
+            tasks = [{'name': name, 'dependencies': dependencies} for name, dependencies in merged.items()]
+
+        # Predecessors, task by task; `listed_by` notes the last task listing each dependency, to skip repeats
+        predecessor_offsets = [0]
+        predecessors = []
+        listed_by = [-1] * len(names)
+        for task_id, task in enumerate(tasks):
+            for dependency in task.get('dependencies', ()):
+                dependency_id = ids.get(dependency)
+                if dependency_id is None:
+                    dependency_id = ids[dependency] = len(names)
+                    names.append(dependency)
+                    listed_by.append(-1)
+                if listed_by[dependency_id] != task_id:
+                    listed_by[dependency_id] = task_id
+                    predecessors.append(dependency_id)
+            predecessor_offsets.append(len(predecessors))
+        # Dependencies that are not tasks have no dependencies themselves
+        predecessor_offsets.extend([len(predecessors)] * (len(names) - len(tasks)))
+
+        # Successors, by counting the dependents of every task and placing them at its offset
+        count = len(names)
+        successor_offsets = [0] * (count + 1)
+        for dependency_id in predecessors:
+            successor_offsets[dependency_id + 1] += 1
+        for task_id in range(count):
+            successor_offsets[task_id + 1] += successor_offsets[task_id]
+        successors = [0] * len(predecessors)
+        filled = successor_offsets[:count]
+        for task_id in range(len(tasks)):
+            for index in range(predecessor_offsets[task_id], predecessor_offsets[task_id + 1]):
+                dependency_id = predecessors[index]
+                successors[filled[dependency_id]] = task_id
+                filled[dependency_id] += 1
+        return cls(names, ids, array(ID_TYPECODE, predecessor_offsets), array(ID_TYPECODE, predecessors),
+                   array(ID_TYPECODE, successor_offsets), array(ID_TYPECODE, successors))
+
+    def _sort(self):
+        """Kahn's algorithm: returns a topological order and the level of every task."""
+        count = len(self.names)
+        offsets = self.successor_offsets.tolist()
+        successors = self.successor_ids.tolist()
+        remaining = self.indegrees.tolist()
+        levels = [0] * count
+        order = [task_id for task_id in range(count) if remaining[task_id] == 0]
+        for task_id in order:  # Grows while iterating, as tasks become ready
+            level = levels[task_id] + 1
+            for index in range(offsets[task_id], offsets[task_id + 1]):
+                successor = successors[index]
+                if levels[successor] < level:
+                    levels[successor] = level
+                remaining[successor] -= 1
+                if remaining[successor] == 0:
+                    order.append(successor)
+        if len(order) < count:
+            cyclic = [self.names[task_id] for task_id in range(count) if remaining[task_id]]
+            raise ValueError(f"Tasks {', '.join(cyclic[:10])} have cyclic dependencies.")
+        return array(ID_TYPECODE, order), array(ID_TYPECODE, levels)
+
+    def __len__(self):
+        return len(self.names)
+
+    def predecessors_of(self, task_id):
+        """Returns the IDs of the dependencies of a task."""
+        return self.predecessor_ids[self.predecessor_offsets[task_id]:self.predecessor_offsets[task_id + 1]]
+
+    def successors_of(self, task_id):
+        """Returns the IDs of the dependents of a task."""
+        return self.successor_ids[self.successor_offsets[task_id]:self.successor_offsets[task_id + 1]]
+
+    def out_degree(self, task_id):
+        """Returns the number of dependents of a task."""
+        return self.successor_offsets[task_id + 1] - self.successor_offsets[task_id]
+
+    def predecessors(self, task_name):
+        """Returns the names of the dependencies of a task."""
+        return [self.names[task_id] for task_id in self.predecessors_of(self.ids[task_name])]
+
+    def successors(self, task_name):
+        """Returns the names of the dependents of a task."""
+        return [self.names[task_id] for task_id in self.successors_of(self.ids[task_name])]
@@ -0,0 +1,168 @@
+import asyncio
+import collections
+import json
+
+# Events kept per job for subscribers that fall behind or reconnect; older events are dropped.
+DEFAULT_MAX_EVENTS = 10000
+
+# Total size of the serialized data of the events kept per job; older events are dropped.
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+# Seconds after a job finished during which its `result-available` events keep their results, for subscribers still
+# reading the stream; the results are then dropped from the log and remain available from the job's record.
+RESULT_GRACE_SECONDS = 60
+
+
+class Event(collections.namedtuple('Event', ['id', 'event', 'payload'])):
+    """An event of a job: its sequence number, starting at 1, its type and its data serialized as JSON."""
+    __slots__ = ()
+
+    @property
+    def data(self):
+        """The data of the event."""
+        return json.loads(self.payload)
+
+
+class JobEvents:
+    """
+    The events of one job, such as `task-started`, `task-finished` and `result-available`, in the order they were
+    published, for streaming to any number of subscribers.
+
+    Publishing never waits for subscribers: every subscriber reads the log from its own position at its own pace, so a
+    slow client cannot hold back the job. There is no backpressure on the job; instead the log is bounded. It keeps
+    the last `max_events` events, as long as their data takes at most `max_bytes` serialized, and a subscriber that
+    falls further behind, or resumes from an event that was dropped, loses events: it receives an `events-lost` event
+    with the number of events it missed and continues with the oldest one kept.
+
+    The data of an event is serialized when it is published, so the log never holds on to results the job has
+    released. `result_grace` seconds after the log is closed, the results are dropped from its `result-available`
+    events, which keep only the task name and `"released": true`. A JobEvents must only be used from one event loop.
+    """
+
+    def __init__(self, max_events=DEFAULT_MAX_EVENTS, max_bytes=DEFAULT_MAX_BYTES, result_grace=RESULT_GRACE_SECONDS):
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.result_grace = result_grace
+        self._events = collections.deque()
+        self._bytes = 0
+        self._next_id = 1
+        self._changed = asyncio.Event()
+        self.closed = False
+
+    def publish(self, event, data):
+        """
+        Appends an event and wakes the subscribers waiting for it.
+
+        Args:
+            event (str): The type of the event.
+            data: The JSON-serializable data of the event.
+
+        Returns:
+            int: The ID of the event.
+        """
+        event_id = self._next_id
+        self._next_id += 1
+        self._append(Event(event_id, event, json.dumps(data, default=repr)))
+        self._wake()
+        return event_id
+
+    def _append(self, event):
+        """Appends an event, dropping the oldest ones beyond `max_events` or `max_bytes`; the newest is always kept."""
+        self._events.append(event)
+        self._bytes += len(event.payload)
+        while len(self._events) > 1 and (len(self._events) > self.max_events or self._bytes > self.max_bytes):
+            self._bytes -= len(self._events.popleft().payload)
+
+    def close(self):
+        """
+        Marks the log as complete: subscribers stop once they have received every event. The results are dropped
+        from the log `result_grace` seconds later.
+        """
+        self.closed = True
+        self._wake()
+        try:
+            asyncio.get_running_loop().call_later(self.result_grace, self.release_results)
+        except RuntimeError:  # Closed outside of the event loop, with no subscriber left to wait for
+            self.release_results()
+
+    def release_results(self):
+        """Replaces the data of the `result-available` events kept in the log with the task name only."""
+        for index, event in enumerate(self._events):
+            if event.event == 'result-available':
+                released = event._replace(payload=json.dumps({"task": event.data["task"], "released": True}))
+                self._bytes += len(released.payload) - len(event.payload)
+                self._events[index] = released
+
+    def _wake(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def subscribe(self, last_event_id=0, heartbeat=None):
+        """
+        Yields the events published after `last_event_id`, waiting for new ones until the log is closed.
+
+        Args:
+            last_event_id (int): ID of the last event the subscriber received, 0 to start from the first.
+            heartbeat (float, optional): Seconds without events after which None is yielded, e.g. to keep the
+                                         connection of a subscriber alive.
+
+        Yields:
+            Event or None: The next event, or None when `heartbeat` seconds passed without one.
+        """
+        position = last_event_id
+        while True:
+            changed = self._changed
+            oldest = self._events[0].id if self._events else self._next_id
+            if position + 1 < oldest:
+                yield Event(oldest - 1, 'events-lost', json.dumps({"count": oldest - 1 - position}))
+                position = oldest - 1
+            if position + 1 < self._next_id:
+                event = self._events[position + 1 - oldest]
+                position = event.id
+                yield event
+                continue
+            if self.closed:
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+
+
+def format_event(event):
+    """
+    Formats an event as a Server-Sent Events message, or a comment keeping the connection alive for None.
+
+    Returns:
+        str: The message.
+    """
+    if event is None:
+        return ": keep-alive\n\n"
+    return f"id: {event.id}\nevent: {event.event}\ndata: {event.payload}\n\n"
+
+
+async def execute_with_events(events, task_name, execute):
+    """
+    Awaits `execute()`, which returns the result, result digest and cached flag of a task as execute_cached does,
+    publishing `task-started` before, and `task-finished` and `result-available`, or `task-failed`, after. Without
+    events the task just runs.
+
+    Args:
+        events (JobEvents or None): The events of the job.
+        task_name (str): The name of the task.
+        execute (callable): Returns the awaitable running the task.
+
+    Returns:
+        tuple: The outcome of `execute()`.
+    """
+    if events is None:
+        return await execute()
+    events.publish('task-started', {"task": task_name})
+    try:
+        outcome = await execute()
+    except Exception as e:
+        events.publish('task-failed', {"task": task_name, "error": str(e)})
+        raise
+    events.publish('task-finished', {"task": task_name, "cached": outcome[2]})
+    events.publish('result-available', {"task": task_name, "result": outcome[0]})
+    return outcome
@@ -2,34 +2,111 @@ import asyncio
 import importlib
 import logging
 import time
+from ..history import execute_timed
+from ..logging_config import log_context, task_logger
+from ..checkpoint import task_digest
+from ..result_cache import execute_cached, result_digest
+from ..resources import execute_with_resources
+from ..events import execute_with_events
 
 class GenericJobHandler:
     """
     Manages the execution of tasks, both parallel and sequential, and handles dynamic task class loading.
+
+    A result is released from `task_results` once every sequential task depending on it has run, unless the task
+    producing it has no dependents or is marked `"output": true`.
+
+    With a ResultCache, tasks whose class source, configuration and dependency results are unchanged since an earlier
+    run reuse their cached results instead of executing.
+
+    With a RunLog, every completion is checkpointed, and the tasks an interrupted run completed are restored instead of
+    executed again.
+
+    Lines logged while a task runs are attributed to it, and per-task lines go to the `joborchrestrator.tasks` logger,
+    which can be gated and sampled separately, see logging_config.
+
+    With a TaskTrace, every execution is recorded as a span. A sequential task counts as queued from the moment its
+    last dependency finished, so the trace shows how long the sequential phase kept ready tasks waiting.
+
+    With a ResourcePool, tasks declaring `resources` only start while those resources are free, see resources.
+
+    With a JobEvents, the start, finish and result of every task are published as they happen, see events.
     """
     
-    def __init__(self, parallel_tasks, sequential_tasks):
+    def __init__(self, parallel_tasks, sequential_tasks, history=None, result_cache=None, run_log=None, trace=None,
+                 resources=None, events=None):
         """
-        Initializes the GenericJobHandler with lists of parallel and sequential tasks.
+        Initializes the GenericJobHandler with lists of parallel and sequential tasks. Task executions are recorded in
+        `history`, a TaskHistory, if given. Unchanged tasks reuse their results from `result_cache`, a ResultCache, if
+        given. Completions are checkpointed to `run_log`, a RunLog, if given, and the tasks it already records as
+        completed are restored. Executions are recorded as spans in `trace`, a TaskTrace, if given. Tasks declaring
+        resources are bounded by `resources`, a ResourcePool, if given. Task progress is published to `events`, a
+        JobEvents, if given.
         """
         self.parallel_tasks = parallel_tasks
         self.sequential_tasks = sequential_tasks
+        self.history = history
+        self.trace = trace
+        self.resources = resources
+        self.events = events
+        self.ready_at = {}
+        self.finished_at = {}
+        self.result_cache = result_cache
+        self.run_log = run_log
+        self.restored_tasks = set()
         self.task_results = {}
+        self.result_digests = {}
+        self.cached_tasks = set()
+        self.pending_consumers = {}
+        for task in sequential_tasks:
+            for dependency in set(task.get('dependencies', [])):
+                self.pending_consumers[dependency] = self.pending_consumers.get(dependency, 0) + 1
+        self.outputs = {task['name'] for task in parallel_tasks + sequential_tasks
+                        if task.get('output', False) or task['name'] not in self.pending_consumers}
+        if self.run_log is not None:
+            self.restore_completed_tasks()
+
+    def restore_completed_tasks(self):
+        """
+        Marks the tasks the run log records as completed as restored, with their logged results. A task is only
+        restored if its configuration is unchanged and all of its dependencies are restored.
+        """
+        for task in self.parallel_tasks + self.sequential_tasks:
+            completed = self.run_log.completed.get(task['name'])
+            dependencies = task.get('dependencies', [])
+            if completed is None or completed[0] != task_digest(task) \
+                    or not all(dependency in self.restored_tasks for dependency in dependencies):
+                continue
+            self.task_results[task['name']] = completed[1]
+            self.restored_tasks.add(task['name'])
+            if self.result_cache is not None:
+                self.result_digests[task['name']] = result_digest(completed[1])
+            self.release_dependencies(set(dependencies))
+        logging.info('Run %s: restored %d completed tasks', self.run_log.run_id, len(self.restored_tasks))
     
     async def run_parallel_tasks(self):
         """
         Executes all parallel tasks asynchronously using asyncio.gather to run them concurrently.
         """
         logging.debug('Executing task in parallel: %s', self.parallel_tasks)
-        return await asyncio.gather(*[self.execute_task(task) for task in self.parallel_tasks])
+        ready_at = time.time()
+        for task in self.parallel_tasks:
+            self.ready_at[task['name']] = ready_at
+        return await asyncio.gather(*[self.execute_task(task) for task in self.parallel_tasks
+                                      if task['name'] not in self.restored_tasks])
  
     async def run_sequential_tasks(self):
         """
         Executes tasks that have dependencies sequentially, ensuring each task starts after its dependencies.
         """
         logging.debug('Executing task in sequence: %s', self.sequential_tasks)
+        phase_started_at = time.time()
         for task in self.sequential_tasks:
+            if task['name'] in self.restored_tasks:
+                continue
             dependencies = task.get('dependencies', [])
+            self.ready_at[task['name']] = max((self.finished_at.get(dependency, phase_started_at)
+                                               for dependency in dependencies), default=phase_started_at)
             task_input_dict = {}
 
             for dependency in dependencies:
@@ -38,15 +115,39 @@ class GenericJobHandler:
 
             task_result = await self.execute_task(task, task_input_dict)
             self.task_results[task['name']] = task_result
+            self.release_dependencies(set(dependencies))
+
+    def release_dependencies(self, dependencies):
+        """
+        Notes that a task has consumed the results of its dependencies, dropping every result whose last consumer it
+        was unless that result is a job output.
+        """
+        for dependency in dependencies:
+            self.pending_consumers[dependency] -= 1
+            if self.pending_consumers[dependency] == 0 and dependency not in self.outputs:
+                self.task_results.pop(dependency, None)
 
     async def execute_task(self, task, input_data=None):
         """
         Executes a single task by dynamically loading its class and calling its execute method.
         """
-        logging.debug('Executing task: %s', task["name"])
+        task_logger.debug('Executing task: %s', task["name"])
         task_class = self.load_task_class(task['name'])
-        task_instance = task_class()
-        task_result = await task_instance.execute(input_data)
+        dependency_digests = {dep: self.result_digests.get(dep) for dep in task.get('dependencies', [])}
+        with log_context(task_name=task['name']):
+            task_result, self.result_digests[task['name']], cached = await execute_with_events(
+                self.events, task['name'], lambda: execute_cached(
+                    self.result_cache, task, task_class, dependency_digests,
+                    lambda: execute_with_resources(
+                        self.resources, task.get('resources'),
+                        lambda: execute_timed(self.history, task['name'], task_class().execute(input_data),
+                                              ready_at=self.ready_at.get(task['name']), trace=self.trace,
+                                              dependencies=task.get('dependencies', [])))))
+        self.finished_at[task['name']] = time.time()
+        if cached:
+            self.cached_tasks.add(task['name'])
+        if self.run_log is not None:
+            self.run_log.record(task, task_result)
         self.task_results[task['name']] = task_result
         return task_result
     
@@ -69,6 +170,9 @@ class GenericJobHandler:
     async def run(self):
         """
         Orchestrates the execution of both parallel and sequential tasks and aggregates their results.
+
+        Returns:
+            dict: The results of the tasks kept until the end of the job, by task name.
         """
         start_time = time.perf_counter()
         await self.run_parallel_tasks()
@@ -76,7 +180,8 @@ class GenericJobHandler:
         start_time = time.perf_counter()
         await self.run_sequential_tasks() #treee
         logging.debug('Total time for sequential execution: %.2f seconds', time.perf_counter() - start_time)
-        logging.debug('All task results: %s', self.task_results)
+        logging.debug('Holding %d task results', len(self.task_results))
+        return self.task_results
 
     def aggregate_response(self):
         """
@@ -2,78 +2,145 @@ import asyncio
 import importlib
 import logging
 import time
-import networkx as nx
+from array import array
+from ..history import execute_timed
+from ..logging_config import log_context, task_logger
+from ..checkpoint import task_digest
+from ..result_cache import execute_cached, result_digest
+from ..resources import ResourcePool, execute_with_resources
+from ..events import execute_with_events
+from ..dag import TaskDag
 
 class GenericJobHandler:
     """
     Manages the execution of tasks, both parallel and sequential, and handles dynamic task class loading.
+
+    A result is released from `task_results` once every task depending on it has completed, unless the task producing
+    it has no dependents or is marked `"output": true`.
+
+    With a ResultCache, tasks whose class source, configuration and dependency results are unchanged since an earlier
+    run reuse their cached results instead of executing.
+
+    With a RunLog, every completion is checkpointed, and the tasks an interrupted run completed are restored instead of
+    executed again.
+
+    Lines logged while a task runs are attributed to it, and per-task lines go to the `joborchrestrator.tasks` logger,
+    which can be gated and sampled separately, see logging_config.
+
+    With a TaskTrace, every execution is recorded as a span, queued from the moment the task became ready.
+
+    Tasks declaring `resources` only start while those resources are free, bounded by the capacities of the job's
+    `resources` setting and of the ResourcePool the handler is given, see resources. A ready task waiting for its
+    resources counts as queued.
+
+    With a JobEvents, `task-started` is published when a task is dispatched, and `task-finished` and `result-available`,
+    with its result, or `task-failed` once it finishes, so that clients can consume results while the job runs.
     """
     
-    def __init__(self, job):
+    def __init__(self, job, history=None, result_cache=None, run_log=None, trace=None, resources=None, events=None,
+                 dag=None):
         """
         Initializes the GenericJobHandler with tasks and job.
-        Builds the dependency graph.
+        Uses the dependency graph `dag`, a TaskDag, compiled with the job if given, or builds it. Task executions are
+        recorded in `history`, a TaskHistory, if given. Unchanged tasks reuse their results from `result_cache`, a
+        ResultCache, if given. Completions are checkpointed to `run_log`, a RunLog, if given, and the tasks it already
+        records as completed are restored. Executions are recorded as spans in `trace`, a TaskTrace, if given. Tasks
+        declaring resources are bounded by `resources`, a ResourcePool, if given, and by the job's own capacities. Task
+        progress is published to `events`, a JobEvents, if given.
         """
         self.task_results = {}
+        self.result_digests = {}
+        self.cached_tasks = set()
+        self.result_cache = result_cache
+        self.run_log = run_log
+        self.restored_tasks = set()
         self.completed_tasks = set()
-        self.ready_queue = []
+        self.ready_at = {}
+        self.history = history
+        self.trace = trace
+        self.events = events
         self.job = job
+        self.resources = ResourcePool(job["resources"], parent=resources) if job.get("resources") else resources
         self.tasks = job.get("tasks", [])  
+        self.task_configs = {task["name"]: task for task in self.tasks}
         
-        # Build the Directed Acyclic Graph (DAG) from task dependencies
-        self.G = nx.DiGraph()
-        for task in self.tasks:
-            task_name = task["name"]
-            self.G.add_node(task_name)
-            for dep in task.get("dependencies", []):
-                self.G.add_edge(dep, task_name)
-
-        # Topologically sort the graph (to ensure correct order)
-        self.sorted_tasks = list(nx.topological_sort(self.G))
-
-    # Lazy Dependency Resolution: Add tasks to ready_queue when their dependencies are satisfied
-    def update_ready_tasks(self):
-        """
-        Lazy Dependency Resolution: Add tasks to ready_queue when their dependencies are satisfied.
-        """
-        for task in self.sorted_tasks:
-            if task not in self.completed_tasks and task not in self.ready_queue:
-                # Only resolve dependencies at this point when task is ready to run
-                if all(dep in self.completed_tasks for dep in self.G.predecessors(task)):
-                    self.ready_queue.append(task)
-
-    # Function to prune the graph by removing completed tasks and dependencies
-    def prune_graph(self):
+        # The Directed Acyclic Graph (DAG) of task dependencies, with the tasks in topological order
+        self.dag = dag if dag is not None else TaskDag.from_tasks(self.tasks)
+        self.sorted_tasks = [self.dag.names[task_id] for task_id in self.dag.order]
+
+        # Number of dependents still to complete per task, and the tasks whose results are kept until the end
+        self.pending_consumers = {name: self.dag.out_degree(task_id) for task_id, name in enumerate(self.dag.names)}
+        self.outputs = {task["name"] for task in self.tasks
+                        if task.get("output", False) or self.pending_consumers[task["name"]] == 0}
+
+        if self.run_log is not None:
+            self.restore_completed_tasks()
+
+    def restore_completed_tasks(self):
         """
-        Prunes the graph by removing completed tasks and their edges to reduce size.
+        Marks the tasks the run log records as completed as completed, with their logged results. A task is only
+        restored if its configuration is unchanged and all of its dependencies are restored.
         """
-        for task in self.completed_tasks:
-            if task in self.G.nodes:
-                self.G.remove_node(task)
+        for task_name in self.sorted_tasks:
+            completed = self.run_log.completed.get(task_name)
+            if completed is None or task_name not in self.task_configs \
+                    or completed[0] != task_digest(self.task_configs[task_name]) \
+                    or not all(dep in self.restored_tasks for dep in self.dag.predecessors(task_name)):
+                continue
+            self.task_results[task_name] = completed[1]
+            self.completed_tasks.add(task_name)
+            self.restored_tasks.add(task_name)
+            if self.result_cache is not None:
+                self.result_digests[task_name] = result_digest(completed[1])
+            self.release_dependencies(task_name)
+        logging.info('Run %s: restored %d completed tasks', self.run_log.run_id, len(self.restored_tasks))
 
     async def execute_task(self, task_name):
         """
         Executes a single task by dynamically loading its class and calling its execute method.
         Passes data from completed dependencies to the task if any.
         """
-        logging.debug('Executing task: %s', task_name)
+        task_logger.debug('Executing task: %s', task_name)
 
         # Prepare input data from dependencies
         input_data = {}
-        dependencies = self.G.predecessors(task_name)  # Get dependent tasks        
+        dependencies = self.dag.predecessors(task_name)  # Get dependent tasks
         #logging.debug(f'self.task_results : {self.task_results}')                
         for dep in dependencies:
             if dep in self.task_results:
                 input_data[dep] = self.task_results[dep]  # Include data from completed dependencies
 
         task_class = self.load_task_class(task_name)
-        task_instance = task_class()
-        task_result = await task_instance.execute(input_data)
+        dependency_digests = {dep: self.result_digests.get(dep) for dep in dependencies}
+        with log_context(task_name=task_name):
+            task_result, self.result_digests[task_name], cached = await execute_with_events(
+                self.events, task_name, lambda: execute_cached(
+                    self.result_cache, self.task_configs[task_name], task_class, dependency_digests,
+                    lambda: execute_with_resources(
+                        self.resources, self.task_configs[task_name].get("resources"),
+                        lambda: execute_timed(self.history, task_name, task_class().execute(input_data),
+                                              self.job.get("name"), self.ready_at.get(task_name), self.trace,
+                                              self.task_configs[task_name].get("dependencies", [])))))
+        if cached:
+            self.cached_tasks.add(task_name)
+        if self.run_log is not None:
+            self.run_log.record(self.task_configs[task_name], task_result)
         
         # Store the result in task_results and mark as completed
         self.task_results[task_name] = task_result
         self.completed_tasks.add(task_name)
+        self.release_dependencies(task_name)
         return task_result
+
+    def release_dependencies(self, task_name):
+        """
+        Notes that a completed task no longer needs the results of its dependencies, dropping every result whose last
+        consumer it was unless that result is a job output.
+        """
+        for dep in self.dag.predecessors(task_name):
+            self.pending_consumers[dep] -= 1
+            if self.pending_consumers[dep] == 0 and dep not in self.outputs:
+                self.task_results.pop(dep, None)
     
     def load_task_class(self, task_class_name):
         """
@@ -93,33 +160,61 @@ class GenericJobHandler:
 
     async def run_tasks(self):
         """
-        Orchestrates the execution of tasks (both parallel and sequential) using lazy dependency resolution.
+        Orchestrates the execution of tasks, starting every task the moment its last dependency completes.
+
+        Every task counts its dependencies that have yet to complete, starting from the indegrees of the DAG. A task is
+        started once its count drops to zero, and each completion, delivered through a queue by the task's done
+        callback, decrements the counts of the task's dependents, so scheduling the whole job takes O(V + E) work and
+        a slow task only holds back the tasks depending on it. The first task to fail cancels the tasks still running,
+        and its exception is raised.
         """
-        # Initial call to populate ready_queue with tasks that have no dependencies
-        self.update_ready_tasks()
-
-        # Continue until all tasks are completed
-        while len(self.completed_tasks) < len(self.sorted_tasks):
-            if self.ready_queue:
-                # Find tasks that can be run in parallel
-                tasks_to_run = self.ready_queue.copy()
-                self.ready_queue.clear()  # Clear the ready queue since we are about to execute these tasks
-                
-                logging.debug(f"Running tasks in parallel: {tasks_to_run}")
-                await asyncio.gather(*[self.execute_task(task) for task in tasks_to_run])
-
-                # After pruning, update the ready_queue with newly eligible tasks
-                self.update_ready_tasks()
-            else:
-                logging.debug("No tasks can be run at this stage, waiting for dependencies to resolve.")
-                await asyncio.sleep(0.1)  # Introduce a small delay to avoid tight loops
+        dag = self.dag
+        remaining = array(dag.indegrees.typecode, dag.indegrees)
+        for task_name in self.completed_tasks:
+            for dependent in dag.successors_of(dag.ids[task_name]):
+                remaining[dependent] -= 1
+        completions = asyncio.Queue()
+        running = {}
+
+        def start(task_id):
+            task_name = dag.names[task_id]
+            self.ready_at[task_name] = time.time()
+            future = asyncio.ensure_future(self.execute_task(task_name))
+            future.add_done_callback(completions.put_nowait)
+            running[future] = task_id
+
+        for task_id in dag.order:
+            if remaining[task_id] == 0 and dag.names[task_id] not in self.completed_tasks:
+                start(task_id)
+        try:
+            while running:
+                future = await completions.get()
+                task_id = running.pop(future)
+                future.result()  # Raises the exception of a failed task
+                for dependent in dag.successors_of(task_id):
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        logging.debug("Task %s is ready", dag.names[dependent])
+                        start(dependent)
+        finally:
+            for future in running:
+                future.cancel()
+            if running:
+                await asyncio.wait(running)
+                for future in running:
+                    if not future.cancelled():
+                        future.exception()  # Retrieved, so that tasks failing together are not logged as unhandled
 
     async def run(self):
         """
         Starts the execution of tasks.
+
+        Returns:
+            dict: The results of the tasks kept until the end of the job, by task name.
         """
         start_time = time.perf_counter()
         await self.run_tasks()
         logging.debug('Total time for task execution: %.2f seconds', time.perf_counter() - start_time)
-        logging.debug('All task results: %s', self.task_results)
+        logging.debug('Holding %d task results', len(self.task_results))
+        return self.task_results
 
@@ -0,0 +1,424 @@
+import asyncio
+import atexit
+import heapq
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+
+# Database used when no path is given, next to the config folder.
+DEFAULT_HISTORY_PATH = Path(__file__).resolve().parents[2] / '.cache' / 'task_history.sqlite3'
+
+# Number of most recent executions per task that statistics are computed over.
+DEFAULT_WINDOW = 1000
+
+# Largest number of executions inserted in one transaction.
+BATCH_SIZE = 512
+
+# Number of most recent executions kept per task; older ones are deleted by the writer.
+DEFAULT_RETENTION = DEFAULT_WINDOW
+
+# Largest number of task names bound in one query, below SQLite's limit on host parameters.
+QUERY_CHUNK_SIZE = 500
+
+# Duration assumed for tasks without recorded history when estimating a makespan.
+DEFAULT_TASK_DURATION = 1.0
+
+# When a task started (seconds since the epoch), its wall time and the CPU time spent in its own steps.
+TaskTiming = namedtuple('TaskTiming', ['started_at', 'wall_time', 'cpu_time'])
+
+# Statistics of the successful executions of a task; cpu_time and queue_wait are means.
+TaskStatistics = namedtuple('TaskStatistics', ['count', 'failures', 'p50', 'p95', 'max', 'cpu_time', 'queue_wait'])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS task_executions (
+    id INTEGER PRIMARY KEY,
+    job_name TEXT,
+    task_name TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    wall_time REAL NOT NULL,
+    cpu_time REAL,
+    queue_wait REAL,
+    outcome TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS task_executions_by_task ON task_executions (task_name, id);
+"""
+
+_INSERT = ("INSERT INTO task_executions (job_name, task_name, started_at, wall_time, cpu_time, queue_wait, outcome) "
+           "VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+_SELECT_WINDOW = """
+SELECT task_name, wall_time, cpu_time, queue_wait, outcome FROM (
+    SELECT task_name, wall_time, cpu_time, queue_wait, outcome,
+           ROW_NUMBER() OVER (PARTITION BY task_name ORDER BY id DESC) AS recency
+    FROM task_executions {where}
+) WHERE recency <= ?
+"""
+
+_PRUNE = """
+DELETE FROM task_executions WHERE task_name = ? AND id <= (
+    SELECT id FROM task_executions WHERE task_name = ? ORDER BY id DESC LIMIT 1 OFFSET ?
+)
+"""
+
+_CLOSE = object()
+
+_histories = {}
+_histories_lock = threading.Lock()
+
+
+class TimedAwaitable:
+    """
+    Awaits a task coroutine while measuring its wall time and the CPU time of its own steps only, excluding other
+    coroutines that run on the event loop while it is suspended.
+
+    Attributes:
+        timing (TaskTiming): The measured timing, set once the awaitable has finished or raised.
+    """
+
+    def __init__(self, awaitable):
+        """
+        Args:
+            awaitable: The coroutine or future to await.
+        """
+        self.awaitable = awaitable
+        self.timing = None
+
+    def __await__(self):
+        started_at = time.time()
+        start_time = time.perf_counter()
+        cpu_time = 0.0
+        iterator = self.awaitable.__await__()
+        value, exception = None, None
+        try:
+            while True:
+                step_start = time.thread_time()
+                try:
+                    if exception is not None:
+                        yielded = iterator.throw(exception)
+                    else:
+                        yielded = iterator.send(value)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    cpu_time += time.thread_time() - step_start
+                try:
+                    value, exception = (yield yielded), None
+                except BaseException as thrown:
+                    value, exception = None, thrown
+        finally:
+            self.timing = TaskTiming(started_at, time.perf_counter() - start_time, cpu_time)
+
+
+def _percentile(sorted_values, percent):
+    """Returns the nearest-rank percentile of an ascending list of values."""
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def simulate_makespan(tasks, durations, max_workers):
+    """
+    Estimates the makespan of a job by simulating its execution with at most `max_workers` tasks running at once.
+    Ready tasks are started longest remaining path first.
+
+    Args:
+        tasks (list): The task configurations of the job.
+        durations (dict): Maps task names to their estimated durations in seconds.
+        max_workers (int): Number of tasks that may run at once.
+
+    Returns:
+        float: The estimated makespan in seconds.
+
+    Raises:
+        ValueError: If the job has cyclic or unknown dependencies.
+    """
+    names = [task['name'] for task in tasks]
+    positions = {name: position for position, name in enumerate(names)}
+    dependents = {name: [] for name in names}
+    pending = {}
+    for task in tasks:
+        dependencies = set(task.get('dependencies', []))
+        for dependency in dependencies:
+            if dependency not in dependents:
+                raise ValueError(f"Task '{task['name']}' depends on unknown task '{dependency}'.")
+            dependents[dependency].append(task['name'])
+        pending[task['name']] = len(dependencies)
+
+    # Longest remaining path of every task, computed in reverse topological order.
+    order = []
+    remaining = dict(pending)
+    ready = [name for name in names if remaining[name] == 0]
+    while ready:
+        name = ready.pop()
+        order.append(name)
+        for dependent in dependents[name]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                ready.append(dependent)
+    if len(order) != len(names):
+        raise ValueError("Job has cyclic dependencies.")
+    priorities = {}
+    for name in reversed(order):
+        priorities[name] = durations[name] + max((priorities[dependent] for dependent in dependents[name]), default=0)
+
+    ready = [(-priorities[name], positions[name], name) for name in names if pending[name] == 0]
+    heapq.heapify(ready)
+    running = []
+    now = 0.0
+    while ready or running:
+        while ready and len(running) < max_workers:
+            _, position, name = heapq.heappop(ready)
+            heapq.heappush(running, (now + durations[name], position, name))
+        now, _, name = heapq.heappop(running)
+        for dependent in dependents[name]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                heapq.heappush(ready, (-priorities[dependent], positions[dependent], dependent))
+    return now
+
+
+class TaskHistory:
+    """
+    Persistent store of task executions in a local SQLite database. Recording only queues the execution; a background
+    thread inserts queued executions in batches, so the event loop never waits for the disk.
+
+    Attributes:
+        path (Path): The database file.
+    """
+
+    def __init__(self, path=None, retention=DEFAULT_RETENTION):
+        """
+        Opens the database, creating it if necessary, and starts the writer thread.
+
+        Args:
+            path (str or Path, optional): Database file. Defaults to DEFAULT_HISTORY_PATH.
+            retention (int): Number of most recent executions kept per task.
+        """
+        self.path = Path(path or DEFAULT_HISTORY_PATH)
+        self.retention = max(1, retention)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")  # Lets queries read while the writer inserts
+            connection.executescript(_SCHEMA)
+        finally:
+            connection.close()
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write, name='task-history-writer', daemon=True)
+        self._writer.start()
+
+    def record(self, task_name, wall_time, cpu_time=None, queue_wait=None, outcome='success', job_name=None,
+               started_at=None):
+        """
+        Queues one task execution for writing.
+
+        Args:
+            task_name (str): The task name.
+            wall_time (float): Wall time of the execution in seconds.
+            cpu_time (float, optional): CPU time of the execution in seconds.
+            queue_wait (float, optional): Time between the task becoming ready and starting, in seconds.
+            outcome (str): 'success' or 'failure'.
+            job_name (str, optional): Name of the job the task ran in.
+            started_at (float, optional): Start time in seconds since the epoch. Defaults to now minus the wall time.
+        """
+        if started_at is None:
+            started_at = time.time() - wall_time
+        self._queue.put((job_name, task_name, started_at, wall_time, cpu_time, queue_wait, outcome))
+
+    def _write(self):
+        """
+        Writer thread loop: inserts queued executions in batches, and deletes the executions of the batch's tasks
+        beyond the retention, until the history is closed.
+        """
+        connection = sqlite3.connect(self.path)
+        try:
+            while True:
+                item = self._queue.get()
+                batch, signals = [], []
+                while True:
+                    if isinstance(item, tuple):
+                        batch.append(item)
+                    else:
+                        signals.append(item)
+                    if len(batch) >= BATCH_SIZE or item is _CLOSE:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if batch:
+                    try:
+                        with connection:
+                            connection.executemany(_INSERT, batch)
+                            connection.executemany(_PRUNE, ((task_name, task_name, self.retention) for task_name
+                                                            in dict.fromkeys(item[1] for item in batch)))
+                    except sqlite3.Error as e:
+                        logging.error("Could not write %d task executions to %s: %s", len(batch), self.path, e)
+                for signal in signals:
+                    if signal is not _CLOSE:
+                        signal.set()
+                if _CLOSE in signals:
+                    return
+        finally:
+            connection.close()
+
+    def flush(self, timeout=None):
+        """
+        Waits until every execution recorded so far has been written.
+
+        Returns:
+            bool: True if the pending executions were written within the timeout.
+        """
+        if self._closed:
+            return True
+        written = threading.Event()
+        self._queue.put(written)
+        return written.wait(timeout)
+
+    def close(self):
+        """Writes the pending executions and stops the writer thread."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_CLOSE)
+            self._writer.join()
+
+    def task_statistics(self, task_names=None, window=DEFAULT_WINDOW):
+        """
+        Returns wall time percentiles and mean CPU and queue-wait times of tasks over their most recent executions.
+        The tasks are queried QUERY_CHUNK_SIZE names at a time.
+
+        Args:
+            task_names (iterable, optional): Tasks to report. Defaults to every recorded task.
+            window (int): Number of most recent executions per task to include.
+
+        Returns:
+            dict: Maps task names to TaskStatistics. Tasks without successful executions have None for every time.
+        """
+        self.flush()
+        if task_names is None:
+            queries = [("", [])]
+        else:
+            names = list(dict.fromkeys(task_names))
+            queries = [(f"WHERE task_name IN ({', '.join('?' * len(chunk))})", chunk)
+                       for chunk in (names[start:start + QUERY_CHUNK_SIZE]
+                                     for start in range(0, len(names), QUERY_CHUNK_SIZE))]
+        rows = []
+        connection = sqlite3.connect(self.path)
+        try:
+            for where, parameters in queries:
+                rows.extend(connection.execute(_SELECT_WINDOW.format(where=where), parameters + [window]))
+        finally:
+            connection.close()
+
+        executions = {}
+        for task_name, wall_time, cpu_time, queue_wait, outcome in rows:
+            executions.setdefault(task_name, []).append((wall_time, cpu_time, queue_wait, outcome))
+
+        statistics = {}
+        for task_name, task_executions in executions.items():
+            succeeded = [execution for execution in task_executions if execution[3] == 'success']
+            failures = len(task_executions) - len(succeeded)
+            if not succeeded:
+                statistics[task_name] = TaskStatistics(len(task_executions), failures, None, None, None, None, None)
+                continue
+            wall_times = sorted(execution[0] for execution in succeeded)
+            cpu_times = [execution[1] for execution in succeeded if execution[1] is not None]
+            queue_waits = [execution[2] for execution in succeeded if execution[2] is not None]
+            statistics[task_name] = TaskStatistics(
+                len(task_executions), failures, _percentile(wall_times, 50), _percentile(wall_times, 95),
+                wall_times[-1], sum(cpu_times) / len(cpu_times) if cpu_times else None,
+                sum(queue_waits) / len(queue_waits) if queue_waits else None)
+        return statistics
+
+    def estimate_makespan(self, tasks, max_workers, percentile='p50', window=DEFAULT_WINDOW):
+        """
+        Estimates the makespan of a job for a number of workers from the recorded task durations. Tasks without
+        history count as DEFAULT_TASK_DURATION.
+
+        Args:
+            tasks (list): The task configurations of the job.
+            max_workers (int): Number of tasks that may run at once.
+            percentile (str): Statistic used as task duration, 'p50', 'p95' or 'max'.
+            window (int): Number of most recent executions per task to include.
+
+        Returns:
+            float: The estimated makespan in seconds.
+        """
+        statistics = self.task_statistics((task['name'] for task in tasks), window)
+        durations = {}
+        for task in tasks:
+            recorded = statistics.get(task['name'])
+            duration = getattr(recorded, percentile) if recorded is not None else None
+            durations[task['name']] = DEFAULT_TASK_DURATION if duration is None else duration
+        return simulate_makespan(tasks, durations, max_workers)
+
+
+async def execute_timed(history, task_name, awaitable, job_name=None, ready_at=None, trace=None, dependencies=()):
+    """
+    Awaits a task and records its execution in `history` and as a span in `trace`, if given. The span's worker is the
+    asyncio task awaiting it.
+
+    Args:
+        history (TaskHistory or None): Store to record the execution in.
+        task_name (str): The task name.
+        awaitable: The awaitable returned by the task's execute method.
+        job_name (str, optional): Name of the job the task runs in.
+        ready_at (float, optional): When the task became ready, in seconds since the epoch, for its queue wait.
+        trace (TaskTrace, optional): Collection to record the span of the execution in.
+        dependencies (iterable of str): Names of the tasks the task depends on, for its span.
+
+    Returns:
+        The result of the task.
+    """
+    timed = TimedAwaitable(awaitable)
+    outcome = 'failure'
+    try:
+        result = await timed
+        outcome = 'success'
+        return result
+    finally:
+        timing = timed.timing
+        if history is not None:
+            queue_wait = max(0.0, timing.started_at - ready_at) if ready_at is not None else None
+            history.record(task_name, timing.wall_time, timing.cpu_time, queue_wait, outcome, job_name,
+                           timing.started_at)
+        if trace is not None:
+            current_task = asyncio.current_task()
+            trace.record(task_name, timing.started_at, timing.wall_time,
+                         current_task.get_name() if current_task is not None else 'event loop',
+                         queued_at=min(ready_at, timing.started_at) if ready_at is not None else None,
+                         dependencies=dependencies, outcome=outcome, job_name=job_name)
+
+
+def get_task_history(path=None):
+    """
+    Returns the TaskHistory shared by the whole process for a database path, opening it on first use.
+
+    Args:
+        path (str or Path, optional): Database file. Defaults to DEFAULT_HISTORY_PATH.
+
+    Returns:
+        TaskHistory: The shared task history.
+    """
+    path = Path(path or DEFAULT_HISTORY_PATH).resolve()
+    with _histories_lock:
+        history = _histories.get(path)
+        if history is None:
+            history = _histories[path] = TaskHistory(path)
+        return history
+
+
+def close_task_histories():
+    """Flushes and closes every shared TaskHistory."""
+    with _histories_lock:
+        histories = list(_histories.values())
+        _histories.clear()
+    for history in histories:
+        history.close()
+
+
+atexit.register(close_task_histories)
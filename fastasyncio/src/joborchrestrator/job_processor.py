@@ -1,30 +1,71 @@
+import asyncio
+import collections
 import importlib
+import inspect
+import logging
 from jsonschema import validate, ValidationError  # Tools for JSON schema validation
-from .utils import load_json, detect_cycles  # Utility functions for loading JSON and detecting cycles
+from .utils import load_json, detect_cycles, file_version  # Utility functions for loading JSON and detecting cycles
+from .history import get_task_history  # Persistent store of task executions
+from .result_cache import get_result_cache  # Store of task results for incremental re-runs
+from .checkpoint import RunLog  # Write-ahead log of checkpointed runs
+from .logging_config import log_context  # Attributes log lines to the running job
+from .dag import TaskDag  # Compact dependency graph of a job
+
+# A job of a compiled configuration: its settings, handler class and, for handlers taking one, the TaskDag of its
+# tasks, or the message of the error making it invalid.
+CompiledJob = collections.namedtuple('CompiledJob', ['job', 'handler_class', 'error', 'dag'])
+
+# A validated job configuration: the loaded data, the version of the file it was loaded from, its compiled jobs by
+# name, and the error message if the file does not match the schema. Never modified; a reload replaces it as a whole.
+CompiledConfig = collections.namedtuple('CompiledConfig', ['job_data', 'version', 'jobs', 'error'])
 
 class JobProcessor:
     """
     Processes the execution of jobs based on configurations specified in JSON files.
     
+    The job file is validated against the schema and every job is compiled, i.e. its handler class loaded and its
+    dependencies checked for cycles, once when the processor is created, instead of on every execution. A processor
+    living as long as the application can watch the job file and swap in a newly compiled configuration when it
+    changes; jobs already running keep the configuration they started with, and a changed file that is invalid is
+    logged and ignored until it is fixed.
+    
     Attributes:
         job_file (str): The file path to the job configuration JSON.
         schema_file (str): The file path to the JSON schema for validating the job configuration.
         job_data (dict): Loaded job configuration data.
         schema_data (dict): Loaded schema data for validation.
+        config (CompiledConfig): The compiled job configuration in use.
+        history (TaskHistory): Store in which every task execution is recorded.
+        result_cache (ResultCache or None): Store from which unchanged tasks reuse their results when caching is used.
+        run_dir (str or None): Directory of the logs of checkpointed runs.
+        resources (ResourcePool or None): Capacities of the resources tasks declare, shared by every job it runs.
     """
     
-    def __init__(self, job_file: str, schema_file: str):
+    def __init__(self, job_file: str, schema_file: str, history=None, result_cache=None, run_dir=None,
+                 resources=None):
         """
         Initializes the JobProcessor with paths to the job and schema JSON files.
         
         Args:
             job_file (str): The file path to the job configuration JSON.
             schema_file (str): The file path to the JSON schema for validating the job configuration.
+            history (TaskHistory, optional): Store for task executions. Defaults to the shared history in
+                                             '.cache/task_history.sqlite3'.
+            result_cache (ResultCache, optional): Store of task results used by jobs executed with `use_cache`.
+                                                  Defaults to the shared cache in '.cache/task_results'.
+            run_dir (str, optional): Directory of the logs of checkpointed runs. Defaults to '.cache/runs'.
+            resources (ResourcePool, optional): Capacities of the resources tasks declare. Pass the same pool to
+                                                every processor whose jobs must share them.
         """
         self.job_file = job_file  # Storing the job file path
         self.schema_file = schema_file  # Storing the schema file path
-        self.job_data = load_json(job_file)  # Loading job data from the job configuration file
         self.schema_data = load_json(schema_file)  # Loading schema data from the schema file
+        self.config = self.compile_config()  # Loading, validating and compiling the job configuration file
+        self.job_data = self.config.job_data
+        self.history = history or get_task_history()  # Recording task executions
+        self.result_cache = result_cache  # Opened on first use
+        self.run_dir = run_dir  # Logs of checkpointed runs
+        self.resources = resources  # Shared limits of the resources tasks declare
         
     def validate_job_file(self):
         """
@@ -38,6 +79,118 @@ class JobProcessor:
         except ValidationError as e:
             raise ValueError(f"Job validation failed: {e.message}")  # Raising an error if validation fails
     
+    def compile_config(self):
+        """
+        Loads the job file, validates it against the schema and compiles every job.
+        
+        Returns:
+            CompiledConfig: The compiled configuration. A file not matching the schema, or an invalid job, is recorded
+                            in it rather than raised, so that it is reported to the requests using it.
+        
+        Raises:
+            OSError: If the job file cannot be read.
+            ValueError: If the job file is not valid JSON.
+        """
+        version = file_version(self.job_file)
+        job_data = load_json(self.job_file)
+        try:
+            validate(instance=job_data, schema=self.schema_data)
+        except ValidationError as e:
+            return CompiledConfig(job_data, version, {}, f"Job validation failed: {e.message}")
+        jobs = {}
+        for job in job_data['jobs']:
+            try:
+                jobs[job['name']] = self.compile_job(job)
+            except ValueError as e:
+                jobs[job['name']] = CompiledJob(job, None, str(e), None)
+        return CompiledConfig(job_data, version, jobs, None)
+
+    def compile_job(self, job):
+        """
+        Validates a job and compiles it: loads its handler class and builds the TaskDag of its tasks, which also
+        detects cyclic dependencies. The TaskDag is kept for handlers accepting a `dag` argument, so that it is built
+        once per configuration rather than once per execution.
+        
+        Args:
+            job (dict): The job configuration to compile.
+        
+        Returns:
+            CompiledJob: The compiled job.
+        
+        Raises:
+            ValueError: If the job does not have a handler, its handler cannot be loaded or cyclic dependencies are
+                        detected.
+        """
+        if 'handler' not in job:
+            raise ValueError(f"Job '{job['name']}' does not have a handler class.")
+        handler_class = self.load_handler_class(job['handler'])
+        try:
+            dag = TaskDag.from_tasks(job['tasks'])
+        except ValueError:
+            raise ValueError(f"Job '{job['name']}' has cyclic dependencies.")
+        if 'dag' not in inspect.signature(handler_class).parameters:
+            dag = None
+        return CompiledJob(job, handler_class, None, dag)
+
+    def reload_if_changed(self):
+        """
+        Compiles the job file again if it changed since it was compiled, and swaps the new configuration in. An
+        unreadable or invalid file is logged and the configuration in use is kept.
+        
+        Returns:
+            bool: True if a new configuration was swapped in.
+        """
+        try:
+            if file_version(self.job_file) == self.config.version:
+                return False
+            config = self.compile_config()
+        except (OSError, ValueError) as e:
+            logging.error('Failed to reload job file %s, keeping the current configuration: %s', self.job_file, e)
+            return False
+        if config.error is not None:
+            logging.error('Job file %s is invalid, keeping the current configuration: %s', self.job_file,
+                          config.error)
+            return False
+        self.config = config  # A single assignment, so requests see either the old or the new configuration
+        self.job_data = config.job_data
+        logging.info('Reloaded job file %s with %d jobs', self.job_file, len(config.jobs))
+        return True
+
+    async def watch(self, interval: float = 1.0):
+        """
+        Polls the job file every `interval` seconds and swaps in a newly compiled configuration when it changes, until
+        cancelled. Compilation runs in a thread, so the event loop keeps serving requests meanwhile.
+        
+        Args:
+            interval (float): Seconds between two checks of the file.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(self.reload_if_changed)
+
+    def get_compiled_job(self, job_name: str):
+        """
+        Retrieves a compiled job of the configuration in use.
+        
+        Args:
+            job_name (str): The name of the job to retrieve.
+        
+        Returns:
+            CompiledJob: The job, its handler class and its TaskDag.
+        
+        Raises:
+            ValueError: If the job file is invalid, no job with the given name is found or the job is invalid.
+        """
+        config = self.config
+        if config.error is not None:
+            raise ValueError(config.error)
+        compiled = config.jobs.get(job_name)
+        if compiled is None:
+            raise ValueError(f"Job '{job_name}' not found.")
+        if compiled.error is not None:
+            raise ValueError(compiled.error)
+        return compiled
+
     def get_job_by_name(self, job_name: str):
         """
         Retrieves a job configuration by its name.
@@ -67,12 +220,10 @@ class JobProcessor:
             ValueError: If the job does not have a handler or if cyclic dependencies are detected.
         """
 
-        handler_class_name = job.get("handler", None)  # Get the handler class name from job data
-
-        handler_class = self.load_handler_class(handler_class_name)  # Load the appropriate handler class
-        
         if 'handler' not in job:
             raise ValueError(f"Job '{job['name']}' does not have a handler class.")  # Checking for handler class
+
+        handler_class = self.load_handler_class(job['handler'])  # Load the appropriate handler class
         
         task_graph = {task['name']: task.get('dependencies', []) for task in job['tasks']}  # Creating a graph of tasks
         if detect_cycles(task_graph):
@@ -99,22 +250,114 @@ class JobProcessor:
             handler_class = getattr(module, handler_class_name)
             return handler_class
         except (ImportError, AttributeError) as e:
-            raise ValueError(f"Failed to load handler class '{self.handler_class_name}': {e}")
+            raise ValueError(f"Failed to load handler class '{handler_class_name}': {e}")
     
-    async def execute_job(self, job_name: str):
+    async def execute_job(self, job_name: str, use_cache: bool = False, run_id: str = None, trace=None,
+                          events=None):
         """
         Executes the specified job asynchronously.
         
         Args:
             job_name (str): The name of the job to execute.
+            use_cache (bool): Whether tasks whose code, configuration and inputs are unchanged since an earlier run
+                              reuse their cached results instead of executing.
+            run_id (str, optional): If given, task completions are checkpointed under this run ID, so the run can be
+                                    resumed if the worker dies mid-job.
+            trace (TaskTrace, optional): Collection in which a span of every task execution is recorded.
+            events (JobEvents, optional): Log to which the progress and results of the tasks are published.
+        
+        Returns:
+            dict: The results of the job's output tasks, by task name.
         
         Raises:
             ValueError: If the job or its configuration is invalid.
         """
-        self.validate_job_file()  # Validating the job file
-        job = self.get_job_by_name(job_name)  # Retrieving the job by name
-        handler_class = self.validate_job(job)  # Validating the job
+        compiled = self.get_compiled_job(job_name)  # Retrieving the job validated when the configuration was compiled
+        run_log = RunLog.create(job_name, run_id, self.run_dir) if run_id else None
+        return await self.run_job(compiled.job, use_cache, run_log, trace, compiled.handler_class, events,
+                                  compiled.dag)
+
+    async def resume(self, run_id: str, use_cache: bool = False, trace=None):
+        """
+        Continues a checkpointed run that was interrupted, executing only the tasks that had not completed.
+        
+        Args:
+            run_id (str): The ID of the interrupted run.
+            use_cache (bool): Whether unchanged tasks reuse their cached results instead of executing.
+            trace (TaskTrace, optional): Collection in which a span of every task execution is recorded.
+        
+        Raises:
+            ValueError: If the run does not exist or its job is no longer valid.
+        """
+        run_log = RunLog.open(run_id, self.run_dir)  # Reading the completions checkpointed so far
+        try:
+            compiled = self.get_compiled_job(run_log.job_name)
+        except ValueError:
+            run_log.close()
+            raise
+        logging.info('Resuming run %s of job %s with %d completed tasks', run_id, run_log.job_name,
+                     len(run_log.completed))
+        return await self.run_job(compiled.job, use_cache, run_log, trace, compiled.handler_class,
+                                  dag=compiled.dag)
+
+    async def run_job(self, job, use_cache=False, run_log=None, trace=None, handler_class=None, events=None,
+                      dag=None):
+        """
+        Runs a validated job with its handler. The log of a checkpointed run is closed afterwards, and removed if the
+        run completed. Lines logged while the job runs are attributed to it.
+        
+        Args:
+            job (dict): The job configuration.
+            use_cache (bool): Whether unchanged tasks reuse their cached results instead of executing.
+            run_log (RunLog, optional): Log of the run, for checkpointing and resuming it.
+            trace (TaskTrace, optional): Collection in which a span of every task execution is recorded.
+            handler_class (type, optional): The handler class of the compiled job. Without it the job is validated
+                                            first.
+            events (JobEvents, optional): Log to which the progress and results of the tasks are published.
+            dag (TaskDag, optional): The compiled dependency graph of the job, for handlers accepting one.
+        """
+        handler_class = handler_class or self.validate_job(job)  # Validating the job unless it is compiled
+        
+        result_cache = None
+        if use_cache:
+            self.result_cache = self.result_cache or get_result_cache()
+            result_cache = self.result_cache
+        handler_options = {'dag': dag} if dag is not None else {}  # Only handlers taking a DAG are given one
+        job_handler = handler_class(job, history=self.history, result_cache=result_cache,
+                                    run_log=run_log, trace=trace, resources=self.resources,
+                                    events=events, **handler_options)  # Instantiate the handler
+        
+        completed = False
+        try:
+            with log_context(job_name=job['name']):
+                result = await job_handler.run()  # Execute the tasks using the handler
+            completed = True
+            return result
+        finally:
+            if run_log is not None:
+                await asyncio.to_thread(run_log.close, completed)
+                if not completed:
+                    logging.warning('Run %s of job %s did not complete and can be resumed', run_log.run_id,
+                                    run_log.job_name)
+
+    def get_task_statistics(self, job_name: str, max_workers: int = None):
+        """
+        Reports the recorded p50/p95/max wall times of a job's tasks and the estimated makespan of the job.
         
-        job_handler = handler_class(job)  # Instantiate the handler
+        Args:
+            job_name (str): The name of the job.
+            max_workers (int, optional): Number of tasks running at once for the estimate. Defaults to all tasks.
         
-        return await job_handler.run()  # Execute the tasks using the handler and return the result
+        Returns:
+            dict: The statistics of every task with recorded executions and the estimated makespan in seconds.
+        
+        Raises:
+            ValueError: If no job with the given name is found.
+        """
+        job = self.get_job_by_name(job_name)
+        tasks = job.get('tasks', [])
+        statistics = self.history.task_statistics(task['name'] for task in tasks)
+        return {
+            "tasks": {name: stats._asdict() for name, stats in statistics.items()},
+            "estimated_makespan": self.history.estimate_makespan(tasks, max_workers or len(tasks) or 1)
+        }
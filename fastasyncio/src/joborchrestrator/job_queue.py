@@ -0,0 +1,198 @@
+import asyncio
+import collections
+import logging
+import math
+import time
+import uuid
+from .checkpoint import new_run_id  # IDs of checkpointed runs
+from .tracing import TaskTrace  # Chrome traces of the task executions
+from .events import JobEvents  # Progress of the tasks, streamed to clients
+
+# Weight of the latest job duration in the moving average used to estimate when a full queue has room again.
+DURATION_SMOOTHING = 0.2
+
+
+class QueueFullError(Exception):
+    """
+    Raised by JobQueue.submit when as many jobs are waiting as the queue holds.
+
+    Attributes:
+        retry_after (int): Estimated number of seconds until a submission would be admitted.
+    """
+
+    def __init__(self, retry_after):
+        super().__init__(f"The job queue is full, retry in {retry_after} seconds.")
+        self.retry_after = retry_after
+
+
+class JobRecord:
+    """
+    The state of a submitted job, from its submission until it is evicted after finishing.
+
+    Attributes:
+        job_id (str): The ID returned on submission.
+        job_name (str): The name of the job.
+        status (str): 'queued', 'running', 'succeeded' or 'failed'.
+        submitted_at, started_at, finished_at (float or None): Epoch times of the job's transitions.
+        result (dict or None): The results of the job's output tasks once it succeeded.
+        error (str or None): The error of the job once it failed.
+        run_id (str or None): The run ID when the job is checkpointed.
+        trace (TaskTrace or None): The spans of the job's task executions when it is traced.
+        events (JobEvents): The progress of the job's tasks, ending with a `job-finished` event.
+    """
+
+    def __init__(self, job_name, use_cache=False, checkpoint=False, trace=False):
+        self.job_id = uuid.uuid4().hex
+        self.job_name = job_name
+        self.use_cache = use_cache
+        self.status = 'queued'
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.run_id = new_run_id() if checkpoint else None
+        self.trace = TaskTrace() if trace else None
+        self.events = JobEvents()
+
+    @property
+    def finished(self):
+        return self.status in ('succeeded', 'failed')
+
+    def to_dict(self):
+        """Returns the state of the job as a JSON-serializable dictionary."""
+        state = {"job_id": self.job_id, "job_name": self.job_name, "status": self.status,
+                 "submitted_at": self.submitted_at, "started_at": self.started_at, "finished_at": self.finished_at}
+        if self.run_id:
+            state["run_id"] = self.run_id
+        if self.status == 'succeeded':
+            state["result"] = self.result
+        if self.error is not None:
+            state["error"] = self.error
+        if self.trace is not None and self.finished:
+            state["trace"] = self.trace.to_chrome_trace()
+        return state
+
+
+class JobQueue:
+    """
+    Runs submitted jobs in the background, at most `max_running` at once, so that clients do not hold a connection
+    open for the whole run of a job and the number of jobs running at once stays bounded.
+
+    Submitted jobs wait in a queue of at most `max_queued` jobs, drained by `max_running` worker coroutines. A
+    submission to a full queue is rejected with QueueFullError, carrying an estimate of when there will be room,
+    rather than growing the queue without bound. Finished jobs are kept for polling until `max_finished` newer jobs
+    have finished.
+
+    Attributes:
+        processor (JobProcessor): The processor executing the jobs.
+        max_running (int): Maximum number of jobs running at once.
+        max_queued (int): Maximum number of jobs waiting to run.
+        max_finished (int): Number of finished jobs kept for polling.
+    """
+
+    def __init__(self, processor, max_running=4, max_queued=100, max_finished=1000):
+        self.processor = processor
+        self.max_running = max(1, max_running)
+        self.max_queued = max(1, max_queued)
+        self.max_finished = max_finished
+        self._queue = asyncio.Queue(self.max_queued)
+        self._records = {}
+        self._finished = collections.deque()
+        self._workers = []
+        self._mean_duration = None
+
+    def start(self):
+        """Starts the worker coroutines on the running event loop."""
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._work()) for _ in range(self.max_running)]
+
+    async def stop(self):
+        """Cancels the worker coroutines, and with them the jobs they are running."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, job_name: str, use_cache: bool = False, checkpoint: bool = False, trace: bool = False):
+        """
+        Enqueues a job to run in the background.
+
+        Args:
+            job_name (str): The name of the job to execute.
+            use_cache (bool): Whether unchanged tasks reuse their cached results from an earlier run.
+            checkpoint (bool): Whether task completions are checkpointed so the run can be resumed.
+            trace (bool): Whether a Chrome trace of the task executions is recorded.
+
+        Returns:
+            JobRecord: The record of the queued job, whose `job_id` identifies it.
+
+        Raises:
+            ValueError: If the job does not exist or is invalid.
+            QueueFullError: If the queue is full.
+        """
+        self.processor.get_compiled_job(job_name)  # Rejecting unknown or invalid jobs before they are queued
+        record = JobRecord(job_name, use_cache, checkpoint, trace)
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            raise QueueFullError(self.retry_after())
+        self._records[record.job_id] = record
+        logging.info('Queued job %s as %s, %d jobs waiting', job_name, record.job_id, self._queue.qsize())
+        return record
+
+    def get(self, job_id: str):
+        """Returns the record of a submitted job, or None if there is none or it has been evicted."""
+        return self._records.get(job_id)
+
+    def retry_after(self):
+        """
+        Estimates the number of seconds until a full queue has room: the time until one of the running jobs
+        finishes and a queued job takes its place, on average the mean duration of recent jobs over `max_running`.
+
+        Returns:
+            int: The estimate, at least 1.
+        """
+        if self._mean_duration is None:
+            return 1
+        return max(1, math.ceil(self._mean_duration / self.max_running))
+
+    async def _work(self):
+        """Worker coroutine: runs queued jobs one after another until cancelled."""
+        while True:
+            record = await self._queue.get()
+            try:
+                await self._run(record)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, record):
+        record.status = 'running'
+        record.started_at = time.time()
+        record.events.publish('job-started', {"job_id": record.job_id, "job_name": record.job_name})
+        try:
+            record.result = await self.processor.execute_job(record.job_name, record.use_cache, record.run_id,
+                                                             record.trace, record.events)
+            record.status = 'succeeded'
+        except asyncio.CancelledError:
+            record.status, record.error = 'failed', 'The job was cancelled.'
+            raise
+        except Exception as e:
+            logging.error('Job %s (%s) failed: %s', record.job_name, record.job_id, e)
+            record.status, record.error = 'failed', str(e)
+        finally:
+            record.finished_at = time.time()
+            record.events.publish('job-finished', {"job_id": record.job_id, "status": record.status,
+                                                   "error": record.error})
+            record.events.close()
+            self._record_finished(record)
+
+    def _record_finished(self, record):
+        duration = record.finished_at - record.started_at
+        if self._mean_duration is None:
+            self._mean_duration = duration
+        else:
+            self._mean_duration += DURATION_SMOOTHING * (duration - self._mean_duration)
+        self._finished.append(record.job_id)
+        while len(self._finished) > self.max_finished:
+            self._records.pop(self._finished.popleft(), None)
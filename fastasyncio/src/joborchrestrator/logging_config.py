@@ -0,0 +1,146 @@
+import atexit
+import contextlib
+import contextvars
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(context)s%(message)s'
+
+# Name of the logger for per-task lines, such as a task starting, which can be gated and sampled separately.
+TASK_LOGGER = 'joborchrestrator.tasks'
+
+task_logger = logging.getLogger(TASK_LOGGER)
+
+# Job and task the lines logged by the current coroutine are attributed to. Every asyncio task starts with a copy of
+# the context of the code that created it, so the tasks gathered by a handler inherit the job of the handler.
+_job_name = contextvars.ContextVar('job_name', default=None)
+_task_name = contextvars.ContextVar('task_name', default=None)
+
+_listener = None
+_configured = False
+_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def log_context(job_name=None, task_name=None):
+    """
+    Attributes lines logged by the current coroutine or thread within the context to a job and task. Arguments left
+    as None keep the value of the enclosing context.
+    """
+    job_token = _job_name.set(job_name) if job_name is not None else None
+    task_token = _task_name.set(task_name) if task_name is not None else None
+    try:
+        yield
+    finally:
+        if task_token is not None:
+            _task_name.reset(task_token)
+        if job_token is not None:
+            _job_name.reset(job_token)
+
+
+class ContextFilter(logging.Filter):
+    """
+    Copies the job and task of the current log context onto every record as `job_name`, `task_name` and a
+    ready-formatted `context` prefix, unless the record was logged with its own `job_name` or `task_name` in `extra`.
+    """
+
+    def filter(self, record):
+        job_name = getattr(record, 'job_name', None) or _job_name.get()
+        task_name = getattr(record, 'task_name', None) or _task_name.get()
+        record.job_name = job_name
+        record.task_name = task_name
+        if job_name and task_name:
+            record.context = f"[{job_name} {task_name}] "
+        elif job_name or task_name:
+            record.context = f"[{job_name or task_name}] "
+        else:
+            record.context = ""
+        return True
+
+
+class SampleFilter(logging.Filter):
+    """
+    Passes every record at WARNING or above and an evenly spaced fraction `rate` of the records below it.
+    """
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        with self._lock:
+            self._count += 1
+            count = self._count
+        # Passes the record whenever the running count crosses another multiple of 1 / rate.
+        return int(count * self.rate) != int((count - 1) * self.rate)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Queues records as they are, so that formatting happens on the listener thread."""
+
+    def prepare(self, record):
+        return record
+
+
+def configure_logging(log_level=logging.INFO, task_log_level=None, task_sample_rate=1.0, stream=None):
+    """
+    Configures logging once per process; later calls do nothing.
+
+    The event loop never formats or writes a log line: records are put unformatted on an in-process queue by a
+    QueueHandler on the root logger, and a QueueListener formats and writes them to `stream`, stderr by default, from
+    its own thread. Arguments are therefore formatted when the line is written and must not be mutated after they are
+    logged. If the root logger already has handlers, e.g. because uvicorn or the application configured logging, they
+    are kept and only the per-task lines are configured.
+
+    Args:
+        log_level (int): Level of the root logger.
+        task_log_level (int, optional): Level of the per-task lines of `task_logger`. Defaults to `log_level`.
+        task_sample_rate (float): Fraction of the per-task lines below WARNING that are kept.
+        stream (file-like, optional): Stream the lines are written to. Defaults to stderr.
+    """
+    global _listener, _configured
+    with _lock:
+        if _configured:
+            return
+        _configured = True
+        if task_log_level is not None:
+            task_logger.setLevel(task_log_level)
+        if task_sample_rate < 1.0:
+            task_logger.addFilter(SampleFilter(task_sample_rate))
+
+        root = logging.getLogger()
+        if root.handlers:
+            return
+        root.setLevel(log_level)
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        queue_handler = _DeferredQueueHandler(queue.SimpleQueue())
+        queue_handler.addFilter(ContextFilter())
+        _listener = QueueListener(queue_handler.queue, handler, respect_handler_level=True)
+        _listener.start()
+        root.addHandler(queue_handler)
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """
+    Writes every queued record and stops the listener thread. Records logged afterwards are written directly.
+    """
+    global _listener
+    with _lock:
+        listener, _listener = _listener, None
+        if listener is None:
+            return
+        listener.stop()
+        root = logging.getLogger()
+        for queue_handler in [handler for handler in root.handlers if isinstance(handler, _DeferredQueueHandler)]:
+            root.removeHandler(queue_handler)
+        for handler in listener.handlers:
+            handler.addFilter(ContextFilter())
+            root.addHandler(handler)
@@ -0,0 +1,138 @@
+import asyncio
+import collections
+
+
+class ResourcePool:
+    """
+    Capacities of named resources, such as database connections or memory, shared by the tasks run through it.
+
+    Tasks declare what they use with `"resources": {"db": 1, "mem_gb": 8}` in the job file. A task only starts once
+    every resource it uses is free; until then its coroutine waits without blocking the event loop. Released resources
+    go to the waiting tasks in arrival order, but a task that fits may start ahead of an earlier one that does not yet,
+    so a large task never holds back smaller ones behind it.
+
+    Pools can be nested: a job's pool with the job's own capacities has the processor's pool as parent, shared by
+    every job, and a task only starts when its resources are free in both. Resources no pool declares a capacity for
+    are unlimited. A pool must only be used from one event loop at a time.
+
+    Attributes:
+        capacities (dict): Maps resource names to their capacity.
+        parent (ResourcePool or None): Pool whose capacities also apply to every acquisition through this one.
+    """
+
+    def __init__(self, capacities=None, parent=None):
+        self.capacities = dict(capacities or {})
+        self.parent = parent
+        self._in_use = collections.Counter()
+        # Every pool of a tree shares the waiting list of its root, so that releasing a resource in a parent can wake
+        # a task waiting through any of its children.
+        self._root = parent._root if parent is not None else self
+        if parent is None:
+            self._waiting = collections.deque()
+
+    def _chain(self):
+        pool = self
+        while pool is not None:
+            yield pool
+            pool = pool.parent
+
+    def check(self, requirements):
+        """
+        Checks that a task's requirements can ever be met.
+
+        Raises:
+            ValueError: If an amount is negative or larger than the capacity of the resource.
+        """
+        for name, amount in requirements.items():
+            if amount < 0:
+                raise ValueError(f"Resource {name} requirement {amount} is negative")
+            for pool in self._chain():
+                if name in pool.capacities and amount > pool.capacities[name]:
+                    raise ValueError(f"Resource {name} requirement {amount} exceeds its capacity of "
+                                     f"{pool.capacities[name]}")
+
+    def _fits(self, requirements):
+        for pool in self._chain():
+            for name, amount in requirements.items():
+                if name in pool.capacities and pool._in_use[name] + amount > pool.capacities[name]:
+                    return False
+        return True
+
+    def _take(self, requirements, sign=1):
+        for pool in self._chain():
+            for name, amount in requirements.items():
+                if name in pool.capacities:
+                    pool._in_use[name] += sign * amount
+
+    async def acquire(self, requirements):
+        """
+        Waits until the required resources are free and takes them.
+
+        Args:
+            requirements (dict): Maps resource names to the amount the task uses.
+
+        Raises:
+            ValueError: If the requirements exceed a capacity and can never be met.
+        """
+        self.check(requirements)
+        if self._fits(requirements):
+            self._take(requirements)
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (self, requirements, waiter)
+        self._root._waiting.append(entry)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Woken with the resources taken for it, but cancelled before it could run.
+                self.release(requirements)
+            else:
+                self._root._waiting.remove(entry)
+            raise
+
+    def release(self, requirements):
+        """
+        Returns resources taken by acquire and wakes the waiting tasks that now fit, in arrival order.
+
+        Args:
+            requirements (dict): The requirements passed to acquire.
+        """
+        self._take(requirements, sign=-1)
+        root = self._root
+        waiting = collections.deque()
+        while root._waiting:
+            entry = root._waiting.popleft()
+            pool, entry_requirements, waiter = entry
+            if pool._fits(entry_requirements):
+                pool._take(entry_requirements)
+                waiter.set_result(None)
+            else:
+                waiting.append(entry)
+        root._waiting = waiting
+
+    def in_use(self):
+        """Returns the amount in use of every resource this pool declares a capacity for."""
+        return {name: self._in_use[name] for name in self.capacities}
+
+
+async def execute_with_resources(resources, requirements, execute):
+    """
+    Awaits `execute()` while holding the resources a task requires, waiting until they are free. Without a pool or
+    requirements the task runs at once.
+
+    Args:
+        resources (ResourcePool or None): The pool bounding the task.
+        requirements (dict or None): The `resources` setting of the task.
+        execute (callable): Returns the awaitable running the task.
+
+    Returns:
+        The result of the task.
+    """
+    if resources is None or not requirements:
+        return await execute()
+    await resources.acquire(requirements)
+    try:
+        return await execute()
+    finally:
+        resources.release(requirements)
@@ -0,0 +1,267 @@
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+
+# Directory used when no path is given, next to the config folder.
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / '.cache' / 'task_results'
+
+# Total size of the stored results above which the least recently used ones are evicted.
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# A result read from the cache and the digest of its pickled form.
+CachedResult = namedtuple('CachedResult', ['value', 'digest'])
+
+_SUFFIX = '.pickle'
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def source_digest(task_class):
+    """
+    Returns the hash of the source code of a task class, or None if the source is not available, e.g. for classes
+    defined interactively.
+
+    Args:
+        task_class (type): The task class.
+
+    Returns:
+        str or None: The hexadecimal SHA-256 digest of the class source.
+    """
+    try:
+        source = inspect.getsource(task_class)
+    except (OSError, TypeError):
+        return None
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+def task_cache_key(task, task_class, dependency_digests):
+    """
+    Computes the cache key of a task.
+
+    Args:
+        task (dict): The task configuration.
+        task_class (type): The task class.
+        dependency_digests (dict): Maps the names of the task's dependencies to the digests of their results.
+
+    Returns:
+        str or None: The hexadecimal key, or None if the task cannot be cached because its source is not available.
+    """
+    source = source_digest(task_class)
+    if source is None:
+        return None
+    content = json.dumps([task['name'], source, task, dependency_digests], sort_keys=True, default=str)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def result_digest(value):
+    """
+    Returns the digest of a result, as the cache would compute it when storing the result.
+
+    Args:
+        value: The result.
+
+    Returns:
+        str or None: The hexadecimal SHA-256 digest of the pickled result, or None if it cannot be pickled.
+    """
+    try:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return None
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed store of pickled task results in a local directory, bounded in size with LRU eviction.
+
+    A task's key covers its name, a hash of its task class's source, its configuration entry and the digests of its
+    dependencies' results, so a re-run after editing one task executes only that task and the dependents whose inputs
+    changed. The order of use is kept in the file modification times, so it survives restarts.
+    """
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Opens the cache directory, creating it if necessary, and indexes the results already stored in it.
+
+        Args:
+            path (str or Path, optional): Cache directory. Defaults to DEFAULT_CACHE_DIR.
+            max_bytes (int): Total size of stored results above which the least recently used ones are evicted.
+        """
+        self.path = Path(path or DEFAULT_CACHE_DIR)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+        stored = []
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(_SUFFIX):
+                stat = entry.stat()
+                stored.append((stat.st_mtime, entry.name[:-len(_SUFFIX)], stat.st_size))
+        for _, key, size in sorted(stored):
+            self._entries[key] = size
+            self._size += size
+        self._evict()
+
+    def _file(self, key):
+        """Returns the path of the file storing the result for a key."""
+        return self.path / f"{key}{_SUFFIX}"
+
+    def get(self, key):
+        """
+        Returns the cached result for a key and marks it as recently used.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            CachedResult or None: The result and its digest, or None on a miss.
+        """
+        if key not in self._entries:
+            return None
+        path = self._file(key)
+        try:
+            data = path.read_bytes()
+            value = pickle.loads(data)
+            os.utime(path)
+        except FileNotFoundError:
+            self._forget(key)
+            return None
+        except Exception as exception:
+            logging.warning("Discarding unreadable cached result %s: %s", key, exception)
+            self._forget(key)
+            path.unlink(missing_ok=True)
+            return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return CachedResult(value, hashlib.sha256(data).hexdigest())
+
+    def put(self, key, value):
+        """
+        Stores a result under a key, evicting the least recently used results if the cache grows too large. Results
+        that cannot be pickled are not stored.
+
+        Args:
+            key (str): The cache key.
+            value: The result.
+
+        Returns:
+            str or None: The digest of the result, or None if it cannot be pickled.
+        """
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as exception:
+            logging.debug("Result for cache key %s is not cached: %s", key, exception)
+            return None
+        digest = hashlib.sha256(data).hexdigest()
+        if len(data) > self.max_bytes:
+            return digest
+        # Written to a temporary file first, so readers never see a partial result.
+        descriptor, temporary = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(data)
+            os.replace(temporary, self._file(key))
+        except OSError as exception:
+            logging.warning("Could not store result for cache key %s: %s", key, exception)
+            Path(temporary).unlink(missing_ok=True)
+            return digest
+        with self._lock:
+            self._size += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict()
+        return digest
+
+    def _forget(self, key):
+        """Drops a key whose file has disappeared or is unreadable from the index."""
+        with self._lock:
+            self._size -= self._entries.pop(key, 0)
+
+    def _evict(self):
+        """Removes least recently used results until the cache fits its size bound. Must be called with the lock held."""
+        while self._size > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._size -= size
+            self._file(key).unlink(missing_ok=True)
+
+    @property
+    def size(self):
+        """Total size of the stored results in bytes."""
+        return self._size
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Removes every stored result."""
+        with self._lock:
+            for key in self._entries:
+                self._file(key).unlink(missing_ok=True)
+            self._entries.clear()
+            self._size = 0
+
+
+async def execute_cached(result_cache, task, task_class, dependency_digests, execute):
+    """
+    Returns the cached result of a task if its class, configuration and dependency results are unchanged, otherwise
+    executes it and stores its result. Cache reads and writes run in a worker thread, off the event loop.
+
+    Args:
+        result_cache (ResultCache or None): Store of task results. Without one the task is simply executed.
+        task (dict): The task configuration. Tasks marked `"cache": false` are always executed.
+        task_class (type): The task class.
+        dependency_digests (dict): Maps the names of the task's dependencies to the digests of their results.
+        execute (callable): Returns the awaitable executing the task.
+
+    Returns:
+        tuple: The result, its digest (None without a cache, or if a dependency has no digest and the result cannot be
+               pickled) and whether it came from the cache.
+    """
+    if result_cache is None:
+        return await execute(), None, False
+    cache_key = None
+    if task.get('cache', True) and None not in dependency_digests.values():
+        cache_key = task_cache_key(task, task_class, dependency_digests)
+    if cache_key is not None:
+        cached = await asyncio.to_thread(result_cache.get, cache_key)
+        if cached is not None:
+            logging.info("Task %s is unchanged, reusing its cached result.", task['name'])
+            return cached.value, cached.digest, True
+    result = await execute()
+    if cache_key is not None:
+        return result, await asyncio.to_thread(result_cache.put, cache_key, result), False
+    return result, result_digest(result), False
+
+
+def get_result_cache(path=None, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Returns the ResultCache shared by the whole process for a directory, opening it on first use.
+
+    Args:
+        path (str or Path, optional): Cache directory. Defaults to DEFAULT_CACHE_DIR.
+        max_bytes (int): Size bound used when the cache is opened.
+
+    Returns:
+        ResultCache: The shared result cache.
+    """
+    path = Path(path or DEFAULT_CACHE_DIR).resolve()
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = ResultCache(path, max_bytes)
+        return cache
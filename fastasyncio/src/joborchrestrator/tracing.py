@@ -0,0 +1,133 @@
+import json
+import os
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+# One attempt of a task. Times are in seconds since the epoch; queued_at is None for tasks started without queueing.
+# The worker is the name of the thread or asyncio task the task ran on, in the process with ID process_id.
+TaskSpan = namedtuple('TaskSpan', ['task_name', 'job_name', 'queued_at', 'started_at', 'finished_at', 'process_id',
+                                   'worker', 'dependencies', 'outcome'])
+
+
+class TaskTrace:
+    """
+    Thread-safe collection of task spans, exportable as Chrome trace-event JSON. The export loads into Perfetto
+    (https://ui.perfetto.dev) or chrome://tracing and shows every coroutine as a track: a task is a slice on the track
+    of the coroutine that awaited it, the time it waited to start is an async slice on the job's queue track, and every
+    dependency is a flow arrow from the end of the dependency to the start of the dependent. Idle phases, stragglers
+    and serialization points, such as the sequential phase of GenericJobHandler, are visible at a glance.
+
+    Attributes:
+        spans (list of TaskSpan): The recorded spans, in order of recording.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def record(self, task_name, started_at, wall_time, worker, process_id=None, queued_at=None, dependencies=(),
+               outcome='success', job_name=None):
+        """
+        Records one attempt of a task.
+
+        Args:
+            task_name (str): The task name.
+            started_at (float): Start time in seconds since the epoch.
+            wall_time (float): Wall time of the attempt in seconds.
+            worker (str): Name of the thread or coroutine the task ran on.
+            process_id (int, optional): ID of the process the task ran in. Defaults to the current process.
+            queued_at (float, optional): Time the task was queued, in seconds since the epoch.
+            dependencies (iterable of str): Names of the tasks the task depends on.
+            outcome (str): 'success', 'failure' or 'timeout'.
+            job_name (str, optional): Name of the job the task ran in.
+        """
+        span = TaskSpan(task_name, job_name, queued_at, started_at, started_at + wall_time,
+                        process_id or os.getpid(), worker, tuple(dependencies), outcome)
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self):
+        """Removes every recorded span."""
+        with self._lock:
+            self.spans.clear()
+
+    def to_chrome_trace(self):
+        """
+        Converts the recorded spans to Chrome trace events. Timestamps are microseconds since the earliest recorded
+        time, which is kept in `otherData` as seconds since the epoch.
+
+        Returns:
+            dict: The trace, in the JSON object format of the trace-event specification.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        origin = min((span.queued_at or span.started_at for span in spans), default=0.0)
+
+        def microseconds(seconds):
+            return round((seconds - origin) * 1e6, 3)
+
+        events = []
+        thread_ids = {}
+        for process_id in sorted({span.process_id for span in spans}):
+            events.append({"name": "process_name", "ph": "M", "pid": process_id,
+                           "args": {"name": "orchestrator" if process_id == os.getpid()
+                                    else f"worker process {process_id}"}})
+        for span in spans:
+            key = (span.process_id, span.worker)
+            if key not in thread_ids:
+                thread_ids[key] = len(thread_ids) + 1
+                events.append({"name": "thread_name", "ph": "M", "pid": span.process_id, "tid": thread_ids[key],
+                               "args": {"name": span.worker or "unknown"}})
+
+        # The last successful attempt of every task, which its dependents' flow arrows start from. A task shared
+        # between jobs is only traced by the job that executed it, so other jobs fall back to that span.
+        producers = {}
+        for span in spans:
+            if span.outcome == 'success':
+                producers[(span.job_name, span.task_name)] = span
+                producers[(None, span.task_name)] = span
+
+        flow_id = 0
+        for span_id, span in enumerate(spans):
+            thread_id = thread_ids[(span.process_id, span.worker)]
+            category = span.job_name or "job"
+            events.append({
+                "name": span.task_name, "cat": category, "ph": "X", "pid": span.process_id, "tid": thread_id,
+                "ts": microseconds(span.started_at), "dur": round((span.finished_at - span.started_at) * 1e6, 3),
+                "args": {"outcome": span.outcome, "dependencies": list(span.dependencies),
+                         "queue_wait_ms": round((span.started_at - span.queued_at) * 1e3, 3)
+                         if span.queued_at is not None else None}})
+            if span.queued_at is not None and span.queued_at < span.started_at:
+                for phase, seconds in (("b", span.queued_at), ("e", span.started_at)):
+                    events.append({"name": span.task_name, "cat": f"{category} queue", "ph": phase,
+                                   "id": span_id, "pid": os.getpid(), "ts": microseconds(seconds)})
+            for dependency in span.dependencies:
+                producer = producers.get((span.job_name, dependency)) or producers.get((None, dependency))
+                if producer is None or producer.finished_at > span.started_at:
+                    continue
+                flow_id += 1
+                # The flow starts inside the producer's slice, just before it ends, so viewers bind it to that slice.
+                start = max(producer.started_at, producer.finished_at - 1e-6)
+                events.append({"name": "dependency", "cat": "dependency", "ph": "s", "id": flow_id,
+                               "pid": producer.process_id, "tid": thread_ids[(producer.process_id, producer.worker)],
+                               "ts": microseconds(start)})
+                events.append({"name": "dependency", "cat": "dependency", "ph": "f", "bp": "e", "id": flow_id,
+                               "pid": span.process_id, "tid": thread_id, "ts": microseconds(span.started_at)})
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"origin": origin}}
+
+    def save(self, path):
+        """
+        Writes the trace to a JSON file that Perfetto and chrome://tracing can open.
+
+        Args:
+            path (str or Path): The file to write.
+
+        Returns:
+            Path: The written file.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as file:
+            json.dump(self.to_chrome_trace(), file)
+        return path
@@ -1,16 +1,23 @@
 import json
 from pathlib import Path
 
-def load_json(file_path):
+def resolve_path(file_path):
+    """Resolve a path relative to the project folder, such as 'config/job.json'."""
     # Get the current directory of this script
     current_dir = Path(__file__).resolve().parent
     # Construct the path to the config folder
-    config_path = current_dir.parents[1] / file_path
+    return current_dir.parents[1] / file_path
 
+def load_json(file_path):
     """Load a JSON file."""
-    with open(config_path, 'r') as file:
+    with open(resolve_path(file_path), 'r') as file:
         return json.load(file)
 
+def file_version(file_path):
+    """Return the modification time and size of a file, which change whenever the file is rewritten."""
+    stat = resolve_path(file_path).stat()
+    return stat.st_mtime_ns, stat.st_size
+
 def detect_cycles(task_graph):
     """Detect cycles in a directed graph of tasks using Depth-First Search."""
     visited = set()
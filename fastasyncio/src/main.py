@@ -1,45 +1,149 @@
+import asyncio
+import contextlib
 import logging
+import os
 import uvicorn
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Header, Request, status
+from fastapi.responses import StreamingResponse
 from joborchrestrator.job_processor import JobProcessor
+from joborchrestrator.history import get_task_history
+from joborchrestrator.job_queue import JobQueue, QueueFullError
+from joborchrestrator.events import format_event
+from joborchrestrator.checkpoint import new_run_id
+from joborchrestrator.tracing import TaskTrace
+from joborchrestrator.logging_config import configure_logging
+from joborchrestrator.resources import ResourcePool
 
-# Initialize the FastAPI application
-app = FastAPI()
+# Set up logging once, written from a background thread. LOG_LEVEL sets the level of all lines, TASK_LOG_LEVEL the
+# level of per-task lines and TASK_LOG_SAMPLE the fraction of per-task lines below WARNING that are written.
+configure_logging(getattr(logging, os.environ.get('LOG_LEVEL', 'INFO').upper()),
+                  getattr(logging, os.environ['TASK_LOG_LEVEL'].upper()) if 'TASK_LOG_LEVEL' in os.environ else None,
+                  float(os.environ.get('TASK_LOG_SAMPLE', '1.0')))
+
+def parse_capacities(spec):
+    """
+    Parses resource capacities given as comma-separated NAME=CAPACITY pairs, e.g. "db=4,mem_gb=16".
+    
+    Returns:
+        dict: Maps resource names to their capacity.
+    """
+    capacities = {}
+    for pair in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, capacity = pair.partition('=')
+        capacities[name.strip()] = float(capacity)
+    return capacities
 
-# Set up logging with a specific format and debug level to capture detailed information
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+# Capacities of the resources tasks declare, from RESOURCES, shared by the jobs of every request.
+resource_pool = ResourcePool(parse_capacities(os.environ.get('RESOURCES', '')))
 
-def get_processor():
+# Seconds between two checks of config/job.json for changes, from CONFIG_POLL_INTERVAL.
+config_poll_interval = float(os.environ.get('CONFIG_POLL_INTERVAL', '1.0'))
+
+# Jobs submitted to POST /jobs running at once, from MAX_RUNNING_JOBS, and waiting to run, from MAX_QUEUED_JOBS.
+max_running_jobs = int(os.environ.get('MAX_RUNNING_JOBS', '4'))
+max_queued_jobs = int(os.environ.get('MAX_QUEUED_JOBS', '100'))
+
+# SQLite database recording the task executions, from TASK_HISTORY_PATH; defaults to '.cache/task_history.sqlite3'.
+task_history_path = os.environ.get('TASK_HISTORY_PATH')
+
+# Seconds without events after which an event stream sends a keep-alive comment, so proxies keep the connection open.
+event_stream_heartbeat = 15.0
+
+def create_processor():
     """
-    Dependency injection function that creates and returns an instance of JobProcessor.
-    This function is used by FastAPI's dependency injection system to provide an orchestrator instance.
+    Creates the JobProcessor of the application, with the job configuration validated and compiled.
     
     Returns:
         JobProcessor: An instance of JobProcessor configured with job and schema JSON files.
     """
-    return JobProcessor("config/job.json", "config/schema.json")
+    return JobProcessor("config/job.json", "config/schema.json", history=get_task_history(task_history_path),
+                        resources=resource_pool)
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Creates the one JobProcessor serving every request when the application starts, and watches the job file for
+    changes while it runs, swapping in the recompiled configuration. Starts the queue of submitted jobs, whose running
+    jobs are cancelled on shutdown.
+    """
+    app.state.processor = create_processor()
+    app.state.job_queue = JobQueue(app.state.processor, max_running_jobs, max_queued_jobs)
+    app.state.job_queue.start()
+    watcher = asyncio.create_task(app.state.processor.watch(config_poll_interval))
+    try:
+        yield
+    finally:
+        watcher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await watcher
+        await app.state.job_queue.stop()
+
+# Initialize the FastAPI application
+app = FastAPI(lifespan=lifespan)
+
+def get_processor(request: Request):
+    """
+    Dependency injection function that returns the JobProcessor of the application.
+    This function is used by FastAPI's dependency injection system to provide an orchestrator instance.
+    The processor is created once, in the lifespan, or on first use when the application runs without one.
+    
+    Returns:
+        JobProcessor: The JobProcessor holding the compiled job configuration.
+    """
+    state = request.app.state
+    if getattr(state, 'processor', None) is None:
+        state.processor = create_processor()
+    return state.processor
+
+def get_job_queue(request: Request, processor: JobProcessor = Depends(get_processor)):
+    """
+    Dependency injection function that returns the queue of submitted jobs of the application, started in the
+    lifespan, or on first use when the application runs without one.
+    
+    Returns:
+        JobQueue: The JobQueue running submitted jobs in the background.
+    """
+    state = request.app.state
+    if getattr(state, 'job_queue', None) is None:
+        state.job_queue = JobQueue(processor, max_running_jobs, max_queued_jobs)
+        state.job_queue.start()
+    return state.job_queue
 
 @app.post("/execute_job/{job_name}")
-async def execute_job(job_name: str, processor: JobProcessor = Depends(get_processor)):
+async def execute_job(job_name: str, use_cache: bool = False, checkpoint: bool = False, trace: bool = False,
+                      processor: JobProcessor = Depends(get_processor)):
     """
     FastAPI endpoint to execute a job by its name using the JobProcessor.
     This endpoint handles POST requests and uses dependency injection to get an processor instance.
     
     Args:
         job_name (str): The name of the job to execute.
+        use_cache (bool): Whether unchanged tasks reuse their cached results from an earlier run.
+        checkpoint (bool): Whether task completions are checkpointed so the run can be resumed if the worker dies.
+        trace (bool): Whether the response includes a Chrome trace of the task executions, for Perfetto.
         processor (JobProcessor): An instance of JobProcessor to handle the job execution.
         
     Returns:
-        dict: A dictionary with the status and message of the job execution.
+        dict: A dictionary with the status and message of the job execution, the run ID when checkpointing and the
+              Chrome trace-event JSON when tracing.
         
     Raises:
         HTTPException: An exception with appropriate status code and detail message when an error occurs.
     """
     try:
         # Attempt to execute the job using the processor
-        await processor.execute_job(job_name)
+        run_id = new_run_id() if checkpoint else None
+        if run_id:
+            logging.info('Starting run %s of job %s', run_id, job_name)
+        task_trace = TaskTrace() if trace else None
+        await processor.execute_job(job_name, use_cache, run_id, task_trace)
         # Return a success message if the job is executed successfully
-        return {"status": "success", "message": f"Job '{job_name}' executed successfully."}
+        response = {"status": "success", "message": f"Job '{job_name}' executed successfully."}
+        if run_id:
+            response["run_id"] = run_id
+        if task_trace is not None:
+            response["trace"] = task_trace.to_chrome_trace()
+        return response
     except ValueError as e:
         # Log and raise an HTTP 400 error if a ValueError occurs (e.g., job not found or validation fails)
         logging.error('ValueError: %s', e)
@@ -49,6 +153,152 @@ async def execute_job(job_name: str, processor: JobProcessor = Depends(get_proce
         logging.error('Unexpected error: %s', e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
+@app.post("/jobs/{job_name}", status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(job_name: str, use_cache: bool = False, checkpoint: bool = False, trace: bool = False,
+                     job_queue: JobQueue = Depends(get_job_queue)):
+    """
+    FastAPI endpoint queuing a job to run in the background and returning its ID at once, instead of holding the
+    connection open until the job has run. Its status and results are polled with `GET /jobs/{job_id}`.
+    
+    Args:
+        job_name (str): The name of the job to execute.
+        use_cache (bool): Whether unchanged tasks reuse their cached results from an earlier run.
+        checkpoint (bool): Whether task completions are checkpointed so the run can be resumed if the worker dies.
+        trace (bool): Whether the job's status includes a Chrome trace of the task executions once it finished.
+        job_queue (JobQueue): The queue running submitted jobs.
+        
+    Returns:
+        dict: The ID and status of the queued job, and its run ID when checkpointing.
+        
+    Raises:
+        HTTPException: 400 if the job does not exist or is invalid, 429 with a Retry-After header if the queue is
+                       full.
+    """
+    try:
+        return job_queue.submit(job_name, use_cache, checkpoint, trace).to_dict()
+    except ValueError as e:
+        logging.error('ValueError: %s', e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except QueueFullError as e:
+        logging.warning('Rejected job %s: %s', job_name, e)
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e),
+                            headers={"Retry-After": str(e.retry_after)})
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str, job_queue: JobQueue = Depends(get_job_queue)):
+    """
+    FastAPI endpoint reporting the status of a submitted job: queued, running, succeeded or failed, with the results
+    of its output tasks once it succeeded and its error once it failed.
+    
+    Args:
+        job_id (str): The ID returned when the job was submitted.
+        job_queue (JobQueue): The queue running submitted jobs.
+        
+    Returns:
+        dict: The status of the job.
+        
+    Raises:
+        HTTPException: 404 if no job has the ID, or it finished so long ago that it was evicted.
+    """
+    record = job_queue.get(job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found.")
+    return record.to_dict()
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str, last_event_id: int = 0,
+                     last_event_id_header: int = Header(None, alias="Last-Event-ID"),
+                     job_queue: JobQueue = Depends(get_job_queue)):
+    """
+    FastAPI endpoint streaming the progress of a submitted job as Server-Sent Events: `job-started`, `task-started`,
+    `task-finished`, `result-available` with the task's result, `task-failed`, and finally `job-finished`, after
+    which the stream ends. Every event carries an ID; a client reconnecting with the `Last-Event-ID` header, or the
+    `last_event_id` query parameter, receives only the events after it. A client too slow to keep up is not waited
+    for: it receives `events-lost` for the events dropped from the job's bounded log. Results are dropped from the
+    log a minute after the job finished, and remain available from `GET /jobs/{job_id}`.
+    
+    Args:
+        job_id (str): The ID returned when the job was submitted.
+        last_event_id (int): ID of the last event the client received, 0 to start from the first.
+        last_event_id_header (int, optional): The `Last-Event-ID` header sent by reconnecting EventSource clients,
+                                              taking precedence over `last_event_id`.
+        job_queue (JobQueue): The queue running submitted jobs.
+        
+    Returns:
+        StreamingResponse: The `text/event-stream` of the job's events.
+        
+    Raises:
+        HTTPException: 404 if no job has the ID, or it finished so long ago that it was evicted.
+    """
+    record = job_queue.get(job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found.")
+    after = last_event_id_header if last_event_id_header is not None else last_event_id
+    
+    async def stream():
+        async for event in record.events.subscribe(after, event_stream_heartbeat):
+            yield format_event(event)
+    
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.post("/resume/{run_id}")
+async def resume_run(run_id: str, use_cache: bool = False, trace: bool = False,
+                     processor: JobProcessor = Depends(get_processor)):
+    """
+    FastAPI endpoint continuing a checkpointed run that was interrupted, e.g. because the worker died mid-job. Only the
+    tasks that had not completed are executed.
+    
+    Args:
+        run_id (str): The ID of the interrupted run, as returned or logged when it started.
+        use_cache (bool): Whether unchanged tasks reuse their cached results from an earlier run.
+        trace (bool): Whether the response includes a Chrome trace of the executed tasks, for Perfetto.
+        processor (JobProcessor): An instance of JobProcessor to handle the job execution.
+        
+    Returns:
+        dict: A dictionary with the status and message of the resumed run, and the Chrome trace-event JSON when
+              tracing.
+        
+    Raises:
+        HTTPException: 404 if the run does not exist, 500 for any other error.
+    """
+    try:
+        task_trace = TaskTrace() if trace else None
+        await processor.resume(run_id, use_cache, task_trace)
+        response = {"status": "success", "message": f"Run '{run_id}' resumed and completed.", "run_id": run_id}
+        if task_trace is not None:
+            response["trace"] = task_trace.to_chrome_trace()
+        return response
+    except ValueError as e:
+        logging.error('ValueError: %s', e)
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logging.error('Unexpected error: %s', e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@app.get("/job_stats/{job_name}")
+async def job_stats(job_name: str, max_workers: int = None, processor: JobProcessor = Depends(get_processor)):
+    """
+    FastAPI endpoint reporting the recorded p50/p95/max task durations of a job and its estimated makespan when at
+    most `max_workers` tasks run at once.
+    
+    Args:
+        job_name (str): The name of the job.
+        max_workers (int, optional): Number of tasks running at once for the estimate. Defaults to all tasks.
+        processor (JobProcessor): An instance of JobProcessor providing the task history.
+        
+    Returns:
+        dict: The task statistics and the estimated makespan in seconds.
+        
+    Raises:
+        HTTPException: 404 if the job does not exist.
+    """
+    try:
+        # Off the event loop: reading the history waits for its writer and queries SQLite
+        return await asyncio.to_thread(processor.get_task_statistics, job_name, max_workers)
+    except ValueError as e:
+        logging.error('ValueError: %s', e)
+        raise HTTPException(status_code=404, detail=str(e))
+
 if __name__ == "__main__":
     # Run the FastAPI app with Uvicorn, listening on all interfaces on port 8000, with auto-reload enabled
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
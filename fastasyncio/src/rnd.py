@@ -1,5 +1,6 @@
-import networkx as nx
 import asyncio
+from array import array
+from joborchrestrator.dag import TaskDag
 
 # Example task graph with dependencies
 task_graph = {
@@ -10,36 +11,11 @@ task_graph = {
     "Task5": ["Task2"]
 }
 
-# Build the Directed Acyclic Graph (DAG)
-G = nx.DiGraph()
-for task, deps in task_graph.items():
-    G.add_node(task)
-    for dep in deps:
-        G.add_edge(dep, task)
+# Build the Directed Acyclic Graph (DAG), with its tasks interned to integer IDs
+G = TaskDag.from_tasks([{"name": task, "dependencies": deps} for task, deps in task_graph.items()])
 
-# Topologically sort the graph (to ensure correct order)
-sorted_tasks = list(nx.topological_sort(G))
-
-# Maintain a set of completed tasks
-completed_tasks = set()
-
-# Maintain a queue of tasks ready to be executed
-ready_queue = []
-
-# Lazy Dependency Resolution: Add tasks to ready_queue when their dependencies are satisfied
-def update_ready_tasks(G):
-    for task in sorted_tasks:
-        if task not in completed_tasks and task not in ready_queue:
-            # Only resolve dependencies at this point when task is ready to run
-            if all(dep in completed_tasks for dep in G.predecessors(task)):
-                ready_queue.append(task)
-
-# Function to prune the graph by removing completed tasks and dependencies
-def prune_graph(G, completed_tasks):
-    for task in completed_tasks:
-        if task in G.nodes:
-            # Remove the task from the graph
-            G.remove_node(task)
+# Number of unfinished dependencies per task
+remaining = array(G.indegrees.typecode, G.indegrees)
 
 # Simulate task execution
 async def execute_task(task):
@@ -47,32 +23,19 @@ async def execute_task(task):
     await asyncio.sleep(1)  # Simulate time taken to execute the task
     print(f"Completed {task}")
 
-# Run the tasks sequentially or in parallel based on the ready tasks
+# Run every task as soon as its last dependency has completed
 async def run_tasks(G):
-    global completed_tasks
-    
-    # Initial call to populate ready_queue with tasks that have no dependencies
-    update_ready_tasks(G)
-
-    # Continue until all tasks are completed
-    while len(completed_tasks) < len(sorted_tasks):
-        if ready_queue:
-            # Find tasks that can be run in parallel
-            tasks_to_run = ready_queue.copy()
-            ready_queue.clear()  # Clear the ready queue since we are about to execute these tasks
-            
-            print(f"Running in parallel: {tasks_to_run}")
-            await asyncio.gather(*[execute_task(task) for task in tasks_to_run])
-
-            # Mark tasks as completed and prune the graph
-            completed_tasks.update(tasks_to_run)
-            prune_graph(G, completed_tasks)
-
-            # After pruning, update the ready_queue with newly eligible tasks
-            update_ready_tasks(G)
-        else:
-            print("No tasks can be run at this stage, waiting for dependencies to resolve.")
-            await asyncio.sleep(0.1)  # Introduce a small delay to avoid tight loops
+    async def run(task_id):
+        await execute_task(G.names[task_id])
+        # Start the dependents whose last dependency this was
+        ready = []
+        for dependent in G.successors_of(task_id):
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                ready.append(dependent)
+        await asyncio.gather(*[run(dependent) for dependent in ready])
+
+    await asyncio.gather(*[run(task_id) for task_id in G.order if remaining[task_id] == 0])
 
 # Run the main task orchestration loop
 asyncio.run(run_tasks(G))
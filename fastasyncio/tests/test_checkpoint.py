@@ -0,0 +1,74 @@
+import pytest
+from unittest.mock import patch
+
+import os
+import sys
+
+
+# Append the project root directory to sys.path
+root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, root)  # Insert at the beginning to prioritize
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(1, project_root)  # Insert at the beginning to prioritize
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(2, base_src)  # Insert at the beginning to prioritize
+
+
+from src.joborchrestrator.checkpoint import RunLog
+from src.joborchrestrator.handler.generic_job_handler import GenericJobHandler
+from src.joborchrestrator.handler.generic_job_handler_dag import GenericJobHandler as DagJobHandler
+
+executed = []
+
+class RecordingTask:
+    async def execute(self, input_data=None):
+        executed.append(input_data)
+        return 'executed'
+
+@pytest.fixture
+def run_log(tmp_path):
+    run_log = RunLog.create('Job1', run_dir=tmp_path)
+    run_log.record({'name': 'Task1'}, 'checkpointed')
+    run_log.close()
+    run_log = RunLog.open(run_log.run_id, tmp_path)
+    yield run_log
+    run_log.close()
+
+def test_torn_record_is_cut_off(tmp_path):
+    run_log = RunLog.create('Job1', run_dir=tmp_path)
+    run_log.record({'name': 'Task1'}, 'first')
+    run_log.record({'name': 'Task2'}, 'second')
+    run_log.close()
+    with open(run_log.path, 'r+b') as file:
+        file.truncate(os.path.getsize(run_log.path) - 3)
+
+    reopened = RunLog.open(run_log.run_id, tmp_path)
+    reopened.close()
+    assert reopened.job_name == 'Job1'
+    assert list(reopened.completed) == ['Task1']
+
+@pytest.mark.asyncio
+async def test_dag_handler_restores_checkpointed_tasks(run_log, tmp_path):
+    executed.clear()
+    job = {'name': 'Job1', 'tasks': [{'name': 'Task1'}, {'name': 'Task2', 'dependencies': ['Task1']}]}
+    job_handler = DagJobHandler(job, run_log=run_log)
+    with patch.object(job_handler, 'load_task_class', return_value=RecordingTask):
+        await job_handler.run()
+    run_log.close()
+
+    assert executed == [{'Task1': 'checkpointed'}]
+    assert job_handler.restored_tasks == {'Task1'}
+    reopened = RunLog.open(run_log.run_id, tmp_path)
+    reopened.close()
+    assert set(reopened.completed) == {'Task1', 'Task2'}
+
+@pytest.mark.asyncio
+async def test_handler_restores_checkpointed_tasks(run_log):
+    executed.clear()
+    job_handler = GenericJobHandler([{'name': 'Task1'}, {'name': 'Task2'}],
+                                    [{'name': 'Task3', 'dependencies': ['Task1']}], run_log=run_log)
+    with patch.object(job_handler, 'load_task_class', return_value=RecordingTask):
+        await job_handler.run()
+
+    assert executed == [None, {'Task1': 'checkpointed'}]
+    assert job_handler.restored_tasks == {'Task1'}
@@ -0,0 +1,55 @@
+import pytest
+
+import os
+import sys
+
+
+# Append the project root directory to sys.path
+root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, root)  # Insert at the beginning to prioritize
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(1, project_root)  # Insert at the beginning to prioritize
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(2, base_src)  # Insert at the beginning to prioritize
+
+
+from src.joborchrestrator.dag import TaskDag
+
+
+def test_neighbours_indegrees_and_levels():
+    dag = TaskDag.from_tasks([{'name': 'Task3', 'dependencies': ['Task1', 'Task2']},
+                              {'name': 'Task1', 'dependencies': []},
+                              {'name': 'Task2', 'dependencies': ['Task1']},
+                              {'name': 'Task4', 'dependencies': ['Task2']}])
+
+    assert dag.predecessors('Task3') == ['Task1', 'Task2']
+    assert sorted(dag.successors('Task2')) == ['Task3', 'Task4']
+    assert dict(zip(dag.names, dag.indegrees)) == {'Task3': 2, 'Task1': 0, 'Task2': 1, 'Task4': 1}
+    assert dict(zip(dag.names, dag.levels)) == {'Task3': 2, 'Task1': 0, 'Task2': 1, 'Task4': 2}
+    position = {dag.names[task_id]: index for index, task_id in enumerate(dag.order)}
+    assert position['Task1'] < position['Task2'] < position['Task3']
+
+
+def test_unknown_and_repeated_dependencies():
+    dag = TaskDag.from_tasks([{'name': 'Task2', 'dependencies': ['Task1', 'External', 'Task1']},
+                              {'name': 'Task1'}])
+
+    assert dag.predecessors('Task2') == ['Task1', 'External']
+    assert dag.out_degree(dag.ids['Task1']) == 1
+    assert len(dag) == 3
+
+
+def test_cycles_are_rejected():
+    with pytest.raises(ValueError, match="cyclic dependencies"):
+        TaskDag.from_tasks([{'name': 'Task1', 'dependencies': ['Task3']},
+                            {'name': 'Task2', 'dependencies': ['Task1']},
+                            {'name': 'Task3', 'dependencies': ['Task2']}])
+
+
+def test_long_chain():
+    count = 100_000
+    dag = TaskDag.from_tasks([{'name': f'Task{index}', 'dependencies': [f'Task{index - 1}'] if index else []}
+                              for index in range(count)])
+
+    assert list(dag.order) == list(range(count))
+    assert dag.levels[count - 1] == count - 1
@@ -0,0 +1,110 @@
+import asyncio
+import json
+import pytest
+
+import os
+import sys
+
+
+# Append the project root directory to sys.path
+root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, root)  # Insert at the beginning to prioritize
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(1, project_root)  # Insert at the beginning to prioritize
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(2, base_src)  # Insert at the beginning to prioritize
+
+
+from src.joborchrestrator.events import JobEvents, format_event, execute_with_events
+
+
+async def collect(events, last_event_id=0):
+    return [(event.id, event.event) async for event in events.subscribe(last_event_id)]
+
+
+async def collect_data(events):
+    return [event.data async for event in events.subscribe()]
+
+
+@pytest.mark.asyncio
+async def test_subscribers_receive_events_as_they_are_published():
+    events = JobEvents()
+    events.publish('job-started', {})
+    subscriber = asyncio.create_task(collect(events))
+    await asyncio.sleep(0)
+    events.publish('task-started', {"task": "Task1"})
+    await asyncio.sleep(0.01)
+    events.publish('task-finished', {"task": "Task1"})
+    events.close()
+
+    assert await subscriber == [(1, 'job-started'), (2, 'task-started'), (3, 'task-finished')]
+
+
+@pytest.mark.asyncio
+async def test_subscribers_resume_after_the_last_event_id():
+    events = JobEvents()
+    for index in range(5):
+        events.publish('result-available', {"task": f"Task{index}"})
+    events.close()
+
+    assert [event_id for event_id, _ in await collect(events, 3)] == [4, 5]
+
+
+@pytest.mark.asyncio
+async def test_slow_subscribers_are_told_about_dropped_events():
+    events = JobEvents(max_events=3)
+    for index in range(10):
+        events.publish('result-available', {"task": f"Task{index}"})
+    events.close()
+
+    received = [event async for event in events.subscribe(2)]
+    assert (received[0].event, received[0].data) == ('events-lost', {"count": 5})
+    assert [event.id for event in received[1:]] == [8, 9, 10]
+
+
+@pytest.mark.asyncio
+async def test_task_outcomes_are_published():
+    events = JobEvents()
+
+    async def succeed():
+        return {"Task1": 1}, "digest", False
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    await execute_with_events(events, "Task1", succeed)
+    with pytest.raises(RuntimeError):
+        await execute_with_events(events, "Task2", fail)
+    events.close()
+
+    received = [event async for event in events.subscribe()]
+    assert [event.event for event in received] == ['task-started', 'task-finished', 'result-available',
+                                                   'task-started', 'task-failed']
+    assert received[2].data == {"task": "Task1", "result": {"Task1": 1}}
+    message = format_event(received[2])
+    assert message.startswith("id: 3\nevent: result-available\ndata: ")
+    assert json.loads(message.split("data: ", 1)[1]) == received[2].data
+
+
+@pytest.mark.asyncio
+async def test_log_is_bounded_by_bytes():
+    events = JobEvents(max_bytes=100)
+    for index in range(10):
+        events.publish('result-available', {"task": f"Task{index}", "result": "x" * 40})
+    events.close()
+
+    received = [event async for event in events.subscribe()]
+    assert received[0].event == 'events-lost'
+    assert [event.data["task"] for event in received[1:]] == ['Task9']
+
+
+@pytest.mark.asyncio
+async def test_results_are_released_after_the_grace_period():
+    events = JobEvents(result_grace=0.01)
+    events.publish('result-available', {"task": "Task1", "result": [1, 2, 3]})
+    events.publish('job-finished', {"status": "succeeded"})
+    events.close()
+    assert (await collect_data(events))[0] == {"task": "Task1", "result": [1, 2, 3]}
+
+    await asyncio.sleep(0.05)
+    assert await collect_data(events) == [{"task": "Task1", "released": True}, {"status": "succeeded"}]
@@ -71,3 +71,22 @@ async def test_run(job_handler):
         await job_handler.run()
         mock_run_parallel.assert_awaited_once()
         mock_run_sequential.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_results_are_released_after_last_consumer():
+    parallel_tasks = [{'name': 'Task1'}, {'name': 'Task2', 'output': True}]
+    sequential_tasks = [{'name': 'Task3', 'dependencies': ['Task1', 'Task2']},
+                        {'name': 'Task4', 'dependencies': ['Task3']}]
+    job_handler = GenericJobHandler(parallel_tasks, sequential_tasks)
+    inputs = []
+
+    class RecordingTask:
+        async def execute(self, input_data=None):
+            inputs.append(input_data)
+            return 'result'
+
+    with patch.object(job_handler, 'load_task_class', return_value=RecordingTask):
+        await job_handler.run()
+
+    assert inputs[-1] == {'Task3': 'result'}
+    assert set(job_handler.task_results) == {'Task2', 'Task4'}
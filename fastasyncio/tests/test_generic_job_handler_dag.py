@@ -0,0 +1,123 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+
+import os
+import sys
+
+
+# Append the project root directory to sys.path
+root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, root)  # Insert at the beginning to prioritize
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(1, project_root)  # Insert at the beginning to prioritize
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(2, base_src)  # Insert at the beginning to prioritize
+
+
+from src.joborchrestrator.handler.generic_job_handler_dag import GenericJobHandler
+from src.joborchrestrator.events import JobEvents
+
+@pytest.mark.asyncio
+async def test_results_are_released_after_last_consumer():
+    job = {'name': 'Job1', 'tasks': [{'name': 'Task1'},
+                                     {'name': 'Task2', 'dependencies': ['Task1']},
+                                     {'name': 'Task3', 'dependencies': ['Task1'], 'output': True},
+                                     {'name': 'Task4', 'dependencies': ['Task2', 'Task3']}]}
+    job_handler = GenericJobHandler(job)
+
+    class RecordingTask:
+        async def execute(self, input_data=None):
+            return 'result'
+
+    with patch.object(job_handler, 'load_task_class', return_value=RecordingTask):
+        await job_handler.run()
+
+    assert job_handler.completed_tasks == {'Task1', 'Task2', 'Task3', 'Task4'}
+    assert set(job_handler.task_results) == {'Task3', 'Task4'}
+
+@pytest.mark.asyncio
+async def test_resource_capacity_of_job_bounds_concurrency():
+    job = {'name': 'Job1', 'resources': {'db': 2},
+           'tasks': [{'name': f'Task{index}', 'resources': {'db': 1}} for index in range(6)]}
+    job_handler = GenericJobHandler(job)
+    running = []
+    peak = []
+
+    class DatabaseTask:
+        async def execute(self, input_data=None):
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+
+    with patch.object(job_handler, 'load_task_class', return_value=DatabaseTask):
+        await job_handler.run()
+
+    assert len(job_handler.completed_tasks) == 6
+    assert max(peak) == 2
+
+@pytest.mark.asyncio
+async def test_task_progress_is_published():
+    job = {'name': 'Job1', 'tasks': [{'name': 'Task1'}, {'name': 'Task2', 'dependencies': ['Task1']}]}
+    events = JobEvents()
+    job_handler = GenericJobHandler(job, events=events)
+
+    class RecordingTask:
+        async def execute(self, input_data=None):
+            return 'result'
+
+    with patch.object(job_handler, 'load_task_class', return_value=RecordingTask):
+        await job_handler.run()
+    events.close()
+
+    received = [(event.event, event.data["task"]) async for event in events.subscribe()]
+    assert received == [('task-started', 'Task1'), ('task-finished', 'Task1'), ('result-available', 'Task1'),
+                        ('task-started', 'Task2'), ('task-finished', 'Task2'), ('result-available', 'Task2')]
+
+@pytest.mark.asyncio
+async def test_dependents_start_as_soon_as_their_dependencies_complete():
+    job = {'name': 'Job1', 'tasks': [{'name': 'Fast'}, {'name': 'Slow'},
+                                     {'name': 'AfterFast', 'dependencies': ['Fast']}]}
+    job_handler = GenericJobHandler(job)
+    finished = []
+    durations = {'Fast': 0.01, 'Slow': 0.2, 'AfterFast': 0.01}
+
+    def load_task_class(task_name):
+        class SleepingTask:
+            async def execute(self, input_data=None):
+                await asyncio.sleep(durations[task_name])
+                finished.append(task_name)
+        return SleepingTask
+
+    with patch.object(job_handler, 'load_task_class', side_effect=load_task_class):
+        await job_handler.run()
+
+    # AfterFast does not wait for Slow, which it does not depend on
+    assert finished == ['Fast', 'AfterFast', 'Slow']
+
+@pytest.mark.asyncio
+async def test_failing_task_cancels_running_tasks():
+    job = {'name': 'Job1', 'tasks': [{'name': 'Broken'}, {'name': 'Slow'},
+                                     {'name': 'AfterSlow', 'dependencies': ['Slow']}]}
+    job_handler = GenericJobHandler(job)
+    cancelled = []
+
+    def load_task_class(task_name):
+        class Task:
+            async def execute(self, input_data=None):
+                if task_name == 'Broken':
+                    raise RuntimeError("task failed")
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    cancelled.append(task_name)
+                    raise
+        return Task
+
+    with patch.object(job_handler, 'load_task_class', side_effect=load_task_class):
+        with pytest.raises(RuntimeError):
+            await job_handler.run()
+
+    assert cancelled == ['Slow']
+    assert 'AfterSlow' not in job_handler.completed_tasks
@@ -0,0 +1,92 @@
+import asyncio
+import pytest
+
+import os
+import sys
+
+
+# Append the project root directory to sys.path
+root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, root)  # Insert at the beginning to prioritize
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(1, project_root)  # Insert at the beginning to prioritize
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(2, base_src)  # Insert at the beginning to prioritize
+
+
+from src.joborchrestrator.history import TaskHistory, execute_timed, simulate_makespan
+
+@pytest.fixture
+def history(tmp_path):
+    history = TaskHistory(tmp_path / 'history.sqlite3')
+    yield history
+    history.close()
+
+def test_task_statistics(history):
+    for wall_time in range(1, 101):
+        history.record('Task1', float(wall_time), cpu_time=0.5, queue_wait=0.25, job_name='Job1')
+    history.record('Task1', 0.1, outcome='failure', job_name='Job1')
+
+    stats = history.task_statistics(['Task1'])['Task1']
+    assert (stats.count, stats.failures) == (101, 1)
+    assert (stats.p50, stats.p95, stats.max) == (50.0, 95.0, 100.0)
+    assert (stats.cpu_time, stats.queue_wait) == (0.5, 0.25)
+
+def test_old_executions_are_pruned(tmp_path):
+    history = TaskHistory(tmp_path / 'retained.sqlite3', retention=3)
+    for wall_time in [10.0, 10.0, 1.0, 2.0, 3.0]:
+        history.record('Task1', wall_time)
+    history.record('Task2', 4.0)
+
+    statistics = history.task_statistics()
+    history.close()
+    assert (statistics['Task1'].count, statistics['Task1'].max) == (3, 3.0)
+    assert statistics['Task2'].count == 1
+
+def test_statistics_of_many_tasks(history):
+    # More names than one query binds
+    names = [f'Task{i}' for i in range(1200)]
+    for name in names:
+        history.record(name, 1.0)
+    assert set(history.task_statistics(names)) == set(names)
+
+def test_estimate_makespan(history):
+    history.record('Task1', 2.0)
+    history.record('Task2', 3.0)
+    tasks = [{'name': 'Task1'}, {'name': 'Task2'}, {'name': 'Task3', 'dependencies': ['Task1']}]
+
+    # Task3 has no history and counts as one second
+    assert history.estimate_makespan(tasks, max_workers=1) == 6.0
+    assert history.estimate_makespan(tasks, max_workers=2) == 3.0
+
+def test_simulate_makespan_rejects_cycles():
+    tasks = [{'name': 'Task1', 'dependencies': ['Task2']}, {'name': 'Task2', 'dependencies': ['Task1']}]
+    with pytest.raises(ValueError):
+        simulate_makespan(tasks, {'Task1': 1.0, 'Task2': 1.0}, max_workers=1)
+
+@pytest.mark.asyncio
+async def test_execute_timed_excludes_other_coroutines(history):
+    async def task():
+        await asyncio.sleep(0.05)
+        return 'done'
+
+    async def busy():
+        end = asyncio.get_running_loop().time() + 0.03
+        while asyncio.get_running_loop().time() < end:
+            pass
+
+    result, _ = await asyncio.gather(execute_timed(history, 'Task1', task(), 'Job1'), busy())
+    assert result == 'done'
+
+    stats = history.task_statistics()['Task1']
+    assert stats.p50 >= 0.05
+    assert stats.cpu_time < 0.02
+
+@pytest.mark.asyncio
+async def test_execute_timed_records_failures(history):
+    async def task():
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        await execute_timed(history, 'Task1', task())
+    assert history.task_statistics()['Task1'].failures == 1
@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+
+import os
+import sys
+
+
+# Append the project root directory to sys.path
+root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, root)  # Insert at the beginning to prioritize
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(1, project_root)  # Insert at the beginning to prioritize
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(2, base_src)  # Insert at the beginning to prioritize
+
+
+from src.joborchrestrator.job_queue import JobQueue, QueueFullError
+
+
+class StubProcessor:
+    """Processor whose jobs wait for `release` and return their name, or fail if named 'Broken'."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.running = 0
+        self.peak = 0
+
+    def get_compiled_job(self, job_name):
+        if job_name == 'Missing':
+            raise ValueError(f"Job '{job_name}' not found.")
+
+    async def execute_job(self, job_name, use_cache=False, run_id=None, trace=None, events=None):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await self.release.wait()
+            if job_name == 'Broken':
+                raise RuntimeError("task failed")
+            return {"job": job_name}
+        finally:
+            self.running -= 1
+
+
+async def wait_until_finished(job_queue, records):
+    for _ in range(200):
+        if all(record.finished for record in records):
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("jobs did not finish")
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_in_the_background_up_to_the_cap():
+    processor = StubProcessor()
+    job_queue = JobQueue(processor, max_running=2, max_queued=10)
+    job_queue.start()
+    try:
+        records = [job_queue.submit(f"Job{index}") for index in range(5)] + [job_queue.submit("Broken")]
+        await asyncio.sleep(0.05)
+        assert processor.running == 2
+        assert [record.status for record in records].count('running') == 2
+        processor.release.set()
+        await wait_until_finished(job_queue, records)
+    finally:
+        await job_queue.stop()
+
+    assert processor.peak == 2
+    assert job_queue.get(records[0].job_id).to_dict()["result"] == {"job": "Job0"}
+    assert job_queue.get(records[-1].job_id).to_dict()["status"] == 'failed'
+    assert job_queue.get(records[-1].job_id).error == "task failed"
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_submissions():
+    processor = StubProcessor()
+    job_queue = JobQueue(processor, max_running=1, max_queued=2)
+    job_queue.start()
+    try:
+        job_queue.submit("Job1")
+        await asyncio.sleep(0.01)  # The first job leaves the queue and runs
+        job_queue.submit("Job2")
+        job_queue.submit("Job3")
+        with pytest.raises(QueueFullError) as excinfo:
+            job_queue.submit("Job4")
+        assert excinfo.value.retry_after >= 1
+        with pytest.raises(ValueError):
+            job_queue.submit("Missing")
+    finally:
+        await job_queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_finished_jobs_are_evicted():
+    processor = StubProcessor()
+    processor.release.set()
+    job_queue = JobQueue(processor, max_running=1, max_queued=10, max_finished=2)
+    job_queue.start()
+    try:
+        records = [job_queue.submit(f"Job{index}") for index in range(4)]
+        await wait_until_finished(job_queue, records)
+    finally:
+        await job_queue.stop()
+
+    assert [job_queue.get(record.job_id) is not None for record in records] == [False, False, True, True]
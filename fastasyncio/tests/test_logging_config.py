@@ -0,0 +1,51 @@
+import asyncio
+import logging
+import pytest
+
+import os
+import sys
+
+
+# Append the project root directory to sys.path
+root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, root)  # Insert at the beginning to prioritize
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(1, project_root)  # Insert at the beginning to prioritize
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(2, base_src)  # Insert at the beginning to prioritize
+
+
+from src.joborchrestrator.logging_config import ContextFilter, SampleFilter, log_context
+
+
+def make_record(level=logging.INFO):
+    return logging.LogRecord("test", level, __file__, 1, "message", (), None)
+
+
+def test_log_context_per_coroutine():
+    """Gathered coroutines inherit the job context and keep their own task context."""
+    context_filter = ContextFilter()
+
+    async def task(task_name):
+        with log_context(task_name=task_name):
+            await asyncio.sleep(0.01)
+            record = make_record()
+            context_filter.filter(record)
+            return record.context
+
+    async def job():
+        with log_context(job_name="Job1"):
+            return await asyncio.gather(task("Task1"), task("Task2"))
+
+    assert asyncio.run(job()) == ["[Job1 Task1] ", "[Job1 Task2] "]
+    record = make_record()
+    context_filter.filter(record)
+    assert record.context == ""
+
+
+@pytest.mark.parametrize("rate, expected", [(1.0, 100), (0.1, 10), (0.0, 0)])
+def test_sample_filter(rate, expected):
+    """Only the sampled fraction of lines below WARNING passes, and every warning passes."""
+    sample_filter = SampleFilter(rate)
+    assert sum(sample_filter.filter(make_record()) for _ in range(100)) == expected
+    assert all(sample_filter.filter(make_record(logging.ERROR)) for _ in range(10))
@@ -1,8 +1,11 @@
 import pytest
 from httpx import AsyncClient
 from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
 from unittest.mock import AsyncMock, patch
 import os
+import threading
+import time
 import sys
 
 # Append the project root directory to sys.path
@@ -17,10 +20,21 @@ sys.path.insert(2, base_src)  # Insert at the beginning to prioritize
 
 # Assuming the FastAPI app and JobOrchestrator are imported from their respective modules
 from src.main import app
+import src.main as main_module
+from src.joborchrestrator.history import get_task_history
 from fastasyncio.src.joborchrestrator.job_processor import JobProcessor
 
 
 
+@pytest.fixture(autouse=True)
+def task_history_path(tmp_path, monkeypatch):
+    # Record the executions of the application's processor in a throwaway history instead of the shared one
+    path = tmp_path / 'history.sqlite3'
+    monkeypatch.setattr(main_module, 'task_history_path', path)
+    yield path
+    get_task_history(path).close()
+
+
 @pytest.mark.asyncio
 async def test_execute_job_success():
     # Mock JobOrchestrator to simulate successful job execution
@@ -57,4 +71,51 @@ async def test_execute_job_unexpected_error():
             response = await ac.post("/execute_job/test_job")
             assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
             assert response.json() == {"detail": "Internal Server Error"}
-            
\ No newline at end of file
+            
+def test_processor_lives_as_long_as_the_application():
+    # The lifespan creates one processor with the compiled configuration, shared by every request
+    with TestClient(app) as client, patch.object(type(app.state.processor), 'compile_config') as compile_config:
+        processor = app.state.processor
+        assert client.get("/job_stats/Job1").status_code == status.HTTP_200_OK
+        assert client.get("/job_stats/Job1").status_code == status.HTTP_200_OK
+        assert app.state.processor is processor
+        compile_config.assert_not_called()
+
+def test_job_stats_are_read_off_the_event_loop():
+    # Reading the history blocks on its writer and SQLite, which must not stall the running jobs
+    threads = []
+    with TestClient(app) as client, \
+         patch.object(app.state.processor, 'get_task_statistics',
+                      lambda *args: threads.append(threading.current_thread()) or {}):
+        loop_thread = client.portal.call(threading.current_thread)
+        assert client.get("/job_stats/Job1").status_code == status.HTTP_200_OK
+    assert threads and threads[0] is not loop_thread
+
+def test_submitted_job_is_polled_until_it_finished():
+    with TestClient(app) as client, \
+         patch.object(app.state.processor, 'execute_job', AsyncMock(return_value={"Task3": {"Task3": "done"}})):
+        response = client.post("/jobs/Job1")
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job_id = response.json()["job_id"]
+        for _ in range(100):
+            state = client.get(f"/jobs/{job_id}").json()
+            if state["status"] == "succeeded":
+                break
+            time.sleep(0.01)
+        assert state["result"] == {"Task3": {"Task3": "done"}}
+        assert client.get("/jobs/unknown").status_code == status.HTTP_404_NOT_FOUND
+        assert client.post("/jobs/Missing").status_code == status.HTTP_400_BAD_REQUEST
+
+def test_submitted_job_progress_is_streamed():
+    async def execute_job(job_name, use_cache=False, run_id=None, trace=None, events=None):
+        events.publish('result-available', {"task": "Task1", "result": 1})
+        return {"Task1": 1}
+
+    with TestClient(app) as client, patch.object(app.state.processor, 'execute_job', execute_job):
+        job_id = client.post("/jobs/Job1").json()["job_id"]
+        with client.stream("GET", f"/jobs/{job_id}/events") as response:
+            assert response.headers["content-type"].startswith("text/event-stream")
+            body = "".join(response.iter_text())
+        assert "event: result-available" in body and body.rstrip().endswith('"error": null}')
+        resumed = client.get(f"/jobs/{job_id}/events", headers={"Last-Event-ID": "2"}).text
+        assert resumed.startswith("id: 3\nevent: job-finished")
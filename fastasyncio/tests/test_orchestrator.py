@@ -1,3 +1,5 @@
+import asyncio
+import json
 import pytest
 from unittest.mock import patch, MagicMock
 from jsonschema import ValidationError
@@ -16,14 +18,22 @@ sys.path.insert(2, base_src)  # Insert at the beginning to prioritize
 
 from fastasyncio.src.joborchrestrator.job_processor import JobProcessor
 from src.joborchrestrator.utils import load_json, detect_cycles
+from src.joborchrestrator.history import TaskHistory
 
 
 @pytest.fixture
-def orchestrator():
+def history(tmp_path):
+    # Record task executions in a throwaway history instead of the shared one
+    history = TaskHistory(tmp_path / 'history.sqlite3')
+    yield history
+    history.close()
+
+@pytest.fixture
+def orchestrator(history):
     # "config/job.json", "config/schema.json"
     job_file = 'config/job.json'
     schema_file = 'config/schema.json'
-    return JobProcessor(job_file, schema_file)
+    return JobProcessor(job_file, schema_file, history=history)
 
 def test_validate_job_file(orchestrator):
     with patch('joborchrestrator.utils.load_json', side_effect=[{"jobs": []}, {}]), \
@@ -67,3 +77,69 @@ async def test_execute_job(orchestrator):
         await orchestrator.execute_job('test_job')
        #mock_execute_tasks.assert_called_once()
 
+
+def write_job_file(path, jobs):
+    path.write_text(json.dumps({"jobs": jobs}))
+    # Bump the modification time explicitly, so that rewrites within one clock tick are still noticed
+    version = os.stat(path).st_mtime_ns + 1_000_000
+    os.utime(path, ns=(version, version))
+
+def dag_job(name, tasks):
+    return {"name": name, "handler": "handler.generic_job_handler_dag.GenericJobHandler", "tasks": tasks}
+
+def test_config_is_compiled_once(tmp_path, history):
+    job_file = tmp_path / "job.json"
+    write_job_file(job_file, [dag_job("Job1", [{"name": "Task1", "dependencies": []}]),
+                              dag_job("Cyclic", [{"name": "Task1", "dependencies": ["Task1"]}])])
+    processor = JobProcessor(str(job_file), 'config/schema.json', history=history)
+
+    with patch.object(processor, 'validate_job_file') as validate_job_file, \
+         patch.object(processor, 'validate_job') as validate_job:
+        compiled = processor.get_compiled_job("Job1")
+        validate_job_file.assert_not_called()
+        validate_job.assert_not_called()
+    assert compiled.handler_class.__name__ == "GenericJobHandler"
+    assert compiled.dag.names == ["Task1"]  # Built once, with the job
+    with pytest.raises(ValueError, match="cyclic dependencies"):
+        processor.get_compiled_job("Cyclic")
+    with pytest.raises(ValueError, match="not found"):
+        processor.get_compiled_job("Missing")
+
+def test_changed_config_is_swapped_in(tmp_path, history):
+    job_file = tmp_path / "job.json"
+    write_job_file(job_file, [dag_job("Job1", [{"name": "Task1", "dependencies": []}])])
+    processor = JobProcessor(str(job_file), 'config/schema.json', history=history)
+    assert not processor.reload_if_changed()
+
+    write_job_file(job_file, [dag_job("Job2", [{"name": "Task2", "dependencies": []}])])
+    old_config = processor.config
+    assert processor.reload_if_changed()
+    assert processor.get_compiled_job("Job2").job["tasks"][0]["name"] == "Task2"
+    assert "Job1" in old_config.jobs  # Jobs that started before the reload keep the configuration they started with
+
+def test_invalid_config_change_is_ignored(tmp_path, history):
+    job_file = tmp_path / "job.json"
+    write_job_file(job_file, [dag_job("Job1", [{"name": "Task1", "dependencies": []}])])
+    processor = JobProcessor(str(job_file), 'config/schema.json', history=history)
+
+    write_job_file(job_file, [{"name": "Job1", "tasks": []}])
+    assert not processor.reload_if_changed()
+    job_file.write_text('{"jobs": [')
+    assert not processor.reload_if_changed()
+    assert processor.get_compiled_job("Job1").job["tasks"][0]["name"] == "Task1"
+
+@pytest.mark.asyncio
+async def test_watch_reloads_the_config(tmp_path, history):
+    job_file = tmp_path / "job.json"
+    write_job_file(job_file, [dag_job("Job1", [{"name": "Task1", "dependencies": []}])])
+    processor = JobProcessor(str(job_file), 'config/schema.json', history=history)
+    watcher = asyncio.create_task(processor.watch(0.01))
+    try:
+        write_job_file(job_file, [dag_job("Job2", [{"name": "Task2", "dependencies": []}])])
+        for _ in range(200):
+            if "Job2" in processor.config.jobs:
+                break
+            await asyncio.sleep(0.01)
+        assert "Job2" in processor.config.jobs
+    finally:
+        watcher.cancel()
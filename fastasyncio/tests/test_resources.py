@@ -0,0 +1,105 @@
+import asyncio
+import pytest
+
+import os
+import sys
+
+
+# Append the project root directory to sys.path
+root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, root)  # Insert at the beginning to prioritize
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(1, project_root)  # Insert at the beginning to prioritize
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(2, base_src)  # Insert at the beginning to prioritize
+
+
+from src.joborchrestrator.resources import ResourcePool, execute_with_resources
+
+
+async def run_bounded(resources, requirements, count):
+    """Runs `count` tasks with the same requirements and returns the peak number running at once."""
+    running = []
+    peak = []
+
+    async def task():
+        running.append(1)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.pop()
+
+    await asyncio.gather(*[execute_with_resources(resources, requirements, task) for _ in range(count)])
+    return max(peak)
+
+
+def test_concurrency_is_bounded_by_capacity():
+    """No more tasks holding a resource run at once than its capacity, and all of them complete."""
+    resources = ResourcePool({"db": 3})
+    assert asyncio.run(run_bounded(resources, {"db": 1}, 12)) == 3
+    assert resources.in_use() == {"db": 0}
+
+
+def test_parent_capacity_applies_to_children():
+    """Two jobs' pools under one shared pool are bounded by the shared capacity together."""
+    shared = ResourcePool({"db": 2})
+
+    async def jobs():
+        return await asyncio.gather(run_bounded(ResourcePool({"db": 2}, parent=shared), {"db": 1}, 6),
+                                    run_bounded(ResourcePool(parent=shared), {"db": 1}, 6))
+
+    assert sum(asyncio.run(jobs())) <= 4
+    assert shared.in_use() == {"db": 0}
+
+
+def test_smaller_task_starts_ahead_of_larger_waiting_task():
+    """A waiting task that does not fit yet does not hold back a later one that does."""
+    resources = ResourcePool({"mem_gb": 16})
+    started = []
+
+    async def task(name, mem_gb, hold):
+        await resources.acquire({"mem_gb": mem_gb})
+        started.append(name)
+        await hold.wait()
+        resources.release({"mem_gb": mem_gb})
+
+    async def scenario():
+        hold_first, hold_rest = asyncio.Event(), asyncio.Event()
+        first = asyncio.create_task(task("first", 10, hold_first))
+        await asyncio.sleep(0)
+        large = asyncio.create_task(task("large", 12, hold_rest))
+        small = asyncio.create_task(task("small", 4, hold_rest))
+        await asyncio.sleep(0.01)
+        assert started == ["first", "small"]
+        hold_first.set()
+        await first
+        await asyncio.sleep(0)
+        hold_rest.set()
+        await asyncio.gather(large, small)
+
+    asyncio.run(scenario())
+    assert started == ["first", "small", "large"]
+
+
+def test_cancelled_waiter_is_removed():
+    """A task cancelled while waiting neither takes resources nor blocks the ones behind it."""
+    resources = ResourcePool({"db": 1})
+
+    async def scenario():
+        await resources.acquire({"db": 1})
+        waiter = asyncio.create_task(resources.acquire({"db": 1}))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        resources.release({"db": 1})
+        await asyncio.wait_for(resources.acquire({"db": 1}), 1)
+
+    asyncio.run(scenario())
+    assert resources.in_use() == {"db": 1}
+
+
+def test_requirement_above_capacity_fails():
+    """A task requiring more than a capacity fails instead of waiting forever."""
+    resources = ResourcePool({"mem_gb": 16})
+    with pytest.raises(ValueError):
+        asyncio.run(resources.acquire({"mem_gb": 32}))
@@ -0,0 +1,81 @@
+import pytest
+from unittest.mock import patch
+
+import os
+import sys
+
+
+# Append the project root directory to sys.path
+root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, root)  # Insert at the beginning to prioritize
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(1, project_root)  # Insert at the beginning to prioritize
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(2, base_src)  # Insert at the beginning to prioritize
+
+
+from src.joborchrestrator.result_cache import ResultCache
+from src.joborchrestrator.handler.generic_job_handler_dag import GenericJobHandler
+
+executed = []
+
+class SourceTask:
+    output = 'source'
+
+    async def execute(self, input_data=None):
+        executed.append('Task1')
+        return SourceTask.output
+
+class TransformTask:
+    async def execute(self, input_data=None):
+        executed.append('Task2')
+        return sorted(input_data.values())
+
+TASK_CLASSES = {'Task1': SourceTask, 'Task2': TransformTask}
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(tmp_path)
+
+def test_put_and_get(cache):
+    digest = cache.put('key', {'rows': [1, 2, 3]})
+    assert cache.get('key') == ({'rows': [1, 2, 3]}, digest)
+    assert cache.get('missing') is None
+
+def test_least_recently_used_results_are_evicted(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=2500)
+    cache.put('first', b'x' * 1000)
+    cache.put('second', b'x' * 1000)
+    cache.get('first')
+    cache.put('third', b'x' * 1000)
+    assert 'first' in cache and 'second' not in cache and 'third' in cache
+
+@pytest.mark.asyncio
+async def test_unchanged_tasks_reuse_cached_results(cache):
+    async def run(source_task):
+        executed.clear()
+        job_handler = GenericJobHandler({'name': 'Job1', 'tasks': [
+            source_task, {'name': 'Task2', 'dependencies': ['Task1']}]}, result_cache=cache)
+        with patch.object(job_handler, 'load_task_class', side_effect=TASK_CLASSES.get):
+            await job_handler.run()
+        return job_handler
+
+    await run({'name': 'Task1'})
+    assert executed == ['Task1', 'Task2']
+
+    job_handler = await run({'name': 'Task1'})
+    assert executed == []
+    assert job_handler.cached_tasks == {'Task1', 'Task2'}
+    assert job_handler.task_results == {'Task2': ['source']}
+
+    # An edited configuration with the same result leaves the dependent cached
+    await run({'name': 'Task1', 'retries': 1})
+    assert executed == ['Task1']
+
+    SourceTask.output = 'changed'
+    try:
+        job_handler = await run({'name': 'Task1', 'retries': 2})
+    finally:
+        SourceTask.output = 'source'
+    assert executed == ['Task1', 'Task2']
+    assert job_handler.task_results == {'Task2': ['changed']}
@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+
+import os
+import sys
+
+
+# Append the project root directory to sys.path
+root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, root)  # Insert at the beginning to prioritize
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(1, project_root)  # Insert at the beginning to prioritize
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(2, base_src)  # Insert at the beginning to prioritize
+
+
+from src.joborchrestrator.handler.generic_job_handler import GenericJobHandler as PhasedJobHandler
+from src.joborchrestrator.handler.generic_job_handler_dag import GenericJobHandler
+from src.joborchrestrator.tracing import TaskTrace
+
+
+class SleepingTask:
+    async def execute(self, input_data=None):
+        await asyncio.sleep(0.01)
+        return 'result'
+
+
+@pytest.mark.asyncio
+async def test_dag_handler_records_a_span_per_task():
+    job = {'name': 'Job1', 'tasks': [{'name': 'Task1'},
+                                     {'name': 'Task2'},
+                                     {'name': 'Task3', 'dependencies': ['Task1', 'Task2']}]}
+    trace = TaskTrace()
+    job_handler = GenericJobHandler(job, trace=trace)
+
+    with patch.object(job_handler, 'load_task_class', return_value=SleepingTask):
+        await job_handler.run()
+
+    spans = {span.task_name: span for span in trace.spans}
+    assert set(spans) == {'Task1', 'Task2', 'Task3'}
+    assert spans['Task3'].dependencies == ('Task1', 'Task2')
+    assert spans['Task3'].job_name == 'Job1'
+    assert spans['Task1'].worker != spans['Task2'].worker
+    assert all(span.outcome == 'success' and span.queued_at <= span.started_at for span in spans.values())
+    assert spans['Task3'].started_at >= max(spans['Task1'].finished_at, spans['Task2'].finished_at)
+
+    events = trace.to_chrome_trace()['traceEvents']
+    assert len([event for event in events if event['ph'] == 'X']) == 3
+    assert len([event for event in events if event['ph'] == 'f']) == 2
+
+
+@pytest.mark.asyncio
+async def test_sequential_phase_shows_as_queue_wait():
+    parallel_tasks = [{'name': 'Task1'}]
+    sequential_tasks = [{'name': 'Task2', 'dependencies': ['Task1']},
+                        {'name': 'Task3', 'dependencies': ['Task1']}]
+    trace = TaskTrace()
+    job_handler = PhasedJobHandler(parallel_tasks, sequential_tasks, trace=trace)
+
+    with patch.object(job_handler, 'load_task_class', return_value=SleepingTask):
+        await job_handler.run()
+
+    spans = {span.task_name: span for span in trace.spans}
+    # Task3 was ready when Task1 finished but waited for Task2, on the same coroutine.
+    assert spans['Task3'].queued_at == pytest.approx(spans['Task1'].finished_at, abs=0.005)
+    assert spans['Task3'].started_at >= spans['Task2'].finished_at
+    assert spans['Task2'].worker == spans['Task3'].worker
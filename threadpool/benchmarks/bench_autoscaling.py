@@ -0,0 +1,107 @@
+import logging
+import os
+import random
+import sys
+import time
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from job_orchestrator.handlers.generic_job_handler import GenericJobHandler
+from job_orchestrator.task_durations import task_durations
+from job_orchestrator.task_registry import task_registry
+
+"""
+Makespan benchmark of the AdaptiveWorkerPool used by job_orchestrator.handlers.generic_job_handler with
+`autoscale=True`, against private pools of fixed sizes.
+
+Runs three layered DAGs: one of sleeping tasks, standing in for I/O-bound work, one of CPU-spinning tasks, which
+the GIL serializes, and one mixing both. Every DAG is run on fixed pools of 1 to 64 threads and on the adaptive pool
+with a ceiling of `max_workers`. I/O-bound DAGs want as many threads as tasks are ready, while CPU-bound DAGs gain
+nothing from more than one, so no single fixed size is best for all three; the adaptive pool should come close to the
+best fixed size of each. Its peak thread count and growth and shrink decisions are printed alongside.
+
+Usage:
+    python benchmarks/bench_autoscaling.py [max_workers]
+"""
+
+IO_SECONDS = 0.01
+CPU_SECONDS = 0.002
+LAYERS = 20
+WIDTH = 20
+FIXED_SIZES = (1, 2, 4, 8, 16, 32, 64)
+
+
+def spin(seconds):
+    """Busy-loops on the CPU for `seconds`."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class SleepTask:
+    def execute(self, dependent_response=None):
+        time.sleep(IO_SECONDS)
+
+
+class SpinTask:
+    def execute(self, dependent_response=None):
+        spin(CPU_SECONDS)
+
+
+def generate_tasks(name, io_fraction, seed=0):
+    """
+    Builds a layered DAG in which every task depends on up to three tasks of the previous layer, and registers a
+    sleeping or spinning task class for every task name.
+
+    Args:
+        name (str): Name of the workload, used in the task names.
+        io_fraction (float): Fraction of the tasks that sleep instead of spinning.
+        seed (int): Seed of the random dependencies and task kinds.
+
+    Returns:
+        list of dict: Task configurations in the job_config.json format.
+    """
+    rng = random.Random(seed)
+    tasks = []
+    for layer in range(LAYERS):
+        for index in range(WIDTH):
+            task_name = f"bench.{name}.l{layer}_{index}"
+            dependencies = [f"bench.{name}.l{layer - 1}_{dependency}"
+                            for dependency in rng.sample(range(WIDTH), 3)] if layer else []
+            task_registry.register(task_name, SleepTask if rng.random() < io_fraction else SpinTask)
+            tasks.append({"name": task_name, "dependencies": dependencies})
+    return tasks
+
+
+def run(tasks, max_workers, autoscale):
+    handler = GenericJobHandler(max_workers=max_workers, log_level=logging.WARNING, autoscale=autoscale)
+    start_time = time.perf_counter()
+    handler.execute_tasks(tasks)
+    elapsed = time.perf_counter() - start_time
+    assert len(handler.completed_tasks) == len(tasks)
+    return elapsed, handler.scaling_metrics
+
+
+def main(max_workers=64):
+    workloads = {"io": 1.0, "cpu": 0.0, "mixed": 0.5}
+    print(f"{LAYERS}x{WIDTH} layered DAGs, {IO_SECONDS * 1000:.0f}ms sleeping and {CPU_SECONDS * 1000:.0f}ms spinning "
+          f"tasks, adaptive ceiling {max_workers}")
+    print(f"{'workload':<8} " + " ".join(f"{f'fixed {size}':>9}" for size in FIXED_SIZES)
+          + f" {'adaptive':>9} {'vs best':>8} {'peak':>5} {'grow':>5} {'shrink':>6}")
+    for name, io_fraction in workloads.items():
+        tasks = generate_tasks(name, io_fraction)
+        fixed = []
+        for size in FIXED_SIZES:
+            task_durations.clear()
+            fixed.append(run(tasks, size, autoscale=False)[0])
+        task_durations.clear()
+        adaptive, metrics = run(tasks, max_workers, autoscale=True)
+        print(f"{name:<8} " + " ".join(f"{makespan:>8.3f}s" for makespan in fixed)
+              + f" {adaptive:>8.3f}s {adaptive / min(fixed):>7.2f}x {metrics['peak_workers']:>5} "
+                f"{metrics['grow_decisions']:>5} {metrics['shrink_decisions']:>6}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 64)
@@ -0,0 +1,88 @@
+import logging
+import os
+import sys
+import time
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from job_orchestrator.handlers.generic_job_handler import GenericJobHandler
+from job_orchestrator.task_durations import task_durations
+from job_orchestrator.task_registry import task_registry
+
+"""
+Makespan benchmark for critical-path-first scheduling in job_orchestrator.handlers.generic_job_handler.
+
+Builds a wide-and-deep DAG: many short independent tasks listed first in the configuration, followed by a few long
+dependency chains, and runs it on fewer workers than the DAG is wide. Submitting in configuration order starts the
+chains only after the wide tasks have drained; critical-path order starts them first. The job is run three times:
+in configuration order, with priorities from `estimated_duration` hints, and with priorities from the durations
+recorded by the earlier runs.
+
+Usage:
+    python benchmarks/bench_critical_path.py [max_workers]
+"""
+
+TASK_SECONDS = 0.02
+WIDE_TASKS = 40
+CHAINS = 2
+CHAIN_LENGTH = 25
+
+
+def make_task_class(seconds):
+    """Returns a task class that sleeps for `seconds`, standing in for I/O-bound work."""
+    class SleepTask:
+        def execute(self, dependent_response=None):
+            time.sleep(seconds)
+            return seconds
+    return SleepTask
+
+
+def generate_tasks(with_hints):
+    """
+    Builds the wide-and-deep DAG and registers a task class for every task name.
+
+    Args:
+        with_hints (bool): Whether to set `estimated_duration` on every task.
+
+    Returns:
+        list of dict: Task configurations in the job_config.json format.
+    """
+    tasks = [{"name": f"bench.wide{index}"} for index in range(WIDE_TASKS)]
+    for chain in range(CHAINS):
+        for step in range(CHAIN_LENGTH):
+            dependencies = [f"bench.chain{chain}_{step - 1}"] if step else []
+            tasks.append({"name": f"bench.chain{chain}_{step}", "dependencies": dependencies})
+    for task in tasks:
+        task_registry.register(task['name'], make_task_class(TASK_SECONDS))
+        if with_hints:
+            task['estimated_duration'] = TASK_SECONDS
+    return tasks
+
+
+def run(tasks, max_workers, prioritize):
+    handler = GenericJobHandler(max_workers=max_workers, log_level=logging.WARNING, prioritize=prioritize)
+    start_time = time.perf_counter()
+    handler.execute_tasks(tasks)
+    elapsed = time.perf_counter() - start_time
+    assert len(handler.completed_tasks) == len(tasks)
+    return elapsed
+
+
+def main(max_workers=4):
+    task_durations.clear()
+    total_work = (WIDE_TASKS + CHAINS * CHAIN_LENGTH) * TASK_SECONDS
+    print(f"{len(generate_tasks(False))} tasks, {max_workers} workers, "
+          f"lower bound {max(total_work / max_workers, CHAIN_LENGTH * TASK_SECONDS):.3f}s")
+    print(f"{'scheduling':>28} {'makespan':>10}")
+    baseline = run(generate_tasks(False), max_workers, prioritize=False)
+    print(f"{'configuration order':>28} {baseline:>9.3f}s")
+    hinted = run(generate_tasks(True), max_workers, prioritize=True)
+    print(f"{'critical path (hints)':>28} {hinted:>9.3f}s {1 - hinted / baseline:>8.0%} shorter")
+    recorded = run(generate_tasks(False), max_workers, prioritize=True)
+    print(f"{'critical path (history)':>28} {recorded:>9.3f}s {1 - recorded / baseline:>8.0%} shorter")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4)
@@ -0,0 +1,66 @@
+import os
+import random
+import sys
+import time
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from job_orchestrator.utilities import analyze_dependencies
+
+"""
+Scaling benchmark for job_orchestrator.utilities.analyze_dependencies.
+
+Generates random layered DAGs with a fixed average of four dependencies per task and times the dependency analysis
+for edge counts from 1k to 1M. With linear behaviour the time per edge stays roughly constant as the graph grows.
+
+Usage:
+    python benchmarks/bench_cycle_detection.py [max_edges]
+"""
+
+DEPENDENCIES_PER_TASK = 4
+LAYER_WIDTH = 100
+
+
+def generate_tasks(edge_count, seed=0):
+    """
+    Builds a layered DAG in which every task depends on tasks from the previous layers.
+
+    Args:
+        edge_count (int): Approximate number of dependency edges to generate.
+        seed (int): Seed for the random generator, so runs are comparable.
+
+    Returns:
+        list of dict: Task configurations in the job_config.json format.
+    """
+    rng = random.Random(seed)
+    task_count = max(edge_count // DEPENDENCIES_PER_TASK, LAYER_WIDTH + 1)
+    tasks = []
+    for index in range(task_count):
+        layer_start = (index // LAYER_WIDTH) * LAYER_WIDTH
+        if layer_start == 0:
+            dependencies = []
+        else:
+            dependencies = [f"task{rng.randrange(layer_start)}" for _ in range(DEPENDENCIES_PER_TASK)]
+        tasks.append({"name": f"task{index}", "dependencies": dependencies})
+    rng.shuffle(tasks)
+    return tasks
+
+
+def main(max_edges=1_000_000):
+    print(f"{'edges':>10} {'tasks':>10} {'seconds':>10} {'ns/edge':>10}")
+    edge_count = 1_000
+    while edge_count <= max_edges:
+        tasks = generate_tasks(edge_count)
+        edges = sum(len(task['dependencies']) for task in tasks)
+        start_time = time.perf_counter()
+        analysis = analyze_dependencies(tasks)
+        elapsed = time.perf_counter() - start_time
+        assert analysis.cycle is None and len(analysis.order) == len(tasks)
+        print(f"{edges:>10} {len(tasks):>10} {elapsed:>10.3f} {elapsed / edges * 1e9:>10.0f}")
+        edge_count *= 10
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,79 @@
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tracemalloc
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from job_orchestrator.handlers.generic_job_handler import GenericJobHandler
+from job_orchestrator.task_registry import task_registry
+
+"""
+Memory benchmark for result release in job_orchestrator.handlers.generic_job_handler.
+
+Runs a long chain of tasks that each return a large payload, once keeping every result until the end of the job and
+once releasing results as soon as their dependent has finished. Every run happens in a fresh interpreter because the
+peak resident set size of a process never decreases. With release enabled the peak of the Python heap stays at two
+payloads, the input and the output of the running task, and the peak RSS may sit a few payloads above that because the
+allocator keeps freed blocks in per-thread arenas, whereas keeping every result grows linearly with the length of the
+chain.
+
+Usage:
+    python benchmarks/bench_result_memory.py [chain_length]
+"""
+
+PAYLOAD_BYTES = 10 * 1024 * 1024
+
+
+class PayloadTask:
+    def execute(self, dependent_response=None):
+        # Filled rather than zeroed, so the pages are resident.
+        return b'\x01' * PAYLOAD_BYTES
+
+
+def peak_rss_mb():
+    """Returns the peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def run(chain_length, release_results):
+    tasks = []
+    for index in range(chain_length):
+        task_registry.register(f"bench.payload{index}", PayloadTask)
+        task = {"name": f"bench.payload{index}"}
+        if index:
+            task["dependencies"] = [f"bench.payload{index - 1}"]
+        tasks.append(task)
+
+    baseline = peak_rss_mb()
+    tracemalloc.start()
+    handler = GenericJobHandler(max_workers=2, log_level=logging.CRITICAL, release_results=release_results)
+    handler.execute_tasks(tasks)
+    assert handler.succeeded
+    heap_peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return peak_rss_mb() - baseline, heap_peak
+
+
+def main(chain_length=40):
+    print(f"Chain of {chain_length} tasks returning {PAYLOAD_BYTES // (1024 * 1024)} MiB each")
+    print(f"{'results':>10} {'peak RSS growth':>17} {'peak heap':>13} {'payloads':>10}")
+    payload_mb = PAYLOAD_BYTES / 1024 / 1024
+    for mode in ['keep', 'release']:
+        output = subprocess.run([sys.executable, __file__, str(chain_length), mode], check=True, capture_output=True,
+                                text=True).stdout
+        growth, heap_peak = map(float, output.split())
+        print(f"{mode:>10} {growth:>13.1f} MiB {heap_peak:>9.1f} MiB {heap_peak / payload_mb:>10.1f}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        print(*run(int(sys.argv[1]), sys.argv[2] == 'release'))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 40)
@@ -0,0 +1,75 @@
+import logging
+import os
+import sys
+import time
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from job_orchestrator.handlers.generic_job_handler import GenericJobHandler
+from job_orchestrator.task_registry import task_registry
+
+"""
+Throughput benchmark for retries with backoff in job_orchestrator.handlers.generic_job_handler.
+
+Runs a fixed set of healthy short tasks next to a growing number of flapping tasks that fail twice before they
+succeed, with a backoff long enough that every flapping task is waiting to retry while the healthy tasks run. Because
+retry delays are timers rather than sleeping workers, the time to finish the healthy tasks stays flat as the number of
+flapping tasks grows.
+
+Usage:
+    python benchmarks/bench_retry_throughput.py [max_workers]
+"""
+
+TASK_SECONDS = 0.005
+HEALTHY_TASKS = 400
+BACKOFF = 0.5
+
+
+class HealthyTask:
+    def execute(self, dependent_response=None):
+        time.sleep(TASK_SECONDS)
+        HealthyTask.finished_at = time.perf_counter()
+
+
+def make_flapping_task_class(failures):
+    """Returns a task class that fails `failures` times before it succeeds."""
+    class FlappingTask:
+        attempts = 0
+
+        def execute(self, dependent_response=None):
+            FlappingTask.attempts += 1
+            if FlappingTask.attempts <= failures:
+                raise ConnectionError("service unavailable")
+    return FlappingTask
+
+
+def run(flapping_tasks, max_workers):
+    tasks = []
+    for index in range(flapping_tasks):
+        task_registry.register(f"bench.flapping{index}", make_flapping_task_class(2))
+        tasks.append({"name": f"bench.flapping{index}", "retries": 2, "backoff": BACKOFF, "jitter": 0.1,
+                      "estimated_duration": 1})
+    for index in range(HEALTHY_TASKS):
+        task_registry.register(f"bench.healthy{index}", HealthyTask)
+        tasks.append({"name": f"bench.healthy{index}"})
+
+    handler = GenericJobHandler(max_workers=max_workers, log_level=logging.CRITICAL)
+    start_time = time.perf_counter()
+    handler.execute_tasks(tasks)
+    assert handler.succeeded
+    return HealthyTask.finished_at - start_time
+
+
+def main(max_workers=4):
+    print(f"{HEALTHY_TASKS} healthy tasks of {TASK_SECONDS * 1000:.0f} ms on {max_workers} workers, "
+          f"flapping tasks retried after {BACKOFF}s and {2 * BACKOFF}s")
+    print(f"{'flapping':>10} {'healthy done':>14} {'tasks/s':>10}")
+    for flapping_tasks in [0, 50, 200, 800]:
+        elapsed = run(flapping_tasks, max_workers)
+        print(f"{flapping_tasks:>10} {elapsed:>13.3f}s {HEALTHY_TASKS / elapsed:>10.0f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4)
@@ -0,0 +1,67 @@
+import logging
+import os
+import sys
+import time
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from job_orchestrator.handlers.generic_job_handler import GenericJobHandler
+from job_orchestrator.job_plan import JobPlan
+from job_orchestrator.process_pool import get_process_pool
+
+"""
+Fan-out benchmark for passing results through shared memory in job_orchestrator.handlers.generic_job_handler.
+
+A process task returns a large payload that N process tasks depend on. With shared memory the payload is copied into
+one segment and every consumer maps it, so the time to fan it out stays flat as N grows. With pickling every consumer
+receives its own copy through the pool's pipes, first from the worker to the orchestrator and then once per consumer,
+so the time grows linearly with N.
+
+Usage:
+    python benchmarks/bench_shared_results.py [payload_mib]
+"""
+
+
+class PayloadTask:
+    def execute(self, dependent_response=None):
+        return b'\x01' * (int(os.environ.get('BENCH_PAYLOAD_MIB', '64')) * 1024 * 1024)
+
+
+class ConsumerTask:
+    def execute(self, dependent_response=None):
+        payload = dependent_response["bench.payload"]
+        return sum(payload[::1024 * 1024])
+
+
+def run(consumers, share_results):
+    tasks = [{"name": "bench.payload", "executor": "process"}]
+    tasks += [{"name": f"bench.consumer{index}", "dependencies": ["bench.payload"], "executor": "process"}
+              for index in range(consumers)]
+    task_classes = {task["name"]: ConsumerTask for task in tasks}
+    task_classes["bench.payload"] = PayloadTask
+    handler = GenericJobHandler(max_workers=consumers, log_level=logging.CRITICAL, share_results=share_results,
+                                plan=JobPlan(tasks, task_classes=task_classes))
+    start = time.perf_counter()
+    handler.execute_tasks(tasks)
+    elapsed = time.perf_counter() - start
+    assert handler.succeeded
+    return elapsed
+
+
+def main(payload_mib=64):
+    os.environ['BENCH_PAYLOAD_MIB'] = str(payload_mib)
+    # Starts the worker processes before measuring.
+    get_process_pool(max_workers=os.cpu_count())
+    run(1, True)
+    print(f"One {payload_mib} MiB process task result fanned out to N process tasks")
+    print(f"{'N':>4} {'pickled':>10} {'shared':>10} {'speedup':>8}")
+    for consumers in [1, 2, 4, 8, 16]:
+        pickled = run(consumers, False)
+        shared = run(consumers, True)
+        print(f"{consumers:>4} {pickled:>9.3f}s {shared:>9.3f}s {pickled / shared:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 64)
@@ -0,0 +1,32 @@
+import os
+import sys
+
+# Append the src directories of both projects to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(1, os.path.join(project_root, '..', 'fastasyncio', 'src'))
+
+"""
+Synthetic DAG benchmark suite comparing the threadpool and fastasyncio engines.
+
+Generates parameterized DAG shapes (wide fan-out, deep chains, stacked diamonds, random layered DAGs and bursts of
+independent tasks) of no-op, sleeping or CPU-spinning tasks, runs them through threadpool's JobOrchestrator and
+GenericJobHandler and through fastasyncio's JobProcessor with its DAG handler, and reports for every run:
+
+    - makespan: Median wall time of the job.
+    - lower_bound: The larger of the critical path, the summed task durations along the longest path, and the total
+      work divided by the number of tasks that can make progress at once.
+    - overhead_per_task_us: Makespan above the lower bound, per task. For no-op tasks this is the entire makespan.
+    - peak_memory_bytes: Peak of the Python heap during a separate run traced with tracemalloc.
+
+Results are saved as JSON, and compared with an earlier result file with `--compare`.
+
+Modules:
+    shapes: Generators of the DAG shapes.
+    tasks: Task kinds for both engines.
+    engines: Runners of a shape on each engine.
+
+Usage:
+    python -m benchmarks.dag_suite [--shapes ...] [--kinds ...] [--engines ...] [--scale 1.0] [--task-ms 1]
+                                   [--workers 8] [--repeat 3] [--output results.json] [--compare baseline.json]
+"""
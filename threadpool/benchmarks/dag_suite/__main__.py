@@ -0,0 +1,176 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from .engines import ENGINES
+from .shapes import SHAPES, critical_path_length
+from .tasks import KINDS
+
+"""
+Command line entry point of the DAG benchmark suite, see the package docstring.
+
+Every shape, task kind and engine combination is first run once under tracemalloc for its peak memory, and then
+`--repeat` times for its median makespan, so tracing, which slows allocation down, stays out of the timed runs and the
+traced run warms up imports and caches. Results are written to `--output`, by default a timestamped file in
+'.cache/benchmarks'. With `--compare`, every run is compared with the run of the same engine, shape, task kind and size
+in an earlier result file, and the exit status is 1 if any makespan grew by more than `--threshold`.
+"""
+
+# Number of tasks per shape at scale 1. Chains are shorter because their tasks run one at a time.
+DEFAULT_SIZES = {
+    'fan_out': 1000,
+    'chain': 200,
+    'diamonds': 1000,
+    'layered': 1000,
+    'burst': 2000,
+}
+
+DEFAULT_OUTPUT_DIR = os.path.join('.cache', 'benchmarks')
+
+
+def measure(engine, shape, dependencies, kind, seconds, repeat):
+    """
+    Runs one shape of one task kind on an engine and computes its metrics.
+
+    Returns:
+        dict: The result of the run, as saved to JSON.
+    """
+    case = f"{shape}_{kind}"
+    task_seconds = 0.0 if kind == 'noop' else seconds
+    tracemalloc.start()
+    try:
+        engine.run(case, dependencies, kind, seconds)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    makespans = [engine.run(case, dependencies, kind, seconds) for _ in range(repeat)]
+
+    makespan = statistics.median(makespans)
+    critical_path = critical_path_length(dependencies)
+    critical_path_seconds = critical_path * task_seconds
+    lower_bound = max(critical_path_seconds, len(dependencies) * task_seconds / engine.parallelism(kind))
+    return {
+        "engine": engine.name,
+        "shape": shape,
+        "kind": kind,
+        "tasks": len(dependencies),
+        "edges": sum(len(task_dependencies) for task_dependencies in dependencies),
+        "critical_path_tasks": critical_path,
+        "task_seconds": task_seconds,
+        "makespan": makespan,
+        "makespans": makespans,
+        "critical_path_seconds": critical_path_seconds,
+        "lower_bound": lower_bound,
+        "bound_ratio": makespan / lower_bound if lower_bound else None,
+        "overhead_per_task_us": max(0.0, makespan - lower_bound) / len(dependencies) * 1e6,
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def result_key(result):
+    return result["engine"], result["shape"], result["kind"], result["tasks"]
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints the makespan and overhead of every result next to the matching baseline result.
+
+    Returns:
+        list of dict: The results whose makespan grew by more than `threshold`, as a fraction of the baseline.
+    """
+    baseline_results = {result_key(result): result for result in baseline["results"]}
+    regressions = []
+    print(f"\n{'engine':<19} {'shape':<9} {'kind':<6} {'makespan':>10} {'baseline':>10} {'change':>8} "
+          f"{'overhead/task':>14}")
+    for result in results:
+        before = baseline_results.get(result_key(result))
+        if before is None:
+            continue
+        change = result["makespan"] / before["makespan"] - 1 if before["makespan"] else 0.0
+        regressed = change > threshold
+        if regressed:
+            regressions.append(result)
+        print(f"{result['engine']:<19} {result['shape']:<9} {result['kind']:<6} {result['makespan']:>9.3f}s "
+              f"{before['makespan']:>9.3f}s {change:>+7.1%} "
+              f"{before['overhead_per_task_us']:>6.0f}->{result['overhead_per_task_us']:<5.0f}us"
+              f"{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.dag_suite',
+                                     description="Run synthetic DAGs through the threadpool and fastasyncio engines.")
+    parser.add_argument('--shapes', nargs='+', choices=list(SHAPES), default=list(SHAPES), help="DAG shapes to run.")
+    parser.add_argument('--kinds', nargs='+', choices=KINDS, default=list(KINDS), help="Task kinds to run.")
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES), default=list(ENGINES), help="Engines to run.")
+    parser.add_argument('--scale', type=float, default=1.0, help="Factor applied to the default number of tasks.")
+    parser.add_argument('--task-ms', type=float, default=1.0, help="Duration of sleeping and spinning tasks in ms.")
+    parser.add_argument('--workers', type=int, default=8, help="Worker threads of the threadpool engines.")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per combination; the median is reported.")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the random layered DAG.")
+    parser.add_argument('--output', help="Result file. Defaults to a timestamped file in .cache/benchmarks.")
+    parser.add_argument('--compare', metavar='BASELINE', help="Earlier result file to compare with.")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="Makespan growth over the baseline, as a fraction, reported as a regression.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    seconds = args.task_ms / 1000
+    shapes = {}
+    for shape in args.shapes:
+        size = max(2, round(DEFAULT_SIZES[shape] * args.scale))
+        shapes[shape] = SHAPES[shape](size, seed=args.seed) if shape == 'layered' else SHAPES[shape](size)
+
+    results = []
+    print(f"{'engine':<19} {'shape':<9} {'kind':<6} {'tasks':>6} {'makespan':>10} {'bound':>9} "
+          f"{'overhead/task':>14} {'peak memory':>12}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        for engine_name in args.engines:
+            engine_dir = os.path.join(work_dir, engine_name)
+            os.makedirs(engine_dir)
+            engine = ENGINES[engine_name](engine_dir, args.workers)
+            try:
+                for shape, dependencies in shapes.items():
+                    for kind in args.kinds:
+                        result = measure(engine, shape, dependencies, kind, seconds, args.repeat)
+                        results.append(result)
+                        print(f"{engine_name:<19} {shape:<9} {kind:<6} {result['tasks']:>6} "
+                              f"{result['makespan']:>9.3f}s {result['lower_bound']:>8.3f}s "
+                              f"{result['overhead_per_task_us']:>12.0f}us "
+                              f"{result['peak_memory_bytes'] / 2 ** 20:>9.1f} MiB")
+            finally:
+                engine.close()
+
+    output = args.output or os.path.join(DEFAULT_OUTPUT_DIR, f"dag_suite-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump({
+            "metadata": {
+                "created": time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "arguments": {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+            },
+            "results": results,
+        }, file, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} of {len(results)} runs regressed by more than {args.threshold:.0%}.")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
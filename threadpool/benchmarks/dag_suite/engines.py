@@ -0,0 +1,136 @@
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+
+from job_orchestrator.handlers.generic_job_handler import GenericJobHandler
+from job_orchestrator.history import TaskHistory
+from job_orchestrator.job import JobOrchestrator
+from job_orchestrator.job_plan import JobPlan
+from job_orchestrator.task_registry import task_registry
+from joborchrestrator.history import TaskHistory as AsyncTaskHistory
+from joborchrestrator.job_processor import JobProcessor
+
+from .tasks import async_task_modules, task_class
+
+"""
+Engines of the DAG benchmark suite. Every engine runs one shape with one task kind and returns the makespan of the
+run in seconds, timed from the call that starts the job to its return.
+
+    - threadpool: threadpool's JobOrchestrator, from a generated job configuration, with a task history, on a worker
+      pool of `workers` threads.
+    - threadpool-handler: threadpool's GenericJobHandler on its own, without configuration, plan cache or history, to
+      separate the handler's overhead from the orchestrator's.
+    - fastasyncio: fastasyncio's JobProcessor with its DAG handler, from a generated job file, with a task history.
+      The DAG handler runs every ready task concurrently, so `workers` does not apply.
+
+Every engine writes its configuration, plan cache and history to its own work directory.
+
+Classes:
+    ThreadpoolEngine: Runs a shape through JobOrchestrator.
+    ThreadpoolHandlerEngine: Runs a shape through GenericJobHandler.
+    FastasyncioEngine: Runs a shape through JobProcessor and the DAG handler.
+"""
+
+THREADPOOL_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+FASTASYNCIO_ROOT = os.path.abspath(os.path.join(THREADPOOL_ROOT, '..', 'fastasyncio'))
+
+
+class ThreadpoolHandlerEngine:
+    name = 'threadpool-handler'
+
+    def __init__(self, work_dir, workers):
+        self.work_dir = work_dir
+        self.workers = workers
+
+    def parallelism(self, kind):
+        """Returns how many tasks of a kind can make progress at once. Spinning threads are serialized by the GIL."""
+        return 1 if kind == 'spin' else self.workers
+
+    def tasks(self, case, dependencies):
+        names = [f"bench.{case}.t{index}" for index in range(len(dependencies))]
+        return [{"name": names[index], "dependencies": [names[dependency] for dependency in task_dependencies]}
+                for index, task_dependencies in enumerate(dependencies)]
+
+    def run(self, case, dependencies, kind, seconds):
+        tasks = self.tasks(case, dependencies)
+        cls = task_class(kind, seconds)
+        handler = GenericJobHandler(max_workers=self.workers, log_level=logging.WARNING,
+                                    plan=JobPlan(tasks, task_classes={task["name"]: cls for task in tasks}))
+        start = time.perf_counter()
+        handler.execute_tasks(tasks)
+        makespan = time.perf_counter() - start
+        if not handler.succeeded:
+            raise RuntimeError(f"Case {case} failed on {self.name}.")
+        return makespan
+
+    def close(self):
+        pass
+
+
+class ThreadpoolEngine(ThreadpoolHandlerEngine):
+    name = 'threadpool'
+
+    def __init__(self, work_dir, workers):
+        super().__init__(work_dir, workers)
+        self.history = TaskHistory(os.path.join(work_dir, 'task_history.sqlite3'))
+
+    def run(self, case, dependencies, kind, seconds):
+        tasks = self.tasks(case, dependencies)
+        cls = task_class(kind, seconds)
+        for task in tasks:
+            task_registry.register(task["name"], cls)
+        config_path = os.path.join(self.work_dir, f"{case}.json")
+        with open(config_path, 'w') as file:
+            json.dump({"jobs": {case: {"handler": "job_orchestrator.handlers.generic_job_handler", "tasks": tasks}}},
+                      file)
+        orchestrator = JobOrchestrator(config_path, os.path.join(THREADPOOL_ROOT, 'config', 'job_schema.json'),
+                                       log_level=logging.WARNING, plan_cache_dir=os.path.join(self.work_dir, 'plans'),
+                                       history=self.history)
+        start = time.perf_counter()
+        outcomes = orchestrator.start_jobs([case], max_workers=self.workers)
+        makespan = time.perf_counter() - start
+        if outcomes[case] is not True:
+            raise RuntimeError(f"Case {case} failed on {self.name}.")
+        return makespan
+
+    def close(self):
+        self.history.close()
+
+
+class FastasyncioEngine:
+    name = 'fastasyncio'
+
+    def __init__(self, work_dir, workers):
+        self.work_dir = work_dir
+        self.history = AsyncTaskHistory(os.path.join(work_dir, 'task_history.sqlite3'))
+
+    def parallelism(self, kind):
+        """Returns how many tasks of a kind can make progress at once. Spinning coroutines block the event loop."""
+        return 1 if kind == 'spin' else math.inf
+
+    def run(self, case, dependencies, kind, seconds):
+        # Task names double as class names and, in lower case, as module names.
+        prefix = ''.join(part.capitalize() for part in case.split('_'))
+        names = [f"{prefix}T{index}" for index in range(len(dependencies))]
+        tasks = [{"name": names[index], "dependencies": [names[dependency] for dependency in task_dependencies]}
+                 for index, task_dependencies in enumerate(dependencies)]
+        job_path = os.path.join(self.work_dir, f"{case}.json")
+        with open(job_path, 'w') as file:
+            json.dump({"jobs": [{"name": case, "handler": "handler.generic_job_handler_dag.GenericJobHandler",
+                                 "tasks": tasks}]}, file)
+        processor = JobProcessor(job_path, os.path.join(FASTASYNCIO_ROOT, 'config', 'schema.json'),
+                                 history=self.history)
+        with async_task_modules(names, task_class(kind, seconds, asynchronous=True)):
+            start = time.perf_counter()
+            asyncio.run(processor.execute_job(case))
+            return time.perf_counter() - start
+
+    def close(self):
+        self.history.close()
+
+
+# Every engine by name.
+ENGINES = {engine.name: engine for engine in (ThreadpoolEngine, ThreadpoolHandlerEngine, FastasyncioEngine)}
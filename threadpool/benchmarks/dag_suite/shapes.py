@@ -0,0 +1,89 @@
+import random
+
+"""
+Generators of synthetic DAG shapes for the DAG benchmark suite.
+
+A shape is a list with one entry per task holding the indices of the tasks it depends on. Dependencies always have a
+lower index than their dependent, so the list is in topological order and every shape is acyclic by construction. The
+engines turn the indices into task names of their own naming convention.
+
+Functions:
+    - fan_out: One root task with `size - 1` independent dependents.
+    - chain: `size` tasks that each depend on the previous one.
+    - diamonds: Diamonds of a source, a layer of parallel tasks and a sink, stacked until there are `size` tasks.
+    - layered: Random layered DAG whose tasks depend on a few random tasks of the previous layer.
+    - burst: `size` independent tasks.
+    - critical_path_length: Number of tasks on the longest path of a shape.
+"""
+
+
+def fan_out(size):
+    """One root task with `size - 1` independent dependents."""
+    return [[]] + [[0] for _ in range(size - 1)]
+
+
+def chain(size):
+    """`size` tasks that each depend on the previous one."""
+    return [[]] + [[index - 1] for index in range(1, size)]
+
+
+def diamonds(size, width=8):
+    """
+    Diamonds of a source, `width` parallel tasks and a sink, stacked so that the sink of one diamond is the source of
+    the next, until there are `size` tasks.
+    """
+    dependencies = [[]]
+    while len(dependencies) + width + 1 <= size:
+        source = len(dependencies) - 1
+        middle = list(range(len(dependencies), len(dependencies) + width))
+        dependencies += [[source] for _ in middle]
+        dependencies.append(middle)
+    return dependencies
+
+
+def layered(size, width=32, fan_in=3, seed=0):
+    """
+    Random layered DAG of `size` tasks in layers of `width` tasks. Every task after the first layer depends on up to
+    `fan_in` random tasks of the previous layer, so the DAG is as deep as it has layers. The same seed always yields
+    the same DAG.
+    """
+    generator = random.Random(seed)
+    dependencies = []
+    previous = []
+    while len(dependencies) < size:
+        layer = list(range(len(dependencies), min(len(dependencies) + width, size)))
+        for _ in layer:
+            dependencies.append(sorted(generator.sample(previous, min(fan_in, len(previous)))))
+        previous = layer
+    return dependencies
+
+
+def burst(size):
+    """`size` independent tasks, which measures dispatch overhead when the tasks are tiny."""
+    return [[] for _ in range(size)]
+
+
+def critical_path_length(dependencies):
+    """
+    Returns the number of tasks on the longest path of a shape.
+
+    Args:
+        dependencies (list of list of int): The shape, in topological order.
+
+    Returns:
+        int: The length of the longest path, in tasks.
+    """
+    depths = []
+    for task_dependencies in dependencies:
+        depths.append(1 + max((depths[dependency] for dependency in task_dependencies), default=0))
+    return max(depths, default=0)
+
+
+# Every shape by name, as a function of the number of tasks.
+SHAPES = {
+    'fan_out': fan_out,
+    'chain': chain,
+    'diamonds': diamonds,
+    'layered': layered,
+    'burst': burst,
+}
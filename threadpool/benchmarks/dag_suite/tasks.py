@@ -0,0 +1,122 @@
+import asyncio
+import contextlib
+import sys
+import time
+import types
+
+"""
+Task kinds of the DAG benchmark suite, for both engines.
+
+    - noop: Returns immediately, so the makespan of a DAG of no-op tasks is pure scheduling overhead.
+    - sleep: Sleeps, releasing the GIL or the event loop, like a task waiting on I/O.
+    - spin: Busy-loops on the CPU while holding the GIL, like a CPU-bound pure Python task.
+
+Every task of a run takes the same number of seconds, set on the task classes before the run. The threadpool engine
+registers the classes under the task names with the task registry. The fastasyncio engine loads a task named `Name`
+from the module `job.task.name`, so async_task_modules installs one generated module per task in `sys.modules` for the
+duration of a run.
+"""
+
+KINDS = ('noop', 'sleep', 'spin')
+
+
+def spin(seconds):
+    """Busy-loops on the CPU for `seconds`."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class NoopTask:
+    seconds = 0.0
+
+    def execute(self, dependent_response=None):
+        return None
+
+
+class SleepTask:
+    seconds = 0.001
+
+    def execute(self, dependent_response=None):
+        time.sleep(self.seconds)
+        return None
+
+
+class SpinTask:
+    seconds = 0.001
+
+    def execute(self, dependent_response=None):
+        spin(self.seconds)
+        return None
+
+
+class AsyncNoopTask:
+    seconds = 0.0
+
+    async def execute(self, input_data):
+        return None
+
+
+class AsyncSleepTask:
+    seconds = 0.001
+
+    async def execute(self, input_data):
+        await asyncio.sleep(self.seconds)
+        return None
+
+
+class AsyncSpinTask:
+    seconds = 0.001
+
+    async def execute(self, input_data):
+        spin(self.seconds)
+        return None
+
+
+TASK_CLASSES = {'noop': NoopTask, 'sleep': SleepTask, 'spin': SpinTask}
+ASYNC_TASK_CLASSES = {'noop': AsyncNoopTask, 'sleep': AsyncSleepTask, 'spin': AsyncSpinTask}
+
+
+def task_class(kind, seconds, asynchronous=False):
+    """
+    Returns the task class of a kind, set to take `seconds`. No-op tasks always take no time.
+
+    Args:
+        kind (str): One of KINDS.
+        seconds (float): Duration of every task of the run.
+        asynchronous (bool): Whether to return the coroutine task class used by fastasyncio.
+
+    Returns:
+        type: The task class.
+    """
+    task_classes = ASYNC_TASK_CLASSES if asynchronous else TASK_CLASSES
+    if kind not in task_classes:
+        raise ValueError(f"Unknown task kind {kind}; expected one of {', '.join(KINDS)}.")
+    cls = task_classes[kind]
+    if kind != 'noop':
+        cls.seconds = seconds
+    return cls
+
+
+@contextlib.contextmanager
+def async_task_modules(task_names, cls):
+    """
+    Makes every task name loadable by the fastasyncio DAG handler while the context is active, as a subclass of `cls`
+    with the task's name in a generated module `job.task.<name in lower case>`.
+
+    Args:
+        task_names (iterable of str): The task names.
+        cls (type): The task class every task runs.
+    """
+    module_names = []
+    try:
+        for task_name in task_names:
+            module_name = f'job.task.{task_name.lower()}'
+            module = types.ModuleType(module_name)
+            setattr(module, task_name, type(task_name, (cls,), {}))
+            sys.modules[module_name] = module
+            module_names.append(module_name)
+        yield
+    finally:
+        for module_name in module_names:
+            sys.modules.pop(module_name, None)
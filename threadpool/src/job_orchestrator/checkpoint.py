@@ -0,0 +1,258 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import queue
+import struct
+import threading
+import time
+import uuid
+import zlib
+from pathlib import Path
+
+"""
+This module defines the RunLog class, a crash-safe write-ahead log of one job run. Every run gets a run ID, and the
+completion of every task is appended to the run's log together with its serialized result. When the process dies
+mid-job, resuming the run reads the log back, restores the completed tasks and their results, and executes only the
+remaining tasks, so the cost of a restart is proportional to the unfinished work.
+
+Appending only queues the completion. A background writer thread writes every queued completion and then calls fsync
+once for the whole batch, so completions arriving close together share one disk flush and no worker thread waits for
+the disk. Each record carries its length and a CRC32 checksum; a record torn by a crash is detected when the log is
+read and cut off before new records are appended.
+
+A task is only restored if its configuration is unchanged since the run started and every task it depends on is
+restored as well; any other task runs again.
+
+Classes:
+    RunLog: Append-only, checksummed log of the task completions of one job run.
+
+Functions:
+    - new_run_id: Returns a new unique run ID.
+    - task_digest: Returns the hash of a task configuration, used to detect tasks changed between crash and resume.
+
+Example usage:
+    run_log = RunLog.create("job1")
+    run_log.record({"name": "jobs.job1.task1"}, "From Task1")
+    run_log.close()
+
+    run_log = RunLog.open(run_id)
+    print(run_log.job_name, list(run_log.completed))
+"""
+
+DEFAULT_RUN_DIR = Path(__file__).resolve().parent.parent.parent / '.cache' / 'runs'
+
+# Length and CRC32 checksum of the payload, preceding every record.
+_RECORD_HEADER = struct.Struct('>II')
+
+_SUFFIX = '.wal'
+
+_CLOSE = object()
+
+
+def new_run_id():
+    """Returns a new unique run ID."""
+    return uuid.uuid4().hex
+
+
+def task_digest(task):
+    """
+    Returns the hash of a task configuration.
+
+    Args:
+        task (dict): The task configuration.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest of the configuration.
+    """
+    return hashlib.sha256(json.dumps(task, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _encode(payload):
+    """Frames a pickled payload as a record."""
+    return _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+class RunLog:
+    """
+    Write-ahead log of the task completions of one job run, written with batched fsyncs by a background thread.
+
+    Attributes:
+        run_id (str): The run ID.
+        path (Path): The log file.
+        job_name (str): Name of the job the run executes.
+        completed (dict): Maps the names of the tasks completed in earlier attempts of the run to their configuration
+                          digest and result.
+    """
+
+    def __init__(self, run_id, job_name=None, run_dir=None):
+        """
+        Opens the log of a run, creating it for a new run. An existing log is read, and a record torn by a crash is
+        cut off. Use RunLog.create and RunLog.open rather than calling this directly.
+
+        Args:
+            run_id (str): The run ID.
+            job_name (str, optional): Name of the job, required for a new run.
+            run_dir (str or Path, optional): Directory of the run logs. Defaults to DEFAULT_RUN_DIR.
+
+        Raises:
+            ValueError: If the run does not exist and no job name is given, or if its log is not a run log.
+        """
+        self.run_id = run_id
+        self.path = Path(run_dir or DEFAULT_RUN_DIR) / f"{run_id}{_SUFFIX}"
+        self.job_name = job_name
+        self.completed = {}
+        if self.path.exists():
+            self._read()
+        elif job_name is None:
+            raise ValueError(f"Run {run_id} not found in {self.path.parent}.")
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'wb') as file:
+                file.write(_encode(pickle.dumps(('run', job_name, time.time()))))
+                file.flush()
+                os.fsync(file.fileno())
+        self._file = open(self.path, 'ab')
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write, name=f'run-log-{run_id[:8]}', daemon=True)
+        self._writer.start()
+
+    @classmethod
+    def create(cls, job_name, run_id=None, run_dir=None):
+        """
+        Starts the log of a new run.
+
+        Args:
+            job_name (str): Name of the job the run executes.
+            run_id (str, optional): The run ID. Defaults to a new unique ID.
+            run_dir (str or Path, optional): Directory of the run logs. Defaults to DEFAULT_RUN_DIR.
+
+        Returns:
+            RunLog: The log of the new run.
+        """
+        return cls(run_id or new_run_id(), job_name, run_dir)
+
+    @classmethod
+    def open(cls, run_id, run_dir=None):
+        """
+        Reopens the log of an interrupted run to resume it.
+
+        Args:
+            run_id (str): The run ID.
+            run_dir (str or Path, optional): Directory of the run logs. Defaults to DEFAULT_RUN_DIR.
+
+        Returns:
+            RunLog: The log of the run, with the tasks completed so far in `completed`.
+
+        Raises:
+            ValueError: If the run does not exist.
+        """
+        return cls(run_id, run_dir=run_dir)
+
+    def _read(self):
+        """Reads the records of an existing log and truncates it after the last intact record."""
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        offset = 0
+        while offset + _RECORD_HEADER.size <= len(data):
+            length, checksum = _RECORD_HEADER.unpack_from(data, offset)
+            payload = data[offset + _RECORD_HEADER.size:offset + _RECORD_HEADER.size + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+            try:
+                record = pickle.loads(payload)
+            except Exception as exception:
+                logging.warning("Run %s: discarding unreadable record: %s", self.run_id, exception)
+                break
+            if record[0] == 'run':
+                self.job_name = record[1]
+            elif record[0] == 'task':
+                self.completed[record[1]] = (record[2], record[3])
+            offset += _RECORD_HEADER.size + length
+        if self.job_name is None:
+            raise ValueError(f"{self.path} is not a run log.")
+        if offset < len(data):
+            logging.warning("Run %s: cutting off %d bytes of a torn record.", self.run_id, len(data) - offset)
+            with open(self.path, 'r+b') as file:
+                file.truncate(offset)
+
+    def record(self, task, result):
+        """
+        Queues the completion of a task for writing. Never blocks on the disk. A result that cannot be pickled is not
+        logged, so the task runs again when the run is resumed.
+
+        Args:
+            task (dict): The task configuration.
+            result: The result of the task.
+        """
+        try:
+            payload = pickle.dumps(('task', task['name'], task_digest(task), result), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as exception:
+            logging.warning("Run %s: result of task %s cannot be checkpointed: %s", self.run_id, task['name'],
+                            exception)
+            return
+        self._queue.put(_encode(payload))
+
+    def _write(self):
+        """Writer thread loop: appends queued records and syncs them to disk once per batch."""
+        while True:
+            item = self._queue.get()
+            records = []
+            signals = []
+            while True:
+                if isinstance(item, bytes):
+                    records.append(item)
+                else:
+                    signals.append(item)
+                if item is _CLOSE:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if records:
+                try:
+                    self._file.write(b''.join(records))
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                except OSError as exception:
+                    logging.error("Run %s: could not write %d task completions: %s", self.run_id, len(records),
+                                  exception)
+            for signal in signals:
+                if signal is not _CLOSE:
+                    signal.set()
+            if _CLOSE in signals:
+                self._file.close()
+                return
+
+    def flush(self, timeout=None):
+        """
+        Waits until every completion recorded so far is on disk.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if the pending completions were written within the timeout.
+        """
+        if self._closed:
+            return True
+        written = threading.Event()
+        self._queue.put(written)
+        return written.wait(timeout)
+
+    def close(self, delete=False):
+        """
+        Writes the pending completions and closes the log.
+
+        Args:
+            delete (bool): Whether to remove the log, e.g. because the run finished and will not be resumed.
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_CLOSE)
+            self._writer.join()
+        if delete:
+            self.path.unlink(missing_ok=True)
@@ -1,16 +1,103 @@
+import collections
 import concurrent.futures
+import functools
+import hashlib
+import json
 import logging
 import os
+import random
+import threading
+import time
+from job_orchestrator.checkpoint import task_digest
+from job_orchestrator.job_plan import JobPlan
+from job_orchestrator.logging_config import log_context, task_logger
+from job_orchestrator.map_tasks import DEFAULT_CHUNK_SIZE, MapRun
+from job_orchestrator.process_pool import get_process_pool
+from job_orchestrator.resources import ResourcePool
+from job_orchestrator.result_cache import result_digest, task_cache_key
+from job_orchestrator.shared_results import SharedBuffer, SharedResults, discard, materialize
+from job_orchestrator.task_durations import TaskTiming, task_durations, timed_call
 from job_orchestrator.task_handler import TaskHandler
+from job_orchestrator.task_registry import task_registry
+from job_orchestrator.timer_queue import timer_queue
 from job_orchestrator.utilities import setup_logging
+from job_orchestrator.worker_pool import DEFAULT_MAX_ADAPTIVE_WORKERS, AdaptiveWorkerPool, WorkerPool
 
 
 """
 This module defines the GenericJobHandler class, which manages the execution of a set of tasks, handling dependencies
 and providing options for parallel execution. The class is designed to handle tasks that may have dependencies on the
-completion of other tasks and can execute tasks in parallel where possible. It uses a ThreadPoolExecutor to manage
-parallel task execution and keeps track of task dependencies to execute dependent tasks sequentially after their
-dependencies have been resolved.
+completion of other tasks and can execute tasks in parallel where possible. It uses a WorkerPool to manage
+parallel task execution and keeps a count of unfinished dependencies for every task. Completion callbacks decrement
+these counts, and a task is submitted to the pool the moment its last dependency finishes, so independent branches of
+a multi-level DAG run in parallel and the job finishes in critical-path time.
+
+When more tasks are ready than there are workers, ready tasks are ordered by their critical path: the longest chain of
+estimated durations from the task to the end of the job. Long chains therefore start first instead of waiting behind
+short tasks listed earlier in the configuration. Estimates come from the `estimated_duration` task setting or from the
+durations measured in earlier runs, see task_durations.
+
+Tasks with `timeout_seconds` fail with TaskTimeoutError once they have run that long, and a job with
+`deadline_seconds` fails every unfinished task once the deadline passes. A timed-out thread task frees its pool slot
+at once: its worker thread is abandoned and replaced, so a stuck call costs its timeout rather than the whole job.
+Whenever a task fails or times out, every task depending on it, directly or transitively, is cancelled before it
+starts.
+
+Tasks with `retries` are resubmitted after a failure or timeout, waiting `backoff` seconds before the first retry and
+twice as long before each further one, spread by `jitter`. The wait is a TimerQueue timer rather than a sleeping
+worker, so tasks waiting to retry do not occupy pool slots and throughput stays flat while a dependency is flapping.
+
+Results are released as soon as they are no longer needed: every task counts the dependents that have yet to finish,
+and once the last of them has completed, failed or been cancelled, the task's result is dropped from `results`. Only
+the results of tasks without dependents and of tasks marked `"output": true` stay until the end of the job, so a long
+chain of large payloads holds one or two of them at a time instead of all of them. Results of tasks shared between
+jobs through SharedTasks stay referenced by their shared future until the SharedTasks instance is discarded.
+
+When a ResultCache is given, a task whose class source, configuration and dependency results are unchanged since an
+earlier run is not executed again: its result is read from the cache. Only the tasks whose inputs changed, and the
+dependents receiving different results from them, run. Tasks configured with `"cache": false` always run, but their
+dependents are still skipped when the new result is identical to the previous one.
+
+When a RunLog is given, the completion and result of every task are appended to it. A handler given the RunLog of an
+interrupted run restores the tasks that completed before the interruption, unless their configuration changed or one
+of their dependencies is not restored, and executes only the remaining tasks.
+
+When a TaskHistory is given, the start time, wall time, CPU time, queue wait and outcome of every task the handler
+executes is recorded in it. Recording only queues the execution; the history writes it from its own thread. When a
+TaskTrace is given, a span with the queued, started and finished times, worker, dependencies and outcome of every
+attempt is recorded in it, for export as a Chrome trace.
+
+Lines logged while the job runs, by the handler, by its tasks on worker threads and by its completion callbacks, are
+attributed to the job through logging_config.log_context. Per-task lines go to the `job_orchestrator.tasks` logger,
+which can be gated and sampled separately from the job-level lines.
+
+Tasks configured with `"executor": "process"` are submitted to the shared ProcessPoolExecutor instead, so CPU-bound
+tasks are not serialized by the GIL. Their dependency results and return values are pickled across the process
+boundary, except for large bytes-like and NumPy array results: these are placed in shared memory once and handed to
+every dependent as a read-only view, so fanning such a result out to N process tasks costs one copy instead of N, see
+shared_results. The segments are released together with the results, and output results still in shared memory are
+copied out of it when the job ends. `share_results=False` pickles every result instead.
+
+When the job comes from a compiled JobPlan the handler reuses its dependency arrays and resolved task classes;
+otherwise it compiles the task list itself before execution.
+
+Several handlers can share one long-lived WorkerPool, which bounds the total concurrency of concurrently running
+jobs and interleaves their tasks fairly. Handlers given the same SharedTasks instance execute a task only once when
+it has the same configuration and the same dependency tree in several of the jobs.
+
+Tasks declaring `"resources": {"db": 1, "mem_gb": 8}` are dispatched only while those resources are free, see
+resources.ResourcePool. Capacities come from the job's `resources` setting and from the ResourcePool the handler is
+given, which an orchestrator shares between all of its jobs; a task waiting for resources holds no worker, so the
+workers keep running the other ready tasks. A task requiring more of a resource than its capacity fails at once.
+
+Tasks configured with `"kind": "map"` run their class over every item of the result of one dependency, in chunks of
+`chunk_size` items that are each one work item on the pool, and reduce the results as the chunks complete, see
+map_tasks. Only a window of chunks is in flight at a time, so a map over a million items creates a few dozen futures.
+
+A handler created with `autoscale=True` runs its job on a private AdaptiveWorkerPool instead of a fixed-size one. The
+pool adds threads while ready tasks are queued and the workers are blocked in I/O, and retires them after idle periods,
+with `max_workers` as its ceiling. The pool's metrics, including its growth and shrink decisions, are kept in
+`scaling_metrics` after the job.
 
 The GenericJobHandler is particularly useful in systems that require complex task management and execution strategies,
 such as workflow engines, batch processing systems, or automation frameworks.
@@ -19,10 +106,27 @@ Classes:
     GenericJobHandler: Manages the setup, validation, and execution of tasks based on JSON configurations.
 
 Dependencies:
-    - concurrent.futures: Used for managing parallel execution of tasks.
+    - collections: Used to queue the cache hits completed one after another.
+    - hashlib, json: Used to derive the keys under which identical tasks are shared between jobs.
+    - ..checkpoint.task_digest: Used to recognize checkpointed tasks whose configuration is unchanged.
     - logging: Used to log information, warnings, and errors.
+    - ..logging_config: Used to attribute log lines to the job and for the logger of per-task lines.
     - os: Used to retrieve the number of CPUs for setting the default number of worker threads.
+    - threading: Used to guard the shared scheduling state updated from completion callbacks.
+    - ..job_plan.JobPlan: Used for the integer-indexed dependency arrays of the job.
+    - ..map_tasks: Used for running map tasks in chunks.
+    - ..process_pool.get_process_pool: Used for executing tasks configured to run in a worker process.
+    - ..resources.ResourcePool: Used for limiting how many tasks using a resource run at once.
+    - ..result_cache: Used for the keys under which task results are cached between runs and for result digests.
+    - ..shared_results: Used for passing large buffer results to and from worker processes through shared memory.
+    - ..task_durations: Used for the duration estimates of the critical path and for measuring task durations.
+    - time: Used to note when tasks are submitted and started, for their queue wait and timeout.
+    - random: Used for the jitter of retry delays.
+    - ..timer_queue.timer_queue: Used for task timeouts, retry delays and the job deadline.
     - ..task_handler.TaskHandler: Used for executing individual tasks.
+    - ..task_registry.task_registry: Used for the task classes whose source is part of the cache key.
+    - ..worker_pool.WorkerPool, AdaptiveWorkerPool: Used for executing tasks on a bounded or self-sizing pool of
+      worker threads.
 
 Example usage:
     # Assuming the module is part of a package and the necessary task configurations are defined.
@@ -30,26 +134,95 @@ Example usage:
     tasks = [
         {"name": "module.task1"},
         {"name": "module.task2", "dependencies": ["module.task1"]},
-        {"name": "module.task3", "dependencies": ["module.task2"]}
+        {"name": "module.task3", "dependencies": ["module.task2"], "executor": "process"}
     ]
     handler.execute_tasks(tasks)
     print(handler.aggregate_results())
 """
 
+# Seconds before the first retry of a task that configures `retries` but no `backoff`.
+DEFAULT_BACKOFF = 1.0
+
+
+class TaskTimeoutError(TimeoutError):
+    """Raised for a task that exceeded its `timeout_seconds` or was still unfinished at the job deadline."""
+
+
 class GenericJobHandler:
     """
     Base class which manages the execution of a set of tasks, handling dependencies and providing options for parallel execution.
     """
-    def __init__(self, max_workers=None, log_level=logging.INFO):
+    def __init__(self, max_workers=None, log_level=logging.INFO, plan=None, worker_pool=None, shared_tasks=None,
+                 prioritize=True, history=None, deadline_seconds=None, release_results=True, result_cache=None,
+                 run_log=None, share_results=True, trace=None, autoscale=False, resources=None):
         """
-        Initializes the GenericJobHandler with optional control over the number of worker threads.
+        Initializes the GenericJobHandler with optional control over the number of worker threads and an optional
+        compiled plan of the job. When a shared worker pool is given, `max_workers` is ignored and the pool's bound
+        applies; otherwise the handler runs the job on a private pool. With `prioritize` set to False ready tasks run
+        in configuration order instead of critical-path order. Task executions are recorded in `history`, a
+        TaskHistory, if given. `deadline_seconds` overrides the job deadline of the plan. With `release_results` set
+        to False every result is kept until the end of the job instead of only the outputs. Unchanged tasks reuse
+        their results from `result_cache`, a ResultCache, if given. Task completions are checkpointed to `run_log`, a
+        RunLog, if given, and the tasks it already records as completed are restored instead of executed. With
+        `share_results` set to False large buffer results are pickled to and from worker processes instead of being
+        passed through shared memory. A span of every task attempt is recorded in `trace`, a TaskTrace, if given.
+        With `autoscale` set to True the private pool sizes itself between a floor and `max_workers`, which then
+        defaults to DEFAULT_MAX_ADAPTIVE_WORKERS. `resources`, a ResourcePool, if given, bounds the tasks declaring
+        resources together with the capacities of the job's `resources` setting.
         """
         setup_logging(log_level)
+        self.plan = plan
+        self.prioritize = prioritize
+        self.history = history
+        self.trace = trace
+        self.deadline_seconds = deadline_seconds
+        self.release_results = release_results
+        self.result_cache = result_cache
+        self.run_log = run_log
+        self.share_results = share_results
+        self.worker_pool = worker_pool
+        self.shared_tasks = shared_tasks
+        self.autoscale = autoscale
+        self.scaling_metrics = None
+        self.resources = resources
         self.results = {}
         self.task_dependencies = {}
         self.completed_tasks = set()
+        self.failed_tasks = set()
+        self.timed_out_tasks = set()
+        self.cancelled_tasks = set()
+        self.cached_tasks = set()
+        self.restored_tasks = set()
         self.tasks = []
-        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.max_workers = max_workers or (DEFAULT_MAX_ADAPTIVE_WORKERS if autoscale
+                                           else min(32, (os.cpu_count() or 1) + 4))
+        self._dependents = []
+        self._pending_dependencies = []
+        self._task_keys = []
+        self._priorities = []
+        self._submitted_at = []
+        self._futures = []
+        self._owned = []
+        self._started_at = []
+        self._threads = []
+        self._timers = []
+        self._finished = []
+        self._attempts = []
+        self._retrying = []
+        self._failed_futures = []
+        self._pending_consumers = []
+        self._outputs = []
+        self._cache_keys = []
+        self._result_digests = []
+        self._shared = SharedResults()
+        self._deadline_expired = False
+        self._job_name = None
+        self._in_flight = 0
+        self._pool = None
+        self._resources = None
+        self._lock = threading.Lock()
+        self._job_done = threading.Event()
+        self._cached_hits = threading.local()
 
     def before_job(self):
         """Logs the beginning of job execution."""
@@ -57,54 +230,654 @@ class GenericJobHandler:
 
     def execute_tasks(self, tasks):
         """
-        Orchestrates the execution of given tasks, managing parallel and sequential execution based on dependencies.
+        Orchestrates the execution of given tasks, submitting each task to the pool as soon as its dependencies complete.
         """
         self.tasks = tasks
         self._prepare_task_dependencies()
-        self._execute_parallel_tasks()
-        self._execute_sequential_tasks()
+        with log_context(job_name=self._job_name):
+            self._execute_ready_tasks()
 
     def _prepare_task_dependencies(self):
-        """Prepares a mapping of tasks to their dependencies for efficient management during execution."""
+        """
+        Prepares integer-indexed dependents lists and counts of unfinished dependencies for every task, reusing the
+        compiled plan when it was built for these tasks.
+
+        Tasks are addressed by their position in the task list, so the hot path in the completion callback only
+        touches lists. A dependency on a task that is not part of the job can never be satisfied, so such a task is
+        reported and left out of the run.
+        """
+        if self.plan is None or self.plan.tasks is not self.tasks:
+            self.plan = JobPlan(self.tasks)
+        self._job_name = self.plan.job_name
+        self._dependents = self.plan.dependents
+        self._pending_dependencies = list(self.plan.dependency_counts)
+
         for task in self.tasks:
             self.task_dependencies[task['name']] = set(task.get('dependencies', []))
-            logging.debug("Task %s dependencies: %s", task['name'], self.task_dependencies[task['name']])
-
-    def _execute_parallel_tasks(self):
-        """Executes tasks that have no dependencies in parallel using a ThreadPoolExecutor."""
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            parallel_tasks = [task for task in self.tasks if not task.get('dependencies', [])]
-            futures = {executor.submit(TaskHandler(task).execute_task): task['name'] for task in parallel_tasks}
-            
-            for future in concurrent.futures.as_completed(futures):
-                task_name = futures[future]
-                try:
-                    self.results[task_name] = future.result()
-                    self.completed_tasks.add(task_name)
-                    logging.info("Parallel task %s completed successfully.", task_name)
-                except Exception as exc:
-                    logging.error("Parallel task %s generated an exception: %s", task_name, exc)
-    
-    def _execute_sequential_tasks(self):
-        """Executes tasks with dependencies sequentially, ensuring that each task's dependencies have been completed."""
+            task_logger.debug("Task %s dependencies: %s", task['name'], self.task_dependencies[task['name']])
+            for dependency in self.task_dependencies[task['name']]:
+                if dependency not in self.plan.task_index:
+                    logging.error("Task %s depends on unknown task %s and will not be run.", task['name'], dependency)
+
+        if self.shared_tasks is not None:
+            self._task_keys = self._compute_task_keys()
+        self._priorities = self._compute_priorities() if self.prioritize else [0] * len(self.tasks)
+        self._submitted_at = [None] * len(self.tasks)
+        self._futures = [None] * len(self.tasks)
+        self._owned = [False] * len(self.tasks)
+        self._started_at = [None] * len(self.tasks)
+        self._threads = [None] * len(self.tasks)
+        self._timers = [None] * len(self.tasks)
+        self._finished = [False] * len(self.tasks)
+        self._attempts = [0] * len(self.tasks)
+        self._retrying = [False] * len(self.tasks)
+        self._failed_futures = [None] * len(self.tasks)
+        self._pending_consumers = [len(dependents) for dependents in self._dependents]
+        self._outputs = [not self.release_results or not self._dependents[index] or task.get('output', False)
+                         for index, task in enumerate(self.tasks)]
+        self._cache_keys = [None] * len(self.tasks)
+        self._result_digests = [None] * len(self.tasks)
+        self._deadline_expired = False
+        if self.run_log is not None:
+            self._restore_completed_tasks()
+
+    def _restore_completed_tasks(self):
+        """
+        Marks the tasks the run log records as completed as finished, with their logged results, in topological
+        order. A task is only restored if its configuration is unchanged and all of its dependencies are restored, so
+        a task that runs again never has a restored dependent waiting on it.
+        """
+        for index in self.plan.order:
+            task = self.tasks[index]
+            completed = self.run_log.completed.get(task['name'])
+            if completed is None or completed[0] != task_digest(task) \
+                    or not all(self._finished[dependency] for dependency in self.plan.dependencies[index]):
+                continue
+            result = completed[1]
+            self._finished[index] = True
+            self.results[task['name']] = result
+            self.completed_tasks.add(task['name'])
+            self.restored_tasks.add(task['name'])
+            if self.result_cache is not None:
+                self._result_digests[index] = result_digest(result)
+            for dependent in self._dependents[index]:
+                self._pending_dependencies[dependent] -= 1
+            self._release_dependencies(index)
+        if self.restored_tasks:
+            logging.info("Run %s: restored %d completed tasks, %d remaining.", self.run_log.run_id,
+                         len(self.restored_tasks), len(self.tasks) - len(self.restored_tasks))
+
+    def _compute_priorities(self):
+        """
+        Computes the critical path of every task: its estimated duration plus the longest critical path among its
+        dependents. Tasks of a cyclic job get no priority.
+
+        Returns:
+            list of float: The priority of every task, by index.
+        """
+        priorities = [0] * len(self.tasks)
+        for index in reversed(self.plan.order):
+            downstream = max((priorities[dependent] for dependent in self.plan.dependents[index]), default=0)
+            priorities[index] = task_durations.estimate(self.tasks[index]) + downstream
+        return priorities
+
+    def _by_priority(self, indices):
+        """Sorts task indices by descending priority, keeping configuration order among equal priorities."""
+        return sorted(indices, key=lambda index: -self._priorities[index])
+
+    def _compute_task_keys(self):
+        """
+        Computes for every task a key covering its configuration and, recursively, those of its dependencies, so two
+        jobs only share a task whose result cannot differ between them. Tasks of a cyclic job get no key.
+
+        Returns:
+            list of str or None: The key of every task, by index.
+        """
+        task_keys = [None] * len(self.tasks)
+        for index in self.plan.order:
+            dependency_keys = [task_keys[dependency] for dependency in self.plan.dependencies[index]]
+            content = json.dumps([self.tasks[index], dependency_keys], sort_keys=True)
+            task_keys[index] = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        return task_keys
+
+    def _execute_ready_tasks(self):
+        """
+        Executes the job on the shared worker pool, or on a private one. Tasks without dependencies are submitted up
+        front; every other task is submitted from the completion callback of its last dependency. Returns once no task
+        is in flight or the job deadline has passed.
+        """
+        ready = self._by_priority(index for index, pending in enumerate(self._pending_dependencies)
+                                  if pending == 0 and not self._finished[index])
+        deadline_seconds = self.deadline_seconds or getattr(self.plan, 'deadline_seconds', None)
+        if self.worker_pool is not None:
+            self._pool = self.worker_pool
+        elif self.autoscale:
+            self._pool = AdaptiveWorkerPool(max_workers=self.max_workers)
+        else:
+            self._pool = WorkerPool(self.max_workers)
+        capacities = getattr(self.plan, 'resources', None)
+        self._resources = ResourcePool(capacities, parent=self.resources) if capacities else self.resources
+        deadline_timer = None
+        try:
+            self._job_done.clear()
+            self._in_flight = len(ready)
+            if not ready:
+                self._job_done.set()
+            if deadline_seconds is not None:
+                deadline_timer = timer_queue.schedule(deadline_seconds, self._on_job_deadline, deadline_seconds)
+            for index in ready:
+                self._submit_task(index)
+            self._job_done.wait()
+        finally:
+            if deadline_timer is not None:
+                deadline_timer.cancel()
+            if isinstance(self._pool, AdaptiveWorkerPool):
+                self.scaling_metrics = self._pool.metrics()
+            if self._pool is not self.worker_pool:
+                self._pool.shutdown()
+            self._pool = None
+            self._resources = None
+            self._release_shared_results()
+
         for task in self.tasks:
-            if task.get('dependencies') and self.task_dependencies[task['name']].issubset(self.completed_tasks):
-                dependencies_results = {dep: self.results[dep] for dep in task.get('dependencies', [])}
-                task_handler = TaskHandler(task, dependencies_results)
-                result = task_handler.execute_task()
-                self.results[task['name']] = result
-                self.completed_tasks.add(task['name'])
-                logging.info("\tSequential task %s completed successfully.", task['name'])
+            if task['name'] not in self.completed_tasks and task['name'] not in self.failed_tasks \
+                    and task['name'] not in self.cancelled_tasks:
+                logging.warning("Task %s was not executed because its dependencies did not complete.", task['name'])
+
+    def _submit_task(self, index):
+        """
+        Submits the task at the given index, passing it the results of its dependencies. A task that another job
+        sharing the same SharedTasks has already submitted is not submitted again; its future is reused. A retried
+        shared task is resubmitted by whichever job retries it first. A task whose result is in the result cache is
+        completed with that result instead.
+        """
+        task = self.tasks[index]
+        if self._deadline_expired:
+            self._fail_task(index, TaskTimeoutError(f"Task {task['name']} was not started before the job deadline."))
+            return
+        dependencies_results = {dep: self.results[dep] for dep in task.get('dependencies', [])}
+        try:
+            cached = self._cached_result(index)
+            if cached is not None:
+                # Completed through the regular completion callback; without a timing it is not recorded as executed.
+                future = concurrent.futures.Future()
+                future.set_result((cached.value, None))
+            elif self.shared_tasks is None or self._task_keys[index] is None:
+                future = self._start_task(index, dependencies_results)
+            else:
+                future = self.shared_tasks.submit(self._task_keys[index],
+                                                  functools.partial(self._start_task, index, dependencies_results),
+                                                  failed=self._failed_futures[index])
+        except Exception as exc:
+            logging.error("Task %s could not be submitted: %s", task['name'], exc)
+            self._fail_task(index, exc)
+            return
+        with self._lock:
+            self._futures[index] = future
+            self._arm_timeout(index)
+            deadline_expired = self._deadline_expired
+        if cached is not None:
+            self._complete_cached(index, future)
+            return
+        future.add_done_callback(functools.partial(self._in_job_context, self._on_task_done, index))
+        if deadline_expired:
+            self._expire_task(index, f"Task {task['name']} was started after the job deadline.")
+
+    def _cached_result(self, index):
+        """
+        Computes the cache key of a task whose dependencies all have result digests and looks its result up in the
+        result cache.
+
+        Returns:
+            CachedResult or None: The cached result and its digest, or None if the task is not cached.
+        """
+        task = self.tasks[index]
+        if self.result_cache is None or not task.get('cache', True) or self._cache_keys[index] is not None:
+            return None
+        dependency_digests = {}
+        for dependency in self.plan.dependencies[index]:
+            if self._result_digests[dependency] is None:
+                return None
+            dependency_digests[self.tasks[dependency]['name']] = self._result_digests[dependency]
+        task_class = self.plan.task_classes.get(task['name']) or task_registry.resolve(task['name'])
+        self._cache_keys[index] = task_cache_key(task, task_class, dependency_digests)
+        if self._cache_keys[index] is None:
+            return None
+        cached = self.result_cache.get(self._cache_keys[index])
+        if cached is None:
+            return None
+        self._result_digests[index] = cached.digest
+        self.cached_tasks.add(task['name'])
+        task_logger.info("Task %s is unchanged, reusing its cached result.", task['name'])
+        return cached
+
+    def _complete_cached(self, index, future):
+        """
+        Completes a task whose result came from the result cache. Completing it submits its dependents, which may be
+        cache hits themselves, so the cache hits found while completing one are queued and completed one after another
+        by the outermost call on this thread instead of recursively, however long the chain of unchanged tasks.
+        """
+        pending = getattr(self._cached_hits, 'pending', None)
+        if pending is not None:
+            pending.append((index, future))
+            return
+        self._cached_hits.pending = pending = collections.deque([(index, future)])
+        try:
+            while pending:
+                self._in_job_context(self._on_task_done, *pending.popleft())
+        finally:
+            self._cached_hits.pending = None
+
+    def _start_task(self, index, dependencies_results):
+        """
+        Starts the task at the given index and notes the submission time. A task declaring `resources` first waits,
+        without occupying a worker, until they are free.
+
+        Returns:
+            concurrent.futures.Future: The future of the task, resolving to its result and its TaskTiming.
+
+        Raises:
+            ValueError: If the task requires more of a resource than its capacity.
+        """
+        self._submitted_at[index] = time.time()
+        self._owned[index] = True
+        requirements = self.tasks[index].get('resources')
+        resources = self._resources
+        if not requirements or resources is None:
+            return self._dispatch_task(index, dependencies_results)
+        resources.check(requirements)
+        future = concurrent.futures.Future()
+        future.set_running_or_notify_cancel()
+        resources.acquire(requirements, self._dispatch_with_resources, index, dependencies_results, future, resources,
+                          priority=self._priorities[index])
+        return future
+
+    def _dispatch_with_resources(self, index, dependencies_results, future, resources):
+        """
+        Resource callback: dispatches a task whose resources have been taken and releases them once its call returns,
+        even if the task timed out before. A task that failed while waiting, e.g. at the job deadline, releases them
+        at once.
+        """
+        requirements = self.tasks[index]['resources']
+        if future.done():
+            resources.release(requirements)
+            return
+        try:
+            source = self._dispatch_task(index, dependencies_results)
+        except Exception as exc:
+            resources.release(requirements)
+            try:
+                future.set_exception(exc)
+            except concurrent.futures.InvalidStateError:
+                pass
+            return
+        source.add_done_callback(lambda _: resources.release(requirements))
+        source.add_done_callback(functools.partial(self._copy_outcome, index, future))
+
+    def _dispatch_task(self, index, dependencies_results):
+        """
+        Runs the task at the given index on the worker pool, or on the process pool for tasks configured with
+        `"executor": "process"`. The timeout of a process task counts from its dispatch, and a timed-out process task
+        keeps its worker process busy until it returns.
+
+        Returns:
+            concurrent.futures.Future: The future of the task, resolving to its result and its TaskTiming.
+        """
+        task = self.tasks[index]
+        task_class = self.plan.task_classes.get(task['name'])
+        if task.get('kind') == 'map':
+            return self._dispatch_map(index, task_class or task_registry.resolve(task['name']), dependencies_results)
+        if task.get('executor') == 'process':
+            if self.share_results:
+                dependencies_results = {name: self._shared.share(name, result)
+                                        for name, result in dependencies_results.items()}
+            task_handler = TaskHandler(task, dependencies_results, task_class=task_class,
+                                       share_result=self.share_results)
+            with self._lock:
+                self._started_at[index] = time.monotonic()
+                self._arm_timeout(index)
+            # The handler resolves its own future on timeout; the process pool must not see it already resolved.
+            future = concurrent.futures.Future()
+            future.set_running_or_notify_cancel()
+            get_process_pool().submit(timed_call, task_handler.execute_task).add_done_callback(
+                functools.partial(self._copy_outcome, index, future))
+            return future
+        task_handler = TaskHandler(task, dependencies_results, task_class=task_class)
+        return self._pool.submit_with_priority(self, self._priorities[index], self._in_job_context, self._run_task,
+                                               index, task_handler)
+
+    def _dispatch_map(self, index, task_class, dependencies_results):
+        """
+        Runs a map task over the result of the dependency named by its `over` setting, or of its only dependency, in
+        chunks on the worker pool or, for `"executor": "process"`, on the process pool, keeping twice as many chunks in
+        flight as there are workers. The timeout of a map task counts from its dispatch, and a map task that timed out
+        stops dispatching chunks.
+
+        Returns:
+            concurrent.futures.Future: The future of the map, resolving to its result and its TaskTiming.
+
+        Raises:
+            ValueError: If the map task does not name the dependency it maps over.
+        """
+        task = self.tasks[index]
+        over = task.get('over')
+        if over is None:
+            if len(dependencies_results) != 1:
+                raise ValueError(f"Map task {task['name']} must name the dependency it maps over with `over`.")
+            over = next(iter(dependencies_results))
+        if over not in dependencies_results:
+            raise ValueError(f"Map task {task['name']} maps over {over}, which is not one of its dependencies.")
+        if task.get('executor') == 'process':
+            submit, workers = get_process_pool().submit, os.cpu_count() or 1
+        else:
+            submit = functools.partial(self._pool.submit_with_priority, self, self._priorities[index],
+                                       self._in_job_context)
+            workers = self._pool.max_workers
+        attempt = self._attempts[index]
+        run = MapRun(task_class, materialize(dependencies_results[over]),
+                     chunk_size=task.get('chunk_size', DEFAULT_CHUNK_SIZE), window=2 * workers, submit=submit,
+                     stopped=lambda: self._finished[index] or self._attempts[index] != attempt)
+        with self._lock:
+            self._started_at[index] = time.monotonic()
+            self._arm_timeout(index)
+        return run.start()
+
+    def _in_job_context(self, fn, *args):
+        """Calls `fn` with `args`, attributing the lines it logs to the job. Used on worker and callback threads."""
+        with log_context(job_name=self._job_name):
+            return fn(*args)
+
+    def _copy_outcome(self, index, target, source):
+        """
+        Resolves `target` with the outcome of `source` unless it has been resolved already, e.g. by a timeout. A
+        result returned in shared memory is replaced with a view of it first, so jobs sharing the task never see the
+        handle; the segment of a result that arrives too late is unlinked.
+        """
+        if source.exception() is not None:
+            try:
+                target.set_exception(source.exception())
+            except concurrent.futures.InvalidStateError:
+                pass
+            return
+        result, timing = source.result()
+        if not isinstance(result, SharedBuffer):
+            try:
+                target.set_result((result, timing))
+            except concurrent.futures.InvalidStateError:
+                pass
+            return
+        task_name = self.tasks[index]['name']
+        if target.done():
+            discard(result)
+            return
+        try:
+            target.set_result((self._shared.adopt(task_name, result), timing))
+        except concurrent.futures.InvalidStateError:
+            self._shared.release(task_name)
+
+    def _run_task(self, index, task_handler):
+        """Runs a task on a worker thread, noting the thread and start time its timeout applies to."""
+        with self._lock:
+            self._threads[index] = threading.current_thread()
+            self._started_at[index] = time.monotonic()
+            self._arm_timeout(index)
+        try:
+            return timed_call(task_handler.execute_task)
+        finally:
+            with self._lock:
+                self._threads[index] = None
+
+    def _arm_timeout(self, index):
+        """
+        Schedules the timeout of a task once both its future and its start time are known, whichever comes last.
+        Must be called with the lock held.
+        """
+        timeout = self.tasks[index].get('timeout_seconds')
+        if timeout is None or self._timers[index] is not None or self._futures[index] is None \
+                or self._started_at[index] is None:
+            return
+        delay = self._started_at[index] + timeout - time.monotonic()
+        self._timers[index] = timer_queue.schedule(delay, self._expire_task, index,
+                                                   f"Task {self.tasks[index]['name']} timed out after {timeout} seconds.")
+
+    def _expire_task(self, index, message):
+        """
+        Fails an unfinished task with TaskTimeoutError. A task started by this handler has its future resolved, which
+        also fails it for jobs sharing it, and its worker thread abandoned; a task started by another job is only
+        failed for this job.
+        """
+        with self._lock:
+            if self._finished[index] or self._futures[index] is None:
+                return
+            future, owned, thread = self._futures[index], self._owned[index], self._threads[index]
+        if not owned:
+            self._fail_task(index, TaskTimeoutError(message))
+            return
+        try:
+            # The done callback records the failure.
+            future.set_exception(TaskTimeoutError(message))
+        except concurrent.futures.InvalidStateError:
+            return
+        if thread is not None and self._pool is not None:
+            self._pool.abandon(thread)
+
+    def _on_job_deadline(self, deadline_seconds):
+        """Timer callback: fails every unfinished task once the job deadline has passed."""
+        with self._lock:
+            self._deadline_expired = True
+            in_flight = [index for index, future in enumerate(self._futures)
+                         if future is not None and not self._finished[index]]
+            retrying = [index for index, waiting in enumerate(self._retrying) if waiting]
+        logging.error("Job deadline of %s seconds passed with %d tasks unfinished.", deadline_seconds,
+                      len(in_flight) + len(retrying))
+        for index in in_flight:
+            self._expire_task(index, f"Task {self.tasks[index]['name']} was unfinished at the job deadline of "
+                                     f"{deadline_seconds} seconds.")
+        for index in retrying:
+            self._fail_task(index, TaskTimeoutError(f"Task {self.tasks[index]['name']} was waiting to retry at the "
+                                                    f"job deadline of {deadline_seconds} seconds."))
+
+    def _schedule_retry(self, index, exc):
+        """
+        Schedules another attempt of a failed task if it has retries left and the job deadline has not passed. The
+        task stays in flight while it waits.
+
+        Returns:
+            bool: True if a retry was scheduled.
+        """
+        task = self.tasks[index]
+        retries = task.get('retries', 0)
+        with self._lock:
+            if self._finished[index] or self._deadline_expired or self._attempts[index] >= retries:
+                return False
+            self._attempts[index] += 1
+            attempt = self._attempts[index]
+            delay = task.get('backoff', DEFAULT_BACKOFF) * 2 ** (attempt - 1)
+            jitter = task.get('jitter', 0)
+            delay *= random.uniform(1 - jitter, 1 + jitter)
+            timeout_timer = self._timers[index]
+            self._failed_futures[index] = self._futures[index]
+            self._futures[index] = None
+            self._owned[index] = False
+            self._started_at[index] = None
+            self._threads[index] = None
+            self._retrying[index] = True
+            self._timers[index] = timer_queue.schedule(delay, self._retry_task, index)
+        if timeout_timer is not None:
+            timeout_timer.cancel()
+        logging.warning("Task %s failed: %s. Retry %d of %d in %.2f seconds.", task['name'], exc, attempt, retries,
+                        delay)
+        return True
+
+    def _retry_task(self, index):
+        """Timer callback: resubmits a task whose retry delay has elapsed."""
+        with self._lock:
+            if not self._retrying[index]:
+                return
+            self._retrying[index] = False
+            self._timers[index] = None
+        self._submit_task(index)
+
+    def _on_task_done(self, index, future):
+        """Completion callback: records the outcome and submits every dependent whose last dependency this was."""
+        task_name = self.tasks[index]['name']
+        if future.cancelled():
+            self._fail_task(index, concurrent.futures.CancelledError(f"Task {task_name} was cancelled."))
+            return
+        try:
+            result, timing = future.result()
+        except Exception as exc:
+            timing = getattr(exc, 'task_timing', None)
+            if isinstance(exc, TaskTimeoutError) and self._started_at[index] is not None:
+                wall_time = time.monotonic() - self._started_at[index]
+                thread = self._threads[index]
+                timing = TaskTiming(time.time() - wall_time, wall_time, None, os.getpid(),
+                                    thread.name if thread is not None else 'process pool')
+            self._record_execution(index, timing, 'timeout' if isinstance(exc, TaskTimeoutError) else 'failure')
+            if not self._schedule_retry(index, exc):
+                self._fail_task(index, exc)
+            return
+
+        stored = result
+        if isinstance(result, memoryview) and (self.result_cache is not None or self.run_log is not None):
+            # Memoryviews cannot be pickled; a view of a result in shared memory is cached and checkpointed as bytes.
+            stored = result.tobytes()
+        if self.result_cache is not None and self._result_digests[index] is None:
+            if self._cache_keys[index] is not None:
+                self._result_digests[index] = self.result_cache.put(self._cache_keys[index], stored)
+            else:
+                self._result_digests[index] = result_digest(stored)
+
+        ready = []
+        with self._lock:
+            if self._finished[index]:
+                return
+            self._finished[index] = True
+            timer = self._timers[index]
+            self._futures[index] = None
+            self.results[task_name] = result
+            self.completed_tasks.add(task_name)
+            self._release_dependencies(index)
+            for dependent in self._dependents[index]:
+                self._pending_dependencies[dependent] -= 1
+                if self._pending_dependencies[dependent] == 0:
+                    ready.append(dependent)
+        if timer is not None:
+            timer.cancel()
+        if self.run_log is not None:
+            self.run_log.record(self.tasks[index], stored)
+        self._record_execution(index, timing, 'success')
+        task_logger.info("Task %s completed successfully.", task_name)
+        self._finish_task(index, ready)
+
+    def _fail_task(self, index, exc):
+        """Records a task as failed, cancels every transitive dependent and finishes the task."""
+        task_name = self.tasks[index]['name']
+        with self._lock:
+            if self._finished[index]:
+                return
+            self._finished[index] = True
+            self._retrying[index] = False
+            timer = self._timers[index]
+            self.failed_tasks.add(task_name)
+            if isinstance(exc, TaskTimeoutError):
+                self.timed_out_tasks.add(task_name)
+            self._futures[index] = None
+            self._release_dependencies(index)
+            cancelled = self._cancel_dependents(index)
+        if timer is not None:
+            timer.cancel()
+        logging.error("Task %s generated an exception: %s", task_name, exc)
+        for dependent in cancelled:
+            logging.warning("Task %s cancelled because its dependency %s did not complete.", dependent, task_name)
+        self._finish_task(index, [])
+
+    def _cancel_dependents(self, index):
+        """
+        Marks every task depending on the given task, directly or transitively, as cancelled and releases the
+        results they were waiting for. None of them can have started. Must be called with the lock held.
+
+        Returns:
+            list of str: Names of the newly cancelled tasks.
+        """
+        cancelled = []
+        stack = list(self._dependents[index])
+        while stack:
+            dependent = stack.pop()
+            task_name = self.tasks[dependent]['name']
+            if task_name in self.cancelled_tasks:
+                continue
+            self.cancelled_tasks.add(task_name)
+            cancelled.append(task_name)
+            self._release_dependencies(dependent)
+            stack.extend(self._dependents[dependent])
+        return cancelled
+
+    def _release_dependencies(self, index):
+        """
+        Notes that the task at the given index no longer needs the results of its dependencies, dropping every result
+        whose last consumer it was unless that result is a job output. Must be called with the lock held.
+        """
+        for dependency in self.plan.dependencies[index]:
+            self._pending_consumers[dependency] -= 1
+            if self._pending_consumers[dependency] == 0 and not self._outputs[dependency]:
+                self.results.pop(self.tasks[dependency]['name'], None)
+                self._shared.release(self.tasks[dependency]['name'])
+
+    def _release_shared_results(self):
+        """Copies the results still in shared memory out of it and releases every segment of the job."""
+        for task_name, result in self.results.items():
+            if self._shared.is_shared(task_name):
+                self.results[task_name] = materialize(result)
+        self._shared.close()
+
+    def _record_execution(self, index, timing, outcome):
+        """
+        Records the timing of a task this handler started in the duration estimates and, if configured, the task
+        history and the trace. Tasks shared from another job are recorded by that job's handler.
+        """
+        submitted_at = self._submitted_at[index]
+        if timing is None or submitted_at is None:
+            return
+        task_name = self.tasks[index]['name']
+        if outcome == 'success':
+            task_durations.record(task_name, timing.wall_time)
+        if self.history is not None:
+            self.history.record(task_name, timing.wall_time, timing.cpu_time, max(0.0, timing.started_at - submitted_at),
+                                outcome, self.plan.job_name, timing.started_at)
+        if self.trace is not None:
+            self.trace.record(task_name, timing.started_at, timing.wall_time, timing.worker, timing.process_id,
+                              min(submitted_at, timing.started_at), self.tasks[index].get('dependencies', []), outcome,
+                              self.plan.job_name)
+
+    def _finish_task(self, index, ready):
+        """Submits newly ready dependents and signals the end of the job once nothing is left in flight."""
+        with self._lock:
+            self._in_flight += len(ready) - 1
+            job_done = self._in_flight == 0
+        for dependent in self._by_priority(ready):
+            self._submit_task(dependent)
+        if job_done:
+            self._job_done.set()
+
+    @property
+    def succeeded(self):
+        """Whether every task of the job completed."""
+        return len(self.completed_tasks) == len({task['name'] for task in self.tasks})
 
     def after_job(self):
-        """Logs the completion of all tasks, indicating the job has finished successfully."""
-        logging.info("Job completed successfully.")
+        """Logs the completion of the job, reporting failed, timed-out and cancelled tasks if there are any."""
+        if self.succeeded:
+            logging.info("Job completed successfully.")
+        else:
+            logging.error("Job finished with %d failed (%d timed out) and %d cancelled tasks.", len(self.failed_tasks),
+                          len(self.timed_out_tasks), len(self.cancelled_tasks))
 
     def error_job(self, error):
         """Logs any errors that occur during the job execution."""
         logging.error("Error occurred: %s", error)
     
     def aggregate_results(self):
-        """Aggregates and returns the results from all completed tasks."""
+        """Aggregates and returns the results of the completed output tasks, see `release_results`."""
         return self.results
     
\ No newline at end of file
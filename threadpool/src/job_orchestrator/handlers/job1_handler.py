@@ -46,4 +46,7 @@ class Job1Handler(GenericJobHandler):
         """
         Handle cleanup and finalization after 'Job 1' has been executed.
         """
-        print("Job 1 completed successfully.")
+        if self.succeeded:
+            print("Job 1 completed successfully.")
+        else:
+            super().after_job()
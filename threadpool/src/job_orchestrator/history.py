@@ -0,0 +1,359 @@
+import atexit
+import heapq
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+from job_orchestrator.job_plan import JobPlan
+from job_orchestrator.task_durations import DEFAULT_TASK_DURATION
+
+"""
+This module defines the TaskHistory class, a persistent SQLite store of task executions. Every execution is recorded
+with its job, start time, wall time, CPU time, the time it waited in the queue and its outcome.
+
+Recording only appends to an in-memory queue. A background writer thread drains the queue and inserts the pending
+executions in one transaction per batch, so neither worker threads nor completion callbacks ever wait for the disk.
+The query API reports p50/p95/max wall times per task over a window of recent executions and estimates the makespan
+of a job for a given number of workers, which helps with sizing `max_workers` and spotting regressions.
+
+The store does not grow without bound: after every batch the writer deletes all but the `retention` most recent
+executions of each task in the batch, so the cost of a query depends on the number of tasks, not on how long the
+history has been recorded.
+
+Classes:
+    TaskHistory: Persistent, batched store of task executions with a query API.
+
+Functions:
+    - simulate_makespan: Estimates the makespan of a job from per-task durations by simulating the scheduler.
+    - get_task_history: Returns the shared TaskHistory for a database path, opening it on first use.
+    - close_task_histories: Flushes and closes every shared TaskHistory.
+
+Example usage:
+    history = get_task_history()
+    history.record("jobs.job1.task1", wall_time=1.02, cpu_time=0.01, queue_wait=0.0, job_name="job1")
+    print(history.task_statistics(["jobs.job1.task1"]))
+    print(history.estimate_makespan(tasks, max_workers=4))
+"""
+
+DEFAULT_HISTORY_PATH = Path(__file__).resolve().parent.parent.parent / '.cache' / 'task_history.sqlite3'
+
+# Number of most recent executions per task that statistics are computed over.
+DEFAULT_WINDOW = 1000
+
+# Largest number of executions inserted in one transaction.
+BATCH_SIZE = 512
+
+# Number of most recent executions kept per task; older ones are deleted by the writer.
+DEFAULT_RETENTION = DEFAULT_WINDOW
+
+# Largest number of task names bound in one query, below SQLite's limit on host parameters.
+QUERY_CHUNK_SIZE = 500
+
+# Statistics of the successful executions of a task within the window. Times are in seconds; cpu_time and queue_wait
+# are means.
+TaskStatistics = namedtuple('TaskStatistics', ['count', 'failures', 'p50', 'p95', 'max', 'cpu_time', 'queue_wait'])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS task_executions (
+    id INTEGER PRIMARY KEY,
+    job_name TEXT,
+    task_name TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    wall_time REAL NOT NULL,
+    cpu_time REAL,
+    queue_wait REAL,
+    outcome TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS task_executions_by_task ON task_executions (task_name, id);
+"""
+
+_INSERT = ("INSERT INTO task_executions (job_name, task_name, started_at, wall_time, cpu_time, queue_wait, outcome) "
+           "VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+_SELECT_WINDOW = """
+SELECT task_name, wall_time, cpu_time, queue_wait, outcome FROM (
+    SELECT task_name, wall_time, cpu_time, queue_wait, outcome,
+           ROW_NUMBER() OVER (PARTITION BY task_name ORDER BY id DESC) AS recency
+    FROM task_executions {where}
+) WHERE recency <= ?
+"""
+
+_PRUNE = """
+DELETE FROM task_executions WHERE task_name = ? AND id <= (
+    SELECT id FROM task_executions WHERE task_name = ? ORDER BY id DESC LIMIT 1 OFFSET ?
+)
+"""
+
+_CLOSE = object()
+
+_histories = {}
+_histories_lock = threading.Lock()
+
+
+def _percentile(sorted_values, percent):
+    """Returns the nearest-rank percentile of an ascending list of values."""
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def simulate_makespan(tasks, durations, max_workers):
+    """
+    Estimates the makespan of a job by simulating its execution on `max_workers` workers, starting ready tasks in
+    critical-path order the way GenericJobHandler does.
+
+    Args:
+        tasks (list of dict): The task configurations of the job.
+        durations (dict): Maps task names to their estimated durations in seconds.
+        max_workers (int): Number of workers.
+
+    Returns:
+        float: The estimated makespan in seconds.
+
+    Raises:
+        ValueError: If the job has cyclic dependencies.
+    """
+    plan = JobPlan(tasks)
+    if plan.cycle:
+        raise ValueError(f"Cyclic dependencies detected: {' -> '.join(plan.cycle)}.")
+
+    costs = [durations[name] for name in plan.task_names]
+    priorities = [0] * len(costs)
+    for index in reversed(plan.order):
+        priorities[index] = costs[index] + max((priorities[dependent] for dependent in plan.dependents[index]),
+                                               default=0)
+
+    pending = list(plan.dependency_counts)
+    ready = [(-priorities[index], index) for index, count in enumerate(pending) if count == 0]
+    heapq.heapify(ready)
+    running = []
+    now = 0.0
+    while ready or running:
+        while ready and len(running) < max_workers:
+            _, index = heapq.heappop(ready)
+            heapq.heappush(running, (now + costs[index], index))
+        now, index = heapq.heappop(running)
+        for dependent in plan.dependents[index]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                heapq.heappush(ready, (-priorities[dependent], dependent))
+    return now
+
+
+class TaskHistory:
+    """
+    Persistent store of task executions in a local SQLite database, written in batches by a background thread.
+    """
+
+    def __init__(self, path=None, retention=DEFAULT_RETENTION):
+        """
+        Opens the database, creating it if necessary, and starts the writer thread.
+
+        Args:
+            path (str or Path, optional): Database file. Defaults to DEFAULT_HISTORY_PATH.
+            retention (int): Number of most recent executions kept per task.
+        """
+        self.path = Path(path or DEFAULT_HISTORY_PATH)
+        self.retention = max(1, retention)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        try:
+            # Write-ahead logging lets queries read while the writer thread inserts.
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+        finally:
+            connection.close()
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write, name='task-history-writer', daemon=True)
+        self._writer.start()
+
+    def record(self, task_name, wall_time, cpu_time=None, queue_wait=None, outcome='success', job_name=None,
+               started_at=None):
+        """
+        Queues one task execution for writing. Never blocks on the database.
+
+        Args:
+            task_name (str): Fully qualified task module name.
+            wall_time (float): Wall time of the execution in seconds.
+            cpu_time (float, optional): CPU time of the execution in seconds.
+            queue_wait (float, optional): Time between submission and start in seconds.
+            outcome (str): 'success', 'failure' or 'timeout'.
+            job_name (str, optional): Name of the job the task ran in.
+            started_at (float, optional): Start time in seconds since the epoch. Defaults to now minus the wall time.
+        """
+        if started_at is None:
+            started_at = time.time() - wall_time
+        self._queue.put((job_name, task_name, started_at, wall_time, cpu_time, queue_wait, outcome))
+
+    def _write(self):
+        """
+        Writer thread loop: inserts queued executions in batches, and deletes the executions of the batch's tasks
+        beyond the retention, until the history is closed.
+        """
+        connection = sqlite3.connect(self.path)
+        try:
+            while True:
+                item = self._queue.get()
+                batch = []
+                signals = []
+                while True:
+                    if isinstance(item, tuple):
+                        batch.append(item)
+                    else:
+                        signals.append(item)
+                    if len(batch) >= BATCH_SIZE or item is _CLOSE:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if batch:
+                    try:
+                        with connection:
+                            connection.executemany(_INSERT, batch)
+                            connection.executemany(_PRUNE, ((task_name, task_name, self.retention) for task_name
+                                                            in dict.fromkeys(item[1] for item in batch)))
+                    except sqlite3.Error as exception:
+                        logging.error("Could not write %d task executions to %s: %s", len(batch), self.path,
+                                      exception)
+                for signal in signals:
+                    if signal is not _CLOSE:
+                        signal.set()
+                if _CLOSE in signals:
+                    return
+        finally:
+            connection.close()
+
+    def flush(self, timeout=None):
+        """
+        Waits until every execution recorded so far has been written.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if the pending executions were written within the timeout.
+        """
+        if self._closed:
+            return True
+        written = threading.Event()
+        self._queue.put(written)
+        return written.wait(timeout)
+
+    def close(self):
+        """Writes the pending executions and stops the writer thread."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_CLOSE)
+            self._writer.join()
+
+    def task_statistics(self, task_names=None, window=DEFAULT_WINDOW, flush=True):
+        """
+        Returns wall time percentiles and mean CPU and queue-wait times of tasks over their most recent executions.
+        The tasks are queried QUERY_CHUNK_SIZE names at a time.
+
+        Args:
+            task_names (iterable of str, optional): Tasks to report. Defaults to every recorded task.
+            window (int): Number of most recent executions per task to include.
+            flush (bool): Whether pending executions are written first. Without it the statistics may miss the
+                          executions recorded in the last moments.
+
+        Returns:
+            dict: Maps task names to TaskStatistics. Tasks without successful executions have None for every time.
+        """
+        if flush:
+            self.flush()
+        if task_names is None:
+            queries = [("", [])]
+        else:
+            names = list(dict.fromkeys(task_names))
+            queries = [(f"WHERE task_name IN ({', '.join('?' * len(chunk))})", chunk)
+                       for chunk in (names[start:start + QUERY_CHUNK_SIZE]
+                                     for start in range(0, len(names), QUERY_CHUNK_SIZE))]
+        rows = []
+        connection = sqlite3.connect(self.path)
+        try:
+            for where, parameters in queries:
+                rows.extend(connection.execute(_SELECT_WINDOW.format(where=where), parameters + [window]))
+        finally:
+            connection.close()
+
+        executions = {}
+        for task_name, wall_time, cpu_time, queue_wait, outcome in rows:
+            executions.setdefault(task_name, []).append((wall_time, cpu_time, queue_wait, outcome))
+
+        statistics = {}
+        for task_name, task_executions in executions.items():
+            succeeded = [execution for execution in task_executions if execution[3] == 'success']
+            failures = len(task_executions) - len(succeeded)
+            if not succeeded:
+                statistics[task_name] = TaskStatistics(len(task_executions), failures, None, None, None, None, None)
+                continue
+            wall_times = sorted(execution[0] for execution in succeeded)
+            cpu_times = [execution[1] for execution in succeeded if execution[1] is not None]
+            queue_waits = [execution[2] for execution in succeeded if execution[2] is not None]
+            statistics[task_name] = TaskStatistics(
+                len(task_executions), failures, _percentile(wall_times, 50), _percentile(wall_times, 95),
+                wall_times[-1], sum(cpu_times) / len(cpu_times) if cpu_times else None,
+                sum(queue_waits) / len(queue_waits) if queue_waits else None)
+        return statistics
+
+    def estimate_makespan(self, tasks, max_workers, percentile='p50', window=DEFAULT_WINDOW):
+        """
+        Estimates the makespan of a job for a number of workers from the recorded task durations. Tasks without
+        history fall back to their `estimated_duration` setting or DEFAULT_TASK_DURATION.
+
+        Args:
+            tasks (list of dict): The task configurations of the job.
+            max_workers (int): Number of workers.
+            percentile (str): Statistic used as task duration, 'p50', 'p95' or 'max'.
+            window (int): Number of most recent executions per task to include.
+
+        Returns:
+            float: The estimated makespan in seconds.
+
+        Raises:
+            ValueError: If the job has cyclic dependencies.
+        """
+        statistics = self.task_statistics((task['name'] for task in tasks), window)
+        durations = {}
+        for task in tasks:
+            recorded = statistics.get(task['name'])
+            duration = getattr(recorded, percentile) if recorded is not None else None
+            if duration is None:
+                duration = task.get('estimated_duration', DEFAULT_TASK_DURATION)
+            durations[task['name']] = duration
+        return simulate_makespan(tasks, durations, max_workers)
+
+
+def get_task_history(path=None):
+    """
+    Returns the TaskHistory shared by the whole process for a database path, opening it on first use.
+
+    Args:
+        path (str or Path, optional): Database file. Defaults to DEFAULT_HISTORY_PATH.
+
+    Returns:
+        TaskHistory: The shared task history.
+    """
+    path = Path(path or DEFAULT_HISTORY_PATH).resolve()
+    with _histories_lock:
+        history = _histories.get(path)
+        if history is None:
+            history = _histories[path] = TaskHistory(path)
+        return history
+
+
+def close_task_histories():
+    """Flushes and closes every shared TaskHistory."""
+    with _histories_lock:
+        histories = list(_histories.values())
+        _histories.clear()
+    for history in histories:
+        history.close()
+
+
+atexit.register(close_task_histories)
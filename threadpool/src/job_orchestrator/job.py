@@ -1,15 +1,51 @@
+import concurrent.futures
 import json
 import logging
+import threading
+import time
+from collections import namedtuple
 from pathlib import Path
 from jsonschema import validate, ValidationError
-from job_orchestrator.utilities import has_cyclic_dependencies, setup_logging
+from job_orchestrator.checkpoint import RunLog, new_run_id
+from job_orchestrator.history import get_task_history
+from job_orchestrator.job_plan import JobPlan, load_cached_plans, plan_cache_key, resolve_task_classes, store_cached_plans
+from job_orchestrator.resources import ResourcePool
+from job_orchestrator.task_durations import task_durations
+from job_orchestrator.utilities import analyze_dependencies, setup_logging
 from job_orchestrator.task_handler import TaskHandler
+from job_orchestrator.worker_pool import AdaptiveWorkerPool, SharedTasks, WorkerPool
 
 """
 This module defines the JobOrchestrator class, which orchestrates the execution of jobs based on configurations
 specified in JSON files. These configurations are validated against a JSON schema to ensure they meet the required
 format. The orchestrator handles job execution, including the management of task dependencies and error handling.
 
+Every job is compiled once into a JobPlan holding the validated tasks, integer-indexed dependency arrays, a
+topological order and the resolved task classes. Validated configurations and compiled plans are cached in-process
+and on disk, keyed by the content hash of the configuration and schema, so repeated runs of the same job skip schema
+validation, cycle detection and task module validation.
+
+Several jobs can run at once through start_jobs. They share one bounded WorkerPool, which interleaves their tasks
+fairly and caps the total concurrency, and identical tasks that appear in more than one of the jobs run only once.
+An orchestrator created with `autoscale=True` sizes that pool, and the private pool of every single job, to the load
+with an AdaptiveWorkerPool instead of using a fixed number of threads.
+
+An orchestrator created with `resources`, e.g. `{"db": 4}`, shares one ResourcePool of those capacities between every
+job it runs, so tasks declaring `"resources": {"db": 1}` never hold more than four connections at once, whichever jobs
+they belong to. A job's own `resources` setting adds capacities that apply to its tasks only.
+
+Every task execution is recorded in a persistent TaskHistory. The first time a job starts, the median durations
+recorded in the history seed the duration estimates used for critical-path scheduling, so a fresh process schedules
+as well as a warmed-up one. Later starts reuse the estimates; once they are DURATIONS_TTL seconds old they are
+refreshed from the history by a background thread, so starting a job does not wait on the history again.
+
+An orchestrator created with a ResultCache runs jobs incrementally: tasks whose class source, configuration and
+dependency results are unchanged since an earlier run reuse their cached results instead of executing.
+
+An orchestrator created with `checkpoints=True` gives every job run a run ID and checkpoints every task completion to
+the run's write-ahead log. If the process dies mid-job, resume(run_id) executes only the tasks that had not completed.
+The log of a run is removed once every task of the run has completed.
+
 The JobOrchestrator is particularly useful in environments where job configurations need to be dynamically loaded
 and validated against a set of rules defined in a schema. It supports logging configuration, path resolution,
 job loading, and execution with robust error management.
@@ -20,17 +56,34 @@ Classes:
 Dependencies:
     - json: Used for loading and parsing JSON files.
     - logging: Used to log information, warnings, and errors.
+    - threading, time: Used to refresh the duration estimates of a job in the background once they are stale.
     - pathlib.Path: Used for file path manipulations.
     - jsonschema.validate, ValidationError: Used for validating JSON data against a schema.
-    - .utilities.has_cyclic_dependencies, setup_logging: Utility functions for checking task dependencies and setting up logging.
+    - .job_plan: Used for compiling jobs into plans and caching them by configuration content.
+    - .resources.ResourcePool: Used for limiting how many tasks using a resource run at once across all jobs.
+    - .checkpoint.RunLog, new_run_id: Used for checkpointing task completions of a run and resuming interrupted runs.
+    - .history.get_task_history: Used for recording task executions and reading recorded task durations.
+    - .task_durations.task_durations: Used for seeding duration estimates from the task history.
+    - .utilities.analyze_dependencies, setup_logging: Utility functions for checking task dependencies and setting up logging.
     - .task_handler.TaskHandler: Used for executing tasks specified in the job configuration.
+    - .worker_pool.WorkerPool, AdaptiveWorkerPool, SharedTasks: Used for running several jobs on one bounded or
+      self-sizing pool of worker threads.
 
 Example usage:
     # Assuming the module is part of a package and the necessary JSON files are in the 'config' directory.
     orchestrator = JobOrchestrator("config/job_config.json", "config/job_schema.json")
     orchestrator.start_job("example_job")
+    orchestrator.start_jobs(["job1", "job2"], max_workers=8)
 """
 
+# Seconds after which the duration estimates of a job's tasks are refreshed from the task history.
+DURATIONS_TTL = 300
+
+# The outcome reported by the handler of a job started through start_jobs, and the ID of its run when checkpoints are
+# enabled, None otherwise. A run whose outcome is not True can be continued with resume(run_id).
+JobRun = namedtuple('JobRun', ['outcome', 'run_id'])
+
+
 class JobOrchestrator:
     """
     Orchestrates the execution of jobs based on configurations specified in a JSON file,
@@ -40,16 +93,28 @@ class JobOrchestrator:
         config_path (str): Path to the job configuration file.
         schema_path (str): Path to the JSON schema file for validation.
         jobs (dict): Loaded and validated job configurations.
+        plans (dict): Compiled job plans by job name, shared with every orchestrator using the same configuration.
+        history (TaskHistory): Store in which every task execution is recorded.
+        result_cache (ResultCache or None): Store from which unchanged tasks reuse their results, if any.
+        checkpoints (bool): Whether task completions are checkpointed so interrupted runs can be resumed.
+        run_dir (str or None): Directory of the run logs.
+        trace (TaskTrace or None): Collection in which a span of every task attempt is recorded, if any.
     
     Methods:
         __init__(self, config_path, schema_path, log_level): Initializes the JobOrchestrator.
         _resolve_paths(self, config_path, schema_path): Resolves and returns the full paths to the configuration and schema files.
         _load_jobs(self): Loads and validates jobs from the configuration file using the schema.
         _validate_paths(self): Validates the existence of the configuration and schema files.
-        start_job(self, job_name): Starts the execution of a specified job by name.
+        start_job(self, job_name, run_id): Starts the execution of a specified job by name.
+        resume(self, run_id): Continues an interrupted run, executing only the tasks that had not completed.
+        start_jobs(self, job_names, worker_pool, max_workers): Runs several jobs concurrently on one shared worker pool.
+        estimate_makespan(self, job_name, max_workers, percentile): Estimates a job's makespan from the task history.
+        _get_job_plan(self, job_name, job): Returns the cached plan for a job, compiling it on first use.
+        preload(self): Resolves the task classes of every configured job in parallel.
     """
     
-    def __init__(self, config_path=None, schema_path=None, log_level=logging.INFO):
+    def __init__(self, config_path=None, schema_path=None, log_level=logging.INFO, plan_cache_dir=None, history=None,
+                 result_cache=None, checkpoints=False, run_dir=None, trace=None, autoscale=False, resources=None):
         """
         Initializes the JobOrchestrator with optional paths to the configuration and schema files.
         
@@ -57,6 +122,15 @@ class JobOrchestrator:
             config_path (str, optional): Path to the job configuration file. Defaults to 'config/job_config.json'.
             schema_path (str, optional): Path to the JSON schema file for validation. Defaults to 'config/job_schema.json'.
             log_level (int): Logging level to use.
+            plan_cache_dir (str, optional): Directory for the on-disk job plan cache. Defaults to '.cache/job_plans'.
+            history (TaskHistory, optional): Store for task executions. Defaults to the shared history in
+                                             '.cache/task_history.sqlite3'.
+            result_cache (ResultCache, optional): Store of task results for incremental re-runs. Disabled by default.
+            checkpoints (bool): Whether task completions of every run are checkpointed to a write-ahead log.
+            run_dir (str, optional): Directory of the run logs. Defaults to '.cache/runs'.
+            trace (TaskTrace, optional): Collection of task spans for a Chrome trace of the runs. Disabled by default.
+            autoscale (bool): Whether jobs run on worker pools that grow and shrink with the load.
+            resources (dict, optional): Capacities of the resources tasks declare, shared by every job.
         """
         setup_logging(log_level)
         
@@ -65,6 +139,16 @@ class JobOrchestrator:
         schema_path = schema_path if schema_path is not None else 'config/job_schema.json'
         
         # Resolve paths and load jobs
+        self.plan_cache_dir = plan_cache_dir
+        self.history = history or get_task_history()
+        self.result_cache = result_cache
+        self.checkpoints = checkpoints
+        self.run_dir = run_dir
+        self.trace = trace
+        self.autoscale = autoscale
+        self.resources = ResourcePool(resources) if resources else None
+        self._durations_loaded_at = {}
+        self._durations_lock = threading.Lock()
         self.config_path, self.schema_path = self._resolve_paths(config_path, schema_path)
         self.jobs = self._load_jobs()
   
@@ -87,6 +171,7 @@ class JobOrchestrator:
     def _load_jobs(self):
         """
         Loads and validates jobs from the configuration file using the schema. Raises exceptions if any errors occur during loading or validation.
+        Validation is skipped when the same configuration and schema content has already been validated.
         
         Returns:
             dict: The loaded and validated job configurations.
@@ -101,7 +186,15 @@ class JobOrchestrator:
                 jobs = json.load(file)
             with self.schema_path.open('r') as schema_file:
                 schema = json.load(schema_file)
-            validate(instance=jobs, schema=schema)
+            self.cache_key = plan_cache_key(jobs, schema)
+            cached = load_cached_plans(self.cache_key, self.plan_cache_dir)
+            if cached is None:
+                validate(instance=jobs, schema=schema)
+                cached = {'jobs': jobs, 'plans': {}}
+                store_cached_plans(self.cache_key, cached, self.plan_cache_dir)
+            else:
+                logging.debug("Using cached job configuration %s.", self.cache_key)
+            self.plans = cached['plans']
         except json.JSONDecodeError as exception:
             logging.error("Error decoding JSON: %s", exception)
             raise
@@ -124,15 +217,20 @@ class JobOrchestrator:
             logging.error("Schema file %s not found.", self.schema_path)
             raise FileNotFoundError(f"Schema file {self.schema_path} not found.")
 
-    def start_job(self, job_name):
+    def start_job(self, job_name, run_id=None, max_workers=None):
         """
-        Starts the execution of a specified job by name. Validates the existence of the job in the configuration and checks for cyclic dependencies.
+        Starts the execution of a specified job by name. Validates the existence of the job in the configuration and
+        executes its compiled plan. With checkpoints enabled the run is logged under `run_id`, or a new run ID.
         
         Args:
             job_name (str): The name of the job to start.
+            run_id (str, optional): ID of the run, used to resume it if it is interrupted.
+            max_workers (int, optional): Size of the job's worker pool, or its ceiling if the orchestrator autoscales.
+                                         Defaults to the handler's default.
         
         Raises:
-            ValueError: If the job is not found in the configuration or if cyclic dependencies are detected.
+            ValueError: If the job is not found in the configuration, if cyclic dependencies are detected or if a
+                        task module is invalid.
         """
         job = self.jobs.get('jobs', {}).get(job_name)
         if not job:
@@ -146,10 +244,230 @@ class JobOrchestrator:
         else:
             logging.info("Handler for job %s is set to %s.", job_name, handler_name)
 
+        plan = self._get_job_plan(job_name, job)
+        self._load_task_durations([plan])
+
+        run_log = RunLog.create(job_name, run_id, self.run_dir) if self.checkpoints else None
+        return self._execute_run(run_log, TaskHandler().execute_job, handler_name, plan.tasks, plan=plan,
+                                 history=self.history, result_cache=self.result_cache, trace=self.trace,
+                                 autoscale=self.autoscale, resources=self.resources, max_workers=max_workers)
+
+    def resume(self, run_id, max_workers=None):
+        """
+        Continues a run that was interrupted, e.g. because the process died. The tasks its log records as completed
+        are restored with their results; only the remaining tasks, and any task whose configuration changed since,
+        are executed.
+
+        Args:
+            run_id (str): ID of the interrupted run.
+            max_workers (int, optional): Size of the run's worker pool, or its ceiling if the orchestrator autoscales.
+                                         Defaults to the handler's default.
+
+        Returns:
+            The outcome reported by the job handler.
+
+        Raises:
+            ValueError: If the run does not exist or its job is no longer in the configuration.
+        """
+        run_log = RunLog.open(run_id, self.run_dir)
+        job = self.jobs.get('jobs', {}).get(run_log.job_name)
+        if not job:
+            run_log.close()
+            logging.error("Job %s of run %s not found in configuration.", run_log.job_name, run_id)
+            raise ValueError(f"Job {run_log.job_name} of run {run_id} not found in configuration.")
+        logging.info("Resuming run %s of job %s with %d completed tasks.", run_id, run_log.job_name,
+                     len(run_log.completed))
+
+        plan = self._get_job_plan(run_log.job_name, job)
+        self._load_task_durations([plan])
+        handler_name = job.get('handler', 'job_orchestrator.handlers.generic_job_handler')
+        return self._execute_run(run_log, TaskHandler().execute_job, handler_name, plan.tasks, plan=plan,
+                                 history=self.history, result_cache=self.result_cache, trace=self.trace,
+                                 autoscale=self.autoscale, resources=self.resources, max_workers=max_workers)
+
+    def _execute_run(self, run_log, execute_job, *args, **handler_options):
+        """
+        Executes a job with its run log, if any, and closes the log afterwards. The log of a run whose tasks all
+        completed is removed; otherwise it is kept so the run can be resumed.
+
+        Returns:
+            The outcome reported by the job handler.
+        """
+        if run_log is None:
+            return execute_job(*args, **handler_options)
+        logging.info("Starting run %s of job %s.", run_log.run_id, run_log.job_name)
+        outcome = None
+        try:
+            outcome = execute_job(*args, run_log=run_log, **handler_options)
+        finally:
+            run_log.close(delete=outcome is True)
+            if outcome is not True:
+                logging.warning("Run %s of job %s did not complete and can be resumed.", run_log.run_id,
+                                run_log.job_name)
+        return outcome
+
+    def start_jobs(self, job_names, worker_pool=None, max_workers=None):
+        """
+        Runs several jobs concurrently on one shared, bounded worker pool. Every job is compiled and validated before
+        any of them starts. Tasks with the same configuration and dependency tree in several of the jobs, such as a
+        common first stage, are executed once and their result is delivered to every job.
+
+        Args:
+            job_names (list of str): Names of the jobs to run.
+            worker_pool (WorkerPool, optional): Long-lived pool to run the jobs on. If omitted, a pool is created for
+                                                this call and shut down when all jobs have finished.
+            max_workers (int, optional): Size of the pool created when `worker_pool` is omitted, or its ceiling if the
+                                         orchestrator autoscales.
+
+        Returns:
+            dict: Maps every job name to a JobRun with the outcome reported by its handler and its run ID.
+
+        Raises:
+            ValueError: If a job is not found in the configuration, has cyclic dependencies or invalid task modules.
+        """
+        job_names = list(dict.fromkeys(job_names))
+        plans = {}
+        for job_name in job_names:
+            job = self.jobs.get('jobs', {}).get(job_name)
+            if not job:
+                logging.error("Job %s not found in configuration.", job_name)
+                raise ValueError(f"Job {job_name} not found in configuration.")
+            plans[job_name] = self._get_job_plan(job_name, job)
+        self._load_task_durations(plans.values())
+
+        if worker_pool is not None:
+            pool = worker_pool
+        elif self.autoscale:
+            pool = AdaptiveWorkerPool(max_workers=max_workers)
+        else:
+            pool = WorkerPool(max_workers)
+        shared_tasks = SharedTasks()
+        run_ids = {job_name: new_run_id() if self.checkpoints else None for job_name in plans}
+        try:
+            # Each job is coordinated by its own thread, which only waits on completions; the tasks themselves run
+            # on the shared worker pool.
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(job_names) or 1,
+                                                       thread_name_prefix='job-coordinator') as coordinators:
+                futures = {
+                    job_name: coordinators.submit(
+                        self._execute_run,
+                        RunLog.create(job_name, run_ids[job_name], self.run_dir) if self.checkpoints else None,
+                        TaskHandler().execute_job, plan.handler_name or 'job_orchestrator.handlers.generic_job_handler',
+                        plan.tasks, plan=plan, worker_pool=pool, shared_tasks=shared_tasks, history=self.history,
+                        result_cache=self.result_cache, trace=self.trace, resources=self.resources)
+                    for job_name, plan in plans.items()
+                }
+                runs = {job_name: JobRun(future.result(), run_ids[job_name]) for job_name, future in futures.items()}
+        finally:
+            if pool is not worker_pool:
+                pool.shutdown()
+        for job_name, run in runs.items():
+            logging.info("Job %s finished with outcome %s.", job_name, run.outcome)
+        return runs
+
+    def _load_task_durations(self, plans):
+        """
+        Seeds the duration estimates of the tasks of the given plans with their median durations from the task history.
+        The history is read before the first run of a plan only; the estimates of a plan loaded more than
+        DURATIONS_TTL seconds ago are refreshed by a background thread while the job runs.
+        """
+        now = time.monotonic()
+        with self._durations_lock:
+            unloaded, stale = [], []
+            for plan in plans:
+                loaded = self._durations_loaded_at.get(plan.job_name)
+                if loaded is None or loaded[0] is not plan:
+                    unloaded.append(plan)
+                elif now - loaded[1] >= DURATIONS_TTL:
+                    stale.append(plan)
+                else:
+                    continue
+                self._durations_loaded_at[plan.job_name] = (plan, now)
+        if unloaded:
+            self._read_task_durations(unloaded)
+        if stale:
+            threading.Thread(target=self._read_task_durations, args=(stale,), name='task-durations-refresh',
+                             daemon=True).start()
+
+    def _read_task_durations(self, plans):
+        """
+        Loads the median durations of the tasks of the given plans from the task history into the duration estimates.
+        Executions still waiting to be written are not waited for: those of this process are already part of the
+        estimates. A history that cannot be read only costs the estimates.
+        """
+        try:
+            statistics = self.history.task_statistics((name for plan in plans for name in plan.task_names),
+                                                      flush=False)
+        except Exception as exception:
+            logging.warning("Could not read task history: %s", exception)
+            return
+        task_durations.load({name: stats.p50 for name, stats in statistics.items() if stats.p50 is not None})
+
+    def estimate_makespan(self, job_name, max_workers, percentile='p50'):
+        """
+        Estimates the makespan of a job for a number of workers from the task durations recorded in the history.
+
+        Args:
+            job_name (str): The name of the job.
+            max_workers (int): Number of workers.
+            percentile (str): Statistic used as task duration, 'p50', 'p95' or 'max'.
+
+        Returns:
+            float: The estimated makespan in seconds.
+
+        Raises:
+            ValueError: If the job is not found in the configuration or has cyclic dependencies.
+        """
+        job = self.jobs.get('jobs', {}).get(job_name)
+        if not job:
+            logging.error("Job %s not found in configuration.", job_name)
+            raise ValueError(f"Job {job_name} not found in configuration.")
+        return self.history.estimate_makespan(job.get('tasks', []), max_workers, percentile)
+
+    def preload(self):
+        """
+        Warms the task registry with the task classes of every configured job, importing their modules in parallel,
+        so the first execution of each task does not pay for the import.
+
+        Raises:
+            ValueError: If a task module is invalid.
+        """
+        resolve_task_classes(task['name'] for job in self.jobs.get('jobs', {}).values() for task in job.get('tasks', []))
+
+    def _get_job_plan(self, job_name, job):
+        """
+        Returns the compiled plan for a job, compiling and caching it on first use. Compilation checks for cyclic
+        dependencies and resolves every task class.
+
+        Args:
+            job_name (str): The name of the job.
+            job (dict): The job configuration.
+
+        Returns:
+            JobPlan: The compiled job plan.
+
+        Raises:
+            ValueError: If cyclic dependencies are detected or if a task module is invalid.
+        """
+        plan = self.plans.get(job_name)
+        if plan is not None:
+            return plan
+
         tasks = job.get('tasks', [])
-        if has_cyclic_dependencies(tasks):
-            logging.error("Cyclic dependencies detected in job %s.", job_name)
-            raise ValueError(f"Cyclic dependencies detected in job {job_name}.")
+        analysis = analyze_dependencies(tasks)
+        if analysis.cycle:
+            cycle_path = " -> ".join(analysis.cycle)
+            logging.error("Cyclic dependencies detected in job %s: %s.", job_name, cycle_path)
+            raise ValueError(f"Cyclic dependencies detected in job {job_name}: {cycle_path}.")
+
+        try:
+            task_classes = resolve_task_classes(task['name'] for task in tasks)
+        except ValueError as exception:
+            logging.error("Validation failed for job %s: %s", job_name, exception)
+            raise ValueError(f"Validation failed for job {job_name}: {exception}") from exception
 
-        task_handler = TaskHandler()
-        task_handler.execute_job(handler_name, tasks)
+        plan = JobPlan(tasks, job_name, job.get('handler'), task_classes, analysis, job.get('deadline_seconds'),
+                       job.get('resources'))
+        self.plans[job_name] = plan
+        store_cached_plans(self.cache_key, {'jobs': self.jobs, 'plans': self.plans}, self.plan_cache_dir)
+        return plan
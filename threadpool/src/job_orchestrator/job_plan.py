@@ -0,0 +1,221 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+from job_orchestrator.task_registry import task_registry
+from job_orchestrator.utilities import analyze_dependencies
+
+"""
+This module defines the JobPlan class, the compiled form of a single job, and a content-addressed cache of compiled
+configurations. A plan holds the validated task list, integer-indexed dependency arrays, a topological order, depth
+levels and the resolved task classes, so a job can be scheduled without re-validating or re-importing anything.
+
+Compiled configurations are cached in-process and on disk, keyed by a hash of the job configuration and schema
+content. Another orchestrator, or another process, loading the same configuration therefore skips schema validation,
+cycle detection and task module validation entirely. Editing either file changes the key, so stale plans are never
+used. Disk entries are pickles and must only be read from a trusted, local cache directory.
+
+Classes:
+    JobPlan: Compiled, scheduler-ready representation of a job.
+
+Functions:
+    - plan_cache_key: Computes the cache key for a configuration and schema.
+    - resolve_task_classes: Resolves task names to their task classes through the process-wide task registry.
+    - load_cached_plans: Returns a cached compiled configuration from memory or disk.
+    - store_cached_plans: Stores a compiled configuration in memory and on disk.
+    - clear_plan_cache: Clears the in-process cache and, optionally, the disk cache.
+
+Example usage:
+    plan = JobPlan(tasks, job_name="job1", handler_name="job_orchestrator.handlers.generic_job_handler")
+    for index in plan.order:
+        print(plan.task_names[index], plan.levels[index], plan.dependencies[index])
+"""
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent.parent / '.cache' / 'job_plans'
+
+# Bump whenever the pickled layout of JobPlan changes so old disk entries are ignored.
+PLAN_FORMAT_VERSION = 3
+
+_memory_cache = {}
+_cache_lock = threading.Lock()
+
+
+class JobPlan:
+    """
+    Compiled, scheduler-ready representation of a job. Tasks are addressed by their position in `tasks`.
+
+    Attributes:
+        job_name (str): Name of the job in the configuration, if known.
+        handler_name (str): Module of the handler that executes the job, if known.
+        tasks (list of dict): The task configurations, in configuration order.
+        task_names (list of str): Name of every task, by index.
+        task_index (dict): Maps task names to their index.
+        dependencies (list of list of int): Indices of the dependencies of every task that are part of the job.
+        dependency_counts (list of int): Number of distinct dependencies of every task, including unknown ones.
+        dependents (list of list of int): Indices of the tasks depending on every task.
+        cycle (list of str or None): The cycle path if the dependencies are cyclic.
+        order (list of int): Task indices in topological order. Empty if the dependencies are cyclic.
+        levels (list of int): Depth level of every task. All zero if the dependencies are cyclic.
+        task_classes (dict): Maps task names to their resolved task classes, if they have been resolved.
+        deadline_seconds (float or None): Time after which unfinished tasks of the job fail, if configured.
+        resources (dict or None): Capacities of the resources the tasks of the job use, if configured.
+    """
+
+    def __init__(self, tasks, job_name=None, handler_name=None, task_classes=None, analysis=None,
+                 deadline_seconds=None, resources=None):
+        """
+        Compiles the dependency arrays of a list of tasks.
+
+        Args:
+            tasks (list of dict): A list of task dictionaries, each containing a 'name' and optional 'dependencies'.
+            job_name (str, optional): Name of the job in the configuration.
+            handler_name (str, optional): Module of the handler that executes the job.
+            task_classes (dict, optional): Resolved task classes, by task name.
+            analysis (DependencyAnalysis, optional): Result of analyze_dependencies for `tasks`, if already computed.
+            deadline_seconds (float, optional): The job deadline from the configuration.
+            resources (dict, optional): The resource capacities from the configuration.
+        """
+        analysis = analysis or analyze_dependencies(tasks)
+        self.job_name = job_name
+        self.handler_name = handler_name
+        self.tasks = tasks
+        self.task_names = [task['name'] for task in tasks]
+        self.task_index = {name: index for index, name in enumerate(self.task_names)}
+        self.dependencies = []
+        self.dependency_counts = []
+        self.dependents = [[] for _ in tasks]
+
+        for index, task in enumerate(tasks):
+            dependency_names = dict.fromkeys(task.get('dependencies', []))
+            known = [self.task_index[name] for name in dependency_names if name in self.task_index]
+            self.dependencies.append(known)
+            self.dependency_counts.append(len(dependency_names))
+            for dependency in known:
+                self.dependents[dependency].append(index)
+
+        self.cycle = analysis.cycle
+        self.order = [self.task_index[name] for name in analysis.order]
+        self.levels = [analysis.levels.get(name, 0) for name in self.task_names]
+        self.task_classes = task_classes or {}
+        self.deadline_seconds = deadline_seconds
+        self.resources = resources
+
+
+def plan_cache_key(config, schema):
+    """
+    Computes the cache key for a configuration and schema from their canonical JSON content, so formatting-only
+    edits do not invalidate the cache.
+
+    Args:
+        config (dict): The loaded job configuration.
+        schema (dict): The loaded JSON schema.
+
+    Returns:
+        str: Hex digest identifying the configuration and schema.
+    """
+    content = json.dumps([PLAN_FORMAT_VERSION, config, schema], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def resolve_task_classes(task_names):
+    """
+    Resolves task names to their task classes through the process-wide task registry, importing modules that are not
+    cached yet in parallel.
+
+    Args:
+        task_names (iterable of str): Fully qualified task module names.
+
+    Returns:
+        dict: Maps task names to their task classes.
+
+    Raises:
+        ValueError: If a task module or task class does not exist.
+    """
+    return task_registry.preload(task_names)
+
+
+def _cache_file(key, cache_dir):
+    return Path(cache_dir or DEFAULT_CACHE_DIR) / f"{key}.pickle"
+
+
+def load_cached_plans(key, cache_dir=None):
+    """
+    Returns the compiled configuration cached under `key`, looking in memory first and on disk second. Unreadable or
+    outdated disk entries are treated as cache misses. Task classes of plans read from disk are registered with the
+    task registry.
+
+    Args:
+        key (str): Cache key from plan_cache_key.
+        cache_dir (str or Path, optional): Disk cache directory. Defaults to DEFAULT_CACHE_DIR.
+
+    Returns:
+        dict or None: A dictionary with the validated 'jobs' configuration and the compiled 'plans' by job name,
+                      or None if nothing is cached.
+    """
+    with _cache_lock:
+        entry = _memory_cache.get(key)
+    if entry is not None:
+        return entry
+
+    cache_file = _cache_file(key, cache_dir)
+    try:
+        with cache_file.open('rb') as file:
+            entry = pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except Exception as exception:
+        logging.warning("Ignoring unreadable job plan cache %s: %s", cache_file, exception)
+        return None
+
+    for plan in entry['plans'].values():
+        for task_name, task_class in plan.task_classes.items():
+            task_registry.register(task_name, task_class)
+    with _cache_lock:
+        return _memory_cache.setdefault(key, entry)
+
+
+def store_cached_plans(key, entry, cache_dir=None):
+    """
+    Stores a compiled configuration in memory and writes it atomically to the disk cache. Failing to write the disk
+    cache is logged and otherwise ignored.
+
+    Args:
+        key (str): Cache key from plan_cache_key.
+        entry (dict): A dictionary with the validated 'jobs' configuration and the compiled 'plans' by job name.
+        cache_dir (str or Path, optional): Disk cache directory. Defaults to DEFAULT_CACHE_DIR.
+    """
+    with _cache_lock:
+        _memory_cache[key] = entry
+
+    cache_file = _cache_file(key, cache_dir)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=cache_file.parent, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except Exception as exception:
+        logging.warning("Could not write job plan cache %s: %s", cache_file, exception)
+
+
+def clear_plan_cache(cache_dir=None, disk=True):
+    """
+    Clears the in-process plan cache and, unless `disk` is False, every entry in the disk cache directory.
+
+    Args:
+        cache_dir (str or Path, optional): Disk cache directory. Defaults to DEFAULT_CACHE_DIR.
+        disk (bool): Whether to delete the disk cache entries as well.
+    """
+    with _cache_lock:
+        _memory_cache.clear()
+    if disk:
+        for cache_file in Path(cache_dir or DEFAULT_CACHE_DIR).glob('*.pickle'):
+            cache_file.unlink(missing_ok=True)
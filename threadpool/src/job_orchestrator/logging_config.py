@@ -0,0 +1,192 @@
+import atexit
+import contextlib
+import contextvars
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+"""
+This module configures logging for the orchestrator once per process, keeping formatting and writing off the threads
+that run tasks.
+
+Records are put on an in-process queue by a QueueHandler on the root logger and formatted and written to stderr by a
+QueueListener on its own thread, so a worker thread logging a line only pays for creating the record and putting it on
+the queue, never for formatting or for the lock of a shared stream. Records are queued unformatted, so arguments are
+formatted when the line is written and must not be mutated after they are logged.
+
+Every line carries the job and task it was logged for: log_context sets them for the current thread or coroutine, the
+handlers set them while tasks and their completion callbacks run, and a filter on the queue handler copies them onto
+every record as `job_name`, `task_name` and a ready-formatted `context` prefix.
+
+Per-task lines, such as a task starting or completing, are logged to the `job_orchestrator.tasks` logger. Its level can
+be set separately from the rest, and a sample rate keeps only an evenly spaced fraction of its lines below WARNING, so
+jobs with thousands of short tasks do not drown the log. Warnings and errors always pass.
+
+A worker process forked from a configured orchestrator has no listener thread, so it writes its records directly to
+the listener's handlers instead.
+
+Functions:
+    - configure_logging: Configures logging once per process.
+    - log_context: Sets the job and task that lines logged within the context are attributed to.
+    - stop_logging: Writes every queued record and stops the listener thread.
+
+Attributes:
+    task_logger (logging.Logger): Logger for per-task lines.
+
+Example usage:
+    configure_logging(logging.INFO, task_sample_rate=0.01)
+    with log_context(job_name="job1", task_name="jobs.job1.task1"):
+        task_logger.info("Starting execution of %s", "Task1")
+"""
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(context)s%(message)s'
+
+# Name of the logger for per-task lines, which can be gated and sampled separately.
+TASK_LOGGER = 'job_orchestrator.tasks'
+
+task_logger = logging.getLogger(TASK_LOGGER)
+
+_job_name = contextvars.ContextVar('job_name', default=None)
+_task_name = contextvars.ContextVar('task_name', default=None)
+
+_listener = None
+_queue_handler = None
+_configured = False
+_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def log_context(job_name=None, task_name=None):
+    """
+    Attributes lines logged by the current thread or coroutine within the context to a job and task. Arguments left
+    as None keep the value of the enclosing context.
+
+    Args:
+        job_name (str, optional): Name of the job.
+        task_name (str, optional): Name of the task.
+    """
+    job_token = _job_name.set(job_name) if job_name is not None else None
+    task_token = _task_name.set(task_name) if task_name is not None else None
+    try:
+        yield
+    finally:
+        if task_token is not None:
+            _task_name.reset(task_token)
+        if job_token is not None:
+            _job_name.reset(job_token)
+
+
+class ContextFilter(logging.Filter):
+    """
+    Copies the job and task of the current log context onto every record, unless the record was logged with its own
+    `job_name` or `task_name` in `extra`.
+    """
+
+    def filter(self, record):
+        job_name = getattr(record, 'job_name', None) or _job_name.get()
+        task_name = getattr(record, 'task_name', None) or _task_name.get()
+        record.job_name = job_name
+        record.task_name = task_name
+        if job_name and task_name:
+            record.context = f"[{job_name} {task_name}] "
+        elif job_name or task_name:
+            record.context = f"[{job_name or task_name}] "
+        else:
+            record.context = ""
+        return True
+
+
+class SampleFilter(logging.Filter):
+    """
+    Passes every record at WARNING or above and an evenly spaced fraction `rate` of the records below it.
+    """
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        with self._lock:
+            self._count += 1
+            count = self._count
+        # Passes the record whenever the running count crosses another multiple of 1 / rate.
+        return int(count * self.rate) != int((count - 1) * self.rate)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Queues records as they are, so that formatting happens on the listener thread."""
+
+    def prepare(self, record):
+        return record
+
+
+def configure_logging(log_level=logging.INFO, task_log_level=None, task_sample_rate=1.0, stream=None):
+    """
+    Configures logging once per process; later calls do nothing. The root logger is set to `log_level` and its records
+    are written by a background thread. If the root logger already has handlers, e.g. because the application
+    configured logging itself, they are kept and only the per-task lines are configured.
+
+    Args:
+        log_level (int): Level of the root logger.
+        task_log_level (int, optional): Level of the per-task lines. Defaults to `log_level`.
+        task_sample_rate (float): Fraction of the per-task lines below WARNING that are kept.
+        stream (file-like, optional): Stream the lines are written to. Defaults to stderr.
+    """
+    global _listener, _queue_handler, _configured
+    with _lock:
+        if _configured:
+            return
+        _configured = True
+        if task_log_level is not None:
+            task_logger.setLevel(task_log_level)
+        if task_sample_rate < 1.0:
+            task_logger.addFilter(SampleFilter(task_sample_rate))
+
+        root = logging.getLogger()
+        if root.handlers:
+            return
+        root.setLevel(log_level)
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        _queue_handler = _DeferredQueueHandler(queue.SimpleQueue())
+        _queue_handler.addFilter(ContextFilter())
+        _listener = QueueListener(_queue_handler.queue, handler, respect_handler_level=True)
+        _listener.start()
+        root.addHandler(_queue_handler)
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Writes every queued record and stops the listener thread. Records logged afterwards are written directly."""
+    global _listener
+    with _lock:
+        listener, _listener = _listener, None
+        if listener is None:
+            return
+        listener.stop()
+        _log_directly(listener)
+
+
+def _log_directly(listener):
+    """Replaces the queue handler on the root logger with the handlers of the listener, behind the context filter."""
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    for handler in listener.handlers:
+        handler.addFilter(ContextFilter())
+        root.addHandler(handler)
+
+
+def _after_fork_in_child():
+    global _listener
+    if _listener is not None:
+        listener, _listener = _listener, None
+        _log_directly(listener)
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
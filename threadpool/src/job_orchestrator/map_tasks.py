@@ -0,0 +1,191 @@
+import concurrent.futures
+import itertools
+import os
+import threading
+import time
+from job_orchestrator.task_durations import TaskTiming, timed_call
+
+"""
+This module runs map tasks: tasks configured with `"kind": "map"` that run their task class over every item of an
+iterable result of one of their dependencies, instead of once.
+
+The items are taken from the iterable in chunks of `chunk_size` and every chunk is one work item on the pool, so the
+scheduling overhead is paid per chunk rather than per item. Chunks are taken lazily and only `window` chunks are in
+flight at once, so mapping over a million-item iterable, or a generator, never creates more futures or holds more
+items than that.
+
+The task class's `execute(item)` is called once per item. If the class also defines `reduce(accumulator, results)`,
+the results of every chunk are streamed into it as the chunk completes, in completion order, starting from the
+class's `initial` attribute (None if absent), and the map task's result is the final accumulator. Otherwise its
+result is the list of every item's result, in item order.
+
+Functions:
+    - map_chunk: Runs a task class over one chunk of items. Module level, so chunks can run in worker processes.
+
+Classes:
+    MapRun: Dispatches the chunks of one map task and reduces their results.
+
+Example usage:
+    run = MapRun(WordCount, range(1_000_000), chunk_size=1000, window=16, submit=executor.submit)
+    total, timing = run.start().result()
+"""
+
+# Items per chunk of a map task without `chunk_size`.
+DEFAULT_CHUNK_SIZE = 64
+
+
+def map_chunk(task_class, chunk):
+    """
+    Runs a task class over one chunk of items, with one instance for the whole chunk.
+
+    Args:
+        task_class (type): The task class of the map task.
+        chunk (list): The items.
+
+    Returns:
+        tuple: The list of the results of every item and the TaskTiming of the chunk.
+    """
+    task_instance = task_class()
+    return timed_call(lambda: [task_instance.execute(item) for item in chunk])
+
+
+class MapRun:
+    """
+    Dispatches the chunks of one map task through `submit` and resolves its future with the reduced result and the
+    TaskTiming of the whole run, whose CPU time is the sum over the chunks. The first chunk to fail fails the run, and
+    a run stopped early fails once its chunks in flight have returned.
+
+    Attributes:
+        future (concurrent.futures.Future): Resolves to the result of the map task and its TaskTiming.
+        chunks (int): Number of chunks dispatched so far.
+    """
+
+    def __init__(self, task_class, items, chunk_size=DEFAULT_CHUNK_SIZE, window=8, submit=None, stopped=None):
+        """
+        Initializes the run.
+
+        Args:
+            task_class (type): The task class of the map task.
+            items (iterable): The items to map over.
+            chunk_size (int): Items per chunk.
+            window (int): Chunks in flight at once.
+            submit (callable): Called as `submit(map_chunk, task_class, chunk)`, returning a future.
+            stopped (callable, optional): Returns True once no further chunks should be dispatched, e.g. because the
+                                          task timed out.
+        """
+        self.task_class = task_class
+        self.chunk_size = chunk_size
+        self.window = max(1, window)
+        self.future = concurrent.futures.Future()
+        self.future.set_running_or_notify_cancel()
+        self.chunks = 0
+        self._submit = submit
+        self._stopped = stopped or (lambda: False)
+        self._items = iter(items)
+        self._exhausted = False
+        self._abandoned = False
+        self._in_flight = 0
+        self._reducer = task_class() if callable(getattr(task_class, 'reduce', None)) else None
+        self._accumulator = getattr(self._reducer, 'initial', None)
+        self._results = {}
+        self._cpu_time = 0.0
+        self._worker = None
+        self._lock = threading.Lock()
+        self._started_at = time.time()
+        self._start_time = time.perf_counter()
+
+    def start(self):
+        """
+        Dispatches the first chunks.
+
+        Returns:
+            concurrent.futures.Future: The future of the run.
+        """
+        try:
+            with self._lock:
+                chunks = self._take_chunks()
+                finished = self._exhausted and not chunks
+        except Exception as exc:
+            self._fail(exc)
+            return self.future
+        self._dispatch(chunks)
+        if finished:
+            self._finish()
+        return self.future
+
+    def _take_chunks(self):
+        """Takes as many chunks from the items as the window allows. Must be called with the lock held."""
+        chunks = []
+        while not self._exhausted and self._in_flight < self.window:
+            chunk = list(itertools.islice(self._items, self.chunk_size))
+            if not chunk:
+                self._exhausted = True
+                break
+            chunks.append((self.chunks, chunk))
+            self.chunks += 1
+            self._in_flight += 1
+        return chunks
+
+    def _dispatch(self, chunks):
+        for index, chunk in chunks:
+            try:
+                future = self._submit(map_chunk, self.task_class, chunk)
+            except Exception as exc:
+                self._fail(exc)
+                return
+            future.add_done_callback(lambda future, index=index: self._on_chunk_done(index, future))
+
+    def _on_chunk_done(self, index, future):
+        """Chunk callback: streams the chunk's results into the reduction and dispatches the next chunks."""
+        if self.future.done():
+            return
+        try:
+            results, timing = future.result()
+        except BaseException as exc:
+            self._fail(exc)
+            return
+        try:
+            with self._lock:
+                self._in_flight -= 1
+                self._cpu_time += timing.cpu_time or 0.0
+                self._worker = timing.worker
+                if self._reducer is not None:
+                    self._accumulator = self._reducer.reduce(self._accumulator, results)
+                else:
+                    self._results[index] = results
+                if self._stopped() and not self._exhausted:
+                    # The remaining items are dropped; the run fails once the chunks in flight have returned.
+                    self._exhausted = self._abandoned = True
+                chunks = self._take_chunks()
+                finished = self._exhausted and self._in_flight == 0
+        except Exception as exc:
+            self._fail(exc)
+            return
+        self._dispatch(chunks)
+        if finished:
+            self._finish()
+
+    def _timing(self):
+        return TaskTiming(self._started_at, time.perf_counter() - self._start_time, self._cpu_time, os.getpid(),
+                          self._worker)
+
+    def _finish(self):
+        if self._abandoned:
+            self._fail(concurrent.futures.CancelledError("The map was stopped before all of its chunks ran."))
+            return
+        with self._lock:
+            if self._reducer is not None:
+                result = self._accumulator
+            else:
+                result = [item for index in range(self.chunks) for item in self._results.pop(index)]
+        try:
+            self.future.set_result((result, self._timing()))
+        except concurrent.futures.InvalidStateError:
+            pass
+
+    def _fail(self, exc):
+        exc.task_timing = self._timing()
+        try:
+            self.future.set_exception(exc)
+        except concurrent.futures.InvalidStateError:
+            pass
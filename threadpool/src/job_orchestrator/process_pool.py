@@ -0,0 +1,85 @@
+import atexit
+import concurrent.futures
+import logging
+import os
+import sys
+import threading
+from multiprocessing import resource_tracker
+
+"""
+This module owns the persistent ProcessPoolExecutor used for tasks configured with `"executor": "process"`.
+CPU-bound tasks run in worker processes so they are not serialized by the GIL, while the pool itself is created
+once per orchestrator process and reused by every job, so worker start-up cost is paid only once.
+
+Task handlers, task arguments and task results cross the process boundary by pickling, so tasks executed this way
+must accept and return picklable values. Large buffer results are the exception, see shared_results: the resource
+tracker is started before the pool so that worker processes share it and a shared memory segment created in a worker
+is tracked as the same segment the orchestrator unlinks.
+
+Functions:
+    - get_process_pool: Returns the shared ProcessPoolExecutor, creating it on first use.
+    - shutdown_process_pool: Shuts down the shared ProcessPoolExecutor, if one has been created.
+
+Example usage:
+    pool = get_process_pool()
+    future = pool.submit(TaskHandler({"name": "jobs.job1.task1"}).execute_task)
+    print(future.result())
+"""
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def _initialize_worker(parent_sys_path):
+    """
+    Makes the parent's import path available in a worker process so task modules resolve the same way.
+
+    Args:
+        parent_sys_path (list of str): The `sys.path` of the orchestrator process.
+    """
+    for path in reversed(parent_sys_path):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def get_process_pool(max_workers=None):
+    """
+    Returns the shared ProcessPoolExecutor, creating it on first use. A pool that broke because a worker process
+    died is replaced with a fresh one.
+
+    Args:
+        max_workers (int, optional): Number of worker processes to start if the pool does not exist yet.
+                                     Defaults to the number of CPUs.
+
+    Returns:
+        concurrent.futures.ProcessPoolExecutor: The shared process pool.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None or getattr(_process_pool, '_broken', False):
+            max_workers = max_workers or os.cpu_count() or 1
+            logging.debug("Starting process pool with %d workers.", max_workers)
+            resource_tracker.ensure_running()
+            _process_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_initialize_worker,
+                initargs=(list(sys.path),)
+            )
+        return _process_pool
+
+
+def shutdown_process_pool(wait=True):
+    """
+    Shuts down the shared ProcessPoolExecutor, if one has been created.
+
+    Args:
+        wait (bool): Whether to wait for running tasks to finish before returning.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=wait)
+            _process_pool = None
+
+
+atexit.register(shutdown_process_pool)
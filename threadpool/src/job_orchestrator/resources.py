@@ -0,0 +1,152 @@
+import collections
+import heapq
+import itertools
+import threading
+
+"""
+This module defines the ResourcePool class, which limits how many tasks using a named resource run at once, beyond
+the number of worker threads.
+
+Tasks declare what they use with `"resources": {"db": 1, "mem_gb": 8}` in the job configuration, and a job or a whole
+orchestrator declares how much of each resource there is, e.g. `{"db": 4, "mem_gb": 16}`. A ready task is dispatched
+only once every resource it uses is free; until then it waits in the pool without occupying a worker thread, and the
+worker takes another ready task instead. When a task finishes, its resources are handed to the waiting tasks with the
+highest priority that now fit, so a task using few resources can start ahead of a larger one that still does not fit.
+
+Pools can be nested: a job's pool with its own capacities has the orchestrator's pool as parent, and a task is only
+dispatched when its resources are free in both. Resources no pool declares a capacity for are unlimited.
+
+Classes:
+    ResourcePool: Capacities of named resources and the tasks waiting for them.
+
+Example usage:
+    pool = ResourcePool({"db": 4})
+    pool.acquire({"db": 1}, print, "connected")
+    pool.release({"db": 1})
+"""
+
+
+class ResourcePool:
+    """
+    Capacities of named resources, the amounts in use and, shared with its parent pools, the callbacks waiting for
+    them. Thread safe.
+
+    Attributes:
+        capacities (dict): Maps resource names to their capacity.
+        parent (ResourcePool or None): Pool whose capacities also apply to every acquisition through this one.
+    """
+
+    def __init__(self, capacities=None, parent=None):
+        """
+        Initializes the pool.
+
+        Args:
+            capacities (dict, optional): Maps resource names to their capacity.
+            parent (ResourcePool, optional): Pool whose capacities also apply.
+        """
+        self.capacities = dict(capacities or {})
+        self.parent = parent
+        self._in_use = collections.Counter()
+        # Every pool of a tree shares the lock and waiting list of its root, so that releasing a resource in a parent
+        # can start a task waiting through any of its children.
+        self._root = parent._root if parent is not None else self
+        if parent is None:
+            self._lock = threading.Lock()
+            self._waiting = []
+            self._sequence = itertools.count()
+
+    def _chain(self):
+        pool = self
+        while pool is not None:
+            yield pool
+            pool = pool.parent
+
+    def check(self, requirements):
+        """
+        Checks that a task's requirements can ever be met.
+
+        Args:
+            requirements (dict): Maps resource names to the amount a task uses.
+
+        Raises:
+            ValueError: If an amount is negative or larger than the capacity of the resource.
+        """
+        for name, amount in requirements.items():
+            if amount < 0:
+                raise ValueError(f"Resource {name} requirement {amount} is negative.")
+            for pool in self._chain():
+                if name in pool.capacities and amount > pool.capacities[name]:
+                    raise ValueError(f"Resource {name} requirement {amount} exceeds its capacity of "
+                                     f"{pool.capacities[name]}.")
+
+    def _fits(self, requirements):
+        for pool in self._chain():
+            for name, amount in requirements.items():
+                if name in pool.capacities and pool._in_use[name] + amount > pool.capacities[name]:
+                    return False
+        return True
+
+    def _take(self, requirements, sign=1):
+        for pool in self._chain():
+            for name, amount in requirements.items():
+                if name in pool.capacities:
+                    pool._in_use[name] += sign * amount
+
+    def acquire(self, requirements, callback, *args, priority=0.0):
+        """
+        Takes the required resources and calls `callback` with `args` once they are free: at once on the calling
+        thread if they are free now, or later on the thread releasing them. The callback must return quickly, e.g. by
+        submitting work to a worker pool, and must eventually lead to release being called with the same requirements.
+
+        Args:
+            requirements (dict): Maps resource names to the amount the task uses.
+            callback (callable): Called once the resources are taken.
+            *args: Arguments passed to the callback.
+            priority (float): Among waiting callbacks, those with higher priorities are considered first.
+
+        Returns:
+            bool: True if the callback ran at once, False if it is waiting.
+        """
+        root = self._root
+        with root._lock:
+            if not self._fits(requirements):
+                heapq.heappush(root._waiting, (-priority, next(root._sequence), self, requirements, callback, args))
+                return False
+            self._take(requirements)
+        callback(*args)
+        return True
+
+    def release(self, requirements):
+        """
+        Returns resources taken by acquire and calls the waiting callbacks that now fit, highest priority first.
+
+        Args:
+            requirements (dict): The requirements passed to acquire.
+        """
+        root = self._root
+        ready = []
+        with root._lock:
+            self._take(requirements, sign=-1)
+            waiting = []
+            while root._waiting:
+                entry = heapq.heappop(root._waiting)
+                pool, entry_requirements = entry[2], entry[3]
+                if pool._fits(entry_requirements):
+                    pool._take(entry_requirements)
+                    ready.append(entry)
+                else:
+                    waiting.append(entry)
+            root._waiting = waiting
+            heapq.heapify(waiting)
+        for entry in ready:
+            entry[4](*entry[5])
+
+    def in_use(self):
+        """Returns the amount in use of every resource this pool declares a capacity for."""
+        with self._root._lock:
+            return {name: self._in_use[name] for name in self.capacities}
+
+    def waiting(self):
+        """Returns the number of callbacks waiting for resources, through this pool or any other of its tree."""
+        with self._root._lock:
+            return len(self._root._waiting)
@@ -0,0 +1,308 @@
+import threading
+from multiprocessing import shared_memory
+
+"""
+This module passes large buffer-backed task results between processes through shared memory instead of pickling.
+
+A task executed in a worker process that returns bytes, a bytearray, a memoryview or a NumPy array of at least
+SHARED_MIN_BYTES has its result copied once into a `multiprocessing.shared_memory` segment, and only a small
+SharedBuffer handle travels back to the orchestrator. Likewise, a large buffer result of a thread task is copied into a
+segment the first time a process task depends on it. Dependent process tasks receive the handle in their
+`dependencies_results` and see a read-only view of the segment, so fanning a result out to N process tasks costs one
+copy instead of N. Thread tasks depending on a shared result receive the same kind of view, without any copy.
+
+Views of a segment are read-only: a memoryview for bytes-like results and a read-only NumPy array for arrays. Results
+that are job outputs are copied out of shared memory when the job ends, and every segment is unlinked as soon as the
+job releases its result, so segment lifetime follows the job. NumPy is optional; it is only imported when an array
+handle is opened.
+
+Classes:
+    SharedBuffer: Picklable handle of a result placed in a shared memory segment.
+    SharedResults: The shared memory segments holding the results of one job.
+
+Functions:
+    - share_result: Places a large buffer result in a new segment, returning its handle.
+    - open_shared: Replaces the handles among dependency results with views of their segments.
+    - close_segments: Detaches the segments opened by open_shared in this process that are no longer viewed.
+    - discard: Unlinks the segment of a handle whose result will never be used.
+    - materialize: Returns a private copy of a view of a shared result.
+
+Example usage:
+    shared = SharedResults()
+    view = shared.adopt("jobs.job1.task1", handle)   # handle returned by a process task
+    inputs = {"jobs.job1.task1": shared.share("jobs.job1.task1", view)}
+    shared.close()
+"""
+
+# Smallest buffer placed in shared memory; smaller results are cheaper to pickle.
+SHARED_MIN_BYTES = 64 * 1024
+
+# Segments opened in this process, by name, and segments whose views were still alive when they were closed.
+_opened = {}
+_lingering = []
+
+_lock = threading.Lock()
+
+
+class SharedBuffer:
+    """
+    Picklable handle of a result placed in a shared memory segment.
+
+    Attributes:
+        name (str): Name of the segment.
+        nbytes (int): Size of the result in bytes.
+        dtype (str or None): NumPy dtype string of an array result, None for a bytes-like result.
+        shape (tuple or None): Shape of an array result.
+    """
+
+    __slots__ = ('name', 'nbytes', 'dtype', 'shape')
+
+    def __init__(self, name, nbytes, dtype=None, shape=None):
+        self.name = name
+        self.nbytes = nbytes
+        self.dtype = dtype
+        self.shape = shape
+
+    def __getstate__(self):
+        return self.name, self.nbytes, self.dtype, self.shape
+
+    def __setstate__(self, state):
+        self.name, self.nbytes, self.dtype, self.shape = state
+
+    def view(self, segment):
+        """
+        Returns a read-only view of the result in its opened segment.
+
+        Args:
+            segment (SharedMemory): The opened segment.
+
+        Returns:
+            memoryview or numpy.ndarray: The view.
+        """
+        if self.dtype is None:
+            return segment.buf[:self.nbytes].toreadonly()
+        import numpy
+        array = numpy.ndarray(self.shape, dtype=numpy.dtype(self.dtype), buffer=segment.buf)
+        array.flags.writeable = False
+        return array
+
+
+def _shareable(value, min_bytes):
+    """
+    Returns the flat byte view and the array metadata of a value that should be placed in shared memory.
+
+    Returns:
+        tuple or None: The byte view, dtype and shape, or None if the value is small or not a contiguous buffer.
+    """
+    is_array = type(value).__module__ == 'numpy' and hasattr(value, '__array_interface__')
+    if not (is_array or isinstance(value, (bytes, bytearray, memoryview))):
+        return None
+    if is_array and value.dtype.hasobject:
+        return None
+    try:
+        data = memoryview(value)
+    except TypeError:
+        return None
+    if not data.c_contiguous or data.nbytes < min_bytes:
+        return None
+    if is_array:
+        return data.cast('B'), value.dtype.str, value.shape
+    return data.cast('B'), None, None
+
+
+def _create(data, dtype, shape):
+    """Copies a flat byte view into a new segment and returns its handle. The creator's mapping is closed."""
+    segment = shared_memory.SharedMemory(create=True, size=data.nbytes)
+    try:
+        segment.buf[:data.nbytes] = data
+    except BaseException:
+        segment.close()
+        segment.unlink()
+        raise
+    handle = SharedBuffer(segment.name, data.nbytes, dtype, shape)
+    segment.close()
+    return handle
+
+
+def _open(handle):
+    """Returns a view of the segment of a handle, opening the segment once per process."""
+    with _lock:
+        segment = _opened.get(handle.name)
+        if segment is None:
+            segment = _opened[handle.name] = shared_memory.SharedMemory(handle.name)
+    return handle.view(segment)
+
+
+def _close(segment):
+    """Closes a segment, deferring the close while views of it are still alive. Must be called with the lock held."""
+    try:
+        segment.close()
+    except BufferError:
+        _lingering.append(segment)
+
+
+def share_result(value, min_bytes=SHARED_MIN_BYTES):
+    """
+    Places a large buffer result in a new shared memory segment. Called in the worker process that produced it.
+
+    Args:
+        value: The task result.
+        min_bytes (int): Smallest buffer placed in shared memory.
+
+    Returns:
+        SharedBuffer or the value: The handle of the segment, or the value itself if it is not shared.
+    """
+    shareable = _shareable(value, min_bytes)
+    return value if shareable is None else _create(*shareable)
+
+
+def open_shared(dependencies_results):
+    """
+    Replaces the SharedBuffer handles among dependency results with read-only views of their segments.
+
+    Args:
+        dependencies_results (dict or None): Maps dependency names to results or handles.
+
+    Returns:
+        dict or None: The dependency results with views instead of handles.
+    """
+    if not dependencies_results or not any(isinstance(value, SharedBuffer) for value in dependencies_results.values()):
+        return dependencies_results
+    return {name: _open(value) if isinstance(value, SharedBuffer) else value
+            for name, value in dependencies_results.items()}
+
+
+def close_segments():
+    """
+    Detaches the segments opened by open_shared in this process, e.g. a worker process after a task. Segments whose
+    views are still alive stay mapped until a later call finds them unused.
+    """
+    with _lock:
+        while _opened:
+            _close(_opened.popitem()[1])
+        _close_lingering()
+
+
+def _close_lingering():
+    """Retries closing the segments whose views were alive when they were closed. Must be called with the lock held."""
+    lingering = _lingering[:]
+    del _lingering[:]
+    for segment in lingering:
+        _close(segment)
+
+
+def discard(value):
+    """
+    Unlinks the segment of a result that will never be used, e.g. the late result of a timed-out task.
+
+    Args:
+        value: A task result, which is ignored unless it is a SharedBuffer.
+    """
+    if isinstance(value, SharedBuffer):
+        with _lock:
+            _unlink(value.name)
+
+
+def materialize(value):
+    """
+    Returns a private copy of a view of a shared result, which stays valid after the segment is released.
+
+    Args:
+        value: A view returned by SharedResults.adopt, or any other result, which is returned unchanged.
+
+    Returns:
+        bytes or numpy.ndarray or the value: The copy.
+    """
+    if isinstance(value, memoryview):
+        return value.tobytes()
+    if type(value).__module__ == 'numpy' and hasattr(value, 'copy'):
+        return value.copy()
+    return value
+
+
+def _unlink(name):
+    """Removes a segment. Existing mappings stay valid until they are closed. Must be called with the lock held."""
+    segment = _opened.pop(name, None)
+    if segment is None:
+        try:
+            segment = shared_memory.SharedMemory(name)
+        except FileNotFoundError:
+            return
+    segment.unlink()
+    _close(segment)
+
+
+class SharedResults:
+    """
+    The shared memory segments holding the results of one job, by the name of the task that produced them.
+    """
+
+    def __init__(self, min_bytes=SHARED_MIN_BYTES):
+        """
+        Args:
+            min_bytes (int): Smallest buffer placed in shared memory.
+        """
+        self.min_bytes = min_bytes
+        self._handles = {}
+        self._lock = threading.Lock()
+
+    def adopt(self, key, handle):
+        """
+        Takes a handle returned by a process task and returns a view of its result for the orchestrator.
+
+        Args:
+            key (str): Name of the task that produced the result.
+            handle (SharedBuffer): The handle.
+
+        Returns:
+            memoryview or numpy.ndarray: A read-only view of the result.
+        """
+        with self._lock:
+            self._handles.setdefault(key, handle)
+            return _open(handle)
+
+    def share(self, key, value):
+        """
+        Returns the handle under which a result is passed to a process task, copying the result into a segment on
+        first use. Small and non-buffer results are returned unchanged and pickled as usual.
+
+        Args:
+            key (str): Name of the task that produced the result.
+            value: The result.
+
+        Returns:
+            SharedBuffer or the value: The handle of the result, or the value itself if it is not shared.
+        """
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is None:
+                shareable = _shareable(value, self.min_bytes)
+                if shareable is None:
+                    return value
+                handle = self._handles[key] = _create(*shareable)
+            return handle
+
+    def is_shared(self, key):
+        """Whether the result of a task lives in a segment held by this job."""
+        return key in self._handles
+
+    def release(self, key):
+        """
+        Unlinks the segment of a result no longer needed by this job. Views of it stay valid until they are dropped.
+
+        Args:
+            key (str): Name of the task that produced the result.
+        """
+        with self._lock:
+            handle = self._handles.pop(key, None)
+        if handle is None:
+            return
+        with _lock:
+            _unlink(handle.name)
+
+    def close(self):
+        """Releases every segment held by this job and detaches released segments that are no longer viewed."""
+        for key in list(self._handles):
+            self.release(key)
+        with _lock:
+            _close_lingering()
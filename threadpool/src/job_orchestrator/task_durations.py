@@ -0,0 +1,145 @@
+import multiprocessing
+import os
+import threading
+import time
+from collections import namedtuple
+
+"""
+This module defines the TaskDurations class, which supplies the per-task duration estimates used to prioritize ready
+tasks by their critical path, and the timed_call helper that measures when a task started and how much wall and CPU
+time it took.
+
+An estimate comes from the task's `estimated_duration` setting in the job configuration when present, otherwise from
+the durations recorded for that task name in earlier runs, and otherwise from DEFAULT_TASK_DURATION. Recorded
+durations are smoothed with an exponential moving average, so one slow run does not dominate the estimate.
+
+Classes:
+    TaskDurations: Records measured task durations and returns duration estimates.
+
+Functions:
+    - timed_call: Calls a function and returns its result together with its TaskTiming.
+
+Attributes:
+    task_durations (TaskDurations): The duration history shared by the whole process.
+
+Example usage:
+    result, timing = timed_call(task_handler.execute_task)
+    task_durations.record(task_handler.task['name'], timing.wall_time)
+    task_durations.estimate({"name": "jobs.job1.task1"})
+"""
+
+# Estimate for tasks with neither a configured hint nor any recorded history.
+DEFAULT_TASK_DURATION = 1.0
+
+# Weight of the newest measurement in the moving average.
+SMOOTHING = 0.3
+
+# When a call started (seconds since the epoch, comparable across processes), its wall and CPU time in seconds, and
+# the process and thread it ran on.
+TaskTiming = namedtuple('TaskTiming', ['started_at', 'wall_time', 'cpu_time', 'process_id', 'worker'],
+                        defaults=(None, None))
+
+
+class TaskDurations:
+    """
+    Process-wide history of measured task durations, keyed by task name.
+    """
+
+    def __init__(self):
+        self._durations = {}
+        self._measured = set()
+        self._lock = threading.Lock()
+
+    def record(self, task_name, seconds):
+        """
+        Folds a measured duration into the moving average of a task.
+
+        Args:
+            task_name (str): Fully qualified task module name.
+            seconds (float): The measured duration.
+        """
+        with self._lock:
+            previous = self._durations.get(task_name)
+            self._measured.add(task_name)
+            if previous is None:
+                self._durations[task_name] = seconds
+            else:
+                self._durations[task_name] = previous + SMOOTHING * (seconds - previous)
+
+    def recorded(self, task_name):
+        """
+        Returns the recorded duration of a task.
+
+        Args:
+            task_name (str): Fully qualified task module name.
+
+        Returns:
+            float or None: The moving average of the measured durations, or None if the task was never measured.
+        """
+        return self._durations.get(task_name)
+
+    def estimate(self, task):
+        """
+        Returns the duration estimate of a task: its configured hint, its recorded history or the default.
+
+        Args:
+            task (dict): The task configuration.
+
+        Returns:
+            float: The estimated duration in seconds.
+        """
+        hint = task.get('estimated_duration')
+        if hint is not None:
+            return hint
+        recorded = self._durations.get(task['name'])
+        return DEFAULT_TASK_DURATION if recorded is None else recorded
+
+    def load(self, durations):
+        """
+        Seeds the history with durations recorded elsewhere, e.g. in the persistent task history, replacing durations
+        loaded before but not durations measured by this process.
+
+        Args:
+            durations (dict): Maps task names to durations in seconds.
+        """
+        with self._lock:
+            for task_name, seconds in durations.items():
+                if task_name not in self._measured:
+                    self._durations[task_name] = seconds
+
+    def clear(self):
+        """Forgets every recorded duration."""
+        with self._lock:
+            self._durations.clear()
+            self._measured.clear()
+
+
+def timed_call(fn):
+    """
+    Calls a function and measures when it started, how long it ran and the CPU time of the calling thread, and notes
+    the process and thread it ran on. The function is module level so it can wrap tasks executed in a worker process.
+    If the call raises, the timing is attached to the exception as `task_timing`.
+
+    Args:
+        fn (callable): The function to call without arguments.
+
+    Returns:
+        tuple: The result of the call and its TaskTiming.
+    """
+    # A task in a worker process runs on the process's main thread, named after the thread that forked it.
+    in_worker_process = multiprocessing.parent_process() is not None
+    worker = multiprocessing.current_process().name if in_worker_process else threading.current_thread().name
+    started_at = time.time()
+    start_time = time.perf_counter()
+    start_cpu_time = time.thread_time()
+    try:
+        result = fn()
+    except BaseException as exception:
+        exception.task_timing = TaskTiming(started_at, time.perf_counter() - start_time,
+                                           time.thread_time() - start_cpu_time, os.getpid(), worker)
+        raise
+    return result, TaskTiming(started_at, time.perf_counter() - start_time, time.thread_time() - start_cpu_time,
+                              os.getpid(), worker)
+
+
+task_durations = TaskDurations()
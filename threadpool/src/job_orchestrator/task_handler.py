@@ -1,6 +1,8 @@
 import importlib
 import logging
-from importlib.util import find_spec
+from job_orchestrator.logging_config import log_context
+from job_orchestrator.shared_results import close_segments, open_shared, share_result
+from job_orchestrator.task_registry import task_registry
 from job_orchestrator.utilities import convert_to_camel_case
 
 
@@ -14,12 +16,22 @@ The TaskHandler class supports:
 - Execution of tasks with or without dependencies.
 - Validation of task modules before execution to ensure the specified tasks and handlers exist.
 
+Task classes are resolved through the process-wide task registry, so each task module is imported once and later
+executions of the same task only cost a dictionary lookup.
+
+Dependency results passed as shared memory handles are opened as read-only views before the task runs, and a handler
+created with `share_result` places a large buffer result in shared memory and returns its handle instead, see
+shared_results.
+
 Classes:
     TaskHandler: Manages the dynamic loading and execution of tasks.
 
 Dependencies:
     - importlib: Used for importing modules dynamically based on string names.
     - logging: Used to log information, warnings, and errors.
+    - .logging_config.log_context: Used to attribute the lines a task logs to the task.
+    - .shared_results: Used for passing large buffer results between processes through shared memory.
+    - .task_registry.task_registry: Resolves and memoizes task classes.
     - .utilities.convert_to_camel_case: A utility function to convert snake_case strings to CamelCase.
 
 Example usage:
@@ -37,18 +49,26 @@ class TaskHandler:
     Handles the execution of a single task, managing dynamic loading and execution.
     """
 
-    def __init__(self, task=None, dependencies_results=None, log_level=logging.INFO):
-        logging.basicConfig(level=log_level, format='%(asctime)s - %(levelname)s - %(message)s')
+    def __init__(self, task=None, dependencies_results=None, task_class=None, share_result=False):
         self.task = task
         self.dependencies_results = dependencies_results
+        self.task_class = task_class
+        self.share_result = share_result
 
-    def execute_job(self, handler_name, tasks):
+    def execute_job(self, handler_name, tasks, plan=None, **handler_options):
         """
         Executes a job by loading the appropriate handler and running the specified tasks.
         
         Args:
             handler_name (str): The full module and class name of the handler.
             tasks (list): A list of tasks to be executed by the handler.
+            plan (JobPlan, optional): The compiled plan of the job. Task modules of a compiled plan have already been
+                                      validated, so validation is skipped.
+            **handler_options: Additional keyword arguments for the handler, e.g. a shared `worker_pool`.
+
+        Returns:
+            bool: True if the job lifecycle completed and every task completed, False if it raised or a task failed,
+                  timed out or was cancelled. None if task validation failed.
         """
         logging.debug("Attempting to execute job with handler: %s", handler_name)
         
@@ -59,22 +79,24 @@ class TaskHandler:
 
         handler = None
         
-        # Validate all task modules before execution
-        if not all(self._validate_task_module(task['name']) for task in tasks):
+        # Validate all task modules before execution, once per distinct task name
+        task_names = dict.fromkeys(task['name'] for task in tasks)
+        if plan is None and not all(self._validate_task_module(task_name) for task_name in task_names):
             logging.error("Validation failed: One or more task modules are invalid.")
             return
         
         try:
             # Dynamically import the module and get the handler class
             module = importlib.import_module(handler_name)
-            handler = getattr(module, handler_class)()
+            handler = getattr(module, handler_class)(plan=plan, **handler_options)
             
-            # Execute the job lifecycle methods
-            handler.before_job()
-            handler.execute_tasks(tasks)
-            handler.after_job()
+            # Execute the job lifecycle methods, attributing the lines they log to the job
+            with log_context(job_name=getattr(plan, 'job_name', None)):
+                handler.before_job()
+                handler.execute_tasks(tasks)
+                handler.after_job()
 
-            return True
+            return getattr(handler, 'succeeded', True)
 
         except Exception as e:
             logging.error("An error occurred while executing the job", exc_info=True)
@@ -92,35 +114,24 @@ class TaskHandler:
         Returns:
             bool: True if the class exists within the module, False otherwise.
         """
-        try:         
-            # as per naming convention converting filename (snake case) to class name (pascal case)
-            class_name = convert_to_camel_case(task_name.split('.')[-1])
-
-            if find_spec(task_name) is None:
-                logging.error("Module %s does not exist.",task_name)
-                return False
-            
-            module = importlib.import_module(task_name)
-            task_class = getattr(module, class_name, None)
-            
-            if task_class is None:
-                logging.error("Class %s does not exist in %s.",class_name,task_name)
-                return False
-            
-            return True
-        except Exception as e:
-            logging.error("An error occurred while validating task module: %s",e)
-            return False       
+        return task_registry.is_valid(task_name)
 
     def execute_task(self):
-        """Dynamically load and execute a task based on its module and class name, passing dependencies results."""
-        task_name = self.task['name']
-        module = importlib.import_module(task_name)
-        
-        # as per naming convention converting filename (snake case) to class name (pascal case)
-        class_name = convert_to_camel_case(task_name.split('.')[-1])        
-
-        task_class = getattr(module, class_name)
+        """
+        Dynamically load and execute a task based on its module and class name, passing dependencies results.
+        The task class comes from the compiled job plan when available, otherwise from the task registry.
+        Shared memory handles among the dependency results are opened for the task and detached afterwards. Lines
+        the task logs are attributed to it.
+        """
+        task_class = self.task_class or task_registry.resolve(self.task['name'])
         task_instance = task_class()
-        return task_instance.execute(self.dependencies_results)
+        dependencies_results = open_shared(self.dependencies_results)
+        try:
+            with log_context(task_name=self.task['name']):
+                result = task_instance.execute(dependencies_results)
+            return share_result(result) if self.share_result else result
+        finally:
+            if dependencies_results is not self.dependencies_results:
+                del dependencies_results
+                close_segments()
       
\ No newline at end of file
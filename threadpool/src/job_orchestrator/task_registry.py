@@ -0,0 +1,118 @@
+import concurrent.futures
+import importlib
+import importlib.util
+import logging
+import os
+from job_orchestrator.utilities import convert_to_camel_case
+
+"""
+This module defines the TaskRegistry class, a process-wide cache that resolves dotted task names to their task
+classes. Every task name is imported and resolved once; later lookups are a single dictionary access, which keeps
+per-task dispatch overhead flat for jobs with many thousands of short tasks.
+
+Resolved classes are memoized with `dict.setdefault`, so concurrent resolutions of the same name from worker threads
+always agree on one class without holding a lock around the import. Failed resolutions are not cached, so a task
+module added later can still be resolved.
+
+Classes:
+    TaskRegistry: Resolves and memoizes task classes.
+
+Attributes:
+    task_registry (TaskRegistry): The registry shared by the whole process.
+
+Example usage:
+    task_registry.preload(["jobs.job1.task1", "jobs.job1.task2"])
+    task_class = task_registry.resolve("jobs.job1.task1")
+"""
+
+
+class TaskRegistry:
+    """
+    Resolves dotted task names to task classes following the naming convention, and memoizes the result.
+    """
+
+    def __init__(self):
+        self._task_classes = {}
+
+    def resolve(self, task_name):
+        """
+        Returns the task class for a task name, importing its module on first use. As per naming convention the class
+        name is the PascalCase form of the last component of the module name.
+
+        Args:
+            task_name (str): Fully qualified task module name, e.g. 'jobs.job1.task1'.
+
+        Returns:
+            type: The task class.
+
+        Raises:
+            ImportError: If the task module does not exist or cannot be imported.
+            AttributeError: If the task class does not exist in the module.
+        """
+        task_class = self._task_classes.get(task_name)
+        if task_class is None:
+            if importlib.util.find_spec(task_name) is None:
+                raise ModuleNotFoundError(f"Module {task_name} does not exist.")
+            module = importlib.import_module(task_name)
+            task_class = getattr(module, convert_to_camel_case(task_name.split('.')[-1]))
+            task_class = self._task_classes.setdefault(task_name, task_class)
+        return task_class
+
+    def register(self, task_name, task_class):
+        """
+        Registers an already resolved task class, e.g. one restored from a cached job plan.
+
+        Args:
+            task_name (str): Fully qualified task module name.
+            task_class (type): The task class.
+        """
+        self._task_classes.setdefault(task_name, task_class)
+
+    def is_valid(self, task_name):
+        """
+        Checks whether a task name resolves to a task class, logging the reason if it does not.
+
+        Args:
+            task_name (str): Fully qualified task module name.
+
+        Returns:
+            bool: True if the task class can be resolved, otherwise False.
+        """
+        try:
+            self.resolve(task_name)
+            return True
+        except Exception as exception:
+            logging.error("Invalid task module %s: %s", task_name, exception)
+            return False
+
+    def preload(self, task_names, max_workers=None):
+        """
+        Resolves every task name that is not cached yet, importing the modules in parallel.
+
+        Args:
+            task_names (iterable of str): Fully qualified task module names; duplicates are resolved once.
+            max_workers (int, optional): Number of threads used for importing. Defaults to min(32, cpu_count + 4).
+
+        Returns:
+            dict: Maps every task name to its task class.
+
+        Raises:
+            ValueError: If one or more task names cannot be resolved.
+        """
+        task_names = list(dict.fromkeys(task_names))
+        missing = [task_name for task_name in task_names if task_name not in self._task_classes]
+        if missing:
+            max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+                valid = list(executor.map(self.is_valid, missing))
+            invalid_tasks = [task_name for task_name, is_valid in zip(missing, valid) if not is_valid]
+            if invalid_tasks:
+                raise ValueError(f"Invalid task modules: {', '.join(invalid_tasks)}.")
+        return {task_name: self._task_classes[task_name] for task_name in task_names}
+
+    def clear(self):
+        """Forgets every resolved task class."""
+        self._task_classes.clear()
+
+
+task_registry = TaskRegistry()
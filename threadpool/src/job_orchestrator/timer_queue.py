@@ -0,0 +1,103 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+"""
+This module defines the TimerQueue class, a single background thread that runs callbacks once their delay has
+elapsed. Timers live in a heap ordered by due time, so scheduling and cancelling are cheap no matter how many timers
+are pending, and a job with thousands of task timeouts costs one thread rather than one thread per timer.
+
+Callbacks run on the timer thread and must return quickly; they should hand real work to a pool.
+
+Classes:
+    TimerQueue: Runs callbacks after a delay on one shared thread.
+    Timer: Handle of a scheduled callback.
+
+Attributes:
+    timer_queue (TimerQueue): The timer queue shared by the whole process.
+
+Example usage:
+    timer = timer_queue.schedule(5.0, print, "five seconds later")
+    timer.cancel()
+"""
+
+
+class Timer:
+    """
+    Handle of a callback scheduled on a TimerQueue.
+    """
+
+    __slots__ = ('due', 'fn', 'args', 'cancelled')
+
+    def __init__(self, due, fn, args):
+        self.due = due
+        self.fn = fn
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """Prevents the callback from running if it has not run yet."""
+        self.cancelled = True
+
+
+class TimerQueue:
+    """
+    Runs scheduled callbacks in due order on a lazily started daemon thread.
+    """
+
+    def __init__(self, thread_name='timer-queue'):
+        self.thread_name = thread_name
+        self._timers = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def schedule(self, delay, fn, *args):
+        """
+        Schedules a callback.
+
+        Args:
+            delay (float): Seconds from now after which the callback runs.
+            fn (callable): The callback.
+            *args: Arguments passed to the callback.
+
+        Returns:
+            Timer: Handle that can cancel the callback.
+        """
+        timer = Timer(time.monotonic() + max(0.0, delay), fn, args)
+        with self._condition:
+            # Cancelled timers are skipped lazily when they reach the top of the heap.
+            heapq.heappush(self._timers, (timer.due, next(self._sequence), timer))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+                self._thread.start()
+            elif self._timers[0][2] is timer:
+                self._condition.notify()
+        return timer
+
+    def _run(self):
+        """Timer thread loop: waits for the earliest timer and runs it."""
+        while True:
+            with self._condition:
+                while True:
+                    if not self._timers:
+                        self._condition.wait()
+                        continue
+                    due, _, timer = self._timers[0]
+                    if timer.cancelled:
+                        heapq.heappop(self._timers)
+                        continue
+                    remaining = due - time.monotonic()
+                    if remaining <= 0:
+                        heapq.heappop(self._timers)
+                        break
+                    self._condition.wait(remaining)
+            try:
+                timer.fn(*timer.args)
+            except Exception as exception:
+                logging.error("Timer callback %s failed: %s", timer.fn, exception, exc_info=True)
+
+
+timer_queue = TimerQueue()
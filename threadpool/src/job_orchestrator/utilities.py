@@ -1,4 +1,6 @@
 import logging
+from collections import namedtuple
+from job_orchestrator.logging_config import configure_logging
 
 """
 This module provides utility functions for setting up logging configurations, converting string formats,
@@ -6,9 +8,14 @@ and detecting cyclic dependencies in task configurations. It is designed to be u
 task management and execution order are critical, particularly in systems that involve complex dependency
 relationships.
 
+Dependency validation is a single iterative colour DFS over all tasks, so it runs in O(V + E) time regardless of how
+many tasks share a dependency, and it never recurses, so very deep chains cannot hit the recursion limit.
+
 Functions:
-    - setup_logging: Configures the logging level and format for the application.
+    - setup_logging: Configures logging once per process, writing log lines from a background thread.
     - convert_to_camel_case: Converts snake_case strings to CamelCase.
+    - analyze_dependencies: Validates task dependencies in one pass, returning a cycle path or a topological order
+                            and per-task depth levels.
     - has_cyclic_dependencies: Checks for cyclic dependencies in a list of tasks.
     - detect_cycle: Detects cycles in task dependencies using an iterative approach.
 
@@ -17,13 +24,14 @@ Example usage is provided at the end of the module to demonstrate how to detect
 
 def setup_logging(log_level=logging.INFO):
     """
-    Configures logging for the application with a specified log level and format.
+    Configures logging for the application with a specified log level. Only the first call in a process takes effect,
+    so calling it again, e.g. from every handler, costs nothing. See logging_config.configure_logging.
     
     Args:
         log_level (int): The logging level threshold. Messages less severe than `log_level` will be ignored.
                          Default is logging.INFO.
     """
-    logging.basicConfig(level=log_level, format='%(asctime)s - %(levelname)s - %(message)s')
+    configure_logging(log_level)
 
 def convert_to_camel_case(snake_str):
     """
@@ -38,6 +46,84 @@ def convert_to_camel_case(snake_str):
     camel_case_str = ''.join(word.capitalize() for word in snake_str.split('_'))
     return camel_case_str
 
+DependencyAnalysis = namedtuple('DependencyAnalysis', ['cycle', 'order', 'levels'])
+DependencyAnalysis.__doc__ = """
+Result of analyze_dependencies.
+
+Attributes:
+    cycle (list of str or None): The offending cycle as a dependency path that starts and ends with the same task
+                                 (e.g. ['a', 'b', 'a'] when 'a' depends on 'b' and 'b' depends on 'a'), or None.
+    order (list of str): Task names in topological order, every task after all of its dependencies. Empty if a
+                         cycle was found.
+    levels (dict): Maps each task name to its depth: 0 for tasks without dependencies, otherwise one more than the
+                   deepest dependency. Tasks with the same level can run in parallel. Empty if a cycle was found.
+"""
+
+_WHITE, _GREY, _BLACK = 0, 1, 2
+
+def _depth_first_search(task_map, roots, colour, order):
+    """
+    Iterative colour DFS along dependency edges. Tasks are coloured grey while they are on the current path and
+    black once all of their dependencies have been explored; finished tasks are appended to `order`, which yields a
+    topological order. Dependencies that are not keys of `task_map` are ignored.
+
+    Args:
+        task_map (dict): A dictionary mapping task names to their respective list of dependencies.
+        roots (iterable of str): Task names to start the search from.
+        colour (dict): Colour of every visited task, shared between calls.
+        order (list): Receives the names of finished tasks.
+
+    Returns:
+        list of str or None: The cycle path if one is reachable from `roots`, otherwise None.
+    """
+    for root in roots:
+        if colour.get(root, _WHITE) != _WHITE:
+            continue
+        colour[root] = _GREY
+        path = [root]
+        pending = [iter(task_map.get(root, ()))]
+        while pending:
+            for dependency in pending[-1]:
+                if dependency not in task_map:
+                    continue
+                state = colour.get(dependency, _WHITE)
+                if state == _GREY:
+                    return path[path.index(dependency):] + [dependency]
+                if state == _WHITE:
+                    colour[dependency] = _GREY
+                    path.append(dependency)
+                    pending.append(iter(task_map[dependency]))
+                    break
+            else:
+                pending.pop()
+                finished = path.pop()
+                colour[finished] = _BLACK
+                order.append(finished)
+    return None
+
+def analyze_dependencies(tasks):
+    """
+    Validates task dependencies in a single O(V + E) pass. Dependencies on tasks that are not in `tasks` cannot
+    form a cycle and are ignored.
+
+    Args:
+        tasks (list of dict): A list of task dictionaries, each containing a 'name' and optional 'dependencies'.
+
+    Returns:
+        DependencyAnalysis: The cycle path if one exists, otherwise the topological order and depth levels.
+    """
+    task_map = {task['name']: task.get('dependencies', []) for task in tasks}
+    colour = {}
+    order = []
+    cycle = _depth_first_search(task_map, task_map, colour, order)
+    if cycle is not None:
+        return DependencyAnalysis(cycle, [], {})
+
+    levels = {}
+    for task_name in order:
+        levels[task_name] = max((levels[dep] + 1 for dep in task_map[task_name] if dep in task_map), default=0)
+    return DependencyAnalysis(None, order, levels)
+
 def has_cyclic_dependencies(tasks):
     """
     Checks for cyclic dependencies in the task configurations using an iterative approach.
@@ -48,11 +134,7 @@ def has_cyclic_dependencies(tasks):
     Returns:
         bool: True if a cyclic dependency is detected, otherwise False.
     """
-    task_map = {task['name']: task.get('dependencies', []) for task in tasks}
-    for task_name in task_map:
-        if detect_cycle(task_map, task_name):
-            return True
-    return False
+    return analyze_dependencies(tasks).cycle is not None
 
 def detect_cycle(task_map, start_task):
     """
@@ -65,20 +147,4 @@ def detect_cycle(task_map, start_task):
     Returns:
         bool: True if a cycle is detected, otherwise False.
     """
-    visited = set()
-    stack = [(start_task, None)]  # Stack of (current_node, parent_node)
-
-    while stack:
-        current_node, parent_node = stack.pop()
-        if current_node in visited:
-            continue
-        visited.add(current_node)
-
-        for neighbor in task_map.get(current_node, []):
-            if neighbor == parent_node:
-                continue  # Avoid going back to the parent node
-            if neighbor in visited:
-                return True  # Cycle detected
-            stack.append((neighbor, current_node))
-
-    return False
+    return _depth_first_search(task_map, [start_task], {}, []) is not None
@@ -0,0 +1,457 @@
+import collections
+import concurrent.futures
+import heapq
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+from job_orchestrator.timer_queue import timer_queue
+
+"""
+This module defines the WorkerPool class, a long-lived, bounded pool of worker threads that several jobs can share,
+and the SharedTasks class, which lets concurrently running jobs execute identical tasks only once.
+
+Work is queued per job and idle workers take the next item from the jobs in round-robin order, so a job with
+thousands of ready tasks cannot starve a job with a handful. Threads are started lazily up to `max_workers` and are
+reused for the lifetime of the pool, so thread creation is paid once no matter how many jobs run, and the total
+concurrency of all jobs stays under a single cap. Within a job, queued work is taken highest priority first and in
+submission order among equal priorities.
+
+A worker stuck in a call that has been given up on, such as a timed-out task, can be abandoned: it stops counting
+against `max_workers`, a replacement is started if work is waiting, and the stuck thread exits once its call returns.
+Futures resolved by their submitter before the call finishes, e.g. with a timeout error, are left as they are.
+
+An AdaptiveWorkerPool sizes itself between a floor and a ceiling instead of using a fixed bound. A controller on the
+shared timer queue samples the pool every `interval` seconds. While work is queued and the CPU time the process used
+stays below half of what the interpreter can use for two samples in a row, the workers are blocked in I/O rather than
+computing, so threads are added: up to the queued work at once while the CPU is mostly idle, and at most doubling the
+pool otherwise. While the CPU is saturated the pool does not grow, because under the GIL more threads cannot add
+throughput to CPU-bound tasks. Workers that stayed idle for `idle_timeout` seconds are retired down to the floor.
+Every decision is kept as a ScalingEvent and counted in the pool's metrics. The controller only samples while work is
+queued or running: once the pool drains it wakes at most once more, to retire the idle threads above the floor, and
+the next submission starts it again, so an idle pool causes no wakeups.
+
+Classes:
+    WorkerPool: Bounded thread pool with fair-share scheduling across jobs.
+    AdaptiveWorkerPool: Worker pool that grows while workers are blocked and shrinks when they are idle.
+    SharedTasks: Deduplicates identical tasks submitted by different jobs.
+
+Example usage:
+    pool = WorkerPool(max_workers=8)
+    future = pool.submit("job1", print, "Hello from job1")
+    future.result()
+    pool.shutdown()
+
+    with AdaptiveWorkerPool(min_workers=2, max_workers=128) as pool:
+        futures = [pool.submit("job1", time.sleep, 0.1) for _ in range(1000)]
+        print(pool.metrics())
+"""
+
+# Ceiling of an AdaptiveWorkerPool created without `max_workers`.
+DEFAULT_MAX_ADAPTIVE_WORKERS = 128
+
+# Fraction of the usable CPU above which an AdaptiveWorkerPool counts as CPU-bound and stops growing.
+SATURATION = 0.5
+
+# Consecutive samples below SATURATION with work queued before an AdaptiveWorkerPool grows, so that a single sample
+# of a CPU-bound pool descheduled by the operating system does not grow it.
+BLOCKED_SAMPLES = 2
+
+# Fraction of the usable CPU below which an AdaptiveWorkerPool grows by all of its queued work at once.
+IDLE_CPU = 0.25
+
+# A decision of an AdaptiveWorkerPool: `action` is 'grow' or 'shrink', `workers` the number of worker threads after
+# it, `queued` the number of queued work items and `utilization` the CPU cores the process used since the last sample.
+ScalingEvent = collections.namedtuple('ScalingEvent', ['time', 'action', 'workers', 'queued', 'utilization'])
+
+
+class WorkerPool:
+    """
+    Bounded pool of worker threads shared by concurrently running jobs, dispatching queued work round-robin
+    across jobs.
+    """
+
+    def __init__(self, max_workers=None, thread_name_prefix='job-worker'):
+        """
+        Initializes the pool. Worker threads are started on demand.
+
+        Args:
+            max_workers (int, optional): Maximum number of worker threads. Defaults to min(32, cpu_count + 4).
+            thread_name_prefix (str): Prefix of the worker thread names.
+        """
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.thread_name_prefix = thread_name_prefix
+        self._queues = {}
+        self._job_order = collections.deque()
+        self._condition = threading.Condition()
+        self._threads = []
+        self._thread_counter = itertools.count()
+        self._sequence = itertools.count()
+        self._idle_workers = 0
+        self._retiring = 0
+        self._abandoned = set()
+        self._shutdown = False
+
+    def submit(self, job_key, fn, *args, **kwargs):
+        """
+        Queues a callable on behalf of a job with the default priority of zero.
+
+        Args:
+            job_key (hashable): Identifies the job submitting the work; queued work is shared fairly between keys.
+            fn (callable): The callable to execute.
+            *args, **kwargs: Arguments passed to the callable.
+
+        Returns:
+            concurrent.futures.Future: Future resolved with the outcome of the call.
+
+        Raises:
+            RuntimeError: If the pool has been shut down.
+        """
+        return self.submit_with_priority(job_key, 0, fn, *args, **kwargs)
+
+    def submit_with_priority(self, job_key, priority, fn, *args, **kwargs):
+        """
+        Queues a callable on behalf of a job. Among the queued work of the job, higher priorities run first.
+
+        Args:
+            job_key (hashable): Identifies the job submitting the work; queued work is shared fairly between keys.
+            priority (float): Priority of the work within its job.
+            fn (callable): The callable to execute.
+            *args, **kwargs: Arguments passed to the callable.
+
+        Returns:
+            concurrent.futures.Future: Future resolved with the outcome of the call.
+
+        Raises:
+            RuntimeError: If the pool has been shut down.
+        """
+        future = concurrent.futures.Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new work after shutdown")
+            queue = self._queues.get(job_key)
+            if queue is None:
+                queue = self._queues[job_key] = []
+                self._job_order.append(job_key)
+            # The sequence number keeps equal priorities in submission order and is never equal, so the remaining
+            # fields are never compared.
+            heapq.heappush(queue, (-priority, next(self._sequence), future, fn, args, kwargs))
+            if self._idle_workers:
+                # The notifier un-counts the woken worker, so back-to-back submissions wake distinct workers.
+                self._idle_workers -= 1
+                self._condition.notify()
+            elif self._can_start_worker():
+                self._start_worker()
+        return future
+
+    def _can_start_worker(self):
+        """Returns whether another worker thread may be started. Must be called with the condition held."""
+        return len(self._threads) < self.max_workers
+
+    def _start_worker(self):
+        """Starts one more worker thread. Must be called with the condition held."""
+        thread = threading.Thread(target=self._work, name=f"{self.thread_name_prefix}-{next(self._thread_counter)}",
+                                  daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def _next_work_item(self):
+        """
+        Returns the next work item, taking the highest priority item from each job in turn, or None once the pool is
+        shut down and drained or the calling worker is retired. Must be called with the condition held.
+        """
+        while not self._job_order:
+            if self._shutdown:
+                return None
+            if self._retiring:
+                self._retiring -= 1
+                self._threads.remove(threading.current_thread())
+                return None
+            self._idle_workers += 1
+            self._condition.wait()
+
+        job_key = self._job_order.popleft()
+        queue = self._queues[job_key]
+        work_item = heapq.heappop(queue)[2:]
+        if queue:
+            self._job_order.append(job_key)
+        else:
+            del self._queues[job_key]
+        return work_item
+
+    def _work(self):
+        """Worker thread loop: runs queued work items until the pool is shut down or the thread is abandoned."""
+        thread = threading.current_thread()
+        while True:
+            with self._condition:
+                if thread in self._abandoned:
+                    self._abandoned.discard(thread)
+                    return
+                work_item = self._next_work_item()
+            if work_item is None:
+                return
+            self._run_work_item(*work_item)
+            # An idle worker must not keep the arguments of its last work item alive.
+            del work_item
+
+    @staticmethod
+    def _run_work_item(future, fn, args, kwargs):
+        """Runs one work item and resolves its future, unless the future was cancelled or resolved by its submitter."""
+        try:
+            if not future.set_running_or_notify_cancel():
+                return
+        except RuntimeError:
+            # Resolved by its submitter before it started.
+            return
+        try:
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as exception:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except concurrent.futures.InvalidStateError:
+            # Resolved by its submitter while running, e.g. timed out.
+            pass
+
+    def abandon(self, thread):
+        """
+        Stops counting a worker thread stuck in a call against `max_workers` and starts a replacement if work is
+        waiting. The abandoned thread exits once its call returns.
+
+        Args:
+            thread (threading.Thread): A worker thread of this pool.
+        """
+        with self._condition:
+            if thread not in self._threads:
+                return
+            self._threads.remove(thread)
+            self._abandoned.add(thread)
+            logging.warning("Abandoned worker thread %s; %d threads remain.", thread.name, len(self._threads))
+            if self._job_order and not self._idle_workers and not self._shutdown and self._can_start_worker():
+                self._start_worker()
+
+    def shutdown(self, wait=True):
+        """
+        Stops accepting work. Already queued work is still executed.
+
+        Args:
+            wait (bool): Whether to wait for the worker threads to finish.
+        """
+        with self._condition:
+            self._shutdown = True
+            self._idle_workers = 0
+            self._condition.notify_all()
+            threads = list(self._threads)
+        if wait:
+            for thread in threads:
+                thread.join()
+        logging.debug("Worker pool shut down after starting %d threads.", len(threads))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown(wait=True)
+        return False
+
+
+class AdaptiveWorkerPool(WorkerPool):
+    """
+    Worker pool that grows while queued work waits on workers blocked in I/O and shrinks after idle periods, between
+    `min_workers` and `max_workers` threads.
+
+    Attributes:
+        min_workers (int): Floor of the number of worker threads.
+        max_workers (int): Ceiling of the number of worker threads.
+        scaling_events (collections.deque of ScalingEvent): The most recent growth and shrink decisions.
+    """
+
+    def __init__(self, min_workers=None, max_workers=None, thread_name_prefix='job-worker', interval=0.01,
+                 idle_timeout=1.0, cpu_budget=None):
+        """
+        Initializes the pool with `min_workers` threads allowed. Worker threads are started on demand, and the
+        controller samples from a submission until the pool has drained.
+
+        Args:
+            min_workers (int, optional): Floor of the number of worker threads. Defaults to min(4, cpu_count).
+            max_workers (int, optional): Ceiling of the number of worker threads. Defaults to
+                                         DEFAULT_MAX_ADAPTIVE_WORKERS.
+            thread_name_prefix (str): Prefix of the worker thread names.
+            interval (float): Seconds between two samples of the controller.
+            idle_timeout (float): Seconds workers must have been idle before they are retired.
+            cpu_budget (float, optional): CPU cores the worker threads can use at once. Defaults to 1 when the
+                                          interpreter has a GIL and to the number of CPUs otherwise.
+        """
+        max_workers = max_workers or DEFAULT_MAX_ADAPTIVE_WORKERS
+        super().__init__(max_workers, thread_name_prefix)
+        self.min_workers = min(min_workers or min(4, os.cpu_count() or 1), self.max_workers)
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+        self.cpu_budget = cpu_budget or (1.0 if gil_enabled else float(os.cpu_count() or 1))
+        self.scaling_events = collections.deque(maxlen=1000)
+        self._target = self.min_workers
+        self._peak_workers = 0
+        self._grown = 0
+        self._shrunk = 0
+        self._utilization = 0.0
+        self._timer = None
+        self._parked = False
+        self._generation = 0
+        self._sampled_at = None
+        self._cpu_time = None
+        self._idle_since = None
+        self._fewest_idle = 0
+        self._blocked_samples = 0
+
+    def submit_with_priority(self, job_key, priority, fn, *args, **kwargs):
+        future = super().submit_with_priority(job_key, priority, fn, *args, **kwargs)
+        with self._condition:
+            self._peak_workers = max(self._peak_workers, len(self._threads))
+            if (self._timer is None or self._parked) and not self._shutdown:
+                self._sampled_at, self._cpu_time = time.monotonic(), time.process_time()
+                self._idle_since, self._fewest_idle = self._sampled_at, self._idle_workers
+                self._blocked_samples = 0
+                self._arm(self.interval)
+        return future
+
+    def _arm(self, delay, parked=False):
+        """
+        Schedules the next controller step in place of any scheduled one. A parked step is the last one of a drained
+        pool and is brought forward by the next submission. Must be called with the condition held.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+        self._generation += 1
+        self._parked = parked
+        self._timer = timer_queue.schedule(delay, self._sample, self._generation)
+
+    def _can_start_worker(self):
+        return len(self._threads) < self._target
+
+    def _sample(self, generation):
+        """
+        Controller step, run on the timer queue: measures the CPU utilization since the last sample and grows or
+        shrinks the pool. Schedules the next step while work is queued or running; a drained pool with threads above
+        the floor is sampled once more when they can be retired, and a drained pool at its floor stops the controller.
+        """
+        with self._condition:
+            if generation != self._generation:
+                return  # Replaced by a step scheduled since
+            if self._shutdown:
+                self._timer = None
+                return
+            now, cpu_time = time.monotonic(), time.process_time()
+            elapsed = now - self._sampled_at
+            self._utilization = (cpu_time - self._cpu_time) / elapsed if elapsed > 0 else 0.0
+            self._sampled_at, self._cpu_time = now, cpu_time
+            queued = sum(len(queue) for queue in self._queues.values())
+            workers = len(self._threads)
+
+            if queued and workers < self.max_workers and self._utilization < SATURATION * self.cpu_budget:
+                self._blocked_samples += 1
+            else:
+                self._blocked_samples = 0
+
+            if self._blocked_samples >= BLOCKED_SAMPLES:
+                # Work is waiting while the workers leave the CPU idle, so they are blocked rather than computing.
+                growth = queued if self._utilization < IDLE_CPU * self.cpu_budget else max(1, workers)
+                self._target = min(self.max_workers, max(self._target, workers) + min(growth, queued))
+                while len(self._threads) < self._target:
+                    self._start_worker()
+                self._decide('grow', queued)
+                self._idle_since, self._fewest_idle = now, self._idle_workers
+            else:
+                self._fewest_idle = min(self._fewest_idle, self._idle_workers)
+                if now - self._idle_since >= self.idle_timeout:
+                    surplus = min(self._fewest_idle, workers - self._retiring - self.min_workers)
+                    if surplus > 0 and not queued:
+                        self._target = max(self.min_workers, workers - self._retiring - surplus)
+                        self._retiring += surplus
+                        self._idle_workers -= surplus
+                        for _ in range(surplus):
+                            self._condition.notify()
+                        self._decide('shrink', queued, workers - surplus)
+                    self._idle_since, self._fewest_idle = now, self._idle_workers
+            self._peak_workers = max(self._peak_workers, len(self._threads))
+            workers = len(self._threads) - self._retiring
+            if queued or workers > self._idle_workers:
+                self._arm(self.interval)
+            elif workers > self.min_workers:
+                self._arm(max(self.interval, self._idle_since + self.idle_timeout - now), parked=True)
+            else:
+                self._timer, self._parked = None, False
+
+    def _decide(self, action, queued, workers=None):
+        """Records a scaling decision. Must be called with the condition held."""
+        workers = len(self._threads) if workers is None else workers
+        if action == 'grow':
+            self._grown += 1
+        else:
+            self._shrunk += 1
+        self.scaling_events.append(ScalingEvent(time.time(), action, workers, queued, self._utilization))
+        logging.debug("Worker pool %s to %d threads with %d items queued at %.2f CPU utilization.",
+                      'grew' if action == 'grow' else 'shrank', workers, queued, self._utilization)
+
+    def metrics(self):
+        """
+        Returns the current state of the pool and counts of its scaling decisions.
+
+        Returns:
+            dict: `workers`, `idle_workers`, `queued`, `peak_workers`, `min_workers`, `max_workers`, `grow_decisions`,
+                  `shrink_decisions` and `utilization`, the CPU cores the process used in the last sampling interval.
+        """
+        with self._condition:
+            return {
+                "workers": len(self._threads) - self._retiring,
+                "idle_workers": self._idle_workers,
+                "queued": sum(len(queue) for queue in self._queues.values()),
+                "peak_workers": self._peak_workers,
+                "min_workers": self.min_workers,
+                "max_workers": self.max_workers,
+                "grow_decisions": self._grown,
+                "shrink_decisions": self._shrunk,
+                "utilization": self._utilization,
+            }
+
+    def shutdown(self, wait=True):
+        super().shutdown(wait)
+        with self._condition:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+
+class SharedTasks:
+    """
+    Deduplicates identical tasks submitted by concurrently running jobs: the first job to submit a task key runs it,
+    later jobs receive the same future.
+    """
+
+    def __init__(self):
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def submit(self, task_key, submit_task, failed=None):
+        """
+        Returns the future for a task key, submitting the task only if no job has submitted it yet, or if the shared
+        future is the `failed` one of an attempt the caller wants to retry.
+
+        Args:
+            task_key (hashable): Identifies the task and everything its result depends on.
+            submit_task (callable): Submits the task and returns its future.
+            failed (concurrent.futures.Future, optional): The future of a failed attempt being retried.
+
+        Returns:
+            concurrent.futures.Future: The shared future of the task.
+        """
+        with self._lock:
+            future = self._futures.get(task_key)
+            if future is None or future is failed:
+                future = self._futures[task_key] = submit_task()
+            else:
+                logging.debug("Reusing shared task %s.", task_key)
+            return future
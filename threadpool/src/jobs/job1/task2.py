@@ -1,15 +1,10 @@
 import time
-import logging
 
-from job_orchestrator.utilities import setup_logging
+from job_orchestrator.logging_config import task_logger
 
 from ..task import Task
 
 class Task2(Task):
-    def __init__(self):
-        # Configure logging at the initialization level of each task
-        setup_logging()
-
     def execute(self, dependent_response=None):
         """
         Execute the task, optionally with an input.
@@ -25,13 +20,13 @@ class Task2(Task):
         """
         task_name = self.__class__.__name__
         if dependent_response is None or (isinstance(dependent_response, dict) and not dependent_response):
-            logging.info("Starting execution of %s", task_name)
+            task_logger.info("Starting execution of %s", task_name)
             time.sleep(1)  # Simulate a delay to mimic task processing
-            logging.info("End Executing %s", task_name)
+            task_logger.info("End Executing %s", task_name)
             return f"From {task_name}"
         else:
-            logging.info("Starting execution of %s with input: %s", task_name, dependent_response)
+            task_logger.info("Starting execution of %s with input: %s", task_name, dependent_response)
             time.sleep(1)  # Simulate a delay to mimic task processing
-            logging.info("End Executing %s with input: %s", task_name, dependent_response)
+            task_logger.info("End Executing %s with input: %s", task_name, dependent_response)
             return f"From {task_name} with {dependent_response}"
         
\ No newline at end of file
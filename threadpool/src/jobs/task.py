@@ -1,19 +1,14 @@
-import logging
+from job_orchestrator.logging_config import task_logger
 
 class Task:
     """
     Base class for tasks that can be executed with optional dependent responses.
     
     This class is designed to be extended by more specific task implementations that override
-    the execute method to perform concrete actions.
+    the execute method to perform concrete actions. Tasks do not configure logging themselves; the
+    orchestrator configures it once per process, and tasks log their lines to `task_logger`.
     """
     
-    def __init__(self):
-        """
-        Initializes the Task instance. Setup can be added here if needed.
-        """
-        logging.basicConfig(level=logging.INFO)
-    
     def execute(self, dependent_response=None):
         """
         Executes the task. This method should be overridden in subclasses.
@@ -27,9 +22,9 @@ class Task:
         Raises:
             NotImplementedError: If the method is not overridden in a subclass.
         """
-        logging.info("Executing task...")
+        task_logger.info("Executing task...")
         if dependent_response is not None:
-            logging.info(f"Received dependent response: {dependent_response}")
+            task_logger.info("Received dependent response: %s", dependent_response)
         
         # Placeholder for demonstration that should be replaced with actual task logic in subclasses.
         raise NotImplementedError("Execute method must be overridden in subclasses.")
@@ -6,8 +6,12 @@ sys.path.insert(0, project_root)
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(1, project_root)
 
+import argparse
 import logging
 from job_orchestrator.job import JobOrchestrator
+from job_orchestrator.logging_config import configure_logging
+from job_orchestrator.result_cache import get_result_cache
+from job_orchestrator.tracing import TaskTrace
 from job_orchestrator.utilities import setup_logging
 
 
@@ -18,25 +22,84 @@ error management. The module can be used in environments where jobs need to be e
 and where error handling and logging are crucial for maintaining system integrity.
 
 Functions:
-    main(job_name): The main entry point for the module. It configures logging, initializes the JobOrchestrator with the
+    initiate_job(job_name, cache, checkpoints, trace_path, autoscale, resources, max_workers): The main entry point for the module. It configures logging, initializes the JobOrchestrator with the
                     specified job configuration and schema files, and executes the job while handling various exceptions.
+    initiate_jobs(job_names, max_workers, cache, checkpoints, trace_path, autoscale, resources): Runs several jobs
+                    concurrently on one shared, bounded worker pool.
+    resume_run(run_id, cache, trace_path, autoscale, resources, max_workers): Continues an interrupted run, executing only the tasks that had not completed.
+    report_history(job_names, max_workers): Prints recorded task durations and makespan estimates instead of running.
+    save_trace(trace, trace_path): Writes the task spans of a run as a Chrome trace.
+    parse_resources(specs): Parses NAME=CAPACITY resource capacities from the command line.
 
 Example usage:
     If this script is executed directly (i.e., not imported), it will read the job configuration from 'config/job_config.json'
-    and the schema from 'config/job_schema.json', attempt to execute the job named 'job1', and handle any errors that occur.
+    and the schema from 'config/job_schema.json', attempt to execute the jobs named on the command line (default 'job1'),
+    and handle any errors that occur:
+
+        python src/main.py
+        python src/main.py job1 job2 --max-workers 8
+        python src/main.py job1 --cache
+        python src/main.py job1 --checkpoint
+        python src/main.py job1 job2 --trace trace.json
+        python src/main.py job1 job2 --task-log-level WARNING
+        python src/main.py job1 job2 --autoscale --max-workers 64
+        python src/main.py job1 job2 --resource db=4 --resource mem_gb=16
+        python src/main.py --resume 3f2a...
+        python src/main.py job1 --stats --max-workers 8
 """
 
-def initiate_job(job_name):
+def save_trace(trace, trace_path):
+    """
+    Writes the task spans of a run as a Chrome trace, if one was requested.
+
+    Args:
+        trace (TaskTrace or None): The recorded spans.
+        trace_path (str or None): The JSON file to write, for Perfetto or chrome://tracing.
+    """
+    if trace is not None:
+        logging.info("Wrote the trace of %d task executions to %s.", len(trace.spans), trace.save(trace_path))
+
+def parse_resources(specs):
+    """
+    Parses resource capacities given as NAME=CAPACITY.
+
+    Args:
+        specs (list of str or None): The capacities, e.g. ["db=4", "mem_gb=16"].
+
+    Returns:
+        dict: Maps resource names to their capacity.
+
+    Raises:
+        ValueError: If a capacity is malformed.
+    """
+    capacities = {}
+    for spec in specs or []:
+        name, separator, capacity = spec.partition('=')
+        if not separator or not name:
+            raise ValueError(f"Resource capacity {spec} is not of the form NAME=CAPACITY.")
+        capacities[name] = float(capacity)
+    return capacities
+
+def initiate_job(job_name, cache=False, checkpoints=False, trace_path=None, autoscale=False, resources=None,
+                 max_workers=None):
     """
     Main function to execute a job using the JobOrchestrator.
     
     This function sets up the configuration path, initializes the JobOrchestrator,
     and attempts to start a specified job. It handles exceptions by logging them
-    and exiting the program with an error status.
+    and exiting the program with an error status, and exits the same way when a
+    task of the job failed, timed out or was cancelled.
     
     Args:
         job_name (str): The name of the job to be executed, which should correspond to one of the jobs
                         defined in the job configuration file.
+        cache (bool): Whether unchanged tasks reuse their results from the result cache in '.cache/task_results'.
+        checkpoints (bool): Whether task completions are checkpointed so the run can be resumed if it is interrupted.
+        trace_path (str, optional): File to which a Chrome trace of the task executions is written.
+        autoscale (bool): Whether the job runs on a worker pool that grows and shrinks with the load, up to
+                          `max_workers`.
+        resources (dict, optional): Capacities of the resources the tasks declare.
+        max_workers (int, optional): Upper bound on the number of worker threads of the job.
     
     Raises:
         FileNotFoundError: If the configuration or schema files are not found.
@@ -45,15 +108,164 @@ def initiate_job(job_name):
     """
     setup_logging()  # Configure the logging based on predefined settings.
         
+    trace = TaskTrace() if trace_path else None
     try:
         # Initialize the JobOrchestrator and start the specified job
-        orchestrator = JobOrchestrator('config/job_config.json','config/job_schema.json')
-        orchestrator.start_job(job_name)
-        logging.info("Successfully executed job: %s", job_name)   
+        orchestrator = JobOrchestrator('config/job_config.json','config/job_schema.json',
+                                       result_cache=get_result_cache() if cache else None, checkpoints=checkpoints,
+                                       trace=trace, autoscale=autoscale, resources=resources)
+        succeeded = orchestrator.start_job(job_name, max_workers=max_workers) is True
+        save_trace(trace, trace_path)
     except Exception as e:
         logging.error("Failed to execute job: %s", e, exc_info=True)
         sys.exit(1)
+    if not succeeded:
+        logging.error("Job %s did not complete: tasks failed, timed out or were cancelled.", job_name)
+        sys.exit(1)
+    logging.info("Successfully executed job: %s", job_name)
+
+def initiate_jobs(job_names, max_workers=None, cache=False, checkpoints=False, trace_path=None, autoscale=False,
+                  resources=None):
+    """
+    Executes several jobs concurrently on one shared worker pool using the JobOrchestrator. Exits with an error status
+    if any of the jobs did not complete.
+
+    Args:
+        job_names (list of str): The names of the jobs to be executed.
+        max_workers (int, optional): Upper bound on the number of worker threads shared by all jobs.
+        autoscale (bool): Whether the shared pool grows and shrinks with the load, up to `max_workers`.
+        resources (dict, optional): Capacities of the resources the tasks declare, shared by all jobs.
+        cache (bool): Whether unchanged tasks reuse their results from the result cache in '.cache/task_results'.
+        checkpoints (bool): Whether task completions are checkpointed so the runs can be resumed if interrupted.
+        trace_path (str, optional): File to which a Chrome trace of the task executions of all jobs is written.
+    """
+    setup_logging()  # Configure the logging based on predefined settings.
+
+    trace = TaskTrace() if trace_path else None
+    try:
+        orchestrator = JobOrchestrator('config/job_config.json','config/job_schema.json',
+                                       result_cache=get_result_cache() if cache else None, checkpoints=checkpoints,
+                                       trace=trace, autoscale=autoscale, resources=resources)
+        runs = orchestrator.start_jobs(job_names, max_workers=max_workers)
+        save_trace(trace, trace_path)
+    except Exception as e:
+        logging.error("Failed to execute jobs: %s", e, exc_info=True)
+        sys.exit(1)
+    failed = {job_name: run for job_name, run in runs.items() if run.outcome is not True}
+    if failed:
+        logging.error("Jobs %s did not complete: tasks failed, timed out or were cancelled.", ", ".join(failed))
+        for job_name, run in failed.items():
+            if run.run_id is not None:
+                logging.error("Resume job %s with --resume %s.", job_name, run.run_id)
+        sys.exit(1)
+    logging.info("Successfully executed jobs: %s", ", ".join(job_names))
+
+def resume_run(run_id, cache=False, trace_path=None, autoscale=False, resources=None, max_workers=None):
+    """
+    Continues a checkpointed run that was interrupted, executing only the tasks that had not completed. Exits with an
+    error status if the run still did not complete.
+
+    Args:
+        run_id (str): ID of the interrupted run, as logged when it started.
+        cache (bool): Whether unchanged tasks reuse their results from the result cache in '.cache/task_results'.
+        trace_path (str, optional): File to which a Chrome trace of the executed tasks is written.
+        autoscale (bool): Whether the run continues on a worker pool that grows and shrinks with the load, up to
+                          `max_workers`.
+        resources (dict, optional): Capacities of the resources the tasks declare.
+        max_workers (int, optional): Upper bound on the number of worker threads of the run.
+    """
+    setup_logging()  # Configure the logging based on predefined settings.
+
+    trace = TaskTrace() if trace_path else None
+    try:
+        orchestrator = JobOrchestrator('config/job_config.json','config/job_schema.json',
+                                       result_cache=get_result_cache() if cache else None, checkpoints=True,
+                                       trace=trace, autoscale=autoscale, resources=resources)
+        succeeded = orchestrator.resume(run_id, max_workers=max_workers) is True
+        save_trace(trace, trace_path)
+    except Exception as e:
+        logging.error("Failed to resume run: %s", e, exc_info=True)
+        sys.exit(1)
+    if not succeeded:
+        logging.error("Run %s did not complete: tasks failed, timed out or were cancelled.", run_id)
+        sys.exit(1)
+    logging.info("Successfully resumed run: %s", run_id)
+
+def report_history(job_names, max_workers=None):
+    """
+    Prints the p50/p95/max wall times recorded for the tasks of each job and the estimated makespan of the job for
+    1 to `max_workers` workers, to help size `max_workers`.
+
+    Args:
+        job_names (list of str): The names of the jobs to report on.
+        max_workers (int, optional): Largest worker count to estimate. Defaults to the number of tasks of the job.
+    """
+    setup_logging()  # Configure the logging based on predefined settings.
+
+    try:
+        orchestrator = JobOrchestrator('config/job_config.json','config/job_schema.json')
+        for job_name in job_names:
+            tasks = orchestrator.jobs.get('jobs', {}).get(job_name, {}).get('tasks', [])
+            statistics = orchestrator.history.task_statistics(task['name'] for task in tasks)
+            print(f"{job_name}:")
+            print(f"  {'task':<24} {'runs':>6} {'failed':>6} {'p50':>8} {'p95':>8} {'max':>8}")
+            for task in tasks:
+                stats = statistics.get(task['name'])
+                if stats is None or stats.p50 is None:
+                    print(f"  {task['name']:<24} {'no successful executions recorded':>40}")
+                else:
+                    print(f"  {task['name']:<24} {stats.count:>6} {stats.failures:>6} "
+                          f"{stats.p50:>8.3f} {stats.p95:>8.3f} {stats.max:>8.3f}")
+            for workers in range(1, (max_workers or len(tasks)) + 1):
+                print(f"  estimated makespan with {workers} workers: "
+                      f"{orchestrator.estimate_makespan(job_name, workers):.3f}s")
+    except Exception as e:
+        logging.error("Failed to report task history: %s", e, exc_info=True)
+        sys.exit(1)
 
 if __name__ == '__main__':
-    job_name = 'job1'  # Name of the job to be executed
-    initiate_job(job_name)
+    parser = argparse.ArgumentParser(description="Execute jobs defined in config/job_config.json.")
+    parser.add_argument('job_names', nargs='*', default=['job1'], help="Names of the jobs to be executed.")
+    parser.add_argument('--max-workers', type=int, default=None,
+                        help="Worker threads of the job, or shared by all jobs when several jobs are executed.")
+    parser.add_argument('--stats', action='store_true',
+                        help="Print recorded task durations and makespan estimates instead of executing the jobs.")
+    parser.add_argument('--cache', action='store_true',
+                        help="Skip tasks whose code, settings and inputs are unchanged, reusing their cached results.")
+    parser.add_argument('--checkpoint', action='store_true',
+                        help="Checkpoint task completions so an interrupted run can be resumed.")
+    parser.add_argument('--resume', metavar='RUN_ID',
+                        help="Resume an interrupted checkpointed run, executing only its unfinished tasks.")
+    parser.add_argument('--trace', metavar='PATH',
+                        help="Write a Chrome trace of the task executions to PATH, for Perfetto or chrome://tracing.")
+    parser.add_argument('--autoscale', action='store_true',
+                        help="Grow the worker pool while tasks wait on I/O and shrink it when idle, up to "
+                             "--max-workers threads.")
+    parser.add_argument('--resource', action='append', metavar='NAME=CAPACITY',
+                        help="Capacity of a resource tasks declare, e.g. db=4; tasks only start while their resources "
+                             "are free. Can be repeated.")
+    parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help="Level of the log lines.")
+    parser.add_argument('--task-log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help="Level of the per-task log lines, such as a task starting or completing. "
+                             "Defaults to --log-level.")
+    parser.add_argument('--task-log-sample', type=float, default=1.0, metavar='RATE',
+                        help="Fraction of the per-task log lines below WARNING that are written, e.g. 0.01.")
+    args = parser.parse_args()
+    try:
+        resources = parse_resources(args.resource)
+    except ValueError as e:
+        parser.error(str(e))
+    configure_logging(getattr(logging, args.log_level),
+                      getattr(logging, args.task_log_level) if args.task_log_level else None, args.task_log_sample)
+
+    if args.stats:
+        report_history(args.job_names, args.max_workers)
+    elif args.resume:
+        resume_run(args.resume, args.cache, args.trace, args.autoscale, resources, args.max_workers)
+    elif len(args.job_names) == 1:
+        initiate_job(args.job_names[0], args.cache, args.checkpoint, args.trace, args.autoscale, resources,
+                     args.max_workers)
+    else:
+        initiate_jobs(args.job_names, args.max_workers, args.cache, args.checkpoint, args.trace, args.autoscale,
+                      resources)
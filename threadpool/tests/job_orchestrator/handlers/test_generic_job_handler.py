@@ -1,6 +1,10 @@
 import os
 import sys
+import tempfile
+import threading
+import time
 import unittest
+from unittest.mock import ANY, patch
 
 
 
@@ -11,7 +15,87 @@ base_src = os.path.join(base_threadpool, 'src')
 sys.path.insert(1, base_src)  # Insert at the beginning to prioritize
 
 
-from src.job_orchestrator.handlers.generic_job_handler import GenericJobHandler
+from src.job_orchestrator.handlers.generic_job_handler import GenericJobHandler, TaskTimeoutError
+from job_orchestrator.checkpoint import RunLog
+from job_orchestrator.job_plan import JobPlan
+from job_orchestrator.resources import ResourcePool
+from job_orchestrator.result_cache import ResultCache
+from job_orchestrator.shared_results import SHARED_MIN_BYTES
+from job_orchestrator.task_durations import task_durations
+from job_orchestrator.task_registry import task_registry
+from job_orchestrator.tracing import TaskTrace
+
+
+def register_recording_tasks(task_names, started):
+    """Registers a task class for every name that appends the name to `started` when it runs."""
+    for task_name in task_names:
+        class RecordingTask:
+            def execute(self, dependent_response=None, task_name=task_name):
+                started.append(task_name)
+                return task_name
+        task_registry.register(task_name, RecordingTask)
+
+
+def register_hanging_task(task_name, release):
+    """Registers a task class that blocks until `release` is set, standing in for a stuck I/O call."""
+    class HangingTask:
+        def execute(self, dependent_response=None):
+            release.wait()
+            return task_name
+    task_registry.register(task_name, HangingTask)
+
+
+class CachedSourceTask:
+    """Task whose result is `output`, counting its executions in `executed`."""
+    output = "source"
+    executed = []
+
+    def execute(self, dependent_response=None):
+        CachedSourceTask.executed.append("cache.source")
+        return CachedSourceTask.output
+
+
+class CachedTransformTask:
+    """Task deriving its result from its dependencies, counting its executions in `executed`."""
+    def execute(self, dependent_response=None):
+        CachedSourceTask.executed.append("cache.transform")
+        return sorted(dependent_response.values())
+
+
+class ChainLinkTask:
+    """Task adding one to the result of its dependency, counting its executions in `executed`."""
+    executed = 0
+
+    def execute(self, dependent_response=None):
+        ChainLinkTask.executed += 1
+        return sum(dependent_response.values()) + 1 if dependent_response else 0
+
+
+class NoneResultTask:
+    """Task returning None, counting its executions in `executed`."""
+    executed = 0
+
+    def execute(self, dependent_response=None):
+        NoneResultTask.executed += 1
+
+
+class LargePayloadTask:
+    """Task returning a buffer large enough to be passed through shared memory."""
+    def execute(self, dependent_response=None):
+        return bytes(range(256)) * (SHARED_MIN_BYTES // 128)
+
+
+class PayloadConsumerTask:
+    """Task reporting the type, size and checksum of the payload it received."""
+    def execute(self, dependent_response=None):
+        payload = dependent_response["shm.source"]
+        return type(payload).__name__, len(payload), sum(payload[::4096])
+
+
+def shared_memory_segments():
+    """Names of the shared memory segments that currently exist, on systems exposing them under /dev/shm."""
+    return set(os.listdir('/dev/shm')) if os.path.isdir('/dev/shm') else set()
+
 
 class TestGenericJobHandler(unittest.TestCase):
 
@@ -22,7 +106,7 @@ class TestGenericJobHandler(unittest.TestCase):
         """           
 
         tasks = [
-            {"name": "jobs.job1.task1"},
+            {"name": "jobs.job1.task1", "output": True},
             {"name": "jobs.job1.task2", "dependencies": ["jobs.job1.task1"] }
         ]
         
@@ -37,9 +121,619 @@ class TestGenericJobHandler(unittest.TestCase):
         self.assertEqual(handler.results["jobs.job1.task1"], "From Task1")
         self.assertEqual(handler.results["jobs.job1.task2"], "From Task2 with {'jobs.job1.task1': 'From Task1'}")
 
+    def test_dependency_listed_after_dependent(self):
+        """
+        Test that a task runs even when its dependency appears later in the task list.
+        """
+        tasks = [
+            {"name": "jobs.job1.task2", "dependencies": ["jobs.job1.task1"]},
+            {"name": "jobs.job1.task1"}
+        ]
+
+        handler = GenericJobHandler(max_workers=2)
+        handler.execute_tasks(tasks)
+
+        self.assertEqual(handler.completed_tasks, {"jobs.job1.task1", "jobs.job1.task2"})
+        self.assertEqual(handler.results["jobs.job1.task2"], "From Task2 with {'jobs.job1.task1': 'From Task1'}")
+
+    def test_dependent_tasks_run_in_parallel(self):
+        """
+        Test that tasks sharing a completed dependency are started together instead of one after another.
+        """
+        tasks = [
+            {"name": "jobs.job1.task1"},
+            {"name": "jobs.job1.task2", "dependencies": ["jobs.job1.task1"]},
+            {"name": "jobs.job1.task3", "dependencies": ["jobs.job1.task1"]}
+        ]
+
+        handler = GenericJobHandler(max_workers=2)
+        start_time = time.perf_counter()
+        handler.execute_tasks(tasks)
+        elapsed = time.perf_counter() - start_time
+
+        self.assertEqual(len(handler.completed_tasks), 3)
+        self.assertLess(elapsed, 2.9)
+
+    def test_process_executor_tasks(self):
+        """
+        Test that tasks configured for the process pool exchange results with thread pool tasks.
+        """
+        tasks = [
+            {"name": "jobs.job1.task1", "executor": "process", "output": True},
+            {"name": "jobs.job1.task2", "dependencies": ["jobs.job1.task1"], "executor": "thread"},
+            {"name": "jobs.job1.task3", "dependencies": ["jobs.job1.task2"], "executor": "process"}
+        ]
+
+        handler = GenericJobHandler(max_workers=2)
+        handler.execute_tasks(tasks)
+
+        self.assertEqual(handler.results["jobs.job1.task1"], "From Task1")
+        self.assertEqual(handler.results["jobs.job1.task3"],
+                         "From Task3 with {'jobs.job1.task2': \"From Task2 with {'jobs.job1.task1': 'From Task1'}\"}")
+
+    def test_large_results_are_passed_through_shared_memory(self):
+        """
+        Test that a large process task result reaches every process and thread dependent as a view of one shared
+        memory segment, that an output result is copied out of it and that no segment outlives the job.
+        """
+        tasks = [
+            {"name": "shm.source", "executor": "process"},
+            {"name": "shm.output", "executor": "process", "output": True},
+            {"name": "shm.thread", "dependencies": ["shm.source"]},
+        ] + [{"name": f"shm.consumer{i}", "dependencies": ["shm.source"], "executor": "process"} for i in range(3)]
+        task_classes = {task["name"]: PayloadConsumerTask for task in tasks}
+        task_classes.update({"shm.source": LargePayloadTask, "shm.output": LargePayloadTask})
+        segments_before = shared_memory_segments()
+
+        handler = GenericJobHandler(max_workers=4, plan=JobPlan(tasks, task_classes=task_classes))
+        handler.execute_tasks(tasks)
+
+        payload = LargePayloadTask().execute()
+        expected = ("memoryview", len(payload), sum(payload[::4096]))
+        self.assertTrue(handler.succeeded)
+        self.assertEqual(handler.results["shm.thread"], expected)
+        for i in range(3):
+            self.assertEqual(handler.results[f"shm.consumer{i}"], expected)
+        self.assertNotIn("shm.source", handler.results)
+        self.assertIsInstance(handler.results["shm.output"], bytes)
+        self.assertEqual(handler.results["shm.output"], payload)
+        self.assertEqual(shared_memory_segments() - segments_before, set())
+
+    def test_large_results_are_pickled_when_sharing_is_disabled(self):
+        """
+        Test that with shared memory disabled process dependents receive their own copy of a large result.
+        """
+        tasks = [
+            {"name": "shm.source", "executor": "process"},
+            {"name": "shm.consumer", "dependencies": ["shm.source"], "executor": "process"},
+        ]
+        plan = JobPlan(tasks, task_classes={"shm.source": LargePayloadTask, "shm.consumer": PayloadConsumerTask})
+
+        handler = GenericJobHandler(max_workers=2, plan=plan, share_results=False)
+        handler.execute_tasks(tasks)
+
+        self.assertEqual(handler.results["shm.consumer"][0], "bytes")
+
+    def test_unknown_dependency_is_not_executed(self):
+        """
+        Test that a task depending on a task outside the job is skipped without blocking the rest of the job.
+        """
+        tasks = [
+            {"name": "jobs.job1.task1"},
+            {"name": "jobs.job1.task2", "dependencies": ["jobs.job9.missing"]}
+        ]
+
+        handler = GenericJobHandler(max_workers=2)
+        handler.execute_tasks(tasks)
+
+        self.assertEqual(handler.completed_tasks, {"jobs.job1.task1"})
+        self.assertNotIn("jobs.job1.task2", handler.results)
+
+    def test_critical_path_runs_first(self):
+        """
+        Test that, with fewer workers than ready tasks, the task heading the longest chain runs before short tasks
+        listed earlier in the configuration.
+        """
+        started = []
+        register_recording_tasks(["critical.short1", "critical.short2", "critical.chain1", "critical.chain2"], started)
+        tasks = [
+            {"name": "critical.short1", "estimated_duration": 1},
+            {"name": "critical.short2", "estimated_duration": 1},
+            {"name": "critical.chain1", "estimated_duration": 1},
+            {"name": "critical.chain2", "dependencies": ["critical.chain1"], "estimated_duration": 5}
+        ]
+
+        handler = GenericJobHandler(max_workers=1)
+        handler.execute_tasks(tasks)
+
+        self.assertEqual(handler._priorities, [1, 1, 6, 5])
+        self.assertEqual(started, ["critical.chain1", "critical.chain2", "critical.short1", "critical.short2"])
+
+    def test_configuration_order_without_prioritization(self):
+        """
+        Test that ready tasks run in configuration order when prioritization is disabled.
+        """
+        started = []
+        register_recording_tasks(["unordered.short", "unordered.chain1", "unordered.chain2"], started)
+        tasks = [
+            {"name": "unordered.short", "estimated_duration": 1},
+            {"name": "unordered.chain1", "estimated_duration": 1},
+            {"name": "unordered.chain2", "dependencies": ["unordered.chain1"], "estimated_duration": 5}
+        ]
+
+        handler = GenericJobHandler(max_workers=1, prioritize=False)
+        handler.execute_tasks(tasks)
+
+        self.assertEqual(started, ["unordered.short", "unordered.chain1", "unordered.chain2"])
+
+    def test_timed_out_task_frees_its_worker(self):
+        """
+        Test that a stuck task fails after its timeout, its dependents are cancelled and other ready work still runs
+        on the single worker.
+        """
+        release = threading.Event()
+        self.addCleanup(release.set)
+        started = []
+        register_hanging_task("timeout.stuck", release)
+        register_recording_tasks(["timeout.dependent", "timeout.grandchild", "timeout.independent"], started)
+        tasks = [
+            {"name": "timeout.stuck", "timeout_seconds": 0.2, "estimated_duration": 10},
+            {"name": "timeout.dependent", "dependencies": ["timeout.stuck"]},
+            {"name": "timeout.grandchild", "dependencies": ["timeout.dependent"]},
+            {"name": "timeout.independent", "estimated_duration": 1}
+        ]
+
+        handler = GenericJobHandler(max_workers=1)
+        start_time = time.perf_counter()
+        with patch.object(handler, '_fail_task', wraps=handler._fail_task) as fail_task:
+            handler.execute_tasks(tasks)
+        elapsed = time.perf_counter() - start_time
+
+        self.assertLess(elapsed, 2)
+        self.assertEqual(handler.failed_tasks, {"timeout.stuck"})
+        self.assertEqual(handler.timed_out_tasks, {"timeout.stuck"})
+        self.assertEqual(handler.cancelled_tasks, {"timeout.dependent", "timeout.grandchild"})
+        self.assertEqual(started, ["timeout.independent"])
+        self.assertFalse(handler.succeeded)
+        fail_task.assert_called_once_with(handler.plan.task_index["timeout.stuck"], ANY)
+        self.assertIsInstance(fail_task.call_args.args[1], TaskTimeoutError)
+
+    def test_task_within_timeout_completes(self):
+        """
+        Test that a task finishing within its timeout is not affected by it.
+        """
+        handler = GenericJobHandler(max_workers=1)
+        handler.execute_tasks([{"name": "jobs.job1.task1", "timeout_seconds": 5}])
+
+        self.assertEqual(handler.completed_tasks, {"jobs.job1.task1"})
+        self.assertTrue(handler.succeeded)
+
+    def test_job_deadline_fails_unfinished_tasks(self):
+        """
+        Test that every unfinished task fails at the job deadline and tasks not yet started are cancelled.
+        """
+        release = threading.Event()
+        self.addCleanup(release.set)
+        started = []
+        register_hanging_task("deadline.stuck", release)
+        register_recording_tasks(["deadline.quick", "deadline.dependent"], started)
+        tasks = [
+            {"name": "deadline.stuck"},
+            {"name": "deadline.quick"},
+            {"name": "deadline.dependent", "dependencies": ["deadline.stuck"]}
+        ]
+
+        handler = GenericJobHandler(max_workers=2, deadline_seconds=0.2)
+        with patch.object(handler, '_fail_task', wraps=handler._fail_task) as fail_task:
+            handler.execute_tasks(tasks)
+
+        self.assertEqual(handler.completed_tasks, {"deadline.quick"})
+        self.assertEqual(handler.timed_out_tasks, {"deadline.stuck"})
+        self.assertEqual(handler.cancelled_tasks, {"deadline.dependent"})
+        self.assertIsInstance(fail_task.call_args.args[1], TaskTimeoutError)
+        self.assertIn("job deadline", str(fail_task.call_args.args[1]))
+
+    def test_failed_task_cancels_dependents(self):
+        """
+        Test that the dependents of a failing task are reported as cancelled.
+        """
+        class FailingTask:
+            def execute(self, dependent_response=None):
+                raise ValueError("boom")
+        task_registry.register("failing.task", FailingTask)
+        register_recording_tasks(["failing.dependent"], [])
+
+        handler = GenericJobHandler(max_workers=1)
+        handler.execute_tasks([{"name": "failing.task"},
+                               {"name": "failing.dependent", "dependencies": ["failing.task"]}])
+
+        self.assertEqual(handler.failed_tasks, {"failing.task"})
+        self.assertEqual(handler.cancelled_tasks, {"failing.dependent"})
+        with self.assertLogs(level='ERROR') as logs:
+            handler.after_job()
+        self.assertIn("1 failed (0 timed out) and 1 cancelled tasks", logs.output[0])
+
+    def test_resource_limits_bound_concurrency(self):
+        """
+        Test that no more tasks using a resource run at once than the job's capacity, while tasks without resources
+        keep running on the free workers.
+        """
+        lock = threading.Lock()
+        running = []
+        peak = []
+        finished = []
+
+        class DatabaseTask:
+            def execute(self, dependent_response=None):
+                with lock:
+                    running.append(1)
+                    peak.append(len(running))
+                time.sleep(0.05)
+                with lock:
+                    running.pop()
+                    finished.append("db")
+
+        class FreeTask:
+            def execute(self, dependent_response=None):
+                with lock:
+                    finished.append("free")
+
+        tasks = [{"name": f"resources.db{index}", "resources": {"db": 1}} for index in range(6)]
+        tasks += [{"name": f"resources.free{index}"} for index in range(3)]
+        task_classes = {task["name"]: DatabaseTask if "db" in task["name"] else FreeTask for task in tasks}
+        handler = GenericJobHandler(max_workers=6, plan=JobPlan(tasks, task_classes=task_classes,
+                                                                resources={"db": 2}))
+        handler.execute_tasks(tasks)
+
+        self.assertTrue(handler.succeeded)
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(finished[:3], ["free"] * 3)
+
+    def test_resource_requirement_above_capacity_fails(self):
+        """
+        Test that a task requiring more of a resource than the shared pool's capacity fails instead of waiting forever.
+        """
+        register_recording_tasks(["resources.huge", "resources.small"], [])
+        resources = ResourcePool({"mem_gb": 16})
+        handler = GenericJobHandler(max_workers=2, resources=resources)
+        handler.execute_tasks([{"name": "resources.huge", "resources": {"mem_gb": 32}},
+                               {"name": "resources.small", "resources": {"mem_gb": 8}}])
+
+        self.assertEqual(handler.failed_tasks, {"resources.huge"})
+        self.assertEqual(handler.completed_tasks, {"resources.small"})
+        self.assertEqual(resources.in_use(), {"mem_gb": 0})
+
+    def test_map_task_reduces_an_upstream_result(self):
+        """
+        Test that a map task runs its class over every item of its dependency's result in chunks and reduces them, and
+        that a map task without reduce returns the results in item order.
+        """
+        class RangeTask:
+            def execute(self, dependent_response=None):
+                return range(10_000)
+
+        class SquareSum:
+            initial = 0
+
+            def execute(self, item):
+                return item * item
+
+            def reduce(self, accumulator, results):
+                return accumulator + sum(results)
+
+        class Negate:
+            def execute(self, item):
+                return -item
+
+        tasks = [{"name": "map.source"},
+                 {"name": "map.squares", "dependencies": ["map.source"], "kind": "map", "chunk_size": 500,
+                  "output": True},
+                 {"name": "map.negated", "dependencies": ["map.source", "map.squares"], "kind": "map",
+                  "over": "map.source"}]
+        task_classes = {"map.source": RangeTask, "map.squares": SquareSum, "map.negated": Negate}
+        handler = GenericJobHandler(max_workers=4, plan=JobPlan(tasks, task_classes=task_classes))
+        handler.execute_tasks(tasks)
+
+        self.assertTrue(handler.succeeded)
+        self.assertEqual(handler.results["map.squares"], sum(item * item for item in range(10_000)))
+        self.assertEqual(handler.results["map.negated"], [-item for item in range(10_000)])
+
+    def test_map_task_without_over_needs_one_dependency(self):
+        """Test that a map task with several dependencies and no `over` setting fails."""
+        register_recording_tasks(["map.left", "map.right"], [])
+        task_registry.register("map.ambiguous", type("Identity", (), {"execute": lambda self, item: item}))
+        handler = GenericJobHandler(max_workers=2)
+        handler.execute_tasks([{"name": "map.left"}, {"name": "map.right"},
+                               {"name": "map.ambiguous", "dependencies": ["map.left", "map.right"], "kind": "map"}])
+
+        self.assertEqual(handler.failed_tasks, {"map.ambiguous"})
+
+    def test_task_attempts_are_traced(self):
+        """
+        Test that every attempt of a task is recorded as a span with its times, worker, dependencies and outcome.
+        """
+        attempts = []
+
+        class FlakyTask:
+            def execute(self, dependent_response=None):
+                attempts.append(1)
+                if len(attempts) == 1:
+                    raise ValueError("flaky")
+                return "flaky"
+        task_registry.register("trace.flaky", FlakyTask)
+        register_recording_tasks(["trace.first", "trace.second"], [])
+        tasks = [
+            {"name": "trace.first"},
+            {"name": "trace.flaky", "dependencies": ["trace.first"], "retries": 1, "backoff": 0.01},
+            {"name": "trace.second", "dependencies": ["trace.first", "trace.flaky"]},
+        ]
+        trace = TaskTrace()
+
+        handler = GenericJobHandler(max_workers=2, trace=trace)
+        handler.execute_tasks(tasks)
+
+        spans = trace.spans
+        self.assertEqual([(span.task_name, span.outcome) for span in spans],
+                         [("trace.first", "success"), ("trace.flaky", "failure"), ("trace.flaky", "success"),
+                          ("trace.second", "success")])
+        self.assertEqual(spans[-1].dependencies, ("trace.first", "trace.flaky"))
+        for span in spans:
+            self.assertEqual(span.process_id, os.getpid())
+            self.assertNotEqual(span.worker, threading.current_thread().name)
+            self.assertLessEqual(span.queued_at, span.started_at)
+            self.assertLessEqual(span.started_at, span.finished_at)
+        self.assertLessEqual(spans[2].finished_at, spans[3].started_at)
+
+    def test_failing_task_is_retried_without_blocking_workers(self):
+        """
+        Test that a flapping task is retried after its backoff and that other tasks run on the single worker while it
+        waits.
+        """
+        started = []
+        attempts = []
+
+        class FlappingTask:
+            def execute(self, dependent_response=None):
+                attempts.append(time.perf_counter())
+                if len(attempts) < 3:
+                    raise ConnectionError("service unavailable")
+                return "recovered"
+        task_registry.register("retry.flapping", FlappingTask)
+        register_recording_tasks([f"retry.other{index}" for index in range(5)], started)
+        tasks = [{"name": "retry.flapping", "retries": 2, "backoff": 0.1, "estimated_duration": 10}]
+        tasks += [{"name": f"retry.other{index}"} for index in range(5)]
+
+        handler = GenericJobHandler(max_workers=1)
+        handler.execute_tasks(tasks)
+
+        self.assertEqual(handler.results["retry.flapping"], "recovered")
+        self.assertTrue(handler.succeeded)
+        self.assertEqual(len(started), 5)
+        # Exponential backoff: 0.1 seconds before the first retry, 0.2 before the second.
+        self.assertGreaterEqual(attempts[1] - attempts[0], 0.1)
+        self.assertGreaterEqual(attempts[2] - attempts[1], 0.2)
+
+    def test_retries_exhausted(self):
+        """
+        Test that a task failing more often than its retries allow fails and cancels its dependents.
+        """
+        attempts = []
+
+        class BrokenTask:
+            def execute(self, dependent_response=None):
+                attempts.append(1)
+                raise ConnectionError("service unavailable")
+        task_registry.register("retry.broken", BrokenTask)
+        register_recording_tasks(["retry.dependent"], [])
+
+        handler = GenericJobHandler(max_workers=1)
+        handler.execute_tasks([{"name": "retry.broken", "retries": 2, "backoff": 0.01, "jitter": 0.5},
+                               {"name": "retry.dependent", "dependencies": ["retry.broken"]}])
+
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(handler.failed_tasks, {"retry.broken"})
+        self.assertEqual(handler.cancelled_tasks, {"retry.dependent"})
+
+    def test_intermediate_results_are_released(self):
+        """
+        Test that a result is dropped once its last dependent has finished while outputs and sinks are kept.
+        """
+        live_results = []
+
+        class ChainTask:
+            def execute(self, dependent_response=None):
+                live_results.append(len(handler.results))
+                return "payload"
+        for task_name in ("release.first", "release.second", "release.third", "release.fourth"):
+            task_registry.register(task_name, ChainTask)
+        tasks = [{"name": "release.first"},
+                 {"name": "release.second", "dependencies": ["release.first"], "output": True},
+                 {"name": "release.third", "dependencies": ["release.second"]},
+                 {"name": "release.fourth", "dependencies": ["release.third"]}]
+
+        handler = GenericJobHandler(max_workers=1)
+        handler.execute_tasks(tasks)
+
+        self.assertTrue(handler.succeeded)
+        self.assertEqual(set(handler.results), {"release.second", "release.fourth"})
+        # The fourth task only sees the kept output and its own dependency.
+        self.assertEqual(live_results[-1], 2)
+
+    def test_results_are_kept_until_every_dependent_finished(self):
+        """
+        Test that a result shared by several dependents survives until the last of them, including a retried one, has
+        finished, and that a cancelled dependent releases its other dependencies.
+        """
+        attempts = []
+
+        class FlakyConsumer:
+            def execute(self, dependent_response=None):
+                attempts.append(dependent_response)
+                if len(attempts) < 2:
+                    raise ConnectionError("service unavailable")
+                return "consumed"
+
+        class FailingTask:
+            def execute(self, dependent_response=None):
+                raise ValueError("broken")
+        task_registry.register("release.flaky", FlakyConsumer)
+        task_registry.register("release.failing", FailingTask)
+        register_recording_tasks(["release.source", "release.other", "release.blocked"], [])
+        tasks = [{"name": "release.source"},
+                 {"name": "release.flaky", "dependencies": ["release.source"], "retries": 1, "backoff": 0.01},
+                 {"name": "release.other", "dependencies": ["release.source"]},
+                 {"name": "release.failing"},
+                 {"name": "release.blocked", "dependencies": ["release.source", "release.failing"]}]
+
+        handler = GenericJobHandler(max_workers=2)
+        handler.execute_tasks(tasks)
+
+        self.assertEqual(attempts, [{"release.source": "release.source"}] * 2)
+        self.assertEqual(handler.cancelled_tasks, {"release.blocked"})
+        self.assertEqual(set(handler.results), {"release.flaky", "release.other"})
+
+    def test_results_are_kept_when_release_is_disabled(self):
+        """
+        Test that every result is kept when the handler is created with release_results set to False.
+        """
+        tasks = [{"name": "jobs.job1.task1"},
+                 {"name": "jobs.job1.task2", "dependencies": ["jobs.job1.task1"]}]
+
+        handler = GenericJobHandler(max_workers=1, release_results=False)
+        handler.execute_tasks(tasks)
+
+        self.assertEqual(set(handler.results), {"jobs.job1.task1", "jobs.job1.task2"})
+
+    def test_unchanged_tasks_reuse_cached_results(self):
+        """
+        Test that a re-run with a result cache skips unchanged tasks, re-executes an edited task, and re-executes its
+        dependents only when its result changed.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cache = ResultCache(directory.name)
+        task_registry.register("cache.source", CachedSourceTask)
+        task_registry.register("cache.transform", CachedTransformTask)
+        self.addCleanup(setattr, CachedSourceTask, 'output', "source")
+
+        def run(source_task):
+            CachedSourceTask.executed = []
+            handler = GenericJobHandler(max_workers=2, result_cache=cache)
+            handler.execute_tasks([source_task, {"name": "cache.transform", "dependencies": ["cache.source"]}])
+            self.assertTrue(handler.succeeded)
+            return handler
+
+        run({"name": "cache.source"})
+        self.assertEqual(CachedSourceTask.executed, ["cache.source", "cache.transform"])
+
+        handler = run({"name": "cache.source"})
+        self.assertEqual(CachedSourceTask.executed, [])
+        self.assertEqual(handler.cached_tasks, {"cache.source", "cache.transform"})
+        self.assertEqual(handler.results["cache.transform"], ["source"])
+
+        # An edited configuration with the same result leaves the dependent cached.
+        run({"name": "cache.source", "estimated_duration": 2})
+        self.assertEqual(CachedSourceTask.executed, ["cache.source"])
+
+        CachedSourceTask.output = "changed"
+        handler = run({"name": "cache.source", "estimated_duration": 3})
+        self.assertEqual(CachedSourceTask.executed, ["cache.source", "cache.transform"])
+        self.assertEqual(handler.results["cache.transform"], ["changed"])
+
+        # A task that is never cached still lets its dependents reuse results while its own result is unchanged.
+        run({"name": "cache.source", "estimated_duration": 3, "cache": False})
+        self.assertEqual(CachedSourceTask.executed, ["cache.source"])
+
+    def test_long_cached_chain_completes(self):
+        """
+        Test that a re-run of a chain of unchanged tasks longer than the recursion limit completes from the cache.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cache = ResultCache(directory.name)
+        length = sys.getrecursionlimit() + 100
+        names = [f"cache.chain{i}" for i in range(length)]
+        for name in names:
+            task_registry.register(name, ChainLinkTask)
+        tasks = [{"name": names[0]}] + [{"name": name, "dependencies": [previous]}
+                                        for previous, name in zip(names, names[1:])]
+
+        ChainLinkTask.executed = 0
+        GenericJobHandler(max_workers=2, result_cache=cache).execute_tasks(tasks)
+        self.assertEqual(ChainLinkTask.executed, length)
+
+        ChainLinkTask.executed = 0
+        handler = GenericJobHandler(max_workers=2, result_cache=cache)
+        thread = threading.Thread(target=handler.execute_tasks, args=(tasks,), daemon=True)
+        thread.start()
+        thread.join(timeout=30)
+        self.assertFalse(thread.is_alive())
+        self.assertTrue(handler.succeeded)
+        self.assertEqual(ChainLinkTask.executed, 0)
+        self.assertEqual(len(handler.cached_tasks), length)
+        self.assertEqual(handler.results[names[-1]], length - 1)
+
+    def test_cached_none_result_is_reused(self):
+        """Test that a task whose result is None is not executed again when its result is cached."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cache = ResultCache(directory.name)
+        task_registry.register("cache.none", NoneResultTask)
+
+        NoneResultTask.executed = 0
+        GenericJobHandler(max_workers=2, result_cache=cache).execute_tasks([{"name": "cache.none"}])
+        handler = GenericJobHandler(max_workers=2, result_cache=cache)
+        handler.execute_tasks([{"name": "cache.none"}])
+        self.assertEqual(NoneResultTask.executed, 1)
+        self.assertEqual(handler.cached_tasks, {"cache.none"})
+        self.assertIsNone(handler.results["cache.none"])
+
+    def test_checkpointed_tasks_are_restored(self):
+        """
+        Test that a handler given the log of an interrupted run restores its completed tasks, re-executes a task whose
+        configuration changed together with its dependents, and checkpoints the tasks it executes.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        started = []
+        register_recording_tasks(["resume.first", "resume.second", "resume.third", "resume.fourth"], started)
+        tasks = [{"name": "resume.first"},
+                 {"name": "resume.second", "dependencies": ["resume.first"]},
+                 {"name": "resume.third", "dependencies": ["resume.second"], "timeout_seconds": 5},
+                 {"name": "resume.fourth", "dependencies": ["resume.third"]}]
+        run_log = RunLog.create("resume", run_dir=directory.name)
+        run_log.record(tasks[0], "checkpointed first")
+        run_log.record(tasks[1], "checkpointed second")
+        # Checkpointed before its timeout was changed, so it runs again.
+        run_log.record({"name": "resume.third", "dependencies": ["resume.second"]}, "checkpointed third")
+        run_log.record(tasks[3], "checkpointed fourth")
+        run_log.close()
+
+        run_log = RunLog.open(run_log.run_id, directory.name)
+        handler = GenericJobHandler(max_workers=2, run_log=run_log)
+        handler.execute_tasks(tasks)
+        run_log.close()
+
+        self.assertTrue(handler.succeeded)
+        self.assertEqual(started, ["resume.third", "resume.fourth"])
+        self.assertEqual(handler.restored_tasks, {"resume.first", "resume.second"})
+        reopened = RunLog.open(run_log.run_id, directory.name)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.completed["resume.fourth"][1], "resume.fourth")
+
+    def test_task_durations_are_recorded(self):
+        """
+        Test that the measured duration of every completed task is recorded for later estimates.
+        """
+        task_durations.clear()
+        self.addCleanup(task_durations.clear)
+
+        handler = GenericJobHandler(max_workers=1)
+        handler.execute_tasks([{"name": "jobs.job1.task1"}])
+
+        self.assertGreaterEqual(task_durations.recorded("jobs.job1.task1"), 1)
+
 
-    
-    
 
 if __name__ == '__main__':
     unittest.main()
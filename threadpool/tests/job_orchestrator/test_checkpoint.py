@@ -0,0 +1,77 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, project_root)  # Insert at the beginning to prioritize
+
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(1, base_src)  # Insert at the beginning to prioritize
+
+from job_orchestrator.checkpoint import RunLog, task_digest
+
+
+class TestRunLog(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.run_dir = directory.name
+
+    def test_completions_survive_reopening(self):
+        """Test that reopening a run restores its job name and the results of its completed tasks."""
+        task = {"name": "jobs.job1.task1", "timeout_seconds": 5}
+        run_log = RunLog.create("job1", run_dir=self.run_dir)
+        run_log.record(task, {"rows": [1, 2]})
+        run_log.close()
+
+        reopened = RunLog.open(run_log.run_id, self.run_dir)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.job_name, "job1")
+        self.assertEqual(reopened.completed, {"jobs.job1.task1": (task_digest(task), {"rows": [1, 2]})})
+
+    def test_torn_record_is_cut_off(self):
+        """Test that a record torn by a crash is ignored and records appended after it can be read."""
+        run_log = RunLog.create("job1", run_dir=self.run_dir)
+        run_log.record({"name": "jobs.job1.task1"}, "first")
+        run_log.record({"name": "jobs.job1.task2"}, "second")
+        run_log.close()
+        with open(run_log.path, 'r+b') as file:
+            file.truncate(os.path.getsize(run_log.path) - 3)
+
+        reopened = RunLog.open(run_log.run_id, self.run_dir)
+        self.assertEqual(set(reopened.completed), {"jobs.job1.task1"})
+        reopened.record({"name": "jobs.job1.task3"}, "third")
+        reopened.close()
+        final = RunLog.open(run_log.run_id, self.run_dir)
+        self.addCleanup(final.close)
+        self.assertEqual(set(final.completed), {"jobs.job1.task1", "jobs.job1.task3"})
+
+    def test_unpicklable_result_is_not_logged(self):
+        """Test that a result that cannot be pickled is skipped, so its task runs again on resume."""
+        run_log = RunLog.create("job1", run_dir=self.run_dir)
+        with self.assertLogs(level='WARNING'):
+            run_log.record({"name": "jobs.job1.task1"}, threading.Lock())
+        run_log.close()
+
+        reopened = RunLog.open(run_log.run_id, self.run_dir)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.completed, {})
+
+    def test_unknown_run(self):
+        """Test that opening a run that does not exist raises ValueError."""
+        with self.assertRaises(ValueError):
+            RunLog.open("missing", self.run_dir)
+
+    def test_close_can_delete_log(self):
+        """Test that closing with delete removes the log of a finished run."""
+        run_log = RunLog.create("job1", run_dir=self.run_dir)
+        run_log.close(delete=True)
+        self.assertFalse(run_log.path.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
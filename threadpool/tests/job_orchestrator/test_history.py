@@ -0,0 +1,93 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, project_root)  # Insert at the beginning to prioritize
+
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(1, base_src)  # Insert at the beginning to prioritize
+
+from job_orchestrator.history import TaskHistory, simulate_makespan
+
+
+class TestTaskHistory(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'history.sqlite3')
+        self.history = TaskHistory(self.path)
+        self.addCleanup(self.history.close)
+
+    def test_task_statistics(self):
+        """Test that percentiles, maximum and failures are computed from the recorded executions."""
+        for wall_time in range(1, 101):
+            self.history.record("jobs.job1.task1", float(wall_time), cpu_time=0.5, queue_wait=0.25, job_name="job1")
+        self.history.record("jobs.job1.task1", 0.1, outcome='failure', job_name="job1")
+
+        stats = self.history.task_statistics(["jobs.job1.task1"])["jobs.job1.task1"]
+        self.assertEqual((stats.count, stats.failures), (101, 1))
+        self.assertEqual((stats.p50, stats.p95, stats.max), (50.0, 95.0, 100.0))
+        self.assertEqual((stats.cpu_time, stats.queue_wait), (0.5, 0.25))
+
+    def test_statistics_use_recent_window(self):
+        """Test that only the most recent executions of a task are included."""
+        for wall_time in [10.0, 10.0, 1.0, 1.0]:
+            self.history.record("jobs.job1.task1", wall_time)
+        self.assertEqual(self.history.task_statistics(window=2)["jobs.job1.task1"].max, 1.0)
+
+    def test_old_executions_are_pruned(self):
+        """Test that the writer keeps only the `retention` most recent executions of each task."""
+        history = TaskHistory(self.path + '.retained', retention=3)
+        self.addCleanup(history.close)
+        for wall_time in [10.0, 10.0, 1.0, 2.0, 3.0]:
+            history.record("jobs.job1.task1", wall_time)
+        history.record("jobs.job1.task2", 4.0)
+
+        statistics = history.task_statistics()
+        self.assertEqual((statistics["jobs.job1.task1"].count, statistics["jobs.job1.task1"].max), (3, 3.0))
+        self.assertEqual(statistics["jobs.job1.task2"].count, 1)
+
+    def test_statistics_of_many_tasks(self):
+        """Test that tasks beyond the number of names bound in one query are all reported."""
+        names = [f"jobs.big.task{i}" for i in range(1200)]
+        for name in names:
+            self.history.record(name, 1.0)
+        self.assertEqual(set(self.history.task_statistics(names)), set(names))
+
+    def test_history_persists(self):
+        """Test that executions written by one store are read by another one on the same file."""
+        self.history.record("jobs.job1.task1", 2.0)
+        self.history.close()
+
+        reopened = TaskHistory(self.path)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.task_statistics()["jobs.job1.task1"].p50, 2.0)
+
+    def test_estimate_makespan(self):
+        """Test that the makespan estimate uses recorded durations and falls back to configured hints."""
+        self.history.record("a", 2.0)
+        self.history.record("b", 3.0)
+        tasks = [{"name": "a"}, {"name": "b"}, {"name": "c", "dependencies": ["a"], "estimated_duration": 4.0}]
+
+        self.assertEqual(self.history.estimate_makespan(tasks, max_workers=1), 9.0)
+        self.assertEqual(self.history.estimate_makespan(tasks, max_workers=2), 6.0)
+
+    def test_simulate_makespan_starts_critical_path_first(self):
+        """Test that the simulation starts the longest chain first, like the scheduler does."""
+        tasks = [{"name": "short"}, {"name": "chain1"}, {"name": "chain2", "dependencies": ["chain1"]}]
+        durations = {"short": 1.0, "chain1": 1.0, "chain2": 1.0}
+        self.assertEqual(simulate_makespan(tasks, durations, max_workers=2), 2.0)
+
+    def test_simulate_makespan_rejects_cycles(self):
+        """Test that a cyclic job cannot be estimated."""
+        tasks = [{"name": "a", "dependencies": ["b"]}, {"name": "b", "dependencies": ["a"]}]
+        with self.assertRaises(ValueError):
+            simulate_makespan(tasks, {"a": 1.0, "b": 1.0}, max_workers=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
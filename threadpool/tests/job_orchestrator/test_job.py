@@ -2,7 +2,9 @@ import unittest
 import json
 import os
 import sys
-from unittest.mock import MagicMock, mock_open, patch
+import tempfile
+import threading
+from unittest.mock import ANY, MagicMock, mock_open, patch
 import logging
 
 from jsonschema import ValidationError
@@ -15,9 +17,12 @@ base_src = os.path.join(project_root, 'src')
 sys.path.insert(1, base_src)  # Insert at the beginning to prioritize
 
 
-from src.job_orchestrator.job import JobOrchestrator
+from src.job_orchestrator.job import JobOrchestrator, JobRun
+from job_orchestrator.checkpoint import RunLog
+from job_orchestrator.history import TaskHistory
+from job_orchestrator.job_plan import JobPlan, clear_plan_cache
 from src.job_orchestrator.task_handler import TaskHandler
-from src.job_orchestrator.utilities import setup_logging
+from src.job_orchestrator.utilities import DependencyAnalysis, setup_logging
 
 class TestJobOrchestrator(unittest.TestCase):
 
@@ -25,9 +30,22 @@ class TestJobOrchestrator(unittest.TestCase):
         """
         Setup common properties for tests.
         """
+        # Cache compiled plans in a throwaway directory instead of the shared one.
+        plan_cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(plan_cache_dir.cleanup)
+        self.plan_cache_dir = plan_cache_dir.name
+        clear_plan_cache(disk=False)
+        # Record task executions in a throwaway history instead of the shared one.
+        history_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(history_dir.cleanup)
+        self.history = TaskHistory(os.path.join(history_dir.name, 'history.sqlite3'))
+        self.addCleanup(self.history.close)
+        history_patcher = patch('src.job_orchestrator.job.get_task_history', return_value=self.history)
+        history_patcher.start()
+        self.addCleanup(history_patcher.stop)
         self.config_path = "config/job_config.json"
         self.schema_path = "config/job_schema.json"
-        self.job_orchestrator = JobOrchestrator(self.config_path, self.schema_path)
+        self.job_orchestrator = JobOrchestrator(self.config_path, self.schema_path, plan_cache_dir=self.plan_cache_dir)
         self.log_level = logging.INFO
 
     @patch('builtins.open', new_callable=mock_open, read_data='{"jobs": {"example_job": {"handler": "handler", "tasks": []}}}')
@@ -70,7 +88,8 @@ class TestJobOrchestrator(unittest.TestCase):
         mock_open.return_value.__enter__.return_value = MagicMock()
 
         # Create an instance of JobOrchestrator
-        orchestrator = JobOrchestrator(self.config_path, self.schema_path, self.log_level)
+        orchestrator = JobOrchestrator(self.config_path, self.schema_path, self.log_level,
+                                       plan_cache_dir=self.plan_cache_dir)
 
         # Assertions to ensure proper calls
         mock_open.assert_called()
@@ -82,14 +101,14 @@ class TestJobOrchestrator(unittest.TestCase):
     def test_file_not_found_error(self, mock_exists):
         """Test handling of file not found error."""
         with self.assertRaises(FileNotFoundError):
-            JobOrchestrator(self.config_path, self.schema_path, self.log_level)
+            JobOrchestrator(self.config_path, self.schema_path, self.log_level, plan_cache_dir=self.plan_cache_dir)
 
     @patch('pathlib.Path.open')
     @patch('json.load', side_effect=json.JSONDecodeError("Expecting value", "doc", 0))
     def test_json_decode_error(self, mock_json_load, mock_open):
         """Test handling of JSON decoding errors."""
         with self.assertRaises(json.JSONDecodeError):
-            JobOrchestrator(self.config_path, self.schema_path, self.log_level)
+            JobOrchestrator(self.config_path, self.schema_path, self.log_level, plan_cache_dir=self.plan_cache_dir)
 
     @patch('src.job_orchestrator.job.Path')
     @patch('src.job_orchestrator.job.json.load')
@@ -114,11 +133,12 @@ class TestJobOrchestrator(unittest.TestCase):
             }
         }
         # Creating an instance of JobOrchestrator and starting a job
-        orchestrator = JobOrchestrator("config/job_config.json", "config/job_schema.json")
+        orchestrator = JobOrchestrator("config/job_config.json", "config/job_schema.json",
+                                       plan_cache_dir=self.plan_cache_dir)
         result = orchestrator.start_job("job1")
 
         # Asserting that the job handler and tasks were called correctly
-        mock_task_handler().execute_job.assert_called_once_with("job_orchestrator.handlers.generic_job_handler",[{'name': 'jobs.job1.task1'}, {'name': 'jobs.job1.task2'}])
+        mock_task_handler().execute_job.assert_called_once_with("job_orchestrator.handlers.generic_job_handler",[{'name': 'jobs.job1.task1'}, {'name': 'jobs.job1.task2'}], plan=ANY, history=ANY, result_cache=None, trace=None, autoscale=False, resources=None, max_workers=None)
         mock_validate.assert_called_once()  # Schema validation was performed
 
   
@@ -145,15 +165,16 @@ class TestJobOrchestrator(unittest.TestCase):
         mock_validate.side_effect = ValidationError("Schema validation error")
 
         with self.assertRaises(ValidationError):
-            orchestrator = JobOrchestrator("config/job_config.json", "config/job_schema.json")
+            orchestrator = JobOrchestrator("config/job_config.json", "config/job_schema.json",
+                                           plan_cache_dir=self.plan_cache_dir)
             orchestrator.start_job("job1")
 
-    @patch('src.job_orchestrator.job.has_cyclic_dependencies')
+    @patch('src.job_orchestrator.job.analyze_dependencies')
     @patch('src.job_orchestrator.job.Path')
     @patch('src.job_orchestrator.job.json.load')
     @patch('src.job_orchestrator.job.validate')
     @patch('src.job_orchestrator.job.open', new_callable=mock_open)
-    def test_cyclic_dependency(self, mock_open_file, mock_validate, mock_json_load, mock_path, mock_has_cyclic_dependencies):
+    def test_cyclic_dependency(self, mock_open_file, mock_validate, mock_json_load, mock_path, mock_analyze_dependencies):
         """
         Test if the orchestrator raises an exception for cyclic dependencies in tasks.
         """
@@ -169,14 +190,17 @@ class TestJobOrchestrator(unittest.TestCase):
                 }
             }
         }
-        mock_has_cyclic_dependencies.return_value = True  # Simulate cyclic dependencies
+        # Simulate cyclic dependencies
+        mock_analyze_dependencies.return_value = DependencyAnalysis(["jobs.job1.task1", "jobs.job1.task2", "jobs.job1.task1"], [], {})
 
-        orchestrator = JobOrchestrator("config/job_config.json", "config/job_schema.json")
+        orchestrator = JobOrchestrator("config/job_config.json", "config/job_schema.json",
+                                       plan_cache_dir=self.plan_cache_dir)
 
         with self.assertRaises(ValueError) as context:
             orchestrator.start_job("job1")
 
         self.assertIn("Cyclic dependencies detected", str(context.exception))
+        self.assertIn("jobs.job1.task1 -> jobs.job1.task2 -> jobs.job1.task1", str(context.exception))
 
     @patch('src.job_orchestrator.job.Path')
     @patch('src.job_orchestrator.job.json.load')
@@ -188,14 +212,170 @@ class TestJobOrchestrator(unittest.TestCase):
         mock_path.return_value.exists.return_value = True
         mock_json_load.return_value = {"jobs": {}}
 
-        orchestrator = JobOrchestrator("config/job_config.json", "config/job_schema.json")
+        orchestrator = JobOrchestrator("config/job_config.json", "config/job_schema.json",
+                                       plan_cache_dir=self.plan_cache_dir)
 
         with self.assertRaises(ValueError) as context:
             orchestrator.start_job("job1")
 
         self.assertIn("Job job1 not found", str(context.exception))
 
-    
+    @patch('src.job_orchestrator.job.TaskHandler')
+    def test_repeated_runs_use_cached_plan(self, mock_task_handler):
+        """
+        Test that a second orchestrator for the same configuration skips validation and reuses the compiled plan.
+        """
+        self.job_orchestrator.start_job("job2")
+        first_plan = mock_task_handler().execute_job.call_args.kwargs['plan']
+
+        with patch('src.job_orchestrator.job.validate') as mock_validate, \
+             patch('src.job_orchestrator.job.analyze_dependencies') as mock_analyze_dependencies:
+            orchestrator = JobOrchestrator(self.config_path, self.schema_path, plan_cache_dir=self.plan_cache_dir)
+            orchestrator.start_job("job2")
+
+        mock_validate.assert_not_called()
+        mock_analyze_dependencies.assert_not_called()
+        self.assertIsInstance(first_plan, JobPlan)
+        self.assertIs(mock_task_handler().execute_job.call_args.kwargs['plan'], first_plan)
+
+    @patch('src.job_orchestrator.job.TaskHandler')
+    def test_plans_are_loaded_from_disk_cache(self, mock_task_handler):
+        """
+        Test that a compiled plan written to the disk cache is reused after the in-process cache is dropped.
+        """
+        with tempfile.TemporaryDirectory() as cache_dir:
+            JobOrchestrator(self.config_path, self.schema_path, plan_cache_dir=cache_dir).start_job("job1")
+            clear_plan_cache(disk=False)
+
+            with patch('src.job_orchestrator.job.validate') as mock_validate:
+                orchestrator = JobOrchestrator(self.config_path, self.schema_path, plan_cache_dir=cache_dir)
+            plan = orchestrator.plans["job1"]
+
+        mock_validate.assert_not_called()
+        self.assertEqual(plan.task_names[0], "jobs.job1.task1")
+        self.assertEqual(plan.task_classes["jobs.job1.task1"].__name__, "Task1")
+
+    @patch('src.job_orchestrator.job.Path')
+    @patch('src.job_orchestrator.job.json.load')
+    @patch('src.job_orchestrator.job.validate')
+    @patch('src.job_orchestrator.job.open', new_callable=mock_open)
+    def test_invalid_task_module(self, mock_open_file, mock_validate, mock_json_load, mock_path):
+        """
+        Test that a job referencing a missing task module is rejected before execution.
+        """
+        mock_path.return_value.exists.return_value = True
+        mock_json_load.return_value = {
+            "jobs": {
+                "job1": {
+                    "handler": "job_orchestrator.handlers.generic_job_handler",
+                    "tasks": [{"name": "jobs.job1.missing_task"}]
+                }
+            }
+        }
+        orchestrator = JobOrchestrator("config/job_config.json", "config/job_schema.json",
+                                       plan_cache_dir=self.plan_cache_dir)
+
+        with self.assertRaises(ValueError) as context:
+            orchestrator.start_job("job1")
+
+        self.assertIn("jobs.job1.missing_task", str(context.exception))
+
+    def test_start_jobs_runs_shared_tasks_once(self):
+        """
+        Test that concurrently started jobs share the worker pool and run a task common to both jobs only once.
+        """
+        from jobs.job2.task4 import Task4
+
+        with patch.object(Task4, 'execute', autospec=True, return_value="From Task4") as mock_execute:
+            outcomes = self.job_orchestrator.start_jobs(["job1", "job2"], max_workers=4)
+
+        self.assertEqual(outcomes, {"job1": JobRun(True, None), "job2": JobRun(True, None)})
+        self.assertEqual(mock_execute.call_count, 1)
+
+    def test_start_jobs_returns_run_ids(self):
+        """
+        Test that start_jobs returns the run ID of every checkpointed job, under which an unfinished run is resumed.
+        """
+        run_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(run_dir.cleanup)
+        orchestrator = JobOrchestrator(self.config_path, self.schema_path, checkpoints=True, run_dir=run_dir.name,
+                                       plan_cache_dir=self.plan_cache_dir)
+
+        with patch.object(orchestrator, '_execute_run', wraps=orchestrator._execute_run) as execute_run:
+            runs = orchestrator.start_jobs(["job1", "job2"], max_workers=4)
+
+        self.assertEqual({run.outcome for run in runs.values()}, {True})
+        logged = {call.args[0].job_name: call.args[0].run_id for call in execute_run.call_args_list}
+        self.assertEqual({job_name: run.run_id for job_name, run in runs.items()}, logged)
+        self.assertNotEqual(runs["job1"].run_id, runs["job2"].run_id)
+
+    def test_start_job_records_history(self):
+        """
+        Test that every task execution of a job is recorded in the task history and used for makespan estimates.
+        """
+        self.job_orchestrator.start_job("job2")
+
+        statistics = self.history.task_statistics()
+        self.assertEqual(set(statistics), {"jobs.job2.task4", "jobs.job2.task5", "jobs.job2.task6"})
+        self.assertEqual(statistics["jobs.job2.task5"].count, 1)
+        self.assertGreaterEqual(statistics["jobs.job2.task5"].p50, 1)
+        self.assertAlmostEqual(self.job_orchestrator.estimate_makespan("job2", 1), 3, delta=0.5)
+
+    def test_task_durations_are_read_once_per_plan(self):
+        """
+        Test that the task history is read before the first run of a job only, and refreshed once the estimates are
+        older than DURATIONS_TTL.
+        """
+        plan = self.job_orchestrator._get_job_plan("job2", self.job_orchestrator.jobs['jobs']['job2'])
+        with patch.object(self.history, 'task_statistics', return_value={}) as task_statistics:
+            self.job_orchestrator._load_task_durations([plan])
+            self.job_orchestrator._load_task_durations([plan])
+            self.assertEqual(task_statistics.call_count, 1)
+            self.assertFalse(task_statistics.call_args.kwargs['flush'])
+
+            with patch('src.job_orchestrator.job.DURATIONS_TTL', 0):
+                self.job_orchestrator._load_task_durations([plan])
+                for thread in threading.enumerate():
+                    if thread.name == 'task-durations-refresh':
+                        thread.join()
+            self.assertEqual(task_statistics.call_count, 2)
+
+    def test_resume_executes_only_unfinished_tasks(self):
+        """
+        Test that resuming an interrupted run skips the tasks it checkpointed and removes the log once the run completes.
+        """
+        run_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(run_dir.cleanup)
+        orchestrator = JobOrchestrator(self.config_path, self.schema_path, checkpoints=True, run_dir=run_dir.name,
+                                       plan_cache_dir=self.plan_cache_dir)
+        run_log = RunLog.create("job2", run_dir=run_dir.name)
+        run_log.record(orchestrator.jobs['jobs']['job2']['tasks'][0], "checkpointed")
+        run_log.close()
+
+        self.assertTrue(orchestrator.resume(run_log.run_id))
+
+        self.assertEqual(set(self.history.task_statistics()), {"jobs.job2.task5", "jobs.job2.task6"})
+        self.assertFalse(run_log.path.exists())
+
+    def test_resume_unknown_run(self):
+        """
+        Test that resuming a run that does not exist raises ValueError.
+        """
+        run_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(run_dir.cleanup)
+        orchestrator = JobOrchestrator(self.config_path, self.schema_path, checkpoints=True, run_dir=run_dir.name,
+                                       plan_cache_dir=self.plan_cache_dir)
+        with self.assertRaises(ValueError):
+            orchestrator.resume("missing")
+
+    def test_start_jobs_unknown_job(self):
+        """
+        Test that no job is started when one of the requested jobs does not exist.
+        """
+        with patch('src.job_orchestrator.job.TaskHandler') as mock_task_handler:
+            with self.assertRaises(ValueError):
+                self.job_orchestrator.start_jobs(["job1", "job9"])
+        mock_task_handler.assert_not_called()
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
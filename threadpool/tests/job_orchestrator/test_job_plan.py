@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, project_root)  # Insert at the beginning to prioritize
+
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(1, base_src)  # Insert at the beginning to prioritize
+
+from job_orchestrator.job_plan import (JobPlan, clear_plan_cache, load_cached_plans, plan_cache_key,
+                                       resolve_task_classes, store_cached_plans)
+
+
+class TestJobPlan(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        clear_plan_cache(self.cache_dir.name)
+
+    def tearDown(self):
+        clear_plan_cache(self.cache_dir.name)
+        self.cache_dir.cleanup()
+
+    def test_dependency_arrays(self):
+        """Test that dependencies are compiled into integer-indexed arrays."""
+        tasks = [
+            {"name": "jobs.job1.task3", "dependencies": ["jobs.job1.task1", "jobs.job1.task2"]},
+            {"name": "jobs.job1.task1"},
+            {"name": "jobs.job1.task2", "dependencies": ["jobs.job1.task1", "jobs.job9.unknown"]}
+        ]
+        plan = JobPlan(tasks)
+
+        self.assertEqual(plan.dependencies, [[1, 2], [], [1]])
+        self.assertEqual(plan.dependency_counts, [2, 0, 2])
+        self.assertEqual(plan.dependents, [[], [0, 2], [0]])
+        self.assertEqual(plan.order, [1, 2, 0])
+        self.assertEqual(plan.levels, [2, 0, 1])
+        self.assertIsNone(plan.cycle)
+
+    def test_resolve_task_classes(self):
+        """Test that task classes are resolved following the naming convention."""
+        task_classes = resolve_task_classes(["jobs.job1.task1", "jobs.job2.task4", "jobs.job1.task1"])
+        self.assertEqual({name: cls.__name__ for name, cls in task_classes.items()},
+                         {"jobs.job1.task1": "Task1", "jobs.job2.task4": "Task4"})
+
+        with self.assertRaises(ValueError):
+            resolve_task_classes(["jobs.job1.task1", "jobs.job1.not_a_task"])
+
+    def test_cache_key_ignores_formatting(self):
+        """Test that the cache key depends on content, not on key order or whitespace."""
+        self.assertEqual(plan_cache_key({"a": 1, "b": [1, 2]}, {}), plan_cache_key({"b": [1, 2], "a": 1}, {}))
+        self.assertNotEqual(plan_cache_key({"a": 1}, {}), plan_cache_key({"a": 2}, {}))
+
+    def test_disk_cache_round_trip(self):
+        """Test that a stored entry is read back from disk after the in-process cache is cleared."""
+        plan = JobPlan([{"name": "jobs.job1.task1"}], "job1", task_classes=resolve_task_classes(["jobs.job1.task1"]))
+        store_cached_plans("key", {"jobs": {}, "plans": {"job1": plan}}, self.cache_dir.name)
+        clear_plan_cache(disk=False)
+
+        entry = load_cached_plans("key", self.cache_dir.name)
+
+        self.assertEqual(entry["plans"]["job1"].task_names, ["jobs.job1.task1"])
+        self.assertIs(entry["plans"]["job1"].task_classes["jobs.job1.task1"],
+                      plan.task_classes["jobs.job1.task1"])
+        self.assertIsNone(load_cached_plans("other-key", self.cache_dir.name))
+
+
+if __name__ == '__main__':
+    unittest.main()
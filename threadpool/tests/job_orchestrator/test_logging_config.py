@@ -0,0 +1,83 @@
+import io
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, project_root)  # Insert at the beginning to prioritize
+
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(1, base_src)  # Insert at the beginning to prioritize
+
+from job_orchestrator import logging_config
+from job_orchestrator.logging_config import ContextFilter, SampleFilter, configure_logging, log_context, stop_logging
+
+
+class TestLoggingConfig(unittest.TestCase):
+
+    def record(self, level=logging.INFO, **extra):
+        record = logging.LogRecord("test", level, __file__, 1, "message %s", ("argument",), None)
+        record.__dict__.update(extra)
+        return record
+
+    def test_log_context(self):
+        """Test that records are attributed to the job and task of the enclosing log contexts."""
+        context_filter = ContextFilter()
+        with log_context(job_name="job1"):
+            with log_context(task_name="jobs.job1.task1"):
+                inner = self.record()
+                context_filter.filter(inner)
+            outer = self.record()
+            context_filter.filter(outer)
+        outside = self.record()
+        context_filter.filter(outside)
+        explicit = self.record(job_name="job2")
+        context_filter.filter(explicit)
+
+        self.assertEqual((inner.job_name, inner.task_name, inner.context), ("job1", "jobs.job1.task1",
+                                                                             "[job1 jobs.job1.task1] "))
+        self.assertEqual(outer.context, "[job1] ")
+        self.assertEqual(outside.context, "")
+        self.assertEqual(explicit.context, "[job2] ")
+
+    def test_sample_filter(self):
+        """Test that an evenly spaced fraction of the records below WARNING passes and every warning passes."""
+        sample_filter = SampleFilter(0.25)
+        passed = [sample_filter.filter(self.record()) for _ in range(100)]
+        self.assertEqual(sum(passed), 25)
+        self.assertEqual(passed[:8], [False, False, False, True] * 2)
+        self.assertTrue(all(sample_filter.filter(self.record(logging.WARNING)) for _ in range(10)))
+
+    def test_configure_logging_writes_from_background_thread(self):
+        """Test that lines are queued by the logging thread and written with their context by the listener."""
+        stream = io.StringIO()
+        root = logging.getLogger()
+        with patch.object(logging_config, '_configured', False), patch.object(root, 'handlers', []), \
+                patch.object(root, 'level', root.level):
+            configure_logging(logging.INFO, stream=stream)
+            configure_logging(logging.DEBUG)
+            self.assertEqual(root.level, logging.INFO)
+            self.assertIsInstance(root.handlers[0], logging.handlers.QueueHandler)
+
+            written_by = []
+            handler = logging_config._listener.handlers[0]
+            original_emit = handler.emit
+            handler.emit = lambda record: (written_by.append(threading.current_thread()), original_emit(record))
+
+            with log_context(job_name="job1", task_name="jobs.job1.task1"):
+                logging.info("Starting execution of %s", "Task1")
+            logging.debug("Not written")
+            stop_logging()
+
+        self.assertNotIn(threading.current_thread(), written_by)
+        self.assertEqual(len(written_by), 1)
+        self.assertIn(" - INFO - [job1 jobs.job1.task1] Starting execution of Task1\n", stream.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import concurrent.futures
+import os
+import sys
+import threading
+import unittest
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, project_root)  # Insert at the beginning to prioritize
+
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(1, base_src)  # Insert at the beginning to prioritize
+
+from job_orchestrator.map_tasks import MapRun
+
+
+class Double:
+    def execute(self, item):
+        return item * 2
+
+
+class Total:
+    initial = 0
+
+    def execute(self, item):
+        return item
+
+    def reduce(self, accumulator, results):
+        return accumulator + sum(results)
+
+
+class TestMapRun(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_results_are_in_item_order(self):
+        """Test that a map without reduce returns the result of every item in item order."""
+        run = MapRun(Double, range(1000), chunk_size=7, window=3, submit=self.executor.submit)
+        result, timing = run.start().result()
+
+        self.assertEqual(result, [item * 2 for item in range(1000)])
+        self.assertEqual(run.chunks, 143)
+        self.assertIsNotNone(timing.cpu_time)
+
+    def test_large_map_dispatches_chunks_not_items(self):
+        """Test that a large map is reduced with one work item per chunk and never more chunks in flight than the window."""
+        lock = threading.Lock()
+        in_flight = []
+        peak = []
+
+        def submit(fn, *args):
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            future = self.executor.submit(fn, *args)
+            future.add_done_callback(lambda _: in_flight.pop())
+            return future
+
+        run = MapRun(Total, iter(range(100_000)), chunk_size=1000, window=4, submit=submit)
+        result, _ = run.start().result()
+
+        self.assertEqual(result, sum(range(100_000)))
+        self.assertEqual(run.chunks, 100)
+        self.assertLessEqual(max(peak), 4)
+
+    def test_empty_map(self):
+        """Test that a map over no items finishes at once with the empty result or the initial accumulator."""
+        self.assertEqual(MapRun(Double, [], submit=self.executor.submit).start().result()[0], [])
+        self.assertEqual(MapRun(Total, [], submit=self.executor.submit).start().result()[0], 0)
+
+    def test_failing_chunk_fails_the_map(self):
+        """Test that an exception raised for one item fails the map."""
+        class Fragile:
+            def execute(self, item):
+                if item == 500:
+                    raise ValueError("bad item")
+                return item
+
+        future = MapRun(Fragile, range(1000), chunk_size=10, submit=self.executor.submit).start()
+        with self.assertRaises(ValueError):
+            future.result()
+
+    def test_stopped_map_fails(self):
+        """Test that a map stopped early dispatches no further chunks and fails with CancelledError."""
+        run = MapRun(Double, range(1000), chunk_size=10, window=2, submit=self.executor.submit,
+                     stopped=lambda: True)
+        with self.assertRaises(concurrent.futures.CancelledError):
+            run.start().result()
+        self.assertEqual(run.chunks, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import os
+import sys
+import unittest
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, project_root)  # Insert at the beginning to prioritize
+
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(1, base_src)  # Insert at the beginning to prioritize
+
+from job_orchestrator.process_pool import get_process_pool, shutdown_process_pool
+
+
+class TestProcessPool(unittest.TestCase):
+
+    def tearDown(self):
+        shutdown_process_pool()
+
+    def test_pool_is_reused(self):
+        """Test that the process pool is created once and shared between callers."""
+        self.assertIs(get_process_pool(max_workers=1), get_process_pool())
+
+    def test_tasks_run_in_worker_process(self):
+        """Test that submitted callables run outside the orchestrator process."""
+        worker_pid = get_process_pool(max_workers=1).submit(os.getpid).result()
+        self.assertNotEqual(worker_pid, os.getpid())
+
+    def test_shutdown_creates_new_pool(self):
+        """Test that a pool requested after shutdown is a fresh instance."""
+        pool = get_process_pool(max_workers=1)
+        shutdown_process_pool()
+        self.assertIsNot(pool, get_process_pool(max_workers=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import sys
+import unittest
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, project_root)  # Insert at the beginning to prioritize
+
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(1, base_src)  # Insert at the beginning to prioritize
+
+from job_orchestrator.resources import ResourcePool
+
+
+class TestResourcePool(unittest.TestCase):
+
+    def test_waits_until_capacity_is_free(self):
+        """Test that acquisitions beyond the capacity wait and start as resources are released."""
+        pool = ResourcePool({"db": 2})
+        started = []
+
+        self.assertTrue(pool.acquire({"db": 1}, started.append, "a"))
+        self.assertTrue(pool.acquire({"db": 1}, started.append, "b"))
+        self.assertFalse(pool.acquire({"db": 1}, started.append, "c"))
+        self.assertEqual(started, ["a", "b"])
+        self.assertEqual(pool.in_use(), {"db": 2})
+
+        pool.release({"db": 1})
+        self.assertEqual(started, ["a", "b", "c"])
+        self.assertEqual(pool.waiting(), 0)
+
+    def test_highest_priority_fitting_waiter_starts_first(self):
+        """Test that released resources go to the highest priority waiter and smaller waiters backfill."""
+        pool = ResourcePool({"mem_gb": 16})
+        started = []
+        pool.acquire({"mem_gb": 16}, started.append, "hog")
+        pool.acquire({"mem_gb": 8}, started.append, "low", priority=1)
+        pool.acquire({"mem_gb": 12}, started.append, "high", priority=5)
+        pool.acquire({"mem_gb": 4}, started.append, "small", priority=0)
+
+        pool.release({"mem_gb": 16})
+
+        self.assertEqual(started, ["hog", "high", "small"])
+        self.assertEqual(pool.waiting(), 1)
+
+    def test_parent_capacities_apply_to_children(self):
+        """Test that a child pool is bounded by its own capacities and by those of its parent."""
+        shared = ResourcePool({"db": 2})
+        job1 = ResourcePool({"db": 1}, parent=shared)
+        job2 = ResourcePool(parent=shared)
+        started = []
+
+        self.assertTrue(job1.acquire({"db": 1}, started.append, "job1-a"))
+        self.assertFalse(job1.acquire({"db": 1}, started.append, "job1-b"))
+        self.assertTrue(job2.acquire({"db": 1}, started.append, "job2-a"))
+        self.assertFalse(job2.acquire({"db": 1}, started.append, "job2-b"))
+
+        # Only job2-b fits: job1 is at its own capacity.
+        job2.release({"db": 1})
+        self.assertEqual(started, ["job1-a", "job2-a", "job2-b"])
+        self.assertEqual(shared.in_use(), {"db": 2})
+        job1.release({"db": 1})
+        self.assertEqual(started, ["job1-a", "job2-a", "job2-b", "job1-b"])
+
+    def test_undeclared_resources_are_unlimited(self):
+        """Test that resources without a capacity never block."""
+        pool = ResourcePool({"db": 1})
+        self.assertTrue(all(pool.acquire({"gpu": 1}, lambda: None) for _ in range(10)))
+
+    def test_requirement_above_capacity_is_rejected(self):
+        """Test that a requirement that can never be met is rejected instead of waiting forever."""
+        pool = ResourcePool({"mem_gb": 16}, parent=ResourcePool({"db": 4}))
+        pool.check({"mem_gb": 16, "db": 4})
+        with self.assertRaises(ValueError):
+            pool.check({"db": 5})
+        with self.assertRaises(ValueError):
+            pool.check({"mem_gb": -1})
+
+
+if __name__ == '__main__':
+    unittest.main()
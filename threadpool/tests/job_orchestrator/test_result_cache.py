@@ -0,0 +1,82 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, project_root)  # Insert at the beginning to prioritize
+
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(1, base_src)  # Insert at the beginning to prioritize
+
+from job_orchestrator.result_cache import ResultCache, task_cache_key
+
+
+class SourceTask:
+    def execute(self, dependent_response=None):
+        return "source"
+
+
+class OtherTask:
+    def execute(self, dependent_response=None):
+        return "other"
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = directory.name
+
+    def test_put_and_get(self):
+        """Test that a stored result is returned with the same digest put returned."""
+        cache = ResultCache(self.path)
+        digest = cache.put("key", {"rows": [1, 2, 3]})
+
+        cached = cache.get("key")
+        self.assertEqual(cached.value, {"rows": [1, 2, 3]})
+        self.assertEqual(cached.digest, digest)
+        self.assertIsNone(cache.get("missing"))
+
+    def test_least_recently_used_results_are_evicted(self):
+        """Test that the cache stays within its size bound by evicting the least recently used result."""
+        cache = ResultCache(self.path, max_bytes=2500)
+        for key in ["first", "second"]:
+            cache.put(key, b"x" * 1000)
+        cache.get("first")
+        cache.put("third", b"x" * 1000)
+
+        self.assertIn("first", cache)
+        self.assertNotIn("second", cache)
+        self.assertIn("third", cache)
+        self.assertLessEqual(cache.size, 2500)
+
+    def test_results_survive_reopening(self):
+        """Test that a new cache on the same directory finds the stored results."""
+        digest = ResultCache(self.path).put("key", "value")
+
+        self.assertEqual(ResultCache(self.path).get("key"), ("value", digest))
+
+    def test_unpicklable_results_are_not_stored(self):
+        """Test that a result that cannot be pickled is skipped without failing."""
+        cache = ResultCache(self.path)
+
+        self.assertIsNone(cache.put("key", threading.Lock()))
+        self.assertEqual(len(cache), 0)
+
+    def test_task_cache_key(self):
+        """Test that the key changes with the task class, its configuration and its dependency digests."""
+        task = {"name": "jobs.job1.task2", "dependencies": ["jobs.job1.task1"]}
+        key = task_cache_key(task, SourceTask, {"jobs.job1.task1": "a"})
+
+        self.assertEqual(key, task_cache_key(dict(task), SourceTask, {"jobs.job1.task1": "a"}))
+        self.assertNotEqual(key, task_cache_key(task, OtherTask, {"jobs.job1.task1": "a"}))
+        self.assertNotEqual(key, task_cache_key(dict(task, timeout_seconds=5), SourceTask, {"jobs.job1.task1": "a"}))
+        self.assertNotEqual(key, task_cache_key(task, SourceTask, {"jobs.job1.task1": "b"}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import pickle
+import sys
+import unittest
+from multiprocessing import shared_memory
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, project_root)  # Insert at the beginning to prioritize
+
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(1, base_src)  # Insert at the beginning to prioritize
+
+from job_orchestrator.shared_results import (SHARED_MIN_BYTES, SharedBuffer, SharedResults, close_segments, discard,
+                                             materialize, open_shared, share_result)
+
+
+PAYLOAD = bytes(range(256)) * (SHARED_MIN_BYTES // 256)
+
+
+def segment_exists(name):
+    """Whether a shared memory segment with the given name exists."""
+    try:
+        segment = shared_memory.SharedMemory(name)
+    except FileNotFoundError:
+        return False
+    segment.close()
+    return True
+
+
+class TestSharedResults(unittest.TestCase):
+
+    def test_small_and_non_buffer_results_are_not_shared(self):
+        """Test that results below the size threshold or without a buffer are returned unchanged."""
+        self.assertEqual(share_result(b"small"), b"small")
+        self.assertEqual(share_result("text" * SHARED_MIN_BYTES), "text" * SHARED_MIN_BYTES)
+        self.assertEqual(share_result([PAYLOAD]), [PAYLOAD])
+
+    def test_shared_result_round_trip(self):
+        """Test that a large result travels as a small handle and is opened as a read-only view of the same bytes."""
+        handle = share_result(PAYLOAD)
+        self.assertIsInstance(handle, SharedBuffer)
+        self.assertLess(len(pickle.dumps(handle)), 200)
+
+        results = open_shared({"task1": pickle.loads(pickle.dumps(handle)), "task2": "small"})
+        try:
+            self.assertIsInstance(results["task1"], memoryview)
+            self.assertTrue(results["task1"].readonly)
+            self.assertEqual(results["task1"], PAYLOAD)
+            self.assertEqual(results["task2"], "small")
+        finally:
+            del results
+            close_segments()
+            discard(handle)
+        self.assertFalse(segment_exists(handle.name))
+
+    def test_fan_out_shares_one_segment(self):
+        """Test that a result shared with several consumers is copied into shared memory only once."""
+        shared = SharedResults()
+        handle = shared.share("task1", bytearray(PAYLOAD))
+        self.assertIs(shared.share("task1", bytearray(PAYLOAD)), handle)
+        self.assertTrue(shared.is_shared("task1"))
+        self.assertTrue(segment_exists(handle.name))
+
+        shared.release("task1")
+        self.assertFalse(shared.is_shared("task1"))
+        self.assertFalse(segment_exists(handle.name))
+
+    def test_adopted_result_outlives_release_when_materialized(self):
+        """Test that a materialized copy of an adopted view stays valid after the job releases the segment."""
+        shared = SharedResults()
+        handle = share_result(PAYLOAD)
+        view = shared.adopt("task1", handle)
+        copy = materialize(view)
+        del view
+        shared.close()
+
+        self.assertIsInstance(copy, bytes)
+        self.assertEqual(copy, PAYLOAD)
+        self.assertFalse(segment_exists(handle.name))
+
+
+if __name__ == '__main__':
+    unittest.main()
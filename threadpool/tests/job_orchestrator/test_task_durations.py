@@ -0,0 +1,71 @@
+import os
+import sys
+import unittest
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, project_root)  # Insert at the beginning to prioritize
+
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(1, base_src)  # Insert at the beginning to prioritize
+
+from job_orchestrator.task_durations import DEFAULT_TASK_DURATION, TaskDurations, timed_call
+
+
+class TestTaskDurations(unittest.TestCase):
+
+    def setUp(self):
+        self.task_durations = TaskDurations()
+
+    def test_estimate_prefers_configured_hint(self):
+        """Test that a configured estimated_duration wins over recorded history."""
+        self.task_durations.record("jobs.job1.task1", 4.0)
+        self.assertEqual(self.task_durations.estimate({"name": "jobs.job1.task1", "estimated_duration": 2.5}), 2.5)
+
+    def test_estimate_uses_recorded_history(self):
+        """Test that the recorded duration is used when no hint is configured."""
+        self.task_durations.record("jobs.job1.task1", 4.0)
+        self.assertEqual(self.task_durations.estimate({"name": "jobs.job1.task1"}), 4.0)
+
+    def test_estimate_defaults(self):
+        """Test that tasks without hint and history get the default estimate."""
+        self.assertEqual(self.task_durations.estimate({"name": "jobs.job1.task1"}), DEFAULT_TASK_DURATION)
+
+    def test_record_smooths_measurements(self):
+        """Test that later measurements move the recorded duration only part of the way."""
+        self.task_durations.record("jobs.job1.task1", 1.0)
+        self.task_durations.record("jobs.job1.task1", 2.0)
+        recorded = self.task_durations.recorded("jobs.job1.task1")
+        self.assertGreater(recorded, 1.0)
+        self.assertLess(recorded, 2.0)
+
+    def test_load_keeps_measured_durations(self):
+        """Test that loaded durations only fill in tasks this process has not measured."""
+        self.task_durations.record("jobs.job1.task1", 1.0)
+        self.task_durations.load({"jobs.job1.task1": 9.0, "jobs.job1.task2": 2.0})
+        self.assertEqual(self.task_durations.recorded("jobs.job1.task1"), 1.0)
+        self.assertEqual(self.task_durations.recorded("jobs.job1.task2"), 2.0)
+
+    def test_load_replaces_loaded_durations(self):
+        """Test that a later load replaces durations loaded before."""
+        self.task_durations.load({"jobs.job1.task1": 9.0})
+        self.task_durations.load({"jobs.job1.task1": 3.0})
+        self.assertEqual(self.task_durations.recorded("jobs.job1.task1"), 3.0)
+
+    def test_timed_call(self):
+        """Test that timed_call returns the result together with its timing."""
+        result, timing = timed_call(lambda: "done")
+        self.assertEqual(result, "done")
+        self.assertGreaterEqual(timing.wall_time, 0)
+        self.assertGreaterEqual(timing.cpu_time, 0)
+        self.assertGreater(timing.started_at, 0)
+
+    def test_timed_call_attaches_timing_to_exceptions(self):
+        """Test that the timing of a failing call is available on the exception."""
+        with self.assertRaises(ValueError) as context:
+            timed_call(lambda: int("not a number"))
+        self.assertGreaterEqual(context.exception.task_timing.wall_time, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
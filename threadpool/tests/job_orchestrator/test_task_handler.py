@@ -17,12 +17,15 @@ base_src = os.path.join(project_root, 'src')
 sys.path.insert(2, base_src)  # Insert at the beginning to prioritize
 
 from src.job_orchestrator.task_handler import TaskHandler
+from job_orchestrator.task_registry import task_registry
 
 
 class TestTaskHandler(unittest.TestCase):
 
     def setUp(self):
         """Setup the common test environment settings."""
+        task_registry.clear()
+        self.addCleanup(task_registry.clear)
         self.task_handler = TaskHandler()
         self.task_handler.task = {'name': 'jobs.job1.task1'}
         self.task_handler.dependencies_results = {'data': 'test'}
@@ -104,6 +107,25 @@ class TestTaskHandler(unittest.TestCase):
         # Assertions
         #mock_import_module.assert_called_once_with("my_module")
         self.assertFalse(result)
+
+    @patch('importlib.import_module')
+    def test_repeated_execution_imports_once(self, mock_import_module):
+        """Test that executing the same task repeatedly resolves its class only once."""
+        mock_import_module.return_value.Task1.return_value.execute.return_value = 'success'
+
+        results = [TaskHandler({'name': 'jobs.job1.task1'}).execute_task() for _ in range(3)]
+
+        self.assertEqual(results, ['success'] * 3)
+        mock_import_module.assert_called_once_with('jobs.job1.task1')
+
+    def test_execute_task_with_resolved_class(self):
+        """Test that a task class passed in by a compiled plan is used without importing the module."""
+        mock_task_class = MagicMock()
+        mock_task_class.return_value.execute.return_value = 'success'
+        handler = TaskHandler({'name': 'jobs.job1.missing'}, {'data': 'test'}, task_class=mock_task_class)
+
+        self.assertEqual(handler.execute_task(), 'success')
+        mock_task_class.return_value.execute.assert_called_once_with({'data': 'test'})
  
 
 
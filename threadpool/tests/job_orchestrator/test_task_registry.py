@@ -0,0 +1,50 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, project_root)  # Insert at the beginning to prioritize
+
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(1, base_src)  # Insert at the beginning to prioritize
+
+from job_orchestrator.task_registry import TaskRegistry
+
+
+class TestTaskRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = TaskRegistry()
+
+    def test_resolve_is_memoized(self):
+        """Test that a task module is imported only on the first resolution."""
+        with patch('importlib.import_module', wraps=__import__('importlib').import_module) as mock_import_module:
+            first = self.registry.resolve('jobs.job1.task1')
+            second = self.registry.resolve('jobs.job1.task1')
+
+        self.assertIs(first, second)
+        self.assertEqual(first.__name__, 'Task1')
+        mock_import_module.assert_called_once_with('jobs.job1.task1')
+
+    def test_resolve_missing_task(self):
+        """Test that unknown modules and classes raise instead of being cached."""
+        with self.assertRaises(ImportError):
+            self.registry.resolve('jobs.job1.missing')
+        self.assertFalse(self.registry.is_valid('jobs.job1.task'))
+        self.assertTrue(self.registry.is_valid('jobs.job2.task4'))
+
+    def test_preload(self):
+        """Test that preload resolves every distinct task name and reports invalid ones."""
+        task_classes = self.registry.preload(['jobs.job1.task1', 'jobs.job3.task9', 'jobs.job1.task1'])
+        self.assertEqual({name: cls.__name__ for name, cls in task_classes.items()},
+                         {'jobs.job1.task1': 'Task1', 'jobs.job3.task9': 'Task9'})
+
+        with self.assertRaises(ValueError) as context:
+            self.registry.preload(['jobs.job1.task2', 'jobs.job1.missing'])
+        self.assertIn('jobs.job1.missing', str(context.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import sys
+import threading
+import unittest
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, project_root)  # Insert at the beginning to prioritize
+
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(1, base_src)  # Insert at the beginning to prioritize
+
+from job_orchestrator.timer_queue import TimerQueue
+
+
+class TestTimerQueue(unittest.TestCase):
+
+    def test_callbacks_run_in_due_order(self):
+        """Test that callbacks run in the order of their due times, not their scheduling order."""
+        timer_queue = TimerQueue()
+        order = []
+        done = threading.Event()
+        timer_queue.schedule(0.2, lambda: (order.append("late"), done.set()))
+        timer_queue.schedule(0.05, order.append, "early")
+
+        self.assertTrue(done.wait(2))
+        self.assertEqual(order, ["early", "late"])
+
+    def test_cancelled_timer_does_not_run(self):
+        """Test that a cancelled callback is skipped."""
+        timer_queue = TimerQueue()
+        order = []
+        done = threading.Event()
+        timer = timer_queue.schedule(0.05, order.append, "cancelled")
+        timer_queue.schedule(0.1, done.set)
+        timer.cancel()
+
+        self.assertTrue(done.wait(2))
+        self.assertEqual(order, [])
+
+    def test_failing_callback_does_not_stop_the_queue(self):
+        """Test that an exception in one callback does not prevent later callbacks."""
+        timer_queue = TimerQueue()
+        done = threading.Event()
+        with self.assertLogs(level='ERROR'):
+            timer_queue.schedule(0, int, "not a number")
+            timer_queue.schedule(0.05, done.set)
+            self.assertTrue(done.wait(2))
+
+
+if __name__ == '__main__':
+    unittest.main()
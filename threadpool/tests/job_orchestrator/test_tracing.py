@@ -0,0 +1,64 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, project_root)  # Insert at the beginning to prioritize
+
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(1, base_src)  # Insert at the beginning to prioritize
+
+from job_orchestrator.tracing import TaskTrace
+
+
+class TestTaskTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.trace = TaskTrace()
+        self.trace.record("task1", 100.0, 1.0, "worker_0", queued_at=100.0, job_name="job1")
+        self.trace.record("task2", 101.5, 0.5, "worker_1", queued_at=101.0, dependencies=["task1"], job_name="job1")
+        self.trace.record("task3", 102.0, 2.0, "ForkProcess-1", process_id=12345, dependencies=["task2"],
+                          outcome='failure', job_name="job1")
+
+    def test_spans(self):
+        """Test that every recorded attempt becomes a span with its finish time and outcome."""
+        self.assertEqual([span.task_name for span in self.trace.spans], ["task1", "task2", "task3"])
+        self.assertEqual(self.trace.spans[1].finished_at, 102.0)
+        self.assertEqual(self.trace.spans[1].dependencies, ("task1",))
+        self.assertEqual(self.trace.spans[2].outcome, 'failure')
+
+    def test_chrome_trace_events(self):
+        """Test the task slices, queue slices, dependency flows and track names of the Chrome trace export."""
+        events = self.trace.to_chrome_trace()["traceEvents"]
+
+        slices = {event["name"]: event for event in events if event["ph"] == "X"}
+        self.assertEqual((slices["task1"]["ts"], slices["task1"]["dur"]), (0.0, 1e6))
+        self.assertEqual((slices["task2"]["ts"], slices["task2"]["dur"]), (1.5e6, 0.5e6))
+        self.assertEqual(slices["task2"]["args"]["queue_wait_ms"], 500.0)
+        self.assertNotEqual(slices["task1"]["tid"], slices["task2"]["tid"])
+        self.assertEqual(slices["task3"]["pid"], 12345)
+
+        queued = [(event["ph"], event["ts"]) for event in events if event["ph"] in "be"]
+        self.assertEqual(queued, [("b", 1.0e6), ("e", 1.5e6)])
+
+        flows = [event for event in events if event["ph"] in "sf"]
+        self.assertEqual(len(flows), 4)
+        self.assertEqual(flows[1], {"name": "dependency", "cat": "dependency", "ph": "f", "bp": "e", "id": 1,
+                                    "pid": os.getpid(), "tid": slices["task2"]["tid"], "ts": 1.5e6})
+
+        names = {event["args"]["name"] for event in events if event["ph"] == "M"}
+        self.assertEqual(names, {"orchestrator", "worker process 12345", "worker_0", "worker_1", "ForkProcess-1"})
+
+    def test_save(self):
+        """Test that the trace is written as a JSON object with a traceEvents array."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.trace.save(os.path.join(directory, "traces", "run.json"))
+            with open(path) as file:
+                self.assertEqual(len(json.load(file)["traceEvents"]), len(self.trace.to_chrome_trace()["traceEvents"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
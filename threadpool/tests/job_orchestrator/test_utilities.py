@@ -23,10 +23,10 @@ from src.job_orchestrator.utilities import *
 class TestUtilityFunctions(unittest.TestCase):
 
     def test_setup_logging(self):
-        """Test the setup_logging function to ensure it sets the logging level correctly."""
-        with patch('logging.basicConfig') as mocked_logging:
+        """Test the setup_logging function to ensure it configures logging with the given level."""
+        with patch('src.job_orchestrator.utilities.configure_logging') as mocked_logging:
             setup_logging(log_level=logging.DEBUG)
-            mocked_logging.assert_called_once_with(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+            mocked_logging.assert_called_once_with(logging.DEBUG)
 
     def test_convert_to_camel_case(self):
         """Test the convert_to_camel_case function with various inputs."""
@@ -64,5 +64,60 @@ class TestUtilityFunctions(unittest.TestCase):
         self.assertTrue(detect_cycle(task_map_with_cycle, "task1"))
         self.assertFalse(detect_cycle(task_map_without_cycle, "task1"))
 
+    def test_two_node_cycle(self):
+        """Test that a cycle between two tasks that depend on each other is detected."""
+        tasks = [
+            {"name": "task1", "dependencies": ["task2"]},
+            {"name": "task2", "dependencies": ["task1"]}
+        ]
+        self.assertTrue(has_cyclic_dependencies(tasks))
+        self.assertTrue(detect_cycle({"task1": ["task2"], "task2": ["task1"]}, "task1"))
+
+    def test_diamond_is_not_a_cycle(self):
+        """Test that two tasks sharing a dependency are not reported as a cycle."""
+        tasks = [
+            {"name": "task1", "dependencies": []},
+            {"name": "task2", "dependencies": ["task1"]},
+            {"name": "task3", "dependencies": ["task1"]},
+            {"name": "task4", "dependencies": ["task2", "task3"]}
+        ]
+        self.assertFalse(has_cyclic_dependencies(tasks))
+        self.assertFalse(detect_cycle({task["name"]: task["dependencies"] for task in tasks}, "task4"))
+
+    def test_analyze_dependencies_reports_cycle_path(self):
+        """Test that the analysis returns the offending cycle as a dependency path."""
+        tasks = [
+            {"name": "task1", "dependencies": ["task2"]},
+            {"name": "task2", "dependencies": ["task3"]},
+            {"name": "task3", "dependencies": ["task2"]}
+        ]
+        analysis = analyze_dependencies(tasks)
+        self.assertEqual(analysis.cycle, ["task2", "task3", "task2"])
+        self.assertEqual(analysis.order, [])
+
+    def test_analyze_dependencies_order_and_levels(self):
+        """Test the topological order and depth levels of an acyclic configuration."""
+        tasks = [
+            {"name": "task4", "dependencies": ["task2", "task3"]},
+            {"name": "task3", "dependencies": ["task1"]},
+            {"name": "task2", "dependencies": ["task1", "external.task"]},
+            {"name": "task1"}
+        ]
+        analysis = analyze_dependencies(tasks)
+        self.assertIsNone(analysis.cycle)
+        position = {name: index for index, name in enumerate(analysis.order)}
+        for task in tasks:
+            for dep in task.get("dependencies", []):
+                if dep in position:
+                    self.assertLess(position[dep], position[task["name"]])
+        self.assertEqual(analysis.levels, {"task1": 0, "task2": 1, "task3": 1, "task4": 2})
+
+    def test_analyze_dependencies_deep_chain(self):
+        """Test that a chain deeper than the recursion limit is analysed without errors."""
+        depth = sys.getrecursionlimit() * 2
+        tasks = [{"name": f"task{i}", "dependencies": [f"task{i - 1}"] if i else []} for i in range(depth)]
+        analysis = analyze_dependencies(tasks)
+        self.assertEqual(analysis.levels[f"task{depth - 1}"], depth - 1)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,224 @@
+import concurrent.futures
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Append the project src directory to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..'))
+sys.path.insert(0, project_root)  # Insert at the beginning to prioritize
+
+base_src = os.path.join(project_root, 'src')
+sys.path.insert(1, base_src)  # Insert at the beginning to prioritize
+
+from job_orchestrator.worker_pool import AdaptiveWorkerPool, SharedTasks, WorkerPool
+
+
+class TestWorkerPool(unittest.TestCase):
+
+    def test_concurrency_is_bounded(self):
+        """Test that no more than max_workers callables run at the same time, whichever job submitted them."""
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def work():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.pop()
+
+        with WorkerPool(max_workers=3) as pool:
+            futures = [pool.submit(f"job{i % 4}", work) for i in range(24)]
+            for future in futures:
+                future.result()
+
+        self.assertLessEqual(max(peak), 3)
+        self.assertLessEqual(len(pool._threads), 3)
+
+    def test_round_robin_between_jobs(self):
+        """Test that queued work of several jobs is interleaved instead of drained job by job."""
+        order = []
+        gate = threading.Event()
+
+        with WorkerPool(max_workers=1) as pool:
+            pool.submit("blocker", gate.wait)
+            futures = [pool.submit("job_a", order.append, f"a{i}") for i in range(3)]
+            futures += [pool.submit("job_b", order.append, f"b{i}") for i in range(3)]
+            gate.set()
+            for future in futures:
+                future.result()
+
+        self.assertEqual(order, ["a0", "b0", "a1", "b1", "a2", "b2"])
+
+    def test_priority_within_job(self):
+        """Test that the queued work of one job runs highest priority first, in submission order among equals."""
+        order = []
+        gate = threading.Event()
+
+        with WorkerPool(max_workers=1) as pool:
+            pool.submit("blocker", gate.wait)
+            futures = [pool.submit_with_priority("job", priority, order.append, name)
+                       for name, priority in [("low", 1), ("high", 5), ("default", 0), ("low2", 1)]]
+            gate.set()
+            for future in futures:
+                future.result()
+
+        self.assertEqual(order, ["high", "low", "low2", "default"])
+
+    def test_abandoned_worker_is_replaced(self):
+        """Test that abandoning a stuck worker lets queued work run without exceeding max_workers."""
+        release = threading.Event()
+        started = threading.Event()
+
+        def stuck():
+            started.set()
+            release.wait()
+
+        with WorkerPool(max_workers=1) as pool:
+            stuck_future = pool.submit("job", stuck)
+            started.wait()
+            queued = pool.submit("job", lambda: "ran")
+            stuck_future.set_exception(TimeoutError())
+            pool.abandon(pool._threads[0])
+
+            self.assertEqual(queued.result(timeout=2), "ran")
+            self.assertEqual(len(pool._threads), 1)
+            release.set()
+
+    def test_exceptions_are_propagated(self):
+        """Test that an exception raised by submitted work is set on its future."""
+        with WorkerPool(max_workers=1) as pool:
+            future = pool.submit("job", int, "not a number")
+            with self.assertRaises(ValueError):
+                future.result()
+
+    def test_submit_after_shutdown(self):
+        """Test that the pool rejects work once it has been shut down."""
+        pool = WorkerPool(max_workers=1)
+        pool.shutdown()
+        with self.assertRaises(RuntimeError):
+            pool.submit("job", print)
+
+    def test_shared_tasks_submit_once(self):
+        """Test that a shared task key is only submitted by the first caller."""
+        shared_tasks = SharedTasks()
+        with WorkerPool(max_workers=2) as pool:
+            calls = []
+            first = shared_tasks.submit("key", lambda: pool.submit("job1", calls.append, "job1"))
+            second = shared_tasks.submit("key", lambda: pool.submit("job2", calls.append, "job2"))
+            first.result()
+
+        self.assertIs(first, second)
+        self.assertEqual(calls, ["job1"])
+
+    def test_shared_tasks_resubmit_failed_attempt_once(self):
+        """Test that a failed shared task is resubmitted by the first job retrying it and reused by the others."""
+        shared_tasks = SharedTasks()
+        failed = concurrent.futures.Future()
+        failed.set_exception(ConnectionError())
+        retry = concurrent.futures.Future()
+        shared_tasks.submit("key", lambda: failed)
+
+        first = shared_tasks.submit("key", lambda: retry, failed=failed)
+        second = shared_tasks.submit("key", lambda: self.fail("resubmitted twice"), failed=failed)
+
+        self.assertIs(first, retry)
+        self.assertIs(second, retry)
+
+
+class TestAdaptiveWorkerPool(unittest.TestCase):
+
+    def test_grows_while_workers_block(self):
+        """Test that the pool adds threads beyond its floor while queued work waits on workers blocked in sleep."""
+        with AdaptiveWorkerPool(min_workers=2, max_workers=64, interval=0.01) as pool:
+            start = time.monotonic()
+            futures = [pool.submit("job", time.sleep, 0.05) for _ in range(64)]
+            for future in futures:
+                future.result()
+            elapsed = time.monotonic() - start
+            metrics = pool.metrics()
+
+        self.assertGreater(metrics["peak_workers"], 2)
+        self.assertGreaterEqual(metrics["grow_decisions"], 1)
+        self.assertEqual(pool.scaling_events[0].action, 'grow')
+        # 64 sleeps of 50ms take 1.6s on the two threads of the floor.
+        self.assertLess(elapsed, 1.0)
+
+    def test_growth_is_bounded_by_ceiling(self):
+        """Test that the pool never runs more threads than max_workers."""
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def work():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.pop()
+
+        with AdaptiveWorkerPool(min_workers=1, max_workers=5, interval=0.005) as pool:
+            futures = [pool.submit("job", work) for _ in range(100)]
+            for future in futures:
+                future.result()
+
+        self.assertLessEqual(max(peak), 5)
+        self.assertLessEqual(pool.metrics()["peak_workers"], 5)
+
+    def test_shrinks_to_floor_when_idle(self):
+        """Test that threads idle for idle_timeout are retired down to min_workers, and that work still runs after."""
+        with AdaptiveWorkerPool(min_workers=2, max_workers=32, interval=0.01, idle_timeout=0.1) as pool:
+            for future in [pool.submit("job", time.sleep, 0.05) for _ in range(32)]:
+                future.result()
+            self.assertGreater(pool.metrics()["workers"], 2)
+
+            deadline = time.monotonic() + 5
+            while pool.metrics()["workers"] > 2 and time.monotonic() < deadline:
+                time.sleep(0.02)
+            metrics = pool.metrics()
+            self.assertEqual(metrics["workers"], 2)
+            self.assertGreaterEqual(metrics["shrink_decisions"], 1)
+            self.assertEqual(pool.scaling_events[-1].action, 'shrink')
+
+            self.assertEqual(pool.submit("job", sum, [1, 2]).result(timeout=1), 3)
+
+    def test_controller_stops_when_drained(self):
+        """Test that the controller stops sampling once the pool has drained, and restarts with the next submission."""
+        with AdaptiveWorkerPool(min_workers=2, max_workers=32, interval=0.01, idle_timeout=0.1) as pool:
+            for future in [pool.submit("job", time.sleep, 0.05) for _ in range(32)]:
+                future.result()
+
+            deadline = time.monotonic() + 5
+            while pool._timer is not None and time.monotonic() < deadline:
+                time.sleep(0.02)
+            self.assertIsNone(pool._timer)
+            self.assertEqual(pool.metrics()["workers"], 2)
+            generation = pool._generation
+            time.sleep(0.1)
+            self.assertEqual(pool._generation, generation)
+
+            self.assertEqual(pool.submit("job", sum, [1, 2]).result(timeout=1), 3)
+            self.assertGreater(pool._generation, generation)
+
+    def test_does_not_grow_under_cpu_load(self):
+        """Test that the pool stays at its floor while its workers keep the CPU busy."""
+        def spin(seconds):
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline:
+                pass
+
+        with AdaptiveWorkerPool(min_workers=1, max_workers=16, interval=0.01) as pool:
+            for future in [pool.submit("job", spin, 0.01) for _ in range(30)]:
+                future.result()
+
+        self.assertEqual(pool.metrics()["grow_decisions"], 0)
+        self.assertEqual(pool.metrics()["peak_workers"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,6 +15,7 @@ base_src = os.path.join(project_root, 'src')
 sys.path.insert(2, base_src)  # Insert at the beginning to prioritize
 
 from src.main import initiate_job
+from job_orchestrator.job import JobRun
 
 
 class TestMainFunction(unittest.TestCase):
@@ -38,7 +39,7 @@ class TestMainFunction(unittest.TestCase):
         mock_JobOrchestrator.assert_called_once_with()
 
         # Check that start_job was called with the correct job name
-        mock_orchestrator_instance.start_job.assert_called_once_with(job_name)      
+        mock_orchestrator_instance.start_job.assert_called_once_with(job_name, max_workers=None)      
 
     @patch('src.main.JobOrchestrator')
     def test_main_with_json_decoder_exception(self, MockJobOrchestrator):
@@ -91,5 +92,52 @@ class TestMainFunction(unittest.TestCase):
         
         self.assertEqual(cm.exception.code, 1)
 
+    @patch('src.main.JobOrchestrator')
+    def test_main_with_failed_tasks(self, MockJobOrchestrator):
+        # A job whose tasks failed, timed out or were cancelled is reported by start_job returning False
+        MockJobOrchestrator.return_value.start_job.return_value = False
+
+        with self.assertRaises(SystemExit) as cm:
+            initiate_job('job1')
+
+        self.assertEqual(cm.exception.code, 1)
+
+    @patch('src.main.JobOrchestrator')
+    def test_initiate_jobs_with_failed_job(self, MockJobOrchestrator):
+        MockJobOrchestrator.return_value.start_jobs.return_value = {'job1': JobRun(True, None), 'job2': JobRun(False, '3f2a')}
+
+        with self.assertRaises(SystemExit) as cm:
+            from src.main import initiate_jobs
+            initiate_jobs(['job1', 'job2'])
+
+        self.assertEqual(cm.exception.code, 1)
+
+    @patch('src.main.JobOrchestrator')
+    def test_resume_run_with_failed_tasks(self, MockJobOrchestrator):
+        MockJobOrchestrator.return_value.resume.return_value = False
+
+        with self.assertRaises(SystemExit) as cm:
+            from src.main import resume_run
+            resume_run('3f2a')
+
+        self.assertEqual(cm.exception.code, 1)
+
+    @patch('src.main.JobOrchestrator')
+    def test_resume_run_success(self, MockJobOrchestrator):
+        MockJobOrchestrator.return_value.resume.return_value = True
+
+        from src.main import resume_run
+        resume_run('3f2a', autoscale=True, max_workers=64)
+
+        MockJobOrchestrator.return_value.resume.assert_called_once_with('3f2a', max_workers=64)
+
+    @patch('src.main.JobOrchestrator')
+    def test_main_passes_max_workers(self, MockJobOrchestrator):
+        MockJobOrchestrator.return_value.start_job.return_value = True
+
+        initiate_job('job1', autoscale=True, max_workers=64)
+
+        MockJobOrchestrator.return_value.start_job.assert_called_once_with('job1', max_workers=64)
+
 if __name__ == '__main__':
     unittest.main()